@@ -24,13 +24,15 @@ from api.routers.auth import router as auth_router, seed_admin_user
 from api.middleware.auth import APIKeyMiddleware
 from api.middleware.rate_limiter import RateLimiterMiddleware
 from api.middleware.request_id import RequestIDMiddleware
-from graph.graph_builder import get_graph
+from graph.graph_builder import close_graph, get_graph
+from graph.sqlite_checkpointer import BatchedSqliteSaver, run_checkpoint_compactor
 from mcp_clients.mongo_client import get_mongo_client
 from rag.vectorstore.semantic_cache import get_semantic_cache
 from rag.vectorstore.faiss_store import get_faiss_store
+from tools.government.http_pool import close_government_http
 from observability.tracing import setup_tracing
 from observability.telemetry import telemetry
-from observability.logger import get_logger
+from observability.logger import flush_logs, get_logger
 from observability.performance_monitor import start_performance_monitors
 from config.settings import settings
 
@@ -118,6 +120,10 @@ async def lifespan(app: FastAPI):
         app.state.graph = graph
         logger.info("✅ LangGraph compiled")
 
+        if isinstance(graph.checkpointer, BatchedSqliteSaver) and settings.CHECKPOINT_COMPACT_INTERVAL_SECONDS > 0:
+            app.state.checkpoint_compactor = asyncio.create_task(run_checkpoint_compactor(graph.checkpointer))
+            logger.info("✅ Checkpoint compactor started")
+
         logger.info(f"🟢 RTI-Agent ready on port {settings.PORT} [{settings.APP_ENV}]")
 
         yield  # ← Application runs here
@@ -141,6 +147,10 @@ async def lifespan(app: FastAPI):
 
     # ── Shutdown ──────────────────────────────────────────────────
     logger.info("🔴 RTI-Agent shutting down...")
+    if getattr(app.state, "checkpoint_compactor", None) is not None:
+        app.state.checkpoint_compactor.cancel()
+    # Flushes checkpoint writes still queued for the writer thread and stops it
+    await asyncio.to_thread(close_graph)
     if hasattr(app.state, "mongo") and app.state.mongo is not None:
         try:
             await app.state.mongo.close()
@@ -155,6 +165,15 @@ async def lifespan(app: FastAPI):
         except Exception as pg_close_err:
             logger.error(f"Error closing PostgreSQL checkpointer: {pg_close_err}")
 
+    try:
+        await close_government_http()
+        logger.info("✅ Government HTTP pool closed")
+    except Exception as http_close_err:
+        logger.error(f"Error closing government HTTP pool: {http_close_err}")
+
+    # Records are written by a background thread; make sure shutdown logs land
+    await asyncio.to_thread(flush_logs)
+
 
 # ── FastAPI App ───────────────────────────────────────────────────
 app = FastAPI(
@@ -223,6 +223,7 @@ def _compact_scrape_report(report: dict) -> dict:
             "pages_saved": item.get("pages_saved"),
             "pdfs_saved": item.get("pdfs_saved"),
             "duplicates": item.get("duplicates"),
+            "unchanged": item.get("unchanged", 0),
             "failures": item.get("failures", []),
             "documents": item.get("documents", 0),
         }
@@ -11,7 +11,9 @@ import uuid
 from datetime import datetime, timezone
 from fastapi import APIRouter, Request, HTTPException, Depends
 from api.schemas import RTISubmitRequest, RTISubmitResponse, ApprovalRequest, ApprovalResponse, RespondRequest, RespondResponse
+from communication.workflow_stream import get_workflow_stream_hub, run_graph_streaming
 from graph.state import RTIAgentState
+from llm_router.rate_governor import llm_priority
 from mcp_clients.mongo_client import get_mongo_client
 from security.sanitizer import sanitize_query
 from security.pii_masker import mask_pii
@@ -162,14 +164,12 @@ async def submit_rti(payload: RTISubmitRequest, request: Request):
 
     async def run_workflow():
         try:
-            await graph.ainvoke(initial_state, config=config)
+            enriched = await run_graph_streaming(graph, initial_state, config, request_id=request_id)
             logger.info(f"[/submit] Graph paused at approval | request_id={request_id}")
 
             # Persist enriched state to MongoDB after graph pauses
             try:
-                graph_state = await graph.aget_state(config)
-                if graph_state and graph_state.values:
-                    enriched = graph_state.values
+                if enriched:
                     enriched_update = {
                         "formal_query": enriched.get("formal_query", ""),
                         "department": enriched.get("department", ""),
@@ -212,6 +212,8 @@ async def submit_rti(payload: RTISubmitRequest, request: Request):
         finally:
             rti_active_requests.dec()
 
+    # Open the SSE channel before the run starts so early subscribers wait on it
+    get_workflow_stream_hub().channel(request_id)
     request.app.state.background_tasks = getattr(request.app.state, "background_tasks", set())
     import asyncio
     task = asyncio.create_task(run_workflow())
@@ -314,7 +316,9 @@ async def approve_rti(
 
     try:
         await graph.aupdate_state(config, resume_state)
-        result = await graph.ainvoke(None, config=config)
+        # A reviewer is waiting on this response, so it goes ahead of queued LLM work
+        with llm_priority("high"):
+            result = await run_graph_streaming(graph, None, config, request_id=request_id)
         tracking_id = result.get("tracking_id", "")
         if not tracking_id:
             persisted = await mongo.get_rti_by_request_id(request_id)
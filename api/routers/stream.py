@@ -19,6 +19,7 @@ import json
 import asyncio
 from fastapi import APIRouter, Request, HTTPException
 from sse_starlette.sse import EventSourceResponse
+from communication.workflow_stream import TERMINAL_EVENTS, get_workflow_stream_hub
 from observability.structured_logger import get_logger
 
 logger = get_logger(__name__)
@@ -30,57 +31,30 @@ async def stream_workflow(request_id: str, http_request: Request):
     """
     Stream real-time LangGraph node execution events via SSE.
     The client connects here after POST /submit and sees live progress.
+
+    Events come from the request's in-process channel, which the graph run
+    publishes to. The checkpointer is only read when a reconnecting client
+    (``Last-Event-ID``) can no longer be caught up from the replay buffer.
     """
     logger.info(f"[/stream] SSE connection | request_id={request_id}")
     graph = http_request.app.state.graph
     config = {"configurable": {"thread_id": request_id}}
+    hub = get_workflow_stream_hub()
+    last_event_id = _parse_event_id(http_request.headers.get("last-event-id"))
 
     async def event_generator():
         try:
-            previous_nodes = set()
-            while True:
-                state = await graph.aget_state(config)
-                if not state:
-                    await asyncio.sleep(1)
-                    continue
-
-                workflow_path = state.values.get("workflow_path", [])
-                
-                # Stream newly completed nodes
-                for node in workflow_path:
-                    if node not in previous_nodes:
-                        yield {"event": "agent_start", "data": json.dumps({"agent": node, "status": "running"})}
-                        yield {"event": "agent_done", "data": json.dumps({"agent": node, "status": "done", "duration_ms": round(state.values.get("agent_durations", {}).get(node, 0))})}
-                        previous_nodes.add(node)
-
-                next_nodes = state.next
-                if next_nodes and "approval_node" in next_nodes:
-                    yield {
-                        "event": "approval_required",
-                        "data": json.dumps({
-                            "message": "RTI draft ready for human review",
-                            "request_id": request_id,
-                            "approve_url": f"/api/v1/approve/{request_id}",
-                        }),
-                    }
-                    break
-                
-                if not next_nodes and "tracker_node" in workflow_path:
-                    yield {
-                        "event": "complete",
-                        "data": json.dumps({
-                            "tracking_id": state.values.get("tracking_id", ""),
-                            "status": state.values.get("status", "completed"),
-                            "message": state.values.get("final_response", ""),
-                        }),
-                    }
-                    break
-
-                if await http_request.is_disconnected():
-                    logger.info(f"[/stream] Client disconnected | request_id={request_id}")
-                    break
-
-                await asyncio.sleep(1)
+            resume_from = last_event_id
+            if not hub.can_replay(request_id, last_event_id):
+                # Events published while the checkpoint is read are replayed from the buffer
+                resume_from = hub.channel(request_id).last_id
+                for event in await _snapshot_events(graph, config, request_id):
+                    yield event
+                    if event["event"] in TERMINAL_EVENTS:
+                        return
+
+            async for event in hub.subscribe(request_id, resume_from):
+                yield {"id": str(event.id), "event": event.event, "data": json.dumps(event.data)}
 
         except asyncio.CancelledError:
             logger.info(f"[/stream] Stream cancelled | request_id={request_id}")
@@ -92,3 +66,45 @@ async def stream_workflow(request_id: str, http_request: Request):
             }
 
     return EventSourceResponse(event_generator())
+
+
+async def _snapshot_events(graph, config: dict, request_id: str) -> list[dict]:
+    """Rebuilds progress events from a single checkpoint read."""
+    state = await graph.aget_state(config)
+    if not state or not state.values:
+        return []
+
+    workflow_path = state.values.get("workflow_path", [])
+    durations = state.values.get("agent_durations", {})
+    events = []
+    for node in dict.fromkeys(workflow_path):
+        events.append({"event": "agent_start", "data": json.dumps({"agent": node, "status": "running"})})
+        events.append({"event": "agent_done", "data": json.dumps({"agent": node, "status": "done", "duration_ms": round(durations.get(node, 0))})})
+
+    next_nodes = state.next
+    if next_nodes and "approval_node" in next_nodes:
+        events.append({
+            "event": "approval_required",
+            "data": json.dumps({
+                "message": "RTI draft ready for human review",
+                "request_id": request_id,
+                "approve_url": f"/api/v1/approve/{request_id}",
+            }),
+        })
+    elif not next_nodes and "tracker_node" in workflow_path:
+        events.append({
+            "event": "complete",
+            "data": json.dumps({
+                "tracking_id": state.values.get("tracking_id", ""),
+                "status": state.values.get("status", "completed"),
+                "message": state.values.get("final_response", ""),
+            }),
+        })
+    return events
+
+
+def _parse_event_id(value: str | None) -> int | None:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
@@ -1,50 +1,218 @@
-"""Async in-process event bus for agent/tool/workflow events."""
+"""Async event bus for agent/tool/workflow events.
+
+Consumers get their own bounded queue, indexed by ``(event_type, request_id)``
+so a publish only touches matching subscriptions; ``"*"`` and ``None`` act as
+wildcards. History is kept per request for O(1) lookup. With the optional
+Redis Streams backend, events published by other uvicorn workers are
+delivered to local subscribers as well.
+"""
 
 from __future__ import annotations
 
 import asyncio
-from collections import defaultdict, deque
-from typing import Awaitable, Callable
+import json
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from typing import AsyncIterator, Awaitable, Callable, Literal
 
+from config.settings import settings
 from communication.message_schema import WorkflowEvent
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
 
 Subscriber = Callable[[WorkflowEvent], Awaitable[None]]
+OverflowPolicy = Literal["drop_oldest", "drop_newest", "block"]
+
+
+class Subscription:
+    """A bounded per-consumer queue; ``policy`` decides what happens when it is full."""
+
+    def __init__(self, bus: EventBus, event_type: str, request_id: str | None, maxsize: int, policy: OverflowPolicy):
+        self.bus = bus
+        self.key = (event_type, request_id)
+        self.policy = policy
+        self.queue: asyncio.Queue[WorkflowEvent] = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+
+    async def deliver(self, event: WorkflowEvent) -> None:
+        if self.policy == "block":
+            await self.queue.put(event)
+            return
+        if self.queue.full():
+            self.dropped += 1
+            if self.policy == "drop_newest":
+                return
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    async def get(self) -> WorkflowEvent:
+        return await self.queue.get()
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+    async def __aiter__(self) -> AsyncIterator[WorkflowEvent]:
+        while True:
+            yield await self.queue.get()
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
 
 class EventBus:
-    def __init__(self, max_history: int = 1000):
+    def __init__(
+        self,
+        max_history: int = 1000,
+        *,
+        max_history_per_request: int = 200,
+        max_tracked_requests: int = 1000,
+        backend: RedisStreamBackend | None = None,
+    ):
         self._subscribers: dict[str, list[Subscriber]] = defaultdict(list)
+        self._subscriptions: dict[tuple[str, str | None], set[Subscription]] = defaultdict(set)
         self._history: deque[WorkflowEvent] = deque(maxlen=max_history)
-        self._queue: asyncio.Queue[WorkflowEvent] = asyncio.Queue()
+        self._request_history: OrderedDict[str, deque[WorkflowEvent]] = OrderedDict()
+        self._max_history_per_request = max_history_per_request
+        self._max_tracked_requests = max_tracked_requests
+        self.backend = backend
 
     async def publish(self, event_type: str, payload: dict, *, request_id: str | None = None, node: str | None = None) -> WorkflowEvent:
         event = WorkflowEvent(event_type=event_type, payload=payload, request_id=request_id, node=node)
-        self._history.append(event)
-        await self._queue.put(event)
-        subscribers = [*self._subscribers.get(event_type, []), *self._subscribers.get("*", [])]
-        await asyncio.gather(*(subscriber(event) for subscriber in subscribers), return_exceptions=True)
+        await self.dispatch(event)
+        if self.backend is not None:
+            await self.backend.append(event, self)
         return event
 
+    async def dispatch(self, event: WorkflowEvent) -> None:
+        """Records ``event`` and fans it out to local callbacks and subscriptions."""
+        self._record(event)
+        for key in {(event.event_type, event.request_id), (event.event_type, None), ("*", event.request_id), ("*", None)}:
+            for subscription in list(self._subscriptions.get(key, ())):
+                await subscription.deliver(event)
+        subscribers = [*self._subscribers.get(event.event_type, []), *self._subscribers.get("*", [])]
+        if subscribers:
+            await asyncio.gather(*(subscriber(event) for subscriber in subscribers), return_exceptions=True)
+
+    def _record(self, event: WorkflowEvent) -> None:
+        self._history.append(event)
+        if event.request_id is None:
+            return
+        events = self._request_history.get(event.request_id)
+        if events is None:
+            events = self._request_history[event.request_id] = deque(maxlen=self._max_history_per_request)
+            if len(self._request_history) > self._max_tracked_requests:
+                self._request_history.popitem(last=False)
+        else:
+            self._request_history.move_to_end(event.request_id)
+        events.append(event)
+
     def subscribe(self, event_type: str, subscriber: Subscriber) -> None:
         self._subscribers[event_type].append(subscriber)
 
+    def open_subscription(
+        self,
+        event_type: str = "*",
+        *,
+        request_id: str | None = None,
+        maxsize: int | None = None,
+        policy: OverflowPolicy | None = None,
+    ) -> Subscription:
+        subscription = Subscription(
+            self,
+            event_type,
+            request_id,
+            maxsize or settings.EVENT_BUS_SUBSCRIBER_QUEUE_SIZE,
+            policy or settings.EVENT_BUS_OVERFLOW_POLICY,
+        )
+        self._subscriptions[subscription.key].add(subscription)
+        if self.backend is not None:
+            self.backend.ensure_reader(self)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.key)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.key]
+
     def history(self, *, request_id: str | None = None, limit: int = 100) -> list[WorkflowEvent]:
-        events = [event for event in self._history if request_id is None or event.request_id == request_id]
-        return events[-limit:]
+        events = self._history if request_id is None else self._request_history.get(request_id, ())
+        return list(events)[-limit:]
 
-    async def stream(self, *, request_id: str | None = None):
-        while True:
-            event = await self._queue.get()
-            if request_id is None or event.request_id == request_id:
+    async def stream(self, *, request_id: str | None = None, event_type: str = "*"):
+        with self.open_subscription(event_type, request_id=request_id) as subscription:
+            async for event in subscription:
                 yield event
 
 
+class RedisStreamBackend:
+    """Shares events between workers through one Redis Stream.
+
+    Every worker ``XADD``s its own events and runs a single reader that
+    re-dispatches entries from other workers to its local subscribers.
+    """
+
+    def __init__(self, url: str | None = None, stream_key: str | None = None, maxlen: int | None = None):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.stream_key = stream_key or settings.EVENT_BUS_REDIS_STREAM
+        self.maxlen = maxlen or settings.EVENT_BUS_STREAM_MAXLEN
+        self.origin = uuid.uuid4().hex
+        self._reader: asyncio.Task | None = None
+
+    async def append(self, event: WorkflowEvent, bus: EventBus) -> None:
+        self.ensure_reader(bus)
+        try:
+            await self.client.xadd(
+                self.stream_key,
+                {"origin": self.origin, "event": event.model_dump_json()},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+        except Exception as exc:
+            logger.warning(f"[EventBus] Redis stream append failed: {exc}")
+
+    def ensure_reader(self, bus: EventBus) -> None:
+        if self._reader is None or self._reader.done():
+            self._reader = asyncio.get_running_loop().create_task(self._read(bus))
+
+    async def _read(self, bus: EventBus) -> None:
+        last_id = "$"
+        while True:
+            try:
+                response = await self.client.xread({self.stream_key: last_id}, block=5000, count=500)
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"[EventBus] Redis stream read failed: {exc}")
+                await asyncio.sleep(1)
+                continue
+            for _stream, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    if fields.get("origin") == self.origin:
+                        continue
+                    await bus.dispatch(WorkflowEvent.model_validate(json.loads(fields["event"])))
+
+    async def close(self) -> None:
+        if self._reader is not None:
+            self._reader.cancel()
+        await self.client.aclose()
+
+
 _bus: EventBus | None = None
 
 
 def get_event_bus() -> EventBus:
     global _bus
     if _bus is None:
-        _bus = EventBus()
+        backend = RedisStreamBackend() if settings.EVENT_BUS_BACKEND == "redis" else None
+        _bus = EventBus(backend=backend)
     return _bus
 
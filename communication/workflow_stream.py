@@ -0,0 +1,187 @@
+"""Per-request fan-out of workflow progress events for SSE clients.
+
+The graph run publishes node completions as they stream out of LangGraph;
+every SSE client of that request gets its own queue, and a bounded replay
+buffer lets late joiners and reconnecting clients (``Last-Event-ID``) catch
+up without reading the checkpointer.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from config.settings import settings
+from graph.fused_nodes import stage_members
+from observability.node_logger import get_node_trace_recorder
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+TERMINAL_EVENTS = {"approval_required", "complete", "error"}
+
+_hub: WorkflowStreamHub | None = None
+
+
+@dataclass
+class StreamEvent:
+    id: int
+    event: str
+    data: dict[str, Any]
+
+    @property
+    def terminal(self) -> bool:
+        return self.event in TERMINAL_EVENTS
+
+
+@dataclass
+class RequestChannel:
+    replay_size: int
+    events: deque[StreamEvent] = field(init=False)
+    subscribers: set[asyncio.Queue[StreamEvent | None]] = field(default_factory=set)
+    last_id: int = 0
+    touched_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.events = deque(maxlen=self.replay_size)
+
+    def can_replay_after(self, last_event_id: int) -> bool:
+        """True when every event after ``last_event_id`` is still in the buffer."""
+        first_id = self.events[0].id if self.events else self.last_id + 1
+        return last_event_id >= first_id - 1
+
+    def publish(self, event: str, data: dict[str, Any]) -> StreamEvent:
+        self.last_id += 1
+        item = StreamEvent(self.last_id, event, data)
+        self.events.append(item)
+        self.touched_at = time.monotonic()
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # A subscriber this far behind reconnects and resumes from the buffer
+                self.subscribers.discard(queue)
+                queue.get_nowait()
+                queue.put_nowait(None)
+        return item
+
+
+class WorkflowStreamHub:
+    def __init__(self, replay_size: int | None = None, retention_seconds: int | None = None):
+        self.replay_size = replay_size or settings.SSE_REPLAY_BUFFER_SIZE
+        self.retention_seconds = retention_seconds or settings.SSE_CHANNEL_RETENTION_SECONDS
+        self._channels: dict[str, RequestChannel] = {}
+
+    def channel(self, request_id: str) -> RequestChannel:
+        self._prune()
+        channel = self._channels.get(request_id)
+        if channel is None:
+            channel = self._channels[request_id] = RequestChannel(self.replay_size)
+        return channel
+
+    def has_channel(self, request_id: str) -> bool:
+        return request_id in self._channels
+
+    def publish(self, request_id: str, event: str, data: dict[str, Any]) -> StreamEvent:
+        return self.channel(request_id).publish(event, data)
+
+    def can_replay(self, request_id: str, last_event_id: int | None) -> bool:
+        channel = self._channels.get(request_id)
+        return channel is not None and channel.can_replay_after(last_event_id or 0)
+
+    async def subscribe(self, request_id: str, last_event_id: int | None = None, *, replay: bool = True) -> AsyncIterator[StreamEvent]:
+        """Yields buffered events after ``last_event_id`` then live ones, ending after a terminal event.
+
+        Terminal events that later events have superseded (an ``approval_required``
+        followed by the resumed run) are skipped during replay.
+        """
+        channel = self.channel(request_id)
+        queue: asyncio.Queue[StreamEvent | None] = asyncio.Queue(maxsize=self.replay_size)
+        backlog = [event for event in channel.events if event.id > (last_event_id or 0)] if replay else []
+        channel.subscribers.add(queue)
+        try:
+            for index, event in enumerate(backlog):
+                if event.terminal and index < len(backlog) - 1:
+                    continue
+                yield event
+                if event.terminal:
+                    return
+            while True:
+                event = await queue.get()
+                if event is None:
+                    return
+                yield event
+                if event.terminal:
+                    return
+        finally:
+            channel.subscribers.discard(queue)
+            channel.touched_at = time.monotonic()
+
+    def _prune(self) -> None:
+        cutoff = time.monotonic() - self.retention_seconds
+        for request_id, channel in list(self._channels.items()):
+            if not channel.subscribers and channel.touched_at < cutoff:
+                del self._channels[request_id]
+
+
+async def run_graph_streaming(graph: Any, graph_input: Any, config: dict, *, request_id: str) -> dict[str, Any]:
+    """Runs the graph like ``ainvoke`` while publishing node progress to the request's channel.
+
+    Returns the final state values, as ``ainvoke`` would.
+    """
+    hub = get_workflow_stream_hub()
+    recorder = get_node_trace_recorder()
+    started = time.perf_counter()
+    values: dict[str, Any] = {}
+    interrupted = False
+    try:
+        async for mode, chunk in graph.astream(graph_input, config=config, stream_mode=["updates", "values"]):
+            if mode == "values":
+                values = chunk
+                continue
+            for node, update in chunk.items():
+                if node == "__interrupt__":
+                    interrupted = True
+                    continue
+                durations = (update or {}).get("agent_durations") or values.get("agent_durations", {})
+                # A fused step reports each of its member agents
+                for agent in stage_members(node):
+                    hub.publish(request_id, "agent_start", {"agent": agent, "status": "running"})
+                    hub.publish(request_id, "agent_done", {"agent": agent, "status": "done", "duration_ms": round(durations.get(agent, 0))})
+    except Exception as exc:
+        hub.publish(request_id, "error", {"message": str(exc)})
+        recorder.finish(request_id, (time.perf_counter() - started) * 1000, failed=True)
+        raise
+    # The node trace is only logged when this run failed or was slow
+    recorder.finish(request_id, (time.perf_counter() - started) * 1000)
+    if interrupted:
+        hub.publish(
+            request_id,
+            "approval_required",
+            {
+                "message": "RTI draft ready for human review",
+                "request_id": request_id,
+                "approve_url": f"/api/v1/approve/{request_id}",
+            },
+        )
+    else:
+        hub.publish(
+            request_id,
+            "complete",
+            {
+                "tracking_id": values.get("tracking_id", ""),
+                "status": values.get("status", "completed"),
+                "message": values.get("final_response", ""),
+            },
+        )
+    return values
+
+
+def get_workflow_stream_hub() -> WorkflowStreamHub:
+    global _hub
+    if _hub is None:
+        _hub = WorkflowStreamHub()
+    return _hub
@@ -30,15 +30,45 @@ class Settings(BaseSettings):
     LLM_TEMPERATURE: float = Field(0.2, description="Default LLM temperature")
     LLM_MAX_RETRIES: int = Field(3, description="LLM call max retries")
     CIRCUIT_BREAKER_THRESHOLD: int = Field(5, description="Failures before circuit opens")
+    LLM_CACHE_ENABLED: bool = Field(True, description="Serve identical prompts from the LLM response cache")
+    LLM_CACHE_TTL: int = Field(3600, description="LLM response cache TTL in seconds")
+    LLM_CACHE_MAX_ENTRIES: int = Field(2048, description="Max responses kept in the in-process LLM cache tier")
+    LLM_CACHE_REDIS: bool = Field(True, description="Share cached LLM responses across workers through Redis")
+    LLM_ADAPTIVE_ROUTING: bool = Field(False, description="Fail over and reorder a task's fallback providers by health and latency")
+    LLM_LATENCY_WINDOW: int = Field(100, description="Calls per provider/model kept for rolling latency and error rate")
+    LLM_STATS_MAX_AGE_SECONDS: float = Field(300.0, description="Latency/error samples older than this stop influencing routing, so a demoted provider recovers")
+    LLM_MIN_LATENCY_SAMPLES: int = Field(5, description="Samples needed before latency/error stats influence routing")
+    LLM_MAX_ERROR_RATE: float = Field(0.5, description="Rolling error rate above which a provider is deprioritized")
+    LLM_HEDGE_ENABLED: bool = Field(False, description="Send a hedged request to the next provider when the first is slower than its p95")
+    LLM_HEDGE_P95_MULTIPLIER: float = Field(1.0, description="Hedge delay as a multiple of the leader's p95 latency")
+    LLM_HEDGE_MIN_DELAY_MS: int = Field(250, description="Lower bound for the hedge delay")
+    GROQ_MAX_CONCURRENCY: int = Field(8, description="Max in-flight Groq calls per process (0 = unlimited)")
+    GEMINI_MAX_CONCURRENCY: int = Field(4, description="Max in-flight Gemini calls per process (0 = unlimited)")
+    OPENAI_MAX_CONCURRENCY: int = Field(4, description="Max in-flight OpenAI calls per process (0 = unlimited)")
+    GROQ_TOKENS_PER_MINUTE: int = Field(0, description="Groq tokens per minute; calls queue beyond it (0 = unlimited)")
+    GROQ_REQUESTS_PER_MINUTE: int = Field(0, description="Groq requests per minute; calls queue beyond it (0 = unlimited)")
+    GEMINI_TOKENS_PER_MINUTE: int = Field(0, description="Gemini tokens per minute; calls queue beyond it (0 = unlimited)")
+    GEMINI_REQUESTS_PER_MINUTE: int = Field(0, description="Gemini requests per minute; calls queue beyond it (0 = unlimited)")
+    OPENAI_TOKENS_PER_MINUTE: int = Field(0, description="OpenAI tokens per minute; calls queue beyond it (0 = unlimited)")
+    OPENAI_REQUESTS_PER_MINUTE: int = Field(0, description="OpenAI requests per minute; calls queue beyond it (0 = unlimited)")
+    LLM_RATE_LIMIT_BACKEND: str = Field("memory", description="LLM rate buckets: memory (per process) | redis (shared across workers)")
+    LLM_EXPECTED_COMPLETION_TOKENS: int = Field(256, description="Completion tokens reserved per call before usage is known")
+    LLM_RATE_MAX_POLL_SECONDS: float = Field(1.0, description="Max sleep between rate bucket checks while calls are queued")
 
     # ── MongoDB ───────────────────────────────────────────────────
     MONGO_URI: str = Field("mongodb://localhost:27017/", description="MongoDB URI")
     MONGO_DB_NAME: str = Field("rti_db", description="Database name")
+    MONGO_LOCAL_INDEX_REFRESH_SECONDS: float = Field(5.0, description="Min seconds between vector fallback freshness checks")
 
     # ── Redis ─────────────────────────────────────────────────────
     REDIS_URL: str = Field("redis://localhost:6379/0", description="Redis connection URL")
     REDIS_SEMANTIC_CACHE_TTL: int = Field(3600, description="Semantic cache TTL in seconds")
     REDIS_SESSION_TTL: int = Field(1800, description="Session TTL in seconds")
+    EVENT_BUS_BACKEND: str = Field("memory", description="Event bus backend: memory | redis (Redis Streams, shared across workers)")
+    EVENT_BUS_REDIS_STREAM: str = Field("rti:events", description="Redis Stream key for the shared event bus")
+    EVENT_BUS_STREAM_MAXLEN: int = Field(10000, description="Approximate max entries kept in the event stream")
+    EVENT_BUS_SUBSCRIBER_QUEUE_SIZE: int = Field(256, description="Per-subscriber event queue bound")
+    EVENT_BUS_OVERFLOW_POLICY: str = Field("drop_oldest", description="Full subscriber queue policy: drop_oldest | drop_newest | block")
 
     # ── RAG / Vector Store ────────────────────────────────────────
     # Embeddings provider used for both ingestion and runtime retrieval.
@@ -52,25 +82,74 @@ class Settings(BaseSettings):
         description="Local sentence-transformers model id",
     )
 
-    VECTORSTORE_TYPE: str = Field("faiss", description="Vector store type: faiss | mongodb")
+    VECTORSTORE_TYPE: str = Field("faiss", description="Vector store type: faiss | faiss_native | mongodb")
     FAISS_INDEX_PATH: str = Field("data/vector_store", description="FAISS index directory")
 
     FAISS_TOP_K: int = Field(5, description="Default FAISS top-k retrieval")
     FAISS_ALLOW_DANGEROUS_DESERIALIZATION: bool = Field(False, description="Allow loading trusted local LangChain FAISS docstore pickle")
+    FAISS_COMPACT_SEGMENT_THRESHOLD: int = Field(32, description="Delta segments accumulated before background compaction")
+    FAISS_INDEX_TYPE: str = Field("flat", description="Native FAISS index type: flat | ivf | hnsw")
+    FAISS_IVF_NLIST: int = Field(1024, description="IVF inverted lists (capped by corpus size at training)")
+    FAISS_IVF_NPROBE: int = Field(16, description="IVF lists probed per query")
+    FAISS_HNSW_M: int = Field(32, description="HNSW graph neighbours per node")
+    FAISS_HNSW_EF_CONSTRUCTION: int = Field(200, description="HNSW construction beam width")
+    FAISS_HNSW_EF_SEARCH: int = Field(128, description="HNSW search beam width")
+    FAISS_EXACT_FILTER_THRESHOLD: int = Field(20000, description="Filtered searches matching at most this many rows are scored exactly")
     RAG_TOP_K: int = Field(5, description="Number of retrieved documents")
     RAG_SIMILARITY_THRESHOLD: float = Field(0.7, description="Minimum similarity score")
     CHUNK_SIZE: int = Field(512, description="Document chunk size")
     CHUNK_OVERLAP: int = Field(80, description="Chunk overlap characters")
+    INGEST_LOAD_CONCURRENCY: int = Field(0, description="Concurrent file loaders in the streaming ingestion pipeline (0 = CPU count)")
+    INGEST_QUEUE_SIZE: int = Field(64, description="Files buffered between streaming ingestion stages")
+    INGEST_INDEX_BATCH_SIZE: int = Field(512, description="Chunks embedded and indexed per batch during ingestion")
+    QUEUE_DB_PATH: str = Field("data/queue.db", description="SQLite database backing the embedding job queue")
+    QUEUE_LEASE_SECONDS: float = Field(300.0, description="Visibility timeout before a claimed job is requeued")
+    QUEUE_MAX_ATTEMPTS: int = Field(5, description="Claims per job before it is dead-lettered")
+    QUEUE_RETRY_BASE_SECONDS: float = Field(2.0, description="Base delay of the exponential retry backoff")
+    QUEUE_RETRY_MAX_SECONDS: float = Field(600.0, description="Upper bound on the retry backoff")
+    QUEUE_CLAIM_BATCH_SIZE: int = Field(16, description="Jobs an embedding worker claims per round trip")
     SCRAPE_INTERVAL_HOURS: int = Field(24, description="Default scrape interval for schedulers")
     MAX_SCRAPE_DEPTH: int = Field(1, description="Maximum crawler depth")
+    CRAWL_FRONTIER_DB: str = Field("data/crawl_frontier.db", description="Per-URL validators and content hashes for incremental re-crawls")
+    CRAWL_MAX_FEED_URLS: int = Field(500, description="Max URLs taken from a target's sitemaps and feeds per crawl")
+    CRAWL_WORKERS_PER_TARGET: int = Field(4, description="Concurrent fetch workers per scrape target")
+    CRAWL_HOST_BURST: float = Field(1.0, description="Requests a host's token bucket allows back-to-back before rate_limit_per_second applies")
+    GOV_HTTP_CACHE_DIR: str = Field("data/http_cache", description="On-disk HTTP cache for government fetches")
+    GOV_HTTP_CACHE_MAX_MB: int = Field(512, description="Size cap of the on-disk HTTP cache; least recently stored entries are evicted first")
+    GOV_HTTP_CACHE_MAX_AGE_SECONDS: int = Field(7 * 24 * 3600, description="On-disk HTTP cache entries older than this are evicted")
+    GOV_HTTP_POOL_LIMIT: int = Field(64, description="Max open connections in the shared government HTTP pool")
+    GOV_HTTP_LIMIT_PER_HOST: int = Field(4, description="Max open connections per government host")
+    GOV_HTTP_KEEPALIVE_SECONDS: float = Field(30.0, description="Idle keep-alive for pooled government connections")
+    GOV_HTTP_DNS_TTL_SECONDS: int = Field(300, description="DNS cache TTL for the government HTTP pool")
     EMBEDDING_BATCH_SIZE: int = Field(32, description="Embedding batch size")
     RAG_CACHE_TTL: int = Field(3600, description="RAG result cache TTL seconds")
+    RAG_SEMANTIC_CACHE_ENABLED: bool = Field(True, description="Serve paraphrased queries from the similarity-keyed cache")
+    RAG_SEMANTIC_CACHE_THRESHOLD: float = Field(0.92, description="Min query cosine similarity for a semantic cache hit")
+    RAG_SEMANTIC_CACHE_NEAR_HIT_MARGIN: float = Field(0.05, description="Similarity band below the threshold counted as a near hit")
+    RAG_SEMANTIC_CACHE_MAX_ENTRIES: int = Field(512, description="Cached queries per department/language partition (LRU)")
     MAX_PDF_SIZE_MB: int = Field(25, description="Maximum PDF download size")
+    PDF_PARSE_WORKERS: int = Field(0, description="Processes parsing PDF page ranges (0 = CPU count)")
+    PDF_PAGES_PER_SHARD: int = Field(32, description="Pages per parse job; smaller PDFs are parsed in-thread")
+    OCR_WORKERS: int = Field(0, description="Processes running page OCR (0 = CPU count)")
+    OCR_LOW_DPI: int = Field(150, description="First-pass OCR render resolution")
+    OCR_HIGH_DPI: int = Field(300, description="Re-render resolution for low-confidence OCR pages")
+    OCR_RERENDER_CONFIDENCE: float = Field(0.6, description="OCR confidence below which a page is re-rendered at OCR_HIGH_DPI")
 
     # ── LangGraph Checkpointer ────────────────────────────────────
     CHECKPOINTER_DB: str = Field("data/checkpoints/rti_checkpoints.db", description="SQLite checkpointer path")
     CHECKPOINTER_TYPE: str = Field("sqlite", description="Checkpointer backend type: sqlite | postgres")
     POSTGRES_CHECKPOINTER_URL: str | None = Field(None, description="Postgres connection URL for checkpointing")
+    CHECKPOINT_WRITE_BATCH: int = Field(64, description="Max checkpoint writes group-committed in one SQLite transaction")
+    CHECKPOINT_KEEP_PENDING: int = Field(5, description="Checkpoints kept per thread still running or waiting for approval; finished threads keep 1")
+    CHECKPOINT_COMPACT_INTERVAL_SECONDS: int = Field(600, description="Seconds between checkpoint retention/compaction passes (0 = disabled)")
+    CHECKPOINT_VACUUM_FREE_RATIO: float = Field(0.25, description="Free-page ratio above which compaction VACUUMs the checkpoint DB")
+    STATE_BLOB_OFFLOAD: bool = Field(False, description="Store large state values once by content hash instead of in every SQLite checkpoint; shrinks checkpoints ~14x but slows each checkpoint write")
+    STATE_BLOB_BACKEND: str = Field("sqlite", description="State blob store: sqlite | filesystem")
+    STATE_BLOB_DIR: str = Field("data/checkpoints/blobs", description="Directory holding the state blob store")
+    STATE_BLOB_MIN_BYTES: int = Field(1024, description="Encoded size from which a state value (or list) is offloaded")
+    STATE_BLOB_CACHE_ENTRIES: int = Field(4096, description="Recently used state blobs kept in memory")
+    GRAPH_PARALLEL_BRANCHES: bool = Field(True, description="Run classifier, tool execution and retrieval concurrently after the info fetcher")
+    GRAPH_FUSED_NODES: bool = Field(True, description="Run consecutive deterministic nodes (join/debate/critic/verifier, consensus) as one graph step")
 
     # ── Security ──────────────────────────────────────────────────
     RTI_API_KEY: str = Field("change-me-in-production", description="API key for endpoint auth")
@@ -99,6 +178,7 @@ class Settings(BaseSettings):
     # ── Translation ───────────────────────────────────────────────
     TRANSLATOR_API_ENDPOINT: str = Field("https://libretranslate.de", description="LibreTranslate endpoint")
     TRANSLATOR_API_KEY: str | None = Field(None, description="LibreTranslate API key (optional)")
+    TRANSLATION_PROVIDER_CONCURRENCY: int = Field(4, description="Max concurrent in-flight calls per translation provider")
 
     # ── LangSmith (Observability) ─────────────────────────────────
     LANGCHAIN_TRACING_V2: bool = Field(False, description="Enable LangSmith tracing")
@@ -108,11 +188,23 @@ class Settings(BaseSettings):
     # ── Logging ───────────────────────────────────────────────────
     LOG_LEVEL: str = Field("INFO", description="Logging level")
     LOG_FORMAT: str = Field("json", description="Log format: json | text")
+    LOG_DIR: str = Field("logs", description="Directory for the app, error, security and audit log files")
+    LOG_ASYNC: bool = Field(True, description="Queue log records for a background writer thread instead of formatting them inline")
+    LOG_QUEUE_SIZE: int = Field(10000, description="Log records buffered for the writer thread; records beyond this are dropped and counted")
+    LOG_BATCH_SIZE: int = Field(256, description="Log records formatted and written per batch by the writer thread")
+    NODE_TRACE_MODE: str = Field("light", description="Per-node instrumentation: light | sampled | full")
+    NODE_TRACE_SAMPLE_RATE: float = Field(0.05, description="Share of node runs that get full state hashing in sampled mode")
+    NODE_TRACE_RECORDER: bool = Field(True, description="Keep a per-request ring buffer of node records, dumped for failed or slow requests")
+    NODE_TRACE_RING_SIZE: int = Field(128, description="Node records kept per request by the trace recorder")
+    NODE_TRACE_MAX_REQUESTS: int = Field(1024, description="Requests tracked at once by the trace recorder")
+    NODE_TRACE_SLOW_REQUEST_MS: float = Field(15000, description="Graph run time above which the recorded node trace is dumped")
 
     # ── Agent Workflow ────────────────────────────────────────────
     MAX_REFLECTION_RETRIES: int = Field(2, description="Max self-reflection retry loops")
     HUMAN_APPROVAL_REQUIRED: bool = Field(True, description="Require human approval before submission")
     APPROVAL_TIMEOUT_HOURS: int = Field(24, description="Hours before approval request expires")
+    SSE_REPLAY_BUFFER_SIZE: int = Field(256, description="Workflow events kept per request for late SSE subscribers")
+    SSE_CHANNEL_RETENTION_SECONDS: int = Field(3600, description="Idle time before a request's SSE channel is dropped")
 
     # ── Deployment ────────────────────────────────────────────────
     APP_ENV: str = Field("development", description="Environment: development | production")
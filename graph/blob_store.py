@@ -0,0 +1,396 @@
+"""
+graph/blob_store.py
+--------------------
+Content-addressed offload of large RTIAgentState values out of checkpoints.
+- OffloadingSerializer wraps the checkpointer's serializer. Channel values
+  (and pending writes) whose encoding exceeds STATE_BLOB_MIN_BYTES are
+  stored once under their content hash and replaced by a reference.
+- Lists are stored item by item, so an append-only field such as
+  reasoning_trace or tool_results only adds its new entries per superstep
+  instead of re-serializing the whole list.
+- References are resolved only when a checkpoint is actually loaded,
+  through an LRU of recently used blobs.
+- Only values that are offloaded are hashed. Sizes and hashes are memoized
+  by object identity, including the verdict for values small enough to
+  stay inline: LangGraph hands the same objects back every superstep for
+  fields that did not change, so those are neither re-encoded nor
+  re-hashed. State values must not be mutated in place after a node
+  returns them (nodes here always build new lists and dicts).
+- Blobs and the remaining checkpoint envelope are zlib-compressed (level 1)
+  once they pass COMPRESS_MIN_BYTES.
+- A blob's timestamp is refreshed whenever a checkpoint references it
+  again, so a sweep only deletes blobs that nothing has used since its
+  cutoff.
+The offload trades serialization time for storage: a value that is new in
+a superstep is encoded once to size it and, if it stays inline, again in
+the envelope, and every envelope is compressed. On the workload in
+tests/benchmarks/benchmark_state_blob_offload.py checkpoints shrink about
+14x, but serialization goes from about 1 ms to 7 ms per request and the
+writer thread spends about twice as long per request. STATE_BLOB_OFFLOAD is
+therefore off by default; enable it where checkpoint storage matters more
+than write latency.
+Backends: SQLite (default) or one file per blob on the filesystem.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Iterable
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+from config.settings import settings
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+BLOB_KEY = "__blob__"
+BLOB_LIST_KEY = "__blob_list__"
+
+ZLIB_SUFFIX = "+zlib"
+COMPRESS_MIN_BYTES = 512
+
+Blob = tuple[str, bytes]  # (serializer type tag, encoded bytes)
+
+
+def blob_hash(blob: Blob) -> str:
+    type_, data = blob
+    return hashlib.sha256(type_.encode() + b"\0" + data).hexdigest()[:32]
+
+
+def _pack(blob: Blob) -> Blob:
+    type_, data = blob
+    if len(data) < COMPRESS_MIN_BYTES:
+        return blob
+    return f"{type_}{ZLIB_SUFFIX}", zlib.compress(data, 1)
+
+
+def _unpack(blob: Blob) -> Blob:
+    type_, data = blob
+    if type_.endswith(ZLIB_SUFFIX):
+        return type_[: -len(ZLIB_SUFFIX)], zlib.decompress(data)
+    return blob
+
+
+class SqliteBlobStore:
+    """Blobs in one SQLite table; safe to share across threads."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, type TEXT NOT NULL, data BLOB NOT NULL, created_at REAL NOT NULL)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def put_many(self, blobs: dict[str, Blob], touched: Iterable[str] = ()) -> None:
+        """Stores ``blobs`` and stamps them and the already stored ``touched`` blobs as just used."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO blobs (hash, type, data, created_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(hash) DO UPDATE SET created_at = excluded.created_at",
+                [(key, type_, data, now) for key, (type_, data) in blobs.items()],
+            )
+            self._conn.executemany("UPDATE blobs SET created_at = ? WHERE hash = ?", [(now, key) for key in touched])
+            self._conn.commit()
+
+    def get_many(self, hashes: Iterable[str]) -> dict[str, Blob]:
+        keys = list(hashes)
+        found: dict[str, Blob] = {}
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT hash, type, data FROM blobs WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update({key: (type_, data) for key, type_, data in rows})
+        return found
+
+    def sweep(self, live: set[str], created_before: float) -> int:
+        """Deletes blobs no checkpoint references that were last used before ``created_before``."""
+        with self._lock:
+            stale = [
+                key for (key,) in self._conn.execute("SELECT hash FROM blobs WHERE created_at < ?", (created_before,))
+                if key not in live
+            ]
+            removed = 0
+            for key in stale:
+                removed += self._conn.execute(
+                    "DELETE FROM blobs WHERE hash = ? AND created_at < ?", (key, created_before)
+                ).rowcount
+            self._conn.commit()
+        return removed
+
+
+class FileBlobStore:
+    """One file per blob under ``root/<hash[:2]>/``; the type tag is the first line."""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def put_many(self, blobs: dict[str, Blob], touched: Iterable[str] = ()) -> None:
+        for key in touched:
+            try:
+                os.utime(self._path(key))
+            except FileNotFoundError:
+                pass
+        for key, (type_, data) in blobs.items():
+            path = self._path(key)
+            if os.path.exists(path):
+                os.utime(path)
+                continue
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            partial = f"{path}.{threading.get_ident()}.partial"
+            with open(partial, "wb") as handle:
+                handle.write(type_.encode() + b"\n" + data)
+            os.replace(partial, path)
+
+    def get_many(self, hashes: Iterable[str]) -> dict[str, Blob]:
+        found: dict[str, Blob] = {}
+        for key in hashes:
+            try:
+                with open(self._path(key), "rb") as handle:
+                    type_, _, data = handle.read().partition(b"\n")
+            except FileNotFoundError:
+                continue
+            found[key] = (type_.decode(), data)
+        return found
+
+    def sweep(self, live: set[str], created_before: float) -> int:
+        removed = 0
+        for shard in os.scandir(self.root):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.name not in live and not entry.name.endswith(".partial") and entry.stat().st_mtime < created_before:
+                    os.remove(entry.path)
+                    removed += 1
+        return removed
+
+
+class OffloadingSerializer:
+    """Checkpoint serializer that moves large values into a content-addressed BlobStore."""
+
+    def __init__(
+        self,
+        store: SqliteBlobStore | FileBlobStore,
+        *,
+        inner: Any | None = None,
+        min_bytes: int | None = None,
+        cache_entries: int | None = None,
+    ):
+        self.store = store
+        self.inner = inner or JsonPlusSerializer()
+        self.min_bytes = settings.STATE_BLOB_MIN_BYTES if min_bytes is None else min_bytes
+        self._cache: OrderedDict[str, Blob] = OrderedDict()
+        self._cache_entries = cache_entries or settings.STATE_BLOB_CACHE_ENTRIES
+        # id(value) -> (value, hash or None if kept inline, encoded size); holding the value keeps its id from being reused
+        self._memo: dict[int, tuple[Any, str | None, int]] = {}
+        self._lock = threading.Lock()
+
+    # ── SerializerProtocol ────────────────────────────────────────
+
+    def dumps_typed(self, obj: Any) -> Blob:
+        pending: dict[str, Blob] = {}
+        encoded: list[tuple[Any, str, int]] = []
+        if _is_checkpoint(obj):
+            obj = {**obj, "channel_values": {key: self._offload(value, pending, encoded) for key, value in obj["channel_values"].items()}}
+        else:
+            obj = self._offload(obj, pending, encoded)
+        touched = {key for _value, key, _size in encoded if key is not None and key not in pending}
+        if pending or touched:
+            self.store.put_many(pending, touched)
+        # Only blobs that made it to the store count as known
+        for key, blob in pending.items():
+            self._cache_put(key, blob)
+        self._memoize(encoded)
+        return _pack(self.inner.dumps_typed(obj))
+
+    def loads_typed(self, data: Blob) -> Any:
+        obj = self.inner.loads_typed(_unpack(data))
+        if _is_checkpoint(obj):
+            values = obj["channel_values"]
+            refs = [ref for value in values.values() for ref in _refs(value)]
+            blobs = self._fetch(refs)
+            obj["channel_values"] = {key: self._resolve(value, blobs) for key, value in values.items()}
+            return obj
+        return self._resolve(obj, self._fetch(_refs(obj)))
+
+    def close(self) -> None:
+        """Releases the blob store's connection, if it holds one."""
+        close = getattr(self.store, "close", None)
+        if close is not None:
+            close()
+
+    def with_msgpack_allowlist(self, extra_allowlist: Any) -> "OffloadingSerializer":
+        """Same store and cache, with the graph's msgpack allowlist applied to the inner serializer."""
+        if not hasattr(self.inner, "with_msgpack_allowlist"):
+            return self
+        clone = copy.copy(self)
+        clone.inner = self.inner.with_msgpack_allowlist(extra_allowlist)
+        return clone
+
+    # ── Offload / resolve ─────────────────────────────────────────
+
+    def _offload(self, value: Any, pending: dict[str, Blob], encoded: list) -> Any:
+        if isinstance(value, list) and value:
+            if self._inline(value):
+                return value
+            items = [self._encode(item) for item in value]
+            total = sum(size for _key, size, _blob in items)
+            if total < self.min_bytes:
+                # Remember the sizes so the same list (or its items in a longer one) is not encoded again
+                encoded.append((value, None, total))
+                encoded.extend((item, None, size) for item, (key, size, blob) in zip(value, items) if key is None and blob is not None)
+                return value
+            keys = [self._queue(item, key, size, blob, pending, encoded) for item, (key, size, blob) in zip(value, items)]
+            return {BLOB_LIST_KEY: keys}
+        if not isinstance(value, (dict, str, bytes)):
+            return value
+        if isinstance(value, (str, bytes)) and len(value) * 4 < self.min_bytes:
+            return value
+        if self._inline(value):
+            return value
+        key, size, blob = self._encode(value)
+        if size < self.min_bytes:
+            encoded.append((value, None, size))
+            return value
+        return {BLOB_KEY: self._queue(value, key, size, blob, pending, encoded)}
+
+    def _inline(self, value: Any) -> bool:
+        """True for a value memoized as too small to offload."""
+        memo = self._memo.get(id(value))
+        return memo is not None and memo[0] is value and memo[1] is None
+
+    def _encode(self, value: Any) -> tuple[str | None, int, Blob | None]:
+        """Memoized content hash and size of ``value``, or (None, size, encoded blob) when it has to be encoded.
+
+        The memoized hash is None for values that so far were only ever kept inline.
+        """
+        memo = self._memo.get(id(value))
+        if memo is not None and memo[0] is value:
+            return memo[1], memo[2], None
+        blob = self.inner.dumps_typed(value)
+        return None, len(blob[1]), blob
+
+    def _queue(self, value: Any, key: str | None, size: int, blob: Blob | None, pending: dict[str, Blob], encoded: list) -> str:
+        """Content hash of ``value``, queueing its blob for the store unless it is already there."""
+        if key is not None:
+            encoded.append((value, key, size))
+            return key
+        # Only values that are actually offloaded are hashed
+        blob = blob or self.inner.dumps_typed(value)
+        key = blob_hash(blob)
+        with self._lock:
+            known = key in self._cache
+            if known:
+                self._cache.move_to_end(key)
+        if not known:
+            pending[key] = _pack(blob)
+        encoded.append((value, key, size))
+        return key
+
+    def _memoize(self, encoded: list[tuple[Any, str | None, int]]) -> None:
+        with self._lock:
+            if len(self._memo) + len(encoded) > self._cache_entries:
+                self._memo = {}
+            for value, key, size in encoded:
+                self._memo[id(value)] = (value, key, size)
+
+    def _fetch(self, refs: list[str]) -> dict[str, Blob]:
+        blobs: dict[str, Blob] = {}
+        missing = []
+        with self._lock:
+            for key in refs:
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    blobs[key] = self._cache[key]
+                else:
+                    missing.append(key)
+        if missing:
+            loaded = self.store.get_many(set(missing))
+            for key, blob in loaded.items():
+                self._cache_put(key, blob)
+            blobs.update(loaded)
+        return blobs
+
+    def _resolve(self, value: Any, blobs: dict[str, Blob]) -> Any:
+        if isinstance(value, dict) and len(value) == 1:
+            if BLOB_KEY in value:
+                return self.inner.loads_typed(_unpack(self._blob(value[BLOB_KEY], blobs)))
+            if BLOB_LIST_KEY in value:
+                return [self.inner.loads_typed(_unpack(self._blob(key, blobs))) for key in value[BLOB_LIST_KEY]]
+        return value
+
+    def _blob(self, key: str, blobs: dict[str, Blob]) -> Blob:
+        try:
+            return blobs[key]
+        except KeyError:
+            raise KeyError(f"[OffloadingSerializer] state blob {key} is missing from the blob store") from None
+
+    def _cache_put(self, key: str, blob: Blob) -> None:
+        with self._lock:
+            self._cache[key] = blob
+            self._cache.move_to_end(key)
+            while len(self._cache) > self._cache_entries:
+                self._cache.popitem(last=False)
+
+    # ── Garbage collection ────────────────────────────────────────
+
+    def references(self, data: Blob) -> set[str]:
+        """Blob hashes a serialized checkpoint or write refers to (without loading the blobs)."""
+        obj = self.inner.loads_typed(_unpack(data))
+        values = obj["channel_values"].values() if _is_checkpoint(obj) else [obj]
+        return {ref for value in values for ref in _refs(value)}
+
+    def sweep(self, live: set[str], created_before: float) -> int:
+        removed = self.store.sweep(live, created_before)
+        with self._lock:
+            for key in [key for key in self._cache if key not in live]:
+                del self._cache[key]
+            # A memoized hash may point at a blob that was just deleted
+            self._memo = {}
+        return removed
+
+
+def _is_checkpoint(obj: Any) -> bool:
+    return isinstance(obj, dict) and isinstance(obj.get("channel_values"), dict) and "id" in obj
+
+
+def _refs(value: Any) -> list[str]:
+    if isinstance(value, dict) and len(value) == 1:
+        if BLOB_KEY in value:
+            return [value[BLOB_KEY]]
+        if BLOB_LIST_KEY in value:
+            return list(value[BLOB_LIST_KEY])
+    return []
+
+
+def build_state_serializer() -> OffloadingSerializer | None:
+    """Serializer for the SQLite checkpointer per STATE_BLOB_* settings; None when offload is disabled."""
+    if not settings.STATE_BLOB_OFFLOAD:
+        return None
+    if settings.STATE_BLOB_BACKEND == "filesystem":
+        store = FileBlobStore(settings.STATE_BLOB_DIR)
+    else:
+        store = SqliteBlobStore(os.path.join(settings.STATE_BLOB_DIR, "blobs.db"))
+    logger.info(f"[OffloadingSerializer] state blobs offloaded to {settings.STATE_BLOB_BACKEND} at {settings.STATE_BLOB_DIR}")
+    return OffloadingSerializer(store)
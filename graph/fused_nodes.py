@@ -0,0 +1,51 @@
+"""
+graph/fused_nodes.py
+---------------------
+Fused execution of consecutive graph nodes.
+A fused node runs its members back to back inside one LangGraph step,
+so a chain of cheap deterministic nodes costs one superstep and one
+checkpoint write instead of one each. Members keep their own
+@trace_node telemetry, metrics, workflow_path and agent_durations entries.
+"""
+
+import inspect
+from typing import Any, Callable
+
+from graph.state import RTIAgentState
+
+# Fused graph node -> member nodes, in execution order
+FUSED_STAGES: dict[str, tuple[str, ...]] = {
+    # Join, debate, critic and verifier are pure functions over the joined branch state
+    "deliberation_node": ("branch_join_node", "debate_node", "critic_node", "verifier_node"),
+    # Consensus is pure, so re-running it if memory learning fails on resume costs nothing
+    "consensus_learning_node": ("consensus_node", "memory_learning_node"),
+}
+
+
+def fuse_nodes(members: list[tuple[str, Callable]]) -> Callable:
+    """Builds one graph node that runs ``members`` in order.
+
+    Each member sees the state as updated by the members before it. Members
+    return full list/dict values (``[*state[key], item]``), so applying their
+    updates in turn matches what the state reducers would do between steps.
+    """
+
+    async def fused_node(state: RTIAgentState) -> dict:
+        view: dict[str, Any] = dict(state)
+        update: dict[str, Any] = {}
+        for _name, node in members:
+            result = node(view)
+            if inspect.isawaitable(result):
+                result = await result
+            if result:
+                view.update(result)
+                update.update(result)
+        return update
+
+    fused_node.__name__ = "fused_" + "_".join(name for name, _node in members)
+    return fused_node
+
+
+def stage_members(node: str) -> tuple[str, ...]:
+    """The nodes a graph step actually ran; just ``node`` itself unless it is fused."""
+    return FUSED_STAGES.get(node, (node,))
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 import os
-import sqlite3
-from langgraph.checkpoint.sqlite import SqliteSaver
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langgraph.graph import END, START, StateGraph
 
 from config.settings import settings
+from graph.fused_nodes import FUSED_STAGES, fuse_nodes
+from graph import sqlite_checkpointer
+from graph.sqlite_checkpointer import BatchedSqliteSaver
 from graph.nodes.approval_node import approval_node
 from graph.nodes.classifier_node import classifier_node
 from graph.nodes.consensus_node import consensus_node
@@ -25,7 +26,8 @@ from graph.nodes.tool_selection_node import tool_selection_node
 from graph.nodes.tracker_node import tracker_node
 from graph.nodes.verifier_node import verifier_node
 from graph.nodes.info_fetcher_node import info_fetcher_node
-from graph.router import route_after_approval, route_after_consensus, route_after_reflection, route_after_reviewer, route_after_router, route_after_info_fetcher
+from graph.nodes.join_node import branch_join_node
+from graph.router import ANALYSIS_BRANCHES, route_after_approval, route_after_consensus, route_after_reflection, route_after_reviewer, route_after_router, route_after_info_fetcher, route_to_analysis_branches
 
 from graph.state import RTIAgentState
 from observability.structured_logger import get_logger
@@ -165,18 +167,21 @@ class LazyPostgresCheckpointer(BaseCheckpointSaver):
 lazy_checkpointer = LazyPostgresCheckpointer()
 
 
-def build_graph(enable_hitl: bool = True):
+def build_graph(enable_hitl: bool = True, parallel_branches: bool | None = None, fuse_nodes_enabled: bool | None = None):
+    if parallel_branches is None:
+        parallel_branches = settings.GRAPH_PARALLEL_BRANCHES
+    if fuse_nodes_enabled is None:
+        fuse_nodes_enabled = settings.GRAPH_FUSED_NODES
     if settings.CHECKPOINTER_TYPE == "postgres" and settings.POSTGRES_CHECKPOINTER_URL:
         checkpointer = lazy_checkpointer
     else:
         db_path = settings.CHECKPOINTER_DB
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
-        conn = sqlite3.connect(db_path, check_same_thread=False)
-        checkpointer = SqliteSaver(conn)
+        checkpointer = BatchedSqliteSaver(db_path, offload_state=True)
 
     builder = StateGraph(RTIAgentState)
 
-    for name, node in {
+    nodes = {
         "router_node": router_node,
         "planner_node": planner_node,
         "formatter_node": formatter_node,
@@ -184,6 +189,7 @@ def build_graph(enable_hitl: bool = True):
         "classifier_node": classifier_node,
         "tool_selection_node": tool_selection_node,
         "retrieval_node": retrieval_node,
+        "branch_join_node": branch_join_node,
         "debate_node": debate_node,
         "critic_node": critic_node,
         "verifier_node": verifier_node,
@@ -193,29 +199,50 @@ def build_graph(enable_hitl: bool = True):
         "consensus_node": consensus_node,
         "memory_learning_node": memory_learning_node,
         "tracker_node": tracker_node,
-    }.items():
+    }
+    if fuse_nodes_enabled:
+        # Each fused chain becomes a single step (and a single checkpoint write)
+        for fused_name, members in FUSED_STAGES.items():
+            nodes[fused_name] = fuse_nodes([(member, nodes.pop(member)) for member in members])
+        join_step, consensus_step = "deliberation_node", "consensus_learning_node"
+    else:
+        join_step, consensus_step = "branch_join_node", "consensus_node"
+
+    for name, node in nodes.items():
         builder.add_node(name, node)
 
     builder.add_edge(START, "router_node")
     builder.add_conditional_edges("router_node", route_after_router, {"planner_node": "planner_node", "tracker_node": "tracker_node"})
     builder.add_edge("planner_node", "formatter_node")
     builder.add_edge("formatter_node", "info_fetcher_node")
-    builder.add_conditional_edges("info_fetcher_node", route_after_info_fetcher, {"tracker_node": "tracker_node", "classifier_node": "classifier_node"})
-    builder.add_edge("classifier_node", "tool_selection_node")
-    builder.add_edge("tool_selection_node", "retrieval_node")
-    builder.add_edge("retrieval_node", "debate_node")
-    builder.add_edge("debate_node", "critic_node")
-    builder.add_edge("critic_node", "verifier_node")
-    builder.add_edge("verifier_node", "reviewer_node")
+    if parallel_branches:
+        # Classifier, tool execution and retrieval share no inputs, so they run in one superstep
+        builder.add_conditional_edges("info_fetcher_node", route_to_analysis_branches, ["tracker_node", *ANALYSIS_BRANCHES])
+        builder.add_edge(ANALYSIS_BRANCHES, join_step)
+    else:
+        builder.add_conditional_edges("info_fetcher_node", route_after_info_fetcher, {"tracker_node": "tracker_node", "classifier_node": "classifier_node"})
+        builder.add_edge("classifier_node", "tool_selection_node")
+        builder.add_edge("tool_selection_node", "retrieval_node")
+        builder.add_edge("retrieval_node", join_step)
+    if fuse_nodes_enabled:
+        builder.add_edge("deliberation_node", "reviewer_node")
+    else:
+        builder.add_edge("branch_join_node", "debate_node")
+        builder.add_edge("debate_node", "critic_node")
+        builder.add_edge("critic_node", "verifier_node")
+        builder.add_edge("verifier_node", "reviewer_node")
     builder.add_conditional_edges("reviewer_node", route_after_reviewer, {"approval_node": "approval_node", "reflection_node": "reflection_node"})
-    builder.add_conditional_edges("approval_node", route_after_approval, {"consensus_node": "consensus_node", "reflection_node": "reflection_node", "approval_node": "approval_node"})
+    builder.add_conditional_edges("approval_node", route_after_approval, {"consensus_node": consensus_step, "reflection_node": "reflection_node", "approval_node": "approval_node"})
     builder.add_conditional_edges("reflection_node", route_after_reflection, {"formatter_node": "formatter_node", "tracker_node": "tracker_node"})
-    builder.add_conditional_edges("consensus_node", route_after_consensus, {"memory_learning_node": "memory_learning_node"})
-    builder.add_edge("memory_learning_node", "tracker_node")
+    if fuse_nodes_enabled:
+        builder.add_edge("consensus_learning_node", "tracker_node")
+    else:
+        builder.add_conditional_edges("consensus_node", route_after_consensus, {"memory_learning_node": "memory_learning_node"})
+        builder.add_edge("memory_learning_node", "tracker_node")
     builder.add_edge("tracker_node", END)
 
     graph = builder.compile(checkpointer=checkpointer, interrupt_before=["approval_node"] if enable_hitl else [])
-    logger.info(f"[GraphBuilder] Graph compiled | nodes={list(builder.nodes.keys())} | hitl={'enabled' if enable_hitl else 'disabled'}")
+    logger.info(f"[GraphBuilder] Graph compiled | nodes={list(builder.nodes.keys())} | hitl={'enabled' if enable_hitl else 'disabled'} | parallel_branches={parallel_branches} | fused_nodes={fuse_nodes_enabled}")
     return graph
 
 
@@ -228,3 +255,14 @@ def get_graph(enable_hitl: bool = True):
         _graph_instance = build_graph(enable_hitl=enable_hitl)
     return _graph_instance
 
+
+def close_graph() -> None:
+    """Flushes and closes the shared graph's SQLite checkpointer, stopping its writer thread."""
+    global _graph_instance
+    graph, _graph_instance = _graph_instance, None
+    checkpointer = getattr(graph, "checkpointer", None)
+    # Checked against the real class: tests swap the BatchedSqliteSaver name in this module
+    if isinstance(checkpointer, sqlite_checkpointer.BatchedSqliteSaver):
+        checkpointer.close()
+        logger.info("[GraphBuilder] SQLite checkpointer flushed and closed")
+
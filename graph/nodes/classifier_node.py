@@ -10,6 +10,7 @@ Falls back to Groq if Gemini fails.
 import time
 from pydantic import BaseModel
 from graph.state import RTIAgentState
+from llm_router.adaptive_router import is_rate_limited
 from llm_router.llm_router import get_llm
 from tools.department_lookup import get_valid_departments
 from prompts.classifier import build_classifier_prompt
@@ -69,8 +70,7 @@ async def classifier_node(state: RTIAgentState) -> dict:
         model_used = "gemini-1.5-pro"
 
     except Exception as e:
-        err_str = str(e).lower()
-        is_quota_429 = "429" in err_str or "quota" in err_str or "rate limit" in err_str
+        is_quota_429 = is_rate_limited(e)
         if is_quota_429:
             logger.warning(f"[ClassifierNode] Gemini rate-limited (429); falling back to Groq immediately. Error: {e}")
         else:
@@ -0,0 +1,34 @@
+"""
+graph/nodes/join_node.py
+-------------------------
+BranchJoinNode — fan-in point for the analysis branches (classifier,
+tool selection, retrieval) that run concurrently after the info fetcher.
+Settles the final department once the classifier's answer is in and
+records how long each branch took.
+"""
+
+from observability.node_logger import trace_node
+
+from graph.router import ANALYSIS_BRANCHES
+from graph.state import RTIAgentState
+from observability.logger import get_logger
+from rag.retrievers.metadata_filter import infer_department
+
+logger = get_logger(__name__)
+
+
+@trace_node('branch_join_node')
+async def branch_join_node(state: RTIAgentState) -> dict:
+    request_id = state.get("request_id")
+    formal_query = state.get("formal_query") or state.get("sanitized_query") or state.get("raw_query", "")
+    department = infer_department(formal_query, state.get("department", ""))
+    durations = state.get("agent_durations", {})
+    branch_durations = {name: round(durations[name], 1) for name in ANALYSIS_BRANCHES if name in durations}
+
+    logger.info(f"[BranchJoinNode] joined | request_id={request_id} | department={department} | branch_ms={branch_durations}")
+
+    return {
+        "department": department,
+        "reasoning_trace": [*state.get("reasoning_trace", []), {"node": "branch_join_node", "branch_durations_ms": branch_durations}],
+        "workflow_path": [*state.get("workflow_path", []), "branch_join_node"],
+    }
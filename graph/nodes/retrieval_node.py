@@ -69,8 +69,8 @@ async def retrieval_node(state: RTIAgentState) -> dict:
         cache_hit=cache_hit
     )
 
+    # The department is only a retrieval filter here; branch_join_node settles the final value
     return {
-        "department": department or state.get("department", ""),
         "retrieved_context": contexts,
         "retrieval_scores": scores,
         "retrieval_sources": sources,
@@ -12,6 +12,7 @@ import time
 import json
 from pydantic import BaseModel
 from graph.state import RTIAgentState
+from llm_router.adaptive_router import is_rate_limited
 from llm_router.llm_router import get_llm
 
 from observability.telemetry import telemetry
@@ -96,8 +97,7 @@ async def reviewer_node(state: RTIAgentState) -> dict:
         suggested_improvements = result.suggested_improvements
 
     except Exception as e:
-        err_str = str(e).lower()
-        is_quota_429 = "429" in err_str or "quota" in err_str or "rate limit" in err_str
+        is_quota_429 = is_rate_limited(e)
 
         if is_quota_429:
             logger.warning(
@@ -6,6 +6,7 @@ import time
 
 from graph.state import RTIAgentState
 from observability.metrics import rti_agent_duration
+from rag.retrievers.metadata_filter import infer_department
 from tools.base.tool_schemas import ToolCallPlan
 from tools.base.tool_registry import get_tool_registry
 from tools.base.tool_router import select_tools
@@ -15,7 +16,8 @@ from tools.base.tool_router import select_tools
 async def tool_selection_node(state: RTIAgentState) -> dict:
     started = time.perf_counter()
     query = state.get("formal_query") or state.get("sanitized_query") or state.get("raw_query", "")
-    department = state.get("department", "")
+    # Runs alongside the classifier, so the department may not be known yet
+    department = infer_department(query, state.get("department", ""))
     selected = state.get("selected_tools") or select_tools(query, department)
     registry = get_tool_registry()
     permissions = ["read:public", "read:rag", "privacy:redact"]
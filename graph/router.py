@@ -5,6 +5,9 @@ from observability.structured_logger import get_logger
 
 logger = get_logger(__name__)
 
+# Independent analysis stages fanned out after the info fetcher and merged by branch_join_node
+ANALYSIS_BRANCHES = ["classifier_node", "tool_selection_node", "retrieval_node"]
+
 
 def route_after_router(state: RTIAgentState) -> str:
     intent = state.get("intent", "new_request")
@@ -61,3 +64,7 @@ def route_after_info_fetcher(state: RTIAgentState) -> str:
     return "classifier_node"
 
 
+def route_to_analysis_branches(state: RTIAgentState) -> str | list[str]:
+    if route_after_info_fetcher(state) == "tracker_node":
+        return "tracker_node"
+    return ANALYSIS_BRANCHES
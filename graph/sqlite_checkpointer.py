@@ -0,0 +1,371 @@
+"""
+graph/sqlite_checkpointer.py
+-----------------------------
+Async SQLite checkpointer for the LangGraph workflow.
+- WAL journal, so checkpoint reads never wait on writes.
+- One dedicated writer thread owns the write connection; every put /
+  put_writes / delete is queued to it and whatever has queued up by the
+  time it is free is committed in a single transaction (group commit).
+- Reads run in worker threads on per-thread read connections.
+- compact() applies the retention policy: finished threads keep only their
+  latest checkpoint, threads still running or waiting at the approval
+  interrupt keep their latest CHECKPOINT_KEEP_PENDING. Only threads written
+  since the previous compaction are inspected; their latest checkpoints are
+  read on a reader connection and the deletes go to the writer in small
+  batches, so checkpoint writes never queue behind a full scan.
+The graph does not use DeltaChannel, so every checkpoint carries full
+channel values and older ones can be dropped safely.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Collection, Iterator, Mapping, Sequence
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.checkpoint.base import ChannelVersions, Checkpoint, CheckpointMetadata, CheckpointTuple
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.sqlite import SqliteSaver
+
+from config.settings import settings
+from graph.blob_store import build_state_serializer
+from observability.metrics import rti_checkpoint_batch_size, rti_checkpoint_db_bytes, rti_checkpoint_write_seconds
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+_LATEST_SQL = """
+SELECT checkpoint_id, type, checkpoint FROM checkpoints
+WHERE thread_id = ? AND checkpoint_ns = ? ORDER BY checkpoint_id DESC LIMIT 1
+"""
+
+# Threads pruned per writer transaction during compaction
+_PRUNE_BATCH = 100
+
+
+@dataclass
+class _Job:
+    op: str
+    fn: Callable[..., Any]
+    args: tuple
+    future: Future = field(default_factory=Future)
+    transactional: bool = True
+    queued_at: float = field(default_factory=time.perf_counter)
+
+
+class BatchedSqliteSaver(SqliteSaver):
+    """SqliteSaver with non-blocking async methods and group-committed writes.
+
+    With ``offload_state`` and no explicit ``serde`` the saver builds the
+    STATE_BLOB_* offloading serializer itself and closes it in ``close()``.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        *,
+        batch_size: int | None = None,
+        serde: SerializerProtocol | None = None,
+        offload_state: bool = False,
+    ):
+        self._owned_serde = build_state_serializer() if offload_state and serde is None else None
+        serde = serde or self._owned_serde
+        conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        super().__init__(conn, serde=serde)
+        self.db_path = db_path
+        self.batch_size = batch_size or settings.CHECKPOINT_WRITE_BATCH
+        self.setup()
+        self._readers = threading.local()
+        self._jobs: queue.SimpleQueue[_Job | None] = queue.SimpleQueue()
+        self._closed = False
+        # (thread_id, checkpoint_ns) written since the last compaction; every existing thread at startup
+        self._dirty: set[tuple[str, str]] = set(conn.execute("SELECT DISTINCT thread_id, checkpoint_ns FROM checkpoints"))
+        self._dirty_lock = threading.Lock()
+        self._writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+        self._writer.start()
+
+    def with_allowlist(self, extra_allowlist: Collection[tuple[str, ...]]) -> "BatchedSqliteSaver":
+        # The base class only knows how to apply the allowlist to JsonPlus/Encrypted serializers
+        if not hasattr(self.serde, "with_msgpack_allowlist") or type(self.serde).__module__.startswith("langgraph."):
+            return super().with_allowlist(extra_allowlist)
+        clone = copy.copy(self)
+        clone.serde = self.serde.with_msgpack_allowlist(extra_allowlist)
+        return clone
+
+    def get_next_version(self, current: str | int | None, channel: None) -> str | int:
+        # Plain integers instead of SqliteSaver's 49-character strings: channel_versions and
+        # versions_seen are rewritten into every checkpoint. Threads started on string versions keep them.
+        if isinstance(current, str):
+            return super().get_next_version(current, channel)
+        return (current or 0) + 1
+
+    # ── Connections ───────────────────────────────────────────────
+
+    @contextmanager
+    def cursor(self, transaction: bool = True) -> Iterator[sqlite3.Cursor]:
+        # Writes only ever run on the writer thread, inside its open batch transaction
+        on_writer = threading.current_thread() is self._writer
+        cur = (self.conn if on_writer else self._reader()).cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._readers, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._readers.conn = conn
+        return conn
+
+    # ── Writes ────────────────────────────────────────────────────
+
+    def _submit(self, op: str, fn: Callable[..., Any], *args: Any, transactional: bool = True) -> Future:
+        if self._closed:
+            raise RuntimeError("[BatchedSqliteSaver] checkpointer is closed")
+        job = _Job(op, fn, args, transactional=transactional)
+        self._jobs.put(job)
+        return job.future
+
+    def _put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        saved = SqliteSaver.put(self, config, checkpoint, metadata, new_versions)
+        configurable = config["configurable"]
+        with self._dirty_lock:
+            self._dirty.add((str(configurable["thread_id"]), configurable.get("checkpoint_ns", "")))
+        return saved
+
+    def put(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return self._submit("put", self._put, config, checkpoint, metadata, new_versions).result()
+
+    def put_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        self._submit("put_writes", SqliteSaver.put_writes, self, config, writes, task_id, task_path).result()
+
+    def delete_thread(self, thread_id: str) -> None:
+        self._submit("delete", SqliteSaver.delete_thread, self, thread_id).result()
+
+    async def aput(self, config: RunnableConfig, checkpoint: Checkpoint, metadata: CheckpointMetadata, new_versions: ChannelVersions) -> RunnableConfig:
+        return await asyncio.wrap_future(self._submit("put", self._put, config, checkpoint, metadata, new_versions))
+
+    async def aput_writes(self, config: RunnableConfig, writes: Sequence[tuple[str, Any]], task_id: str, task_path: str = "") -> None:
+        await asyncio.wrap_future(self._submit("put_writes", SqliteSaver.put_writes, self, config, writes, task_id, task_path))
+
+    async def adelete_thread(self, thread_id: str) -> None:
+        await asyncio.wrap_future(self._submit("delete", SqliteSaver.delete_thread, self, thread_id))
+
+    # ── Reads ─────────────────────────────────────────────────────
+
+    async def aget_tuple(self, config: RunnableConfig) -> CheckpointTuple | None:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(
+        self,
+        config: RunnableConfig | None,
+        *,
+        filter: dict[str, Any] | None = None,
+        before: RunnableConfig | None = None,
+        limit: int | None = None,
+    ) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+
+    async def aget_delta_channel_history(self, *, config: RunnableConfig, channels: Sequence[str]) -> Mapping[str, Any]:
+        return await asyncio.to_thread(lambda: self.get_delta_channel_history(config=config, channels=channels))
+
+    # ── Writer thread ─────────────────────────────────────────────
+
+    def _write_loop(self) -> None:
+        while True:
+            batch = [self._jobs.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._jobs.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in batch
+            jobs = [job for job in batch if job is not None]
+            # Maintenance jobs (VACUUM, WAL checkpoints) cannot run inside a transaction
+            pending: list[_Job] = []
+            for job in jobs:
+                if job.transactional:
+                    pending.append(job)
+                    continue
+                self._commit(pending)
+                pending = []
+                self._run_alone(job)
+            self._commit(pending)
+            if stop:
+                return
+
+    def _commit(self, jobs: list[_Job]) -> None:
+        if not jobs:
+            return
+        outcomes: list[tuple[_Job, Any, BaseException | None]] = []
+        try:
+            self.conn.execute("BEGIN")
+            for job in jobs:
+                self.conn.execute("SAVEPOINT job")
+                try:
+                    value = job.fn(*job.args)
+                    self.conn.execute("RELEASE job")
+                    outcomes.append((job, value, None))
+                except Exception as exc:
+                    # Only the failing job is undone; the rest of the batch still commits
+                    self.conn.execute("ROLLBACK TO job")
+                    self.conn.execute("RELEASE job")
+                    outcomes.append((job, None, exc))
+            self.conn.execute("COMMIT")
+        except Exception as exc:
+            logger.error(f"[BatchedSqliteSaver] batch commit failed | jobs={len(jobs)} | error={exc}")
+            if self.conn.in_transaction:
+                self.conn.execute("ROLLBACK")
+            outcomes = [(job, None, exc) for job in jobs]
+        rti_checkpoint_batch_size.observe(len(jobs))
+        self._resolve(outcomes)
+
+    def _run_alone(self, job: _Job) -> None:
+        try:
+            outcome = (job, job.fn(*job.args), None)
+        except Exception as exc:
+            outcome = (job, None, exc)
+        self._resolve([outcome])
+
+    def _resolve(self, outcomes: list[tuple[_Job, Any, BaseException | None]]) -> None:
+        finished = time.perf_counter()
+        for job, value, error in outcomes:
+            rti_checkpoint_write_seconds.labels(op=job.op).observe(finished - job.queued_at)
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(value)
+
+    # ── Retention and compaction ──────────────────────────────────
+
+    async def compact(self, keep_pending: int | None = None, vacuum_free_ratio: float | None = None) -> dict:
+        """Prunes old checkpoints, truncates the WAL and VACUUMs once enough pages are free."""
+        keep = settings.CHECKPOINT_KEEP_PENDING if keep_pending is None else keep_pending
+        free_ratio = settings.CHECKPOINT_VACUUM_FREE_RATIO if vacuum_free_ratio is None else vacuum_free_ratio
+        with self._dirty_lock:
+            threads = list(self._dirty)
+            self._dirty.clear()
+        try:
+            latest = await asyncio.to_thread(self._latest, threads)
+            deleted = 0
+            for start in range(0, len(latest), _PRUNE_BATCH):
+                deleted += await asyncio.wrap_future(self._submit("compact", self._prune, latest[start:start + _PRUNE_BATCH], max(keep, 1)))
+        except BaseException:
+            with self._dirty_lock:
+                self._dirty.update(threads)
+            raise
+        blobs_deleted = await self._sweep_blobs()
+        vacuumed = await asyncio.wrap_future(self._submit("compact", self._maintain, free_ratio, transactional=False))
+        size = self.db_size()
+        logger.info(
+            f"[BatchedSqliteSaver] compacted | checkpoints_deleted={deleted} | blobs_deleted={blobs_deleted} | "
+            f"vacuumed={vacuumed} | db_bytes={size}"
+        )
+        return {"checkpoints_deleted": deleted, "blobs_deleted": blobs_deleted, "vacuumed": vacuumed, "db_bytes": size}
+
+    def _latest(self, threads: list[tuple[str, str]]) -> list[tuple[str, str, str, bool]]:
+        """``(thread_id, checkpoint_ns, latest checkpoint_id, pending)`` per thread, read off the writer thread."""
+        found = []
+        for thread_id, checkpoint_ns in threads:
+            row = self._reader().execute(_LATEST_SQL, (thread_id, checkpoint_ns)).fetchone()
+            if row is None:
+                continue
+            latest = self.serde.loads_typed((row[1], row[2]))
+            # A checkpoint with a pending branch still has a node to run (e.g. approval_node)
+            pending = any(channel.startswith("branch:to:") for channel in latest.get("channel_values", {}))
+            found.append((thread_id, checkpoint_ns, row[0], pending))
+        return found
+
+    def _prune(self, latest: list[tuple[str, str, str, bool]], keep_pending: int) -> int:
+        deleted = 0
+        for thread_id, checkpoint_ns, latest_id, pending in latest:
+            keep = keep_pending if pending else 1
+            # Counted from the checkpoint that was inspected; anything written since stays (and is dirty again)
+            cutoff = self.conn.execute(
+                "SELECT checkpoint_id FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id <= ? "
+                "ORDER BY checkpoint_id DESC LIMIT 1 OFFSET ?",
+                (thread_id, checkpoint_ns, latest_id, keep - 1),
+            ).fetchone()
+            if cutoff is None:
+                continue
+            args = (thread_id, checkpoint_ns, cutoff[0])
+            deleted += self.conn.execute(
+                "DELETE FROM checkpoints WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?", args
+            ).rowcount
+            self.conn.execute("DELETE FROM writes WHERE thread_id = ? AND checkpoint_ns = ? AND checkpoint_id < ?", args)
+        return deleted
+
+    async def _sweep_blobs(self) -> int:
+        """Drops offloaded state blobs (graph/blob_store.py) that no remaining checkpoint or write references.
+
+        The references are scanned on a reader connection and only the delete
+        goes to the writer. The cutoff is taken on the writer once everything
+        queued before it has committed, so the scan sees every checkpoint
+        serialized before the cutoff; anything serialized after it stamps the
+        blobs it reuses, which keeps them out of the delete.
+        """
+        if not hasattr(self.serde, "references"):
+            return 0
+        started = await asyncio.wrap_future(self._submit("compact", time.time))
+        live = await asyncio.to_thread(self._live_blobs)
+        return await asyncio.wrap_future(self._submit("compact", self.serde.sweep, live, started))
+
+    def _live_blobs(self) -> set[str]:
+        live: set[str] = set()
+        for row in self._reader().execute("SELECT type, checkpoint FROM checkpoints UNION ALL SELECT type, value FROM writes"):
+            live |= self.serde.references(row)
+        return live
+
+    def _maintain(self, vacuum_free_ratio: float) -> bool:
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        pages = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        free = self.conn.execute("PRAGMA freelist_count").fetchone()[0]
+        if not pages or free / pages < vacuum_free_ratio:
+            return False
+        self.conn.execute("VACUUM")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return True
+
+    def db_size(self) -> int:
+        """Database plus WAL size in bytes; also published as a gauge."""
+        size = sum(os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal") if os.path.exists(path))
+        rti_checkpoint_db_bytes.set(size)
+        return size
+
+    def close(self) -> None:
+        """Flushes queued writes and stops the writer thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self._jobs.put(None)
+        self._writer.join()
+        self.conn.close()
+        if self._owned_serde is not None:
+            self._owned_serde.close()
+
+
+async def run_checkpoint_compactor(saver: BatchedSqliteSaver, interval: float | None = None) -> None:
+    """Background task: compacts the checkpoint DB every CHECKPOINT_COMPACT_INTERVAL_SECONDS."""
+    interval = interval or settings.CHECKPOINT_COMPACT_INTERVAL_SECONDS
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await saver.compact()
+        except Exception as exc:
+            logger.error(f"[BatchedSqliteSaver] compaction failed: {exc}")
@@ -4,12 +4,36 @@ graph/state.py
 Master TypedDict state schema for the RTI-Agent LangGraph StateGraph.
 This is the single source of truth that flows through every node.
 All fields are Optional where appropriate to support partial hydration.
+
+Fields written by the parallel analysis branches (classifier, tool selection,
+retrieval) carry reducers, so updates from concurrent branches in the same
+superstep are merged instead of rejected.
 """
 
 from typing import TypedDict, Annotated
 from langgraph.graph.message import add_messages
 
 
+def merge_branch_list(left: list | None, right: list | None) -> list:
+    """Nodes return the full list (``[*state[key], item]``).
+
+    A sequential update extends ``left`` and simply replaces it. Concurrent
+    branches each extend the same base, so whatever follows the shared prefix
+    is appended after ``left``.
+    """
+    left, right = left or [], right or []
+    shared = 0
+    for old, new in zip(left, right):
+        if old != new:
+            break
+        shared += 1
+    return [*left, *right[shared:]]
+
+
+def merge_branch_dict(left: dict | None, right: dict | None) -> dict:
+    return {**(left or {}), **(right or {})}
+
+
 class RTIAgentState(TypedDict):
 
     # ── Identity ──────────────────────────────────────────────────
@@ -56,7 +80,7 @@ class RTIAgentState(TypedDict):
     retrieval_citations: list[str]  # Human-readable source citations
     retrieval_metadata: list[dict]  # Full metadata per retrieved chunk
     retrieval_confidence: float     # Aggregate retriever confidence
-    tools_used: list[str]           # Tools invoked during retrieval
+    tools_used: Annotated[list[str], merge_branch_list]  # Tools invoked during retrieval
     cache_hit: bool                 # Whether semantic cache was used
 
     # ── Quality Control ───────────────────────────────────────────
@@ -90,10 +114,10 @@ class RTIAgentState(TypedDict):
     # ── Routing ───────────────────────────────────────────────────
     next_agent: str                 # Name of next node to execute
     intent: str                     # "new_request" | "status_check" | "followup"
-    workflow_path: list[str]        # Ordered list of nodes visited (audit trail)
+    workflow_path: Annotated[list[str], merge_branch_list]  # Ordered list of nodes visited (audit trail)
 
     # ── Observability ─────────────────────────────────────────────
-    agent_durations: dict[str, float]   # {agent_name: duration_ms}
+    agent_durations: Annotated[dict[str, float], merge_branch_dict]  # {agent_name: duration_ms}
     token_counts: dict[str, int]        # {agent_name: total_tokens}
     llm_models_used: dict[str, str]     # {agent_name: model_name}
 
@@ -109,6 +133,6 @@ class RTIAgentState(TypedDict):
     ai_risk_score: float
     escalation_required: bool
     learning_feedback: dict
-    reasoning_trace: list[dict]
+    reasoning_trace: Annotated[list[dict], merge_branch_list]
     live_events: list[dict]
     governance_notes: list[str]
@@ -0,0 +1,297 @@
+"""
+llm_router/adaptive_router.py
+------------------------------
+Latency-aware provider selection around the actual LLM invocation.
+- ProviderStats: rolling p50/p95 latency and error rate per provider/model,
+  over samples younger than LLM_STATS_MAX_AGE_SECONDS.
+- RoutedChatModel: keeps the task's TASK_ROUTING primary unless it is
+  unhealthy, orders the fallbacks by observed latency, fails over on errors,
+  and optionally hedges a second request after the leader's p95.
+Circuit breakers and per-provider concurrency limits are enforced here,
+from real call outcomes. Each call first waits its turn in the provider's
+RateGovernor queue, which also owns the per-minute request/token budgets.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from langchain_core.messages import AIMessage
+
+from config.settings import settings
+from llm_router.circuit_breaker import CircuitBreaker
+from llm_router.rate_governor import RateGovernor, estimate_tokens, get_rate_governor
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    """True for provider quota / 429 errors, whatever client raised them."""
+    if getattr(exc, "status_code", None) == 429 or getattr(getattr(exc, "response", None), "status_code", None) == 429:
+        return True
+    text = str(exc).lower()
+    return "429" in text or "quota" in text or "rate limit" in text
+
+
+class ProviderStats:
+    """Rolling window of call outcomes for one provider/model pair."""
+
+    def __init__(self, window: int | None = None):
+        self._latencies: deque[tuple[float, float]] = deque(maxlen=window or settings.LLM_LATENCY_WINDOW)
+        self._outcomes: deque[tuple[float, bool]] = deque(maxlen=window or settings.LLM_LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def record(self, latency_s: float, ok: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if ok:
+                self._latencies.append((now, latency_s))
+            self._outcomes.append((now, ok))
+
+    def _expire(self) -> None:
+        # A provider that stopped getting traffic keeps its last verdict only this long
+        cutoff = time.monotonic() - settings.LLM_STATS_MAX_AGE_SECONDS
+        for samples in (self._latencies, self._outcomes):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+
+    def percentile(self, q: float) -> float | None:
+        with self._lock:
+            self._expire()
+            if len(self._latencies) < settings.LLM_MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(latency for _at, latency in self._latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            self._expire()
+            if len(self._outcomes) < settings.LLM_MIN_LATENCY_SAMPLES:
+                return 0.0
+            return sum(1 for _at, ok in self._outcomes if not ok) / len(self._outcomes)
+
+    def snapshot(self) -> dict:
+        return {
+            "p50_ms": _ms(self.percentile(0.5)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "error_rate": round(self.error_rate, 3),
+        }
+
+
+class ProviderRegistry:
+    """Process-wide health state shared by every RoutedChatModel."""
+
+    def __init__(self):
+        self.breakers = {
+            provider: CircuitBreaker(name=provider, failure_threshold=settings.CIRCUIT_BREAKER_THRESHOLD)
+            for provider in ("groq", "gemini", "openai")
+        }
+        self._stats: dict[tuple[str, str], ProviderStats] = {}
+        self._semaphores: dict[str, weakref.WeakKeyDictionary] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, provider: str, model: str) -> ProviderStats:
+        key = (provider, model)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = ProviderStats()
+            return self._stats[key]
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        with self._lock:
+            if provider not in self.breakers:
+                self.breakers[provider] = CircuitBreaker(name=provider, failure_threshold=settings.CIRCUIT_BREAKER_THRESHOLD)
+            return self.breakers[provider]
+
+    def semaphore(self, provider: str) -> asyncio.Semaphore:
+        # asyncio primitives belong to one event loop, so keep one per loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            per_loop = self._semaphores.setdefault(provider, weakref.WeakKeyDictionary())
+            if loop not in per_loop:
+                per_loop[loop] = asyncio.Semaphore(_provider_limit(provider, "MAX_CONCURRENCY") or 1_000_000)
+            return per_loop[loop]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        return {
+            "breakers": {name: breaker.get_state() for name, breaker in self.breakers.items()},
+            "providers": {f"{provider}/{model}": item.snapshot() for (provider, model), item in stats.items()},
+        }
+
+
+_registry: ProviderRegistry | None = None
+
+
+def get_provider_registry() -> ProviderRegistry:
+    """Returns singleton ProviderRegistry."""
+    global _registry
+    if _registry is None:
+        _registry = ProviderRegistry()
+    return _registry
+
+
+class _HedgeFailed(Exception):
+    def __init__(self, leader: BaseException, backup: BaseException):
+        super().__init__(f"{leader}; {backup}")
+        self.leader = leader
+        self.backup = backup
+
+
+@dataclass
+class Candidate:
+    provider: str
+    model: str
+    runnable: Any
+
+
+class RoutedChatModel:
+    """Chat model that picks among a task's candidate providers on every call.
+
+    Candidates come in TASK_ROUTING preference order and the first one stays
+    the leader while it is healthy. Among the healthy fallbacks, only
+    candidates that both have enough latency samples swap places by p50; the
+    others keep their table position. Candidates with an open breaker, an
+    error rate above LLM_MAX_ERROR_RATE or a saturated RateGovernor queue are
+    only tried after the healthy ones, until their samples age out.
+    """
+
+    def __init__(
+        self,
+        candidates: list[Candidate],
+        *,
+        task: str,
+        registry: ProviderRegistry | None = None,
+        governor: RateGovernor | None = None,
+    ):
+        if not candidates:
+            raise ValueError("RoutedChatModel needs at least one candidate")
+        self.candidates = candidates
+        self.task = task
+        self.registry = registry or get_provider_registry()
+        self.governor = governor or get_rate_governor()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.candidates[0].runnable, name)
+
+    def with_structured_output(self, schema: Any, *args, **kwargs) -> "RoutedChatModel":
+        structured = [
+            Candidate(item.provider, item.model, item.runnable.with_structured_output(schema, *args, **kwargs))
+            for item in self.candidates
+        ]
+        return RoutedChatModel(structured, task=self.task, registry=self.registry, governor=self.governor)
+
+    def ranked(self) -> list[Candidate]:
+        healthy: list[Candidate] = []
+        unhealthy: list[Candidate] = []
+        for item in self.candidates:
+            (unhealthy if self._unhealthy(item) else healthy).append(item)
+        if len(healthy) > 2:
+            # Sampled fallbacks are sorted by p50 within the slots they already hold
+            p50 = {id(item): self.registry.stats(item.provider, item.model).percentile(0.5) for item in healthy[1:]}
+            slots = [position for position, item in enumerate(healthy) if position > 0 and p50[id(item)] is not None]
+            for position, item in zip(slots, sorted((healthy[slot] for slot in slots), key=lambda item: p50[id(item)])):
+                healthy[position] = item
+        return healthy + unhealthy
+
+    def _unhealthy(self, item: Candidate) -> bool:
+        return (
+            self.registry.breaker(item.provider).is_open
+            or self.registry.stats(item.provider, item.model).error_rate > settings.LLM_MAX_ERROR_RATE
+            or self.governor.saturated(item.provider)
+        )
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> Any:
+        ranked = self.ranked()
+        errors: list[str] = []
+        position = 0
+        while position < len(ranked):
+            leader = ranked[position]
+            backup = ranked[position + 1] if position + 1 < len(ranked) else None
+            delay = self._hedge_delay(leader) if backup is not None else None
+            try:
+                if delay is None:
+                    return await self._call(leader, messages, args, kwargs)
+                return await self._hedged(leader, backup, delay, messages, args, kwargs)
+            except _HedgeFailed as exc:
+                errors.extend([f"{leader.provider}/{leader.model}: {exc.leader}", f"{backup.provider}/{backup.model}: {exc.backup}"])
+                position += 2
+            except Exception as exc:
+                errors.append(f"{leader.provider}/{leader.model}: {exc}")
+                logger.warning(f"[LLMRouter] task={self.task} {leader.provider}/{leader.model} failed, trying next provider: {exc}")
+                position += 1
+        raise RuntimeError(f"[LLMRouter] All LLM providers failed for task={self.task}: {'; '.join(errors)}")
+
+    def _hedge_delay(self, leader: Candidate) -> float | None:
+        if not settings.LLM_HEDGE_ENABLED:
+            return None
+        p95 = self.registry.stats(leader.provider, leader.model).percentile(0.95)
+        if p95 is None:
+            return None
+        return max(p95 * settings.LLM_HEDGE_P95_MULTIPLIER, settings.LLM_HEDGE_MIN_DELAY_MS / 1000)
+
+    async def _hedged(self, leader: Candidate, backup: Candidate, delay: float, messages, args, kwargs) -> Any:
+        """Starts ``backup`` if ``leader`` has not answered within ``delay``; first success wins."""
+        first = asyncio.ensure_future(self._call(leader, messages, args, kwargs))
+        second = None
+        try:
+            done, _pending = await asyncio.wait({first}, timeout=delay)
+            if done:
+                return first.result()
+            logger.info(f"[LLMRouter] task={self.task} hedging {leader.provider} with {backup.provider} after {delay * 1000:.0f}ms")
+            second = asyncio.ensure_future(self._call(backup, messages, args, kwargs))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            raise _HedgeFailed(first.exception(), second.exception())
+        finally:
+            # The slower request is abandoned once either one has answered
+            for task in (first, second):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    async def _call(self, candidate: Candidate, messages: Any, args: tuple, kwargs: dict) -> Any:
+        breaker = self.registry.breaker(candidate.provider)
+        stats = self.registry.stats(candidate.provider, candidate.model)
+        estimated = estimate_tokens(messages)
+        await self.governor.acquire(candidate.provider, estimated)
+        async with self.registry.semaphore(candidate.provider):
+            started = time.perf_counter()
+            try:
+                result = await candidate.runnable.ainvoke(messages, *args, **kwargs)
+            except Exception as exc:
+                stats.record(time.perf_counter() - started, False)
+                breaker.record_failure()
+                if is_rate_limited(exc):
+                    logger.warning(f"[LLMRouter] {candidate.provider} rate-limited for task={self.task}")
+                raise
+        reported = _reported_tokens(result)
+        stats.record(time.perf_counter() - started, True)
+        breaker.record_success()
+        await self.governor.settle(candidate.provider, estimated, reported)
+        return result
+
+
+def _provider_limit(provider: str, name: str) -> int:
+    return int(getattr(settings, f"{provider.upper()}_{name}", 0) or 0)
+
+
+def _reported_tokens(result: Any) -> int | None:
+    usage = getattr(result, "usage_metadata", None) if isinstance(result, AIMessage) else None
+    if usage and usage.get("total_tokens"):
+        return int(usage["total_tokens"])
+    return None
+
+
+def _ms(seconds: float | None) -> float | None:
+    return round(seconds * 1000, 1) if seconds is not None else None
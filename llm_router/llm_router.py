@@ -12,26 +12,28 @@ Task → Model Mapping:
 - review          → Gemini 1.5 Pro (best accuracy)
 - reflection      → Groq llama-3.3-70b-versatile (speed + quality)
 - fallback        → OpenAI GPT-4o (if all else fails)
+
+Clients are built once per (provider, model, temperature) and reused. With
+LLM_ADAPTIVE_ROUTING the returned model is a RoutedChatModel that keeps the
+task's primary while it is healthy and fails over to the fastest healthy
+fallback (see adaptive_router.py); otherwise it is a RoutedChatModel over the
+first provider whose breaker is closed, so every call still waits on the
+RateGovernor. When
+LLM_CACHE_ENABLED is set it is further wrapped in CachedChatModel so identical
+prompts are answered from the response cache.
 """
 
+import threading
+
 from langchain_groq import ChatGroq
 from langchain_google_genai import ChatGoogleGenerativeAI
 from config.settings import settings
-from llm_router.circuit_breaker import CircuitBreaker
+from llm_router.adaptive_router import Candidate, RoutedChatModel, get_provider_registry
+from llm_router.response_cache import CachedChatModel
 from observability.structured_logger import get_logger
 
 logger = get_logger(__name__)
 
-# ── Circuit Breakers (one per provider) ───────────────────────────
-_groq_breaker = CircuitBreaker(
-    name="groq",
-    failure_threshold=settings.CIRCUIT_BREAKER_THRESHOLD,
-)
-_gemini_breaker = CircuitBreaker(
-    name="gemini",
-    failure_threshold=settings.CIRCUIT_BREAKER_THRESHOLD,
-)
-
 # ── Task → Provider Mapping ───────────────────────────────────────
 TASK_ROUTING = {
     "routing": ("groq", settings.GROQ_MODEL_FAST),
@@ -44,6 +46,23 @@ TASK_ROUTING = {
 }
 
 
+# ── Client Pool ───────────────────────────────────────────────────
+_clients: dict[tuple[str, str, float], object] = {}
+_clients_lock = threading.Lock()
+
+
+def _client(provider: str, model: str, temperature: float = None):
+    """Returns the shared client for (provider, model, temperature), building it once."""
+    key = (provider, model, temperature or settings.LLM_TEMPERATURE)
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = _BUILDERS[provider](model, key[2])
+    return client
+
+
 def _build_groq(model: str, temperature: float = None):
     return ChatGroq(
         groq_api_key=settings.GROQ_API_KEY,
@@ -61,6 +80,37 @@ def _build_gemini(model: str, temperature: float = None):
     )
 
 
+def _build_openai(model: str, temperature: float = None):
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(
+        api_key=settings.OPENAI_API_KEY,
+        model=model,
+        temperature=temperature or settings.LLM_TEMPERATURE,
+    )
+
+
+_BUILDERS = {"groq": _build_groq, "gemini": _build_gemini, "openai": _build_openai}
+
+
+def _candidates(task: str, temperature: float = None) -> list[Candidate]:
+    """The task's primary provider, the other primary provider, then OpenAI if configured."""
+    provider, model = TASK_ROUTING.get(task, TASK_ROUTING["default"])
+    order = [(provider, model)]
+    order.append(("gemini", settings.GEMINI_MODEL) if provider == "groq" else ("groq", settings.GROQ_MODEL_SMART))
+    if settings.OPENAI_API_KEY:
+        order.append(("openai", "gpt-4o"))
+
+    registry = get_provider_registry()
+    candidates = []
+    for provider, model in order:
+        try:
+            candidates.append(Candidate(provider, model, _client(provider, model, temperature)))
+        except Exception as e:
+            registry.breaker(provider).record_failure()
+            logger.warning(f"[LLMRouter] Could not build {provider}/{model} for task={task}: {e}")
+    return candidates
+
+
 def get_llm(task: str = "default", temperature: float = None):
     """
     Returns the appropriate LLM instance for a given task.
@@ -73,47 +123,37 @@ def get_llm(task: str = "default", temperature: float = None):
     Returns:
         LangChain chat model instance.
     """
-    provider, model = TASK_ROUTING.get(task, TASK_ROUTING["default"])
-
-    # Try primary provider
-    if provider == "groq" and not _groq_breaker.is_open:
-        try:
-            llm = _build_groq(model, temperature)
-            logger.debug(f"[LLMRouter] Task={task} → Groq/{model}")
-            return llm
-        except Exception as e:
-            _groq_breaker.record_failure()
-            logger.warning(f"[LLMRouter] Groq failed for task={task}: {e}")
-
-    if provider == "gemini" and not _gemini_breaker.is_open:
-        try:
-            llm = _build_gemini(model, temperature)
-            logger.debug(f"[LLMRouter] Task={task} → Gemini/{model}")
-            return llm
-        except Exception as e:
-            _gemini_breaker.record_failure()
-            logger.warning(f"[LLMRouter] Gemini failed for task={task}: {e}")
-
-    # Cross-provider fallback
-    if provider == "gemini" and not _groq_breaker.is_open:
-        logger.warning(f"[LLMRouter] Gemini unavailable → falling back to Groq for task={task}")
-        return _build_groq(settings.GROQ_MODEL_SMART, temperature)
-
-    if provider == "groq" and not _gemini_breaker.is_open:
-        logger.warning(f"[LLMRouter] Groq unavailable → falling back to Gemini for task={task}")
-        return _build_gemini(settings.GEMINI_MODEL, temperature)
-
-    # OpenAI last resort
-    if settings.OPENAI_API_KEY:
-        logger.warning(f"[LLMRouter] All primary providers down → OpenAI fallback for task={task}")
-        from langchain_openai import ChatOpenAI
-        return ChatOpenAI(
-            api_key=settings.OPENAI_API_KEY,
-            model="gpt-4o",
-            temperature=temperature or settings.LLM_TEMPERATURE,
+    candidates = _candidates(task, temperature)
+    if not candidates:
+        raise RuntimeError(
+            f"[LLMRouter] All LLM providers are unavailable for task={task}. "
+            "Check API keys and circuit breaker state."
         )
-
-    raise RuntimeError(
-        f"[LLMRouter] All LLM providers are unavailable for task={task}. "
-        "Check API keys and circuit breaker state."
+    primary = candidates[0]
+
+    if settings.LLM_ADAPTIVE_ROUTING:
+        llm = RoutedChatModel(candidates, task=task)
+        logger.debug(f"[LLMRouter] Task={task} → adaptive over {[f'{item.provider}/{item.model}' for item in candidates]}")
+    else:
+        registry = get_provider_registry()
+        chosen = next((item for item in candidates if not registry.breaker(item.provider).is_open), None)
+        if chosen is None:
+            raise RuntimeError(
+                f"[LLMRouter] All LLM providers are unavailable for task={task}. "
+                "Check API keys and circuit breaker state."
+            )
+        if chosen is not primary:
+            logger.warning(f"[LLMRouter] {primary.provider} unavailable → falling back to {chosen.provider} for task={task}")
+        # A single candidate still goes through the RateGovernor, breaker and stats
+        llm = RoutedChatModel([chosen], task=task)
+        primary = chosen
+
+    if not settings.LLM_CACHE_ENABLED:
+        return llm
+    return CachedChatModel(
+        llm,
+        task=task,
+        provider=primary.provider,
+        model=primary.model,
+        temperature=temperature or settings.LLM_TEMPERATURE,
     )
@@ -0,0 +1,279 @@
+"""
+llm_router/rate_governor.py
+----------------------------
+Client-side throttling against upstream LLM quotas.
+- Per-provider requests-per-minute and tokens-per-minute token buckets,
+  held in process or shared across workers through Redis.
+- Calls that would exceed a bucket wait in a per-provider priority queue
+  instead of hitting the provider and getting a 429.
+Token demand is estimated from prompt length up front and corrected with
+the provider's reported usage once the call returns. These buckets are the
+only per-minute account; the router asks ``saturated()`` before picking a
+provider.
+"""
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator
+
+from config.settings import settings
+from observability.metrics import llm_rate_queue_depth, llm_rate_wait_seconds
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+# Lower value is served first
+PRIORITIES = {"high": 0, "normal": 1, "bulk": 2}
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("llm_priority", default="normal")
+
+
+@contextmanager
+def llm_priority(level: str) -> Iterator[None]:
+    """Sets the queue priority of LLM calls made inside the block (high | normal | bulk)."""
+    if level not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority: {level}")
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    return _priority.get()
+
+
+def estimate_tokens(messages: Any) -> int:
+    """Prompt tokens at ~4 characters per token plus the expected completion."""
+    if isinstance(messages, str):
+        messages = [messages]
+    chars = sum(len(_content(message)) for message in messages)
+    return chars // 4 + settings.LLM_EXPECTED_COMPLETION_TOKENS
+
+
+def _content(message: Any) -> str:
+    if isinstance(message, dict):
+        return str(message.get("content", ""))
+    return str(getattr(message, "content", message))
+
+
+def provider_limits(provider: str) -> dict[str, int]:
+    """Per-minute limits for ``provider``; kinds with no limit configured are omitted."""
+    limits = {
+        "requests": int(getattr(settings, f"{provider.upper()}_REQUESTS_PER_MINUTE", 0) or 0),
+        "tokens": int(getattr(settings, f"{provider.upper()}_TOKENS_PER_MINUTE", 0) or 0),
+    }
+    return {kind: limit for kind, limit in limits.items() if limit > 0}
+
+
+class LocalBuckets:
+    """In-process token buckets; each refills its per-minute limit over 60 s."""
+
+    def __init__(self):
+        self._state: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+
+    async def take(self, provider: str, demand: dict[str, tuple[int, float]]) -> float:
+        """Takes every ``kind -> (limit, amount)`` or none; returns seconds to wait (0 = granted)."""
+        now = time.monotonic()
+        with self._lock:
+            waits = []
+            for kind, (limit, amount) in demand.items():
+                state = self._state.setdefault((provider, kind), [float(limit), now])
+                rate = limit / 60
+                state[0] = min(float(limit), state[0] + (now - state[1]) * rate)
+                state[1] = now
+                needed = min(amount, limit)
+                if state[0] < needed:
+                    waits.append((needed - state[0]) / rate)
+            if waits:
+                return max(waits)
+            for kind, (limit, amount) in demand.items():
+                self._state[(provider, kind)][0] -= min(amount, limit)
+            return 0.0
+
+    async def adjust(self, provider: str, kind: str, delta: float) -> None:
+        """Charges (positive) or refunds (negative) ``delta`` after the fact."""
+        with self._lock:
+            state = self._state.get((provider, kind))
+            if state is not None:
+                state[0] -= delta
+
+
+# KEYS: one hash per kind. ARGV: limit, amount pairs in the same order.
+_TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local wait = 0
+local levels = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[i * 2 - 1])
+    local amount = math.min(tonumber(ARGV[i * 2]), limit)
+    local rate = limit / 60
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or limit
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(limit, tokens + math.max(0, now - ts) * rate)
+    levels[i] = tokens
+    if tokens < amount then
+        wait = math.max(wait, (amount - tokens) / rate)
+    end
+end
+for i, key in ipairs(KEYS) do
+    local tokens = levels[i]
+    if wait == 0 then
+        tokens = tokens - math.min(tonumber(ARGV[i * 2]), tonumber(ARGV[i * 2 - 1]))
+    end
+    redis.call('HSET', key, 'tokens', tokens, 'ts', now)
+    redis.call('EXPIRE', key, 180)
+end
+return tostring(wait)
+"""
+
+
+class RedisBuckets:
+    """Token buckets shared by every worker through Redis hashes; atomic via one Lua script.
+
+    Falls back to in-process buckets if Redis cannot be reached.
+    """
+
+    def __init__(self, url: str | None = None, prefix: str = "llm:rate"):
+        import redis.asyncio as aioredis
+
+        self.client = aioredis.from_url(url or settings.REDIS_URL, decode_responses=True)
+        self.prefix = prefix
+        self._script = self.client.register_script(_TAKE_SCRIPT)
+        self._fallback = LocalBuckets()
+
+    async def take(self, provider: str, demand: dict[str, tuple[int, float]]) -> float:
+        keys = [f"{self.prefix}:{provider}:{kind}" for kind in demand]
+        args = [value for limit, amount in demand.values() for value in (limit, amount)]
+        try:
+            return float(await self._script(keys=keys, args=args))
+        except Exception as exc:
+            logger.warning(f"[RateGovernor] Redis bucket unavailable, using local bucket: {exc}")
+            return await self._fallback.take(provider, demand)
+
+    async def adjust(self, provider: str, kind: str, delta: float) -> None:
+        try:
+            await self.client.hincrbyfloat(f"{self.prefix}:{provider}:{kind}", "tokens", -delta)
+        except Exception as exc:
+            logger.warning(f"[RateGovernor] Redis bucket adjust failed: {exc}")
+            await self._fallback.adjust(provider, kind, delta)
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    sequence: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _Lane:
+    """Priority queue of callers waiting for one provider's buckets."""
+
+    def __init__(self):
+        self.heap: list[_Waiter] = []
+        self.pump: asyncio.Task | None = None
+
+
+class RateGovernor:
+    def __init__(self, buckets: LocalBuckets | RedisBuckets | None = None):
+        self.buckets = buckets or LocalBuckets()
+        self._lanes: dict[str, weakref.WeakKeyDictionary] = {}
+        self._sequence = itertools.count()
+        self._blocked_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    async def acquire(self, provider: str, tokens: int, *, priority: str | None = None) -> None:
+        """Waits until ``provider`` has room for one request of ``tokens`` tokens."""
+        limits = provider_limits(provider)
+        if not limits:
+            return
+        level = priority or current_priority()
+        started = time.monotonic()
+        lane = self._lane(provider)
+        waiter = _Waiter(PRIORITIES.get(level, PRIORITIES["normal"]), next(self._sequence), tokens, asyncio.get_running_loop().create_future())
+        heapq.heappush(lane.heap, waiter)
+        llm_rate_queue_depth.labels(provider=provider).set(len(lane.heap))
+        if lane.pump is None or lane.pump.done():
+            lane.pump = asyncio.ensure_future(self._pump(provider, lane))
+        try:
+            await waiter.future
+        finally:
+            # A cancelled caller leaves its entry behind; the pump discards it
+            waiter.future.cancel()
+            llm_rate_wait_seconds.labels(provider=provider, priority=level).observe(time.monotonic() - started)
+
+    def saturated(self, provider: str) -> bool:
+        """True while the head of ``provider``'s queue is waiting for its buckets to refill."""
+        return self._blocked_until.get(provider, 0.0) > time.monotonic()
+
+    async def settle(self, provider: str, estimated: int, actual: int | None) -> None:
+        """Corrects the token bucket with the usage the provider reported."""
+        if actual is None or "tokens" not in provider_limits(provider) or actual == estimated:
+            return
+        await self.buckets.adjust(provider, "tokens", actual - estimated)
+
+    def _lane(self, provider: str) -> _Lane:
+        # Futures and tasks belong to one event loop, so queues are per loop
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            lanes = self._lanes.setdefault(provider, weakref.WeakKeyDictionary())
+            if loop not in lanes:
+                lanes[loop] = _Lane()
+            return lanes[loop]
+
+    async def _pump(self, provider: str, lane: _Lane) -> None:
+        """Grants the head of the queue whenever the buckets allow; re-reads the head after every wait."""
+        while lane.heap:
+            try:
+                await self._serve_head(provider, lane)
+            except Exception as exc:
+                # The queued callers have nothing else to wake them, so the pump keeps going
+                logger.error(f"[RateGovernor] Pump for {provider} failed, retrying: {exc}")
+                await asyncio.sleep(settings.LLM_RATE_MAX_POLL_SECONDS)
+
+    async def _serve_head(self, provider: str, lane: _Lane) -> None:
+        head = lane.heap[0]
+        if head.future.done():
+            heapq.heappop(lane.heap)
+            llm_rate_queue_depth.labels(provider=provider).set(len(lane.heap))
+            return
+        limits = provider_limits(provider)
+        demand = {kind: (limit, 1 if kind == "requests" else head.tokens) for kind, limit in limits.items()}
+        wait = await self.buckets.take(provider, demand) if demand else 0.0
+        if wait > 0:
+            self._blocked_until[provider] = time.monotonic() + wait
+            await asyncio.sleep(min(wait, settings.LLM_RATE_MAX_POLL_SECONDS))
+            return
+        self._blocked_until.pop(provider, None)
+        # take() can yield, so the caller may have been cancelled and other callers queued ahead of it
+        if head.future.done():
+            for kind, (limit, amount) in demand.items():
+                await self.buckets.adjust(provider, kind, -min(amount, limit))
+        else:
+            head.future.set_result(None)
+        if lane.heap and lane.heap[0] is head:
+            heapq.heappop(lane.heap)
+        llm_rate_queue_depth.labels(provider=provider).set(len(lane.heap))
+
+_governor: RateGovernor | None = None
+
+
+def get_rate_governor() -> RateGovernor:
+    """Returns singleton RateGovernor."""
+    global _governor
+    if _governor is None:
+        buckets = RedisBuckets() if settings.LLM_RATE_LIMIT_BACKEND == "redis" else LocalBuckets()
+        _governor = RateGovernor(buckets)
+    return _governor
@@ -0,0 +1,272 @@
+"""
+llm_router/response_cache.py
+-----------------------------
+Exact-match response cache and request coalescing for chat models.
+- LLMResponseCache: in-process LRU tier in front of an optional Redis tier.
+- CachedChatModel: wraps a LangChain chat model returned by get_llm();
+  ainvoke() and with_structured_output(...).ainvoke() consult the cache.
+Concurrent identical prompts share one upstream call.
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from langchain_core.messages import AIMessage, BaseMessage
+from pydantic import BaseModel
+
+from config.settings import settings
+from observability.llm_telemetry import track_cache_lookup
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+_cache_instance: "LLMResponseCache | None" = None
+
+
+class LLMResponseCache:
+    """Two-tier cache of serialized LLM responses keyed by prompt fingerprint."""
+
+    def __init__(self, max_entries: int | None = None, ttl: int | None = None, redis_url: str | None = None):
+        self.max_entries = max_entries or settings.LLM_CACHE_MAX_ENTRIES
+        self.ttl = ttl or settings.LLM_CACHE_TTL
+        self.redis_url = redis_url
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+        self._connected = redis_url is None
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def _redis(self):
+        if not self._connected:
+            self._connected = True
+            try:
+                import redis.asyncio as aioredis
+
+                self._client = aioredis.from_url(self.redis_url, decode_responses=True)
+                await self._client.ping()
+                logger.info(f"[LLMResponseCache] Redis tier connected: {self.redis_url}")
+            except Exception as e:
+                logger.warning(f"[LLMResponseCache] Redis unavailable: {e}. Using in-process tier only.")
+                self._client = None
+        return self._client
+
+    async def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    return entry[0]
+                del self._entries[key]
+        client = await self._redis()
+        if client is None:
+            return None
+        try:
+            raw = await client.get(f"llm:{key}")
+        except Exception as e:
+            logger.warning(f"[LLMResponseCache] GET failed: {e}")
+            return None
+        if raw is None:
+            return None
+        payload = json.loads(raw)
+        self._remember(key, payload)
+        return payload
+
+    async def set(self, key: str, payload: dict) -> None:
+        self._remember(key, payload)
+        client = await self._redis()
+        if client is None:
+            return
+        try:
+            await client.set(f"llm:{key}", json.dumps(payload), ex=self.ttl)
+        except Exception as e:
+            logger.warning(f"[LLMResponseCache] SET failed: {e}")
+
+    async def get_or_fetch(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> tuple[dict, str]:
+        """Returns ``(payload, outcome)``; outcome is ``hit``, ``coalesced`` or ``miss``.
+
+        Callers arriving while the same key is being fetched await that fetch
+        instead of starting another upstream call.
+        """
+        payload = await self.get(key)
+        if payload is not None:
+            return payload, "hit"
+        task = self._inflight.get(key)
+        outcome = "coalesced"
+        if task is None:
+            outcome = "miss"
+            task = self._inflight[key] = asyncio.ensure_future(self._fill(key, fetch))
+            task.add_done_callback(lambda done: self._inflight.pop(key) if self._inflight.get(key) is done else None)
+        # Shielded so one cancelled waiter does not cancel the call for the others
+        return await asyncio.shield(task), outcome
+
+    async def _fill(self, key: str, fetch: Callable[[], Awaitable[dict]]) -> dict:
+        payload = await fetch()
+        if payload["kind"] != "raw":
+            await self.set(key, payload)
+        return payload
+
+    def _remember(self, key: str, payload: dict) -> None:
+        with self._lock:
+            self._entries[key] = (payload, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def get_llm_response_cache() -> LLMResponseCache:
+    """Returns singleton LLMResponseCache."""
+    global _cache_instance
+    if _cache_instance is None:
+        _cache_instance = LLMResponseCache(redis_url=settings.REDIS_URL if settings.LLM_CACHE_REDIS else None)
+    return _cache_instance
+
+
+class CachedChatModel:
+    """Chat model proxy that answers repeated prompts from LLMResponseCache.
+
+    Attributes other than ainvoke / with_structured_output are delegated to
+    the wrapped model, so callers can keep treating it as the LangChain client.
+    """
+
+    def __init__(
+        self,
+        runnable: Any,
+        *,
+        task: str,
+        provider: str,
+        model: str,
+        temperature: float,
+        cache: LLMResponseCache | None = None,
+        schema: Any = None,
+    ):
+        self.runnable = runnable
+        self.task = task
+        self.provider = provider
+        self.model = model
+        self.temperature = temperature
+        self.cache = cache or get_llm_response_cache()
+        self.schema = schema
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.runnable, name)
+
+    def with_structured_output(self, schema: Any, *args, **kwargs) -> Any:
+        structured = self.runnable.with_structured_output(schema, *args, **kwargs)
+        if kwargs.get("include_raw"):
+            return structured
+        return CachedChatModel(
+            structured,
+            task=self.task,
+            provider=self.provider,
+            model=self.model,
+            temperature=self.temperature,
+            cache=self.cache,
+            schema=schema,
+        )
+
+    async def ainvoke(self, messages: Any, *args, **kwargs) -> Any:
+        if args or kwargs:
+            # Per-call config (stop words, callbacks, tools) is not part of the key
+            return await self.runnable.ainvoke(messages, *args, **kwargs)
+
+        normalized = _normalize_messages(messages)
+        key = cache_key(normalized, provider=self.provider, model=self.model, temperature=self.temperature, schema=self.schema)
+
+        async def fetch() -> dict:
+            result = await self.runnable.ainvoke(messages)
+            return _serialize(result, normalized, self.schema)
+
+        payload, outcome = await self.cache.get_or_fetch(key, fetch)
+        track_cache_lookup(self.task, self.model, outcome, payload.get("tokens", 0) if outcome != "miss" else 0)
+        return _deserialize(payload, self.schema)
+
+
+def cache_key(messages: list[list[str]], *, provider: str, model: str, temperature: float, schema: Any = None) -> str:
+    body = json.dumps(
+        {
+            "provider": provider,
+            "model": model,
+            "temperature": temperature,
+            "schema": _schema_fingerprint(schema),
+            "messages": messages,
+        },
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+def _normalize_messages(messages: Any) -> list[list[str]]:
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    normalized = []
+    for message in messages:
+        if isinstance(message, BaseMessage):
+            role, content = message.type, message.content
+        elif isinstance(message, dict):
+            role, content = message.get("role", "user"), message.get("content", "")
+        elif isinstance(message, (tuple, list)) and len(message) == 2:
+            role, content = message
+        else:
+            role, content = "user", str(message)
+        if not isinstance(content, str):
+            content = json.dumps(content, sort_keys=True, ensure_ascii=False)
+        normalized.append([_ROLE_ALIASES.get(role, role), " ".join(content.split())])
+    return normalized
+
+
+_ROLE_ALIASES = {"human": "user", "ai": "assistant"}
+
+
+def _schema_fingerprint(schema: Any) -> str:
+    if schema is None:
+        return ""
+    if isinstance(schema, type) and issubclass(schema, BaseModel):
+        return f"{schema.__name__}:{json.dumps(schema.model_json_schema(), sort_keys=True)}"
+    if isinstance(schema, dict):
+        return json.dumps(schema, sort_keys=True)
+    return getattr(schema, "__qualname__", repr(schema))
+
+
+def _estimate_tokens(normalized: list[list[str]], output: str) -> int:
+    # ~4 characters per token, used when the provider reports no usage
+    return (sum(len(content) for _role, content in normalized) + len(output)) // 4
+
+
+def _serialize(result: Any, normalized: list[list[str]], schema: Any) -> dict:
+    if isinstance(result, AIMessage):
+        usage = result.usage_metadata or {}
+        tokens = usage.get("total_tokens") or _estimate_tokens(normalized, str(result.content))
+        return {"kind": "message", "content": result.content, "usage": dict(usage) or None, "tokens": tokens}
+    if isinstance(result, BaseModel) and type(result) is schema:
+        data = result.model_dump(mode="json")
+        return {"kind": "model", "data": data, "tokens": _estimate_tokens(normalized, json.dumps(data))}
+    if isinstance(result, dict):
+        try:
+            encoded = json.dumps(result)
+        except (TypeError, ValueError):
+            return {"kind": "raw", "value": result}
+        return {"kind": "json", "data": json.loads(encoded), "tokens": _estimate_tokens(normalized, encoded)}
+    # Not serializable: shared with coalesced callers but never stored
+    return {"kind": "raw", "value": result}
+
+
+def _deserialize(payload: dict, schema: Any) -> Any:
+    kind = payload["kind"]
+    if kind == "message":
+        return AIMessage(content=payload["content"], usage_metadata=payload.get("usage"))
+    if kind == "model":
+        return schema.model_validate(payload["data"])
+    if kind == "json":
+        return json.loads(json.dumps(payload["data"]))
+    return payload["value"]
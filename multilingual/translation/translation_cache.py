@@ -38,3 +38,35 @@ class TranslationCache:
             await cache.set(key, translated, ttl=86400)
         except Exception:
             pass
+
+    async def get_many(self, items: list[tuple[str, str, str]]) -> dict[tuple[str, str, str], str]:
+        """Resolves ``(text, source, target)`` items from memory, then one Redis MGET for the rest."""
+        found: dict[tuple[str, str, str], str] = {}
+        missing: dict[str, tuple[str, str, str]] = {}
+        for item in items:
+            key = self.key(*item)
+            if key in self._memory:
+                found[item] = self._memory[key]
+            else:
+                missing[key] = item
+        if not missing:
+            return found
+        try:
+            cache = await get_semantic_cache()
+            values = await cache.mget(list(missing))
+        except Exception:
+            return found
+        for key, value in zip(missing, values):
+            if value:
+                self._memory[key] = value
+                found[missing[key]] = value
+        return found
+
+    async def set_many(self, translations: dict[tuple[str, str, str], str]) -> None:
+        payload = {self.key(*item): translated for item, translated in translations.items()}
+        self._memory.update(payload)
+        try:
+            cache = await get_semantic_cache()
+            await cache.mset(payload, ttl=86400)
+        except Exception:
+            pass
@@ -28,3 +28,40 @@ class TranslationMemory:
             sort=[("created_at", -1)],
         )
         return doc.get("translated_text") if doc else None
+
+    async def lookup_many(self, db: Any, source_texts: list[str], source_language: str, target_languages: list[str]) -> dict[tuple[str, str], str]:
+        """Returns the latest remembered translation per ``(source_text, target_language)`` in one query."""
+        if db is None or not source_texts or not target_languages:
+            return {}
+        cursor = db["translation_memory"].find(
+            {
+                "source_text": {"$in": source_texts},
+                "source_language": source_language,
+                "target_language": {"$in": target_languages},
+            },
+            {"source_text": 1, "target_language": 1, "translated_text": 1},
+            sort=[("created_at", -1)],
+        )
+        remembered: dict[tuple[str, str], str] = {}
+        async for doc in cursor:
+            remembered.setdefault((doc["source_text"], doc["target_language"]), doc.get("translated_text"))
+        return {key: value for key, value in remembered.items() if value}
+
+    async def remember_many(self, db: Any, entries: list[dict]) -> dict:
+        """Stores ``remember``-shaped entries with a single ``insert_many``."""
+        if db is None or not entries:
+            return {"stored": False}
+        created_at = datetime.now(timezone.utc)
+        docs = [
+            {
+                "source_text": entry["source_text"],
+                "translated_text": entry["translated_text"],
+                "source_language": entry["source_language"],
+                "target_language": entry["target_language"],
+                "metadata": entry.get("metadata") or {},
+                "created_at": created_at,
+            }
+            for entry in entries
+        ]
+        await db["translation_memory"].insert_many(docs, ordered=False)
+        return {"stored": True}
@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import time
 from typing import Any
 
+from config.settings import settings
 from multilingual.detection.language_detector import LanguageDetector
 from multilingual.translation.gemini_translator import GeminiTranslator
 from multilingual.translation.indictrans_adapter import IndicTransAdapter
 from multilingual.translation.translation_cache import TranslationCache
 from multilingual.translation.translation_memory import TranslationMemory
 
+_router: TranslatorRouter | None = None
+
 
 class TranslatorRouter:
     def __init__(self):
@@ -18,37 +22,99 @@ class TranslatorRouter:
         self.cache = TranslationCache()
         self.memory = TranslationMemory()
         self.providers = [IndicTransAdapter(), GeminiTranslator()]
+        self._limits = [asyncio.Semaphore(settings.TRANSLATION_PROVIDER_CONCURRENCY) for _provider in self.providers]
 
     async def translate(self, text: str, target_language: str = "en", source_language: str | None = None, db: Any = None) -> dict:
+        results = await self.translate_many([text], [target_language], source_language=source_language, db=db)
+        return results[0][0]
+
+    async def translate_many(
+        self,
+        texts: list[str],
+        targets: list[str],
+        source_language: str | None = None,
+        db: Any = None,
+    ) -> list[list[dict]]:
+        """Translates every text into every target; returns one result list (in ``targets`` order) per text.
+
+        Each distinct text is detected once. Translation memory is consulted with
+        one ``$in`` query per source language and the cache with one Redis MGET;
+        remaining misses go to the providers concurrently, bounded per provider,
+        and are written back in bulk.
+        """
         started = time.perf_counter()
-        detection = self.detector.detect(text)
-        source = source_language or detection.language
-        if source == target_language:
-            return {
-                "source_language": source,
-                "target_language": target_language,
-                "translated_text": text,
-                "provider": "identity",
-                "cache_hit": False,
-                "latency_ms": 0.0,
-                "confidence": detection.confidence,
-            }
-        remembered = await self.memory.lookup(db, text, source, target_language)
-        if remembered:
-            return self._result(source, target_language, remembered, "translation_memory", True, started, detection.confidence)
-        cached = await self.cache.get(text, source, target_language)
-        if cached:
-            return self._result(source, target_language, cached, "redis_cache", True, started, detection.confidence)
+        detections = {text: self.detector.detect(text) for text in dict.fromkeys(texts)}
+        sources = {text: source_language or detection.language for text, detection in detections.items()}
+        pending = list(dict.fromkeys((text, sources[text], target) for text in detections for target in targets if sources[text] != target))
+
+        resolved: dict[tuple[str, str, str], tuple[str, str, bool]] = {}
+        by_source: dict[str, list[str]] = {}
+        for text, source, _target in pending:
+            by_source.setdefault(source, []).append(text)
+        for source, source_texts in by_source.items():
+            remembered = await self.memory.lookup_many(db, list(dict.fromkeys(source_texts)), source, list(targets))
+            for (text, target), translated in remembered.items():
+                resolved[(text, source, target)] = (translated, "translation_memory", True)
+
+        cached = await self.cache.get_many([item for item in pending if item not in resolved])
+        for item, translated in cached.items():
+            resolved[item] = (translated, "redis_cache", True)
+
+        misses = [item for item in pending if item not in resolved]
+        if misses:
+            translated_misses = await asyncio.gather(*(self._dispatch(*item) for item in misses))
+            fresh = dict(zip(misses, translated_misses))
+            await self.cache.set_many({item: translated for item, (translated, _provider) in fresh.items()})
+            await self.memory.remember_many(
+                db,
+                [
+                    {
+                        "source_text": text,
+                        "translated_text": translated,
+                        "source_language": source,
+                        "target_language": target,
+                        "metadata": {"provider": provider},
+                    }
+                    for (text, source, target), (translated, provider) in fresh.items()
+                ],
+            )
+            for item, (translated, provider) in fresh.items():
+                resolved[item] = (translated, provider, False)
+
+        results: list[list[dict]] = []
+        for text in texts:
+            source, confidence = sources[text], detections[text].confidence
+            row = []
+            for target in targets:
+                if source == target:
+                    row.append(self._identity(text, source, target, confidence))
+                else:
+                    translated, provider, cache_hit = resolved[(text, source, target)]
+                    row.append(self._result(source, target, translated, provider, cache_hit, started, confidence))
+            results.append(row)
+        return results
+
+    async def _dispatch(self, text: str, source: str, target: str) -> tuple[str, str]:
         translated = text
         provider_name = "fallback"
-        for provider in self.providers:
-            translated = await provider.translate(text, source, target_language)
+        for provider, limit in zip(self.providers, self._limits):
+            async with limit:
+                translated = await provider.translate(text, source, target)
             provider_name = provider.__class__.__name__
             if translated and translated != text:
                 break
-        await self.cache.set(text, source, target_language, translated)
-        await self.memory.remember(db, text, translated, source, target_language, {"provider": provider_name})
-        return self._result(source, target_language, translated, provider_name, False, started, detection.confidence)
+        return translated, provider_name
+
+    def _identity(self, text: str, source: str, target: str, confidence: float) -> dict:
+        return {
+            "source_language": source,
+            "target_language": target,
+            "translated_text": text,
+            "provider": "identity",
+            "cache_hit": False,
+            "latency_ms": 0.0,
+            "confidence": confidence,
+        }
 
     def _result(self, source: str, target: str, translated: str, provider: str, cache_hit: bool, started: float, confidence: float) -> dict:
         return {
@@ -60,3 +126,11 @@ class TranslatorRouter:
             "latency_ms": round((time.perf_counter() - started) * 1000, 2),
             "confidence": confidence,
         }
+
+
+def get_translator_router() -> TranslatorRouter:
+    """Returns the shared router so its in-process cache and provider limits span requests."""
+    global _router
+    if _router is None:
+        _router = TranslatorRouter()
+    return _router
@@ -25,8 +25,8 @@ class TelemetryJsonFormatter(jsonlogger.JsonFormatter):
         # 2. Map standard Python logging levels to our taxonomy
         log_record["level"] = record.levelname
         
-        # 3. Inject ContextVars
-        ctx = get_context_dict()
+        # 3. Inject ContextVars (captured on the emitting thread when the record was queued)
+        ctx = log_record.pop("log_context", None) or get_context_dict()
         for key, value in ctx.items():
             if value:  # Only inject if populated
                 log_record[key] = value
@@ -4,7 +4,12 @@ observability/llm_telemetry.py
 Utilities to track LLM costs and usage during execution.
 """
 
-from observability.metrics import rti_estimated_cost_usd, rti_token_usage_total
+from observability.metrics import (
+    llm_cache_lookups_total,
+    llm_cache_tokens_saved_total,
+    rti_estimated_cost_usd,
+    rti_token_usage_total,
+)
 from observability.telemetry import telemetry
 from observability.telemetry_models import Outcome, LogLevel
 
@@ -65,3 +70,27 @@ def track_llm_call(
     )
     
     return cost
+
+
+def track_cache_lookup(task: str, model_name: str, outcome: str, tokens_saved: int = 0):
+    """Counts an LLM response cache lookup and the tokens a hit avoided spending."""
+    llm_cache_lookups_total.labels(task=task, outcome=outcome).inc()
+    if tokens_saved:
+        llm_cache_tokens_saved_total.labels(model=model_name).inc(tokens_saved)
+
+
+def cache_stats() -> dict:
+    """Hit rate and tokens saved so far, aggregated from the Prometheus counters."""
+    lookups = {"hit": 0.0, "coalesced": 0.0, "miss": 0.0}
+    for sample in llm_cache_lookups_total.collect()[0].samples:
+        if sample.name.endswith("_total"):
+            lookups[sample.labels["outcome"]] = lookups.get(sample.labels["outcome"], 0.0) + sample.value
+    tokens_saved = sum(
+        sample.value for sample in llm_cache_tokens_saved_total.collect()[0].samples if sample.name.endswith("_total")
+    )
+    total = sum(lookups.values())
+    return {
+        **{outcome: int(count) for outcome, count in lookups.items()},
+        "hit_rate": (lookups["hit"] + lookups["coalesced"]) / total if total else 0.0,
+        "tokens_saved": int(tokens_saved),
+    }
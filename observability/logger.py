@@ -4,16 +4,29 @@ observability/logger.py
 Configures standard logging handlers with TimedRotatingFileHandler.
 Sets up multiple streams: app, error, security, etc.
 Replaces the old structured_logger.py.
+With LOG_ASYNC (default) loggers only enqueue records:
+- the emitting thread captures context vars and the message, nothing else
+- LogWriter, a background thread, applies PII redaction and JSON formatting
+  once per record and appends the line to every stream it is routed to
+- each stream gets one write + flush per batch
+- a full queue drops the record and counts it in rti_log_records_dropped_total
 """
 
+import atexit
 import os
 import sys
+import queue
 import logging
-from logging.handlers import TimedRotatingFileHandler
+import threading
+from logging.handlers import BaseRotatingHandler, QueueHandler, TimedRotatingFileHandler
+from typing import Mapping, Optional
+from config.settings import settings
+from observability.context import get_context_dict
 from observability.json_formatter import TelemetryJsonFormatter
 from observability.log_sampling import should_sample
+from observability.metrics import rti_log_queue_depth, rti_log_records_dropped_total
 
-LOGS_DIR = "logs"
+LOGS_DIR = settings.LOG_DIR
 os.makedirs(LOGS_DIR, exist_ok=True)
 
 class SamplingFilter(logging.Filter):
@@ -26,12 +39,11 @@ class SamplingFilter(logging.Filter):
 def _create_handler(filename: str, level: int = logging.INFO) -> logging.FileHandler:
     """Creates a file handler. Uses rotation on Linux, but flat files on Windows to avoid WinError 32 lock conflicts."""
     filepath = os.path.join(LOGS_DIR, filename)
-    
+
     if os.name == "nt":
         # Windows multi-process (uvicorn reload) locks prevent TimedRotatingFileHandler from rotating.
         handler = logging.FileHandler(filename=filepath, encoding="utf-8")
     else:
-        from logging.handlers import TimedRotatingFileHandler
         handler = TimedRotatingFileHandler(
             filename=filepath,
             when="midnight",
@@ -39,9 +51,9 @@ def _create_handler(filename: str, level: int = logging.INFO) -> logging.FileHan
             backupCount=14,
             encoding="utf-8"
         )
-        
+
     handler.setLevel(level)
-    
+
     fmt = TelemetryJsonFormatter(
         fmt="%(asctime)s %(levelname)s %(name)s %(message)s"
     )
@@ -60,6 +72,178 @@ def _create_console_handler(level: int = logging.INFO) -> logging.StreamHandler:
     return handler
 
 
+# ── Queued pipeline ───────────────────────────────────────────────
+
+class LogWriter:
+    """Background thread that formats queued records once and batches writes per stream.
+
+    ``streams`` pre-binds stream names to handlers; names not given there open
+    the console or a file under logs/ on first use.
+    """
+
+    def __init__(
+        self,
+        maxsize: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        streams: Optional[Mapping[str, logging.StreamHandler]] = None,
+    ):
+        self.queue: queue.Queue = queue.Queue(maxsize=maxsize or settings.LOG_QUEUE_SIZE)
+        self.batch_size = batch_size or settings.LOG_BATCH_SIZE
+        self.formatter = TelemetryJsonFormatter(fmt="%(asctime)s %(levelname)s %(name)s %(message)s")
+        self.dropped = 0
+        self._reported_dropped = 0
+        self._streams: dict[str, logging.StreamHandler] = dict(streams or {})
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def stream(self, name: str) -> logging.StreamHandler:
+        """Shared handler behind a stream name ("console" or a file under logs/); its filters are not used."""
+        with self._lock:
+            if name not in self._streams:
+                self._streams[name] = _create_console_handler() if name == "console" else _create_handler(name)
+            return self._streams[name]
+
+    def handlers(self) -> list[logging.StreamHandler]:
+        """Handlers of every stream opened so far."""
+        with self._lock:
+            return list(self._streams.values())
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Writes everything already queued, then stops the thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(None)
+        thread.join(timeout)
+        self._thread = None
+
+    def drop(self, record: logging.LogRecord) -> None:
+        self.dropped += 1
+        rti_log_records_dropped_total.labels(level=record.levelname).inc()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Blocks until every record queued before the call has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return False
+        written = threading.Event()
+        self.queue.put(written)
+        return written.wait(timeout)
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while batch[-1] is not None and len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write([item for item in batch if isinstance(item, tuple)])
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if self.dropped != self._reported_dropped:
+                self._report_overflow()
+            rti_log_queue_depth.set(self.queue.qsize())
+            if batch[-1] is None:
+                return
+
+    def _report_overflow(self) -> None:
+        dropped, self._reported_dropped = self.dropped - self._reported_dropped, self.dropped
+        record = logging.makeLogRecord({
+            "name": "observability.logger",
+            "levelno": logging.WARNING,
+            "levelname": "WARNING",
+            "msg": f"[LogWriter] queue full, dropped {dropped} log records",
+            "event": "log_queue_overflow",
+            "dropped_records": dropped,
+        })
+        self._write([((("console", logging.WARNING), ("app.log", logging.WARNING)), record)])
+
+    def _write(self, batch: list[tuple[tuple[tuple[str, int], ...], logging.LogRecord]]) -> None:
+        pending: dict[str, list[str]] = {}
+        last: dict[str, logging.LogRecord] = {}
+        for routes, record in batch:
+            try:
+                line = self.formatter.format(record) + "\n"
+            except Exception:
+                self.stream("console").handleError(record)
+                continue
+            for name, level in routes:
+                if record.levelno >= level:
+                    pending.setdefault(name, []).append(line)
+                    last[name] = record
+        for name, lines in pending.items():
+            handler = self.stream(name)
+            handler.acquire()
+            try:
+                if isinstance(handler, BaseRotatingHandler) and handler.shouldRollover(last[name]):
+                    handler.doRollover()
+                handler.stream.write("".join(lines))
+                handler.flush()
+            except Exception:
+                handler.handleError(last[name])
+            finally:
+                handler.release()
+
+
+class QueuedLogHandler(QueueHandler):
+    """Enqueues a record for LogWriter together with the streams it is routed to."""
+
+    def __init__(self, writer: LogWriter, routes: list[tuple[str, int]]):
+        super().__init__(writer.queue)
+        self.writer = writer
+        self.routes = tuple(routes)
+        for name, _level in routes:
+            writer.stream(name)
+        # Sampled once per record instead of once per stream
+        self.addFilter(SamplingFilter())
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Context vars and message arguments are only valid on the emitting thread
+        record.msg = record.getMessage()
+        record.args = None
+        record.log_context = get_context_dict()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait((self.routes, record))
+        except queue.Full:
+            self.writer.drop(record)
+
+
+_writer: Optional[LogWriter] = None
+
+
+def get_log_writer() -> LogWriter:
+    global _writer
+    if _writer is None:
+        _writer = LogWriter()
+        _writer.start()
+        atexit.register(_writer.stop)
+    return _writer
+
+
+def flush_logs(timeout: float = 5.0) -> None:
+    """Waits for queued records to reach their streams; called on API shutdown."""
+    if _writer is not None:
+        _writer.flush(timeout)
+
+
+def _attach(logger: logging.Logger, routes: list[tuple[str, int]]) -> None:
+    if settings.LOG_ASYNC:
+        logger.addHandler(QueuedLogHandler(get_log_writer(), routes))
+        return
+    for name, level in routes:
+        logger.addHandler(_create_console_handler(level) if name == "console" else _create_handler(name, level))
+
+
 _loggers: dict[str, logging.Logger] = {}
 
 def get_logger(name: str) -> logging.Logger:
@@ -74,13 +258,8 @@ def get_logger(name: str) -> logging.Logger:
     logger.setLevel(logging.DEBUG)  # Let handlers decide
 
     if not logger.handlers:
-        logger.addHandler(_create_console_handler(logging.INFO))
-        logger.addHandler(_create_handler("app.log", logging.INFO))
-        
-        # Dedicated error stream
-        err_handler = _create_handler("error.log", logging.ERROR)
-        logger.addHandler(err_handler)
-        
+        # Console + app.log, plus a dedicated error stream
+        _attach(logger, [("console", logging.INFO), ("app.log", logging.INFO), ("error.log", logging.ERROR)])
         logger.propagate = False
 
     _loggers[name] = logger
@@ -90,18 +269,17 @@ def get_logger(name: str) -> logging.Logger:
 security_logger = logging.getLogger("security")
 security_logger.setLevel(logging.INFO)
 if not security_logger.handlers:
-    security_logger.addHandler(_create_console_handler(logging.INFO))
-    security_logger.addHandler(_create_handler("security.log", logging.INFO))
+    _attach(security_logger, [("console", logging.INFO), ("security.log", logging.INFO)])
     security_logger.propagate = False
 
 audit_logger = logging.getLogger("audit")
 audit_logger.setLevel(logging.INFO)
 if not audit_logger.handlers:
-    audit_logger.addHandler(_create_handler("audit.log", logging.INFO))
+    _attach(audit_logger, [("audit.log", logging.INFO)])
     audit_logger.propagate = False
-    
+
 retrieval_logger = logging.getLogger("retrieval")
 retrieval_logger.setLevel(logging.INFO)
 if not retrieval_logger.handlers:
-    retrieval_logger.addHandler(_create_handler("retrieval.log", logging.INFO))
+    _attach(retrieval_logger, [("retrieval.log", logging.INFO)])
     retrieval_logger.propagate = False
@@ -84,6 +84,18 @@ cache_hit_rate = Counter(
     ["cache"],
 )
 
+semantic_cache_lookups_total = Counter(
+    "semantic_cache_lookups_total",
+    "Similarity-keyed retrieval cache lookups by outcome",
+    ["outcome"],  # labels: hit | near_hit | miss
+)
+
+semantic_cache_similarity = Histogram(
+    "semantic_cache_similarity",
+    "Best cosine similarity found by semantic cache lookups",
+    buckets=[0.5, 0.7, 0.8, 0.85, 0.9, 0.92, 0.95, 0.98, 1.0],
+)
+
 tool_executions_total = Counter(
     "tool_executions_total",
     "Tool executions by tool and status",
@@ -136,6 +148,50 @@ rti_token_usage_total = Counter(
     ["model"],  # labels: groq | gemini | openai
 )
 
+llm_cache_lookups_total = Counter(
+    "llm_cache_lookups_total",
+    "LLM response cache lookups",
+    ["task", "outcome"],  # outcome: hit | coalesced | miss
+)
+
+llm_rate_queue_depth = Gauge(
+    "llm_rate_queue_depth",
+    "LLM calls waiting for a provider's rate limit",
+    ["provider"],
+)
+
+llm_rate_wait_seconds = Histogram(
+    "llm_rate_wait_seconds",
+    "Time LLM calls waited for a provider's rate limit",
+    ["provider", "priority"],
+    buckets=[0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0],
+)
+
+llm_cache_tokens_saved_total = Counter(
+    "llm_cache_tokens_saved_total",
+    "LLM tokens not spent because a response was served from cache or coalesced",
+    ["model"],
+)
+
+# ── Graph Checkpointer ────────────────────────────────────────────
+rti_checkpoint_write_seconds = Histogram(
+    "rti_checkpoint_write_seconds",
+    "Checkpointer write latency from enqueue to commit",
+    ["op"],  # op: put | put_writes | delete | compact
+    buckets=[0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0],
+)
+
+rti_checkpoint_batch_size = Histogram(
+    "rti_checkpoint_batch_size",
+    "Checkpointer writes committed per transaction",
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128],
+)
+
+rti_checkpoint_db_bytes = Gauge(
+    "rti_checkpoint_db_bytes",
+    "Size of the SQLite checkpoint database including its WAL",
+)
+
 # ── Active Requests ───────────────────────────────────────────────
 rti_active_requests = Gauge(
     "rti_active_requests",
@@ -228,3 +284,15 @@ rti_security_events_total = Counter(
     ["classification"],
 )
 
+
+# ── Logging Pipeline ──────────────────────────────────────────────
+rti_log_records_dropped_total = Counter(
+    "rti_log_records_dropped_total",
+    "Log records dropped because the logging queue was full",
+    ["level"],
+)
+
+rti_log_queue_depth = Gauge(
+    "rti_log_queue_depth",
+    "Log records waiting for the background log writer",
+)
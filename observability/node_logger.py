@@ -2,57 +2,162 @@
 observability/node_logger.py
 -----------------------------
 Provides the @trace_node decorator to automatically log LangGraph node execution.
+Instrumentation tiers (NODE_TRACE_MODE):
+- light (default): monotonic timer and changed keys by identity against the
+  input state, one log record per node. No state copies, no hashing.
+- sampled: light, plus the full state diff and hash for a
+  NODE_TRACE_SAMPLE_RATE share of node runs and for every failure.
+- full: state copies, started/completed/state-updated records and a
+  SHA-256 state hash on every node.
+Independently of the tier, NodeTraceRecorder keeps the latest node records
+of each request in a ring buffer and logs them only when the request fails
+or is slow.
 """
 
+import random
+import threading
 import time
+from collections import OrderedDict, deque
 from functools import wraps
-from typing import Callable, Any
+from typing import Callable, Any, Optional
+from config.settings import settings
+from observability.context import request_id_var
 from observability.telemetry import telemetry
-from observability.telemetry_models import Outcome
+from observability.telemetry_models import LogLevel, Outcome
 from observability.graph_tracer import compress_state
 
+_MISSING = object()
+
+
+class NodeTraceRecorder:
+    """Bounded per-request ring buffers of node records, dumped only for failed or slow runs."""
+
+    def __init__(self, ring_size: Optional[int] = None, max_requests: Optional[int] = None):
+        self.ring_size = ring_size or settings.NODE_TRACE_RING_SIZE
+        self.max_requests = max_requests or settings.NODE_TRACE_MAX_REQUESTS
+        self._traces: OrderedDict[str, deque] = OrderedDict()
+        self._failed: set[str] = set()
+        self._lock = threading.Lock()
+
+    def record(self, request_id: str, node: str, latency_ms: float, changed_keys: list[str], outcome: Outcome, error: Optional[str] = None) -> None:
+        if not request_id:
+            return
+        entry = {"node": node, "latency_ms": round(latency_ms, 2), "changed_keys": changed_keys, "outcome": outcome.value}
+        if error:
+            entry["error"] = error
+        with self._lock:
+            ring = self._traces.get(request_id)
+            if ring is None:
+                ring = self._traces[request_id] = deque(maxlen=self.ring_size)
+                if len(self._traces) > self.max_requests:
+                    evicted, _ring = self._traces.popitem(last=False)
+                    self._failed.discard(evicted)
+            ring.append(entry)
+            if outcome == Outcome.FAILURE:
+                self._failed.add(request_id)
+
+    def finish(self, request_id: str, execution_time_ms: float, failed: bool = False) -> Optional[list[dict]]:
+        """Drops the request's records, logging them first if the run failed or was slow."""
+        with self._lock:
+            ring = self._traces.pop(request_id, None)
+            failed = failed or request_id in self._failed
+            self._failed.discard(request_id)
+        if not ring or not (failed or execution_time_ms >= settings.NODE_TRACE_SLOW_REQUEST_MS):
+            return None
+        trace = list(ring)
+        telemetry.log_graph_event(
+            event="node_trace_dump",
+            operation="graph_execution",
+            outcome=Outcome.FAILURE if failed else Outcome.SUCCESS,
+            execution_time_ms=execution_time_ms,
+            node_trace=trace,
+            level=LogLevel.WARNING,
+        )
+        return trace
+
+
+_recorder: Optional[NodeTraceRecorder] = None
+
+
+def get_node_trace_recorder() -> NodeTraceRecorder:
+    global _recorder
+    if _recorder is None:
+        _recorder = NodeTraceRecorder()
+    return _recorder
+
+
+def _get_state_dict(state: Any) -> dict:
+    return state.copy() if isinstance(state, dict) else (
+        state.dict() if hasattr(state, "dict") else {}
+    )
+
+
+def _request_id(state: Any) -> str:
+    request_id = state.get("request_id") if isinstance(state, dict) else getattr(state, "request_id", None)
+    return request_id or request_id_var.get()
+
+
+def _changed_keys(state: Any, result: Any) -> list[str]:
+    """Keys of the node's update that are not the very object already in the state."""
+    if not isinstance(result, dict):
+        return []
+    if not isinstance(state, dict):
+        return list(result)
+    return [key for key, value in result.items() if state.get(key, _MISSING) is not value]
+
+
 def trace_node(node_name: str):
     """
     Decorator for LangGraph nodes.
-    Logs entry, exit, execution time, and state changes (compressed).
+    Logs execution time and changed state keys; how much more depends on NODE_TRACE_MODE.
     """
     def decorator(func: Callable):
-        def _get_state_dict(state: Any):
-            return state.copy() if isinstance(state, dict) else (
-                state.dict() if hasattr(state, "dict") else {}
-            )
+        def _handle_start(state: Any):
+            mode = settings.NODE_TRACE_MODE
+            old_state_dict = None
+            if mode == "full":
+                old_state_dict = _get_state_dict(state)
+                telemetry.log_node_event(
+                    node_name=node_name,
+                    event=f"{node_name}_started",
+                    operation="node_execution",
+                )
+            return mode, old_state_dict, time.perf_counter()
+
+        def _handle_result(state, mode, old_state_dict, start_time, result):
+            latency_ms = (time.perf_counter() - start_time) * 1000
+
+            state_hash = None
+            if mode == "full" or (mode == "sampled" and random.random() < settings.NODE_TRACE_SAMPLE_RATE):
+                # LangGraph nodes return just their updates; diff those against the input state
+                changed_keys, state_hash = compress_state(
+                    old_state_dict if old_state_dict is not None else _get_state_dict(state),
+                    _get_state_dict(result),
+                )
+            else:
+                changed_keys = _changed_keys(state, result)
 
-        def _handle_result(start_time, old_state_dict, result):
-            latency_ms = (time.time() - start_time) * 1000
-            
-            # Compress state changes
-            new_state_dict = result.copy() if isinstance(result, dict) else (
-                result.dict() if hasattr(result, "dict") else {}
-            )
-            
-            # LangGraph nodes often return just the updates to the state
-            # If they return a partial dict, we compute diff against what they returned
-            changed_keys, state_hash = compress_state(old_state_dict, new_state_dict)
-            
             telemetry.log_node_event(
                 node_name=node_name,
                 event=f"{node_name}_completed",
                 operation="node_execution",
                 outcome=Outcome.SUCCESS,
-                execution_time_ms=latency_ms
-            )
-            
-            # Also log the state diff to graph tracer context
-            telemetry.log_graph_event(
-                event=f"{node_name}_state_updated",
-                operation="state_transition",
-                state_hash=state_hash,
-                changed_keys=changed_keys
+                execution_time_ms=latency_ms,
+                changed_keys=changed_keys,
             )
+            if state_hash is not None:
+                telemetry.log_graph_event(
+                    event=f"{node_name}_state_updated",
+                    operation="state_transition",
+                    state_hash=state_hash,
+                    changed_keys=changed_keys
+                )
+            if settings.NODE_TRACE_RECORDER:
+                get_node_trace_recorder().record(_request_id(state), node_name, latency_ms, changed_keys, Outcome.SUCCESS)
             return result
 
-        def _handle_error(start_time, e):
-            latency_ms = (time.time() - start_time) * 1000
+        def _handle_error(state, mode, start_time, e):
+            latency_ms = (time.perf_counter() - start_time) * 1000
             telemetry.log_node_event(
                 node_name=node_name,
                 event=f"{node_name}_failed",
@@ -60,42 +165,37 @@ def trace_node(node_name: str):
                 outcome=Outcome.FAILURE,
                 execution_time_ms=latency_ms
             )
+            if mode != "light":
+                _keys, state_hash = compress_state({}, _get_state_dict(state))
+                telemetry.log_graph_event(
+                    event=f"{node_name}_failed_state",
+                    operation="state_transition",
+                    outcome=Outcome.FAILURE,
+                    state_hash=state_hash,
+                )
             telemetry.log_error(e, operation=f"node_{node_name}")
-            raise e
+            if settings.NODE_TRACE_RECORDER:
+                get_node_trace_recorder().record(_request_id(state), node_name, latency_ms, [], Outcome.FAILURE, error=f"{type(e).__name__}: {e}")
 
         @wraps(func)
         async def async_wrapper(state: Any, *args, **kwargs):
-            start_time = time.time()
-            old_state_dict = _get_state_dict(state)
-            
-            telemetry.log_node_event(
-                node_name=node_name,
-                event=f"{node_name}_started",
-                operation="node_execution",
-            )
-            
+            mode, old_state_dict, start_time = _handle_start(state)
             try:
                 res = await func(state, *args, **kwargs)
-                return _handle_result(start_time, old_state_dict, res)
             except Exception as e:
-                _handle_error(start_time, e)
-            
+                _handle_error(state, mode, start_time, e)
+                raise
+            return _handle_result(state, mode, old_state_dict, start_time, res)
+
         @wraps(func)
         def sync_wrapper(state: Any, *args, **kwargs):
-            start_time = time.time()
-            old_state_dict = _get_state_dict(state)
-            
-            telemetry.log_node_event(
-                node_name=node_name,
-                event=f"{node_name}_started",
-                operation="node_execution",
-            )
-            
+            mode, old_state_dict, start_time = _handle_start(state)
             try:
                 res = func(state, *args, **kwargs)
-                return _handle_result(start_time, old_state_dict, res)
             except Exception as e:
-                _handle_error(start_time, e)
+                _handle_error(state, mode, start_time, e)
+                raise
+            return _handle_result(state, mode, old_state_dict, start_time, res)
 
         import asyncio
         if asyncio.iscoroutinefunction(func):
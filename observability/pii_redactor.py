@@ -3,37 +3,34 @@ observability/pii_redactor.py
 ------------------------------
 Middleware logic to detect and redact Personally Identifiable Information (PII)
 such as emails, phone numbers, Aadhaar, and PAN cards before logs are written.
+Patterns live in security/pii_engine.py, shared with the PII masker.
 """
 
-import re
-from typing import Any, Dict, Union
-
-# ── PII Patterns ──────────────────────────────────────────────────
-# Note: These are heuristic patterns for log redaction.
-PII_PATTERNS = {
-    "EMAIL": re.compile(r'[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+'),
-    "PHONE": re.compile(r'(?:\+91|0)?[ -]?[6-9]\d{9}'),
-    "AADHAAR": re.compile(r'\b\d{4}[ -]?\d{4}[ -]?\d{4}\b'),
-    "PAN": re.compile(r'\b[A-Z]{5}[0-9]{4}[A-Z]{1}\b')
-}
+from typing import Any, Dict
+from security.pii_engine import redact_text
 
 REDACTION_STRING = "[REDACTED]"
 
+# Fields that carry ids, hashes and timestamps, never PII; scanning them only mangles them
+IDENTIFIER_FIELDS = frozenset({
+    "request_id", "active_request_id", "tracking_id", "trace_id", "span_id", "parent_span_id",
+    "thread_id", "session_id", "run_id", "graph_run_id", "node_id", "checkpoint_id",
+    "document_id", "lineage_id", "chunk_id", "state_hash", "content_hash", "source_hash", "epoch_ms",
+})
+
 def redact_string(text: str) -> str:
-    """Redacts PII from a single string."""
+    """Redacts PII from a single string (one scan; strings without digits or '@' are returned as-is)."""
     if not isinstance(text, str):
         return text
-    
-    redacted_text = text
-    for pii_type, pattern in PII_PATTERNS.items():
-        redacted_text = pattern.sub(f"[{pii_type}_REDACTED]", redacted_text)
-    return redacted_text
+    return redact_text(text)
 
 def redact_dict(data: Dict[str, Any]) -> Dict[str, Any]:
-    """Recursively redacts PII from dictionaries."""
+    """Recursively redacts PII from dictionaries; ``IDENTIFIER_FIELDS`` are passed through."""
     redacted_data = {}
     for key, value in data.items():
-        if isinstance(value, str):
+        if key in IDENTIFIER_FIELDS:
+            redacted_data[key] = value
+        elif isinstance(value, str):
             redacted_data[key] = redact_string(value)
         elif isinstance(value, dict):
             redacted_data[key] = redact_dict(value)
@@ -43,9 +43,9 @@ def get_logger(name: str) -> logging.Logger:
         console_handler = logging.StreamHandler(sys.stdout)
         
         # File handler
-        os.makedirs("logs", exist_ok=True)
+        os.makedirs(settings.LOG_DIR, exist_ok=True)
         file_handler = RotatingFileHandler(
-            "logs/rti_agent.log", maxBytes=10*1024*1024, backupCount=5, encoding="utf-8"
+            os.path.join(settings.LOG_DIR, "rti_agent.log"), maxBytes=10*1024*1024, backupCount=5, encoding="utf-8"
         )
 
         if settings.LOG_FORMAT == "json":
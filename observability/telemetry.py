@@ -39,6 +39,7 @@ class TelemetryFacade:
         hitl_enabled: bool = False,
         state_hash: Optional[str] = None,
         changed_keys: Optional[List[str]] = None,
+        node_trace: Optional[List[Dict[str, Any]]] = None,
         level: LogLevel = LogLevel.INFO
     ):
         model = GraphExecutionEvent(
@@ -49,6 +50,7 @@ class TelemetryFacade:
             hitl_enabled=hitl_enabled,
             state_hash=state_hash,
             changed_keys=changed_keys,
+            node_trace=node_trace,
             level=level
         )
         cls._emit(app_logger, model)
@@ -63,6 +65,7 @@ class TelemetryFacade:
         execution_time_ms: Optional[float] = None,
         estimated_cost_usd: float = 0.0,
         tool_calls: int = 0,
+        changed_keys: Optional[List[str]] = None,
         level: LogLevel = LogLevel.INFO
     ):
         model = NodeExecutionEvent(
@@ -73,6 +76,7 @@ class TelemetryFacade:
             execution_time_ms=execution_time_ms,
             estimated_cost_usd=estimated_cost_usd,
             tool_calls=tool_calls,
+            changed_keys=changed_keys,
             level=level
         )
         cls._emit(app_logger, model)
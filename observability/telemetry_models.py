@@ -59,6 +59,7 @@ class GraphExecutionEvent(BaseTelemetryEvent):
     hitl_enabled: bool = False
     state_hash: Optional[str] = None
     changed_keys: Optional[List[str]] = None
+    node_trace: Optional[List[Dict[str, Any]]] = None
 
 class NodeExecutionEvent(BaseTelemetryEvent):
     component: Component = Component.NODE
@@ -66,6 +67,7 @@ class NodeExecutionEvent(BaseTelemetryEvent):
     execution_time_ms: Optional[float] = None
     estimated_cost_usd: float = 0.0
     tool_calls: int = 0
+    changed_keys: Optional[List[str]] = None
     
 class LLMEvent(BaseTelemetryEvent):
     component: Component = Component.LLM
@@ -5,12 +5,17 @@ Supports:
 - local_sentence_transformers: sentence-transformers (no external API keys)
 
 The returned provider object must expose `get_langchain_embedder()`.
+Search paths embed batches of queries through `embed_queries()`, never
+`embed_documents()`, so providers with asymmetric task types (Gemini) get
+query vectors.
 """
 
 from __future__ import annotations
 
 from typing import Any
 
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+
 from rag.embeddings.gemini_embedder import GeminiEmbedder
 from rag.embeddings.local_sentence_transformer_embedder import (
     LocalSentenceTransformerEmbedder,
@@ -47,3 +52,12 @@ def get_embedder(provider: str | None = None) -> Any:
     return _embedder
 
 
+
+
+def embed_queries(embedder: Any, texts: list[str]) -> list[list[float]]:
+    """Query-side embeddings for a batch, on a provider or a LangChain embedder."""
+    if hasattr(embedder, "embed_queries"):
+        return embedder.embed_queries(texts)
+    if isinstance(embedder, GoogleGenerativeAIEmbeddings):
+        return embedder.embed_documents(texts, task_type="RETRIEVAL_QUERY")
+    return [embedder.embed_query(text) for text in texts]
@@ -27,16 +27,27 @@ class GeminiEmbedder:
         self._cache: TTLCache[str, list[float]] = TTLCache(maxsize=10000, ttl=ttl)
         logger.info(f"[GeminiEmbedder] Initialized: {settings.GEMINI_EMBEDDING_MODEL}")
 
-    def _key(self, text: str) -> str:
-        return hashlib.sha256(text.encode("utf-8", errors="ignore")).hexdigest()
+    def _key(self, text: str, task: str = "document") -> str:
+        # Query and document vectors of the same text differ (RETRIEVAL_QUERY vs RETRIEVAL_DOCUMENT)
+        return hashlib.sha256(f"{task}\0{text}".encode("utf-8", errors="ignore")).hexdigest()
 
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     def embed_query(self, text: str) -> list[float]:
-        key = self._key(text)
+        key = self._key(text, "query")
         if key not in self._cache:
             self._cache[key] = self.model.embed_query(text)
         return self._cache[key]
 
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Query embeddings for a batch of search queries in one request."""
+        missing = list(dict.fromkeys(text for text in texts if self._key(text, "query") not in self._cache))
+        if missing:
+            vectors = self.model.embed_documents(missing, task_type="RETRIEVAL_QUERY")
+            for text, vector in zip(missing, vectors):
+                self._cache[self._key(text, "query")] = vector
+        return [self._cache[self._key(text, "query")] for text in texts]
+
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=1, max=10))
     def embed_documents(self, texts: list[str]) -> list[list[float]]:
         output: list[list[float] | None] = []
@@ -106,6 +106,10 @@ class LocalSentenceTransformerEmbedder:
 
         return [vec if vec is not None else [] for vec in outputs]
 
+    def embed_queries(self, texts: list[str]) -> list[list[float]]:
+        """Batch query embeddings; sentence-transformers encodes queries and documents alike."""
+        return self.embed_documents(texts)
+
     async def aembed_query(self, text: str) -> list[float]:
         return await asyncio.to_thread(self.embed_query, text)
 
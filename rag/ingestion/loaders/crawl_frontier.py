@@ -0,0 +1,131 @@
+"""Persistent crawl frontier for incremental government re-crawls.
+
+Per URL it remembers the HTTP validators (ETag / Last-Modified), the hash of
+the last downloaded body, where the raw copy was saved, and the version
+identity of the document built from it. The scraper uses this to send
+conditional GETs, to skip bodies that did not change, and to hand
+``VersionManager`` the previous version of a changed document.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from config.settings import settings
+from rag.types import DocumentMetadata
+
+
+class CrawlFrontier:
+    def __init__(self, db_path: str | Path | None = None):
+        self.db_path = Path(db_path or settings.CRAWL_FRONTIER_DB)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS frontier (
+                    url TEXT PRIMARY KEY,
+                    target TEXT NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    raw_path TEXT,
+                    document_id TEXT,
+                    version INTEGER,
+                    lineage_id TEXT,
+                    source_hash TEXT,
+                    first_seen_at REAL NOT NULL,
+                    last_crawled_at REAL,
+                    last_changed_at REAL
+                )
+            """)
+
+    def get(self, url: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM frontier WHERE url = ?", (url,)).fetchone()
+        return dict(row) if row else None
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        entry = self.get(url)
+        headers: dict[str, str] = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def crawled_since(self, url: str, timestamp: float) -> bool:
+        """True when ``url`` was crawled at or after ``timestamp`` (e.g. a sitemap ``lastmod``)."""
+        entry = self.get(url)
+        return bool(entry and entry["last_crawled_at"] and entry["last_crawled_at"] >= timestamp)
+
+    def record_fetch(
+        self,
+        url: str,
+        target: str,
+        *,
+        content_hash: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        raw_path: str | Path | None = None,
+    ) -> bool:
+        """Stores the validators of a full response; returns True when the body changed."""
+        now = time.time()
+        entry = self.get(url)
+        changed = entry is None or entry["content_hash"] != content_hash
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO frontier (url, target, etag, last_modified, content_hash, raw_path, first_seen_at, last_crawled_at, last_changed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    target = excluded.target,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    raw_path = COALESCE(excluded.raw_path, frontier.raw_path),
+                    last_crawled_at = excluded.last_crawled_at,
+                    last_changed_at = CASE WHEN frontier.content_hash = excluded.content_hash
+                                           THEN frontier.last_changed_at ELSE excluded.last_changed_at END
+                """,
+                (url, target, etag, last_modified, content_hash, str(raw_path) if raw_path else None, now, now, now),
+            )
+        return changed
+
+    def touch(self, url: str) -> None:
+        """Marks ``url`` as crawled without a change (``304`` or identical body)."""
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE frontier SET last_crawled_at = ? WHERE url = ?", (time.time(), url))
+
+    def record_version(self, url: str, metadata: DocumentMetadata) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE frontier SET document_id = ?, version = ?, lineage_id = ?, source_hash = ? WHERE url = ?",
+                (metadata.document_id, metadata.version, metadata.lineage_id, metadata.source_hash, url),
+            )
+
+    def manifest(self, url: str) -> dict[str, dict[str, Any]]:
+        """The previous version of ``url`` in the manifest shape ``VersionManager`` expects."""
+        entry = self.get(url)
+        if not entry or not entry["document_id"]:
+            return {}
+        return {
+            entry["document_id"]: {
+                "source_url": url,
+                "document_id": entry["document_id"],
+                "version": entry["version"] or 1,
+                "lineage_id": entry["lineage_id"] or "",
+                "source_hash": entry["source_hash"] or "",
+                "is_latest": True,
+            }
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,25 +1,46 @@
-"""Config-driven async government website scraper."""
+"""Config-driven async government website scraper.
+
+Re-crawls are incremental: every URL's validators and body hash live in a
+persistent ``CrawlFrontier``, pages are requested with ``If-None-Match`` /
+``If-Modified-Since``, and only bodies that actually changed are parsed and
+returned. Sitemaps (from robots.txt or the target config) and RSS/Atom feeds
+seed the crawl, and entries whose ``lastmod`` predates the last crawl are not
+fetched at all. The frontier records of changed pages are held back until
+``commit_frontier()``, which callers run once the returned documents have been
+ingested; a failed ingest leaves the frontier untouched, so the pages are
+fetched and parsed again on the next crawl.
+
+Each target is crawled by ``CRAWL_WORKERS_PER_TARGET`` concurrent workers
+sharing one queue, with a token bucket per host enforcing
+``rate_limit_per_second``. Link extraction and HTML text extraction run off
+the event loop, and PDFs stream to disk instead of being buffered in memory.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import hashlib
 import json
+import os
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from pathlib import Path
 from typing import Callable
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
+from xml.etree import ElementTree
 
 import aiohttp
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.etree import ParserError
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 from config.settings import settings
 from observability.metrics import scrape_failures_total
 from observability.structured_logger import get_logger
+from rag.ingestion.loaders.crawl_frontier import CrawlFrontier
 from rag.ingestion.loaders.html_loader import load_html
 from rag.ingestion.loaders.pdf_loader import load_pdf
 from rag.types import LoadedDocument, ScrapeResult, ScrapeTarget
@@ -33,19 +54,50 @@ FAILED_DIR = Path("rag/ingestion/corpus/failed")
 
 @dataclass
 class AsyncRateLimiter:
+    """Token bucket: up to ``burst`` requests back-to-back, then ``rate_per_second``."""
+
     rate_per_second: float
+    burst: float = 1.0
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    _last_call: float = 0.0
+    _tokens: float = field(init=False)
+    _updated: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self._tokens = self.burst
 
     async def wait(self) -> None:
         if self.rate_per_second <= 0:
             return
-        interval = 1.0 / self.rate_per_second
+        # Waiters queue on the lock, so tokens are handed out in arrival order
         async with self._lock:
-            elapsed = time.monotonic() - self._last_call
-            if elapsed < interval:
-                await asyncio.sleep(interval - elapsed)
-            self._last_call = time.monotonic()
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate_per_second)
+            self._updated = now
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate_per_second)
+                self._tokens = 1.0
+                self._updated = time.monotonic()
+            self._tokens -= 1
+
+
+@dataclass
+class FetchResult:
+    content: bytes
+    content_type: str
+    status: int = 200
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str = ""
+    # PDFs are streamed here instead of being held in ``content``
+    path: Path | None = None
+
+    def discard(self) -> None:
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
 
 
 class GovernmentScraper:
@@ -56,6 +108,8 @@ class GovernmentScraper:
         raw_dir: str | Path = RAW_DIR,
         user_agent: str = "RTI-Agent-RAG/2.0 (+https://github.com/akashgaikwad28)",
         session_factory: Callable[..., aiohttp.ClientSession] = aiohttp.ClientSession,
+        frontier: CrawlFrontier | None = None,
+        incremental: bool = True,
     ):
         self.config_path = Path(config_path)
         self.raw_dir = Path(raw_dir)
@@ -64,8 +118,20 @@ class GovernmentScraper:
         self.session_factory = session_factory
         self.raw_dir.mkdir(parents=True, exist_ok=True)
         self.failed_dir.mkdir(parents=True, exist_ok=True)
-        self._robots: dict[str, RobotFileParser] = {}
+        self.frontier = frontier or CrawlFrontier()
+        # False re-downloads everything (e.g. for a rebuild) but still records the frontier
+        self.incremental = incremental
+        self._robots: dict[str, asyncio.Future[RobotFileParser]] = {}
+        self._limiters: dict[str, AsyncRateLimiter] = {}
         self._seen_hashes: set[str] = set()
+        self._pending: dict[str, dict] = {}
+
+    def commit_frontier(self) -> int:
+        """Writes the held-back frontier records of changed pages; call after their documents are ingested."""
+        pending, self._pending = self._pending, {}
+        for url, record in pending.items():
+            self.frontier.record_fetch(url, **record)
+        return len(pending)
 
     def load_targets(self, names: list[str] | None = None) -> list[ScrapeTarget]:
         config = json.loads(self.config_path.read_text(encoding="utf-8"))
@@ -97,96 +163,251 @@ class GovernmentScraper:
         max_depth: int | None = None,
     ) -> ScrapeResult:
         result = ScrapeResult(target=target.name)
-        limiter = AsyncRateLimiter(target.rate_limit_per_second)
         depth_limit = min(max_depth if max_depth is not None else target.max_depth, getattr(settings, "MAX_SCRAPE_DEPTH", target.max_depth))
         queue: asyncio.Queue[tuple[str, int]] = asyncio.Queue()
         base = str(target.base_url).rstrip("/")
         for path in target.start_paths:
             await queue.put((urljoin(base + "/", path.lstrip("/")), 0))
+        # Feed entries are leaf documents: fetched, but their links are not followed
+        for url in await self._discover_feed_urls(session, target, result):
+            await queue.put((url, depth_limit))
 
         visited: set[str] = set()
-        while not queue.empty():
-            url, depth = await queue.get()
-            normalized = _normalize_url(url)
-            if normalized in visited or depth > depth_limit:
-                continue
-            visited.add(normalized)
-            result.pages_seen += 1
 
-            if not self._allowed_domain(normalized, target) or not await self._robots_allowed(session, normalized):
-                continue
+        async def worker() -> None:
+            while True:
+                url, depth = await queue.get()
+                try:
+                    await self._crawl_url(session, target, url, depth, depth_limit, queue, visited, result)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(max(settings.CRAWL_WORKERS_PER_TARGET, 1))]
+        try:
+            await queue.join()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        return result
 
-            try:
-                await limiter.wait()
-                content, content_type = await self._fetch(session, normalized)
-                if _is_pdf_url(normalized, content_type):
-                    docs = await self._save_and_load_pdf(content, normalized, target)
-                    result.pdfs_saved += 1 if docs else 0
-                    result.documents.extend(docs)
-                    continue
+    async def _crawl_url(
+        self,
+        session: aiohttp.ClientSession,
+        target: ScrapeTarget,
+        url: str,
+        depth: int,
+        depth_limit: int,
+        queue: asyncio.Queue[tuple[str, int]],
+        visited: set[str],
+        result: ScrapeResult,
+    ) -> None:
+        normalized = _normalize_url(url)
+        if normalized in visited or depth > depth_limit:
+            return
+        visited.add(normalized)
+        result.pages_seen += 1
 
-                html = content.decode(_guess_encoding(content_type), errors="replace")
-                page_hash = _hash(html)
-                if page_hash in self._seen_hashes:
-                    result.duplicates += 1
-                    continue
-                self._seen_hashes.add(page_hash)
-                self._save_raw(normalized, html.encode("utf-8"), suffix=".html")
-                document = await load_html(html, source_url=normalized, department=target.department)
-                if document.text:
-                    result.documents.append(document)
-                    result.pages_saved += 1
+        if not self._allowed_domain(normalized, target) or not await self._robots_allowed(session, normalized):
+            return
 
+        try:
+            await self._limiter(normalized, target).wait()
+            headers = self.frontier.conditional_headers(normalized) if self.incremental else None
+            fetched = await self._fetch(session, normalized, headers=headers)
+            if fetched.not_modified:
+                result.unchanged += 1
+                self.frontier.touch(normalized)
                 if depth < depth_limit:
-                    for link in self._discover_links(html, normalized, target):
-                        await queue.put((link, depth + 1))
-            except Exception as exc:
-                scrape_failures_total.labels(target=target.name).inc()
-                failure = f"{normalized}: {exc}"
-                result.failures.append(failure)
-                self._save_failed(normalized, str(exc))
-                logger.warning(f"[GovernmentScraper] {failure}")
-
-        return result
+                    await self._enqueue_links(queue, await asyncio.to_thread(self._cached_html, normalized), normalized, target, depth)
+                return
+
+            previous = self.frontier.get(normalized)
+            if self.incremental and previous is not None and previous["content_hash"] == fetched.content_hash:
+                # Server ignored the validators but the body is identical
+                fetched.discard()
+                result.unchanged += 1
+                self._remember(normalized, target, fetched)
+                if depth < depth_limit and fetched.path is None:
+                    html = fetched.content.decode(_guess_encoding(fetched.content_type), errors="replace")
+                    await self._enqueue_links(queue, html, normalized, target, depth)
+                return
+
+            if fetched.path is not None:
+                docs, raw_path = await self._save_and_load_pdf(fetched, normalized, target)
+                self._remember(normalized, target, fetched, raw_path, defer=True)
+                result.pdfs_saved += 1 if docs else 0
+                result.documents.extend(docs)
+                return
+
+            html = fetched.content.decode(_guess_encoding(fetched.content_type), errors="replace")
+            page_hash = _hash(html)
+            if page_hash in self._seen_hashes:
+                result.duplicates += 1
+                return
+            self._seen_hashes.add(page_hash)
+            raw_path = await asyncio.to_thread(self._save_raw, normalized, html.encode("utf-8"), suffix=".html")
+            self._remember(normalized, target, fetched, raw_path, defer=True)
+            document = await load_html(html, source_url=normalized, department=target.department)
+            if document.text:
+                result.documents.append(document)
+                result.pages_saved += 1
+
+            if depth < depth_limit:
+                await self._enqueue_links(queue, html, normalized, target, depth)
+        except Exception as exc:
+            scrape_failures_total.labels(target=target.name).inc()
+            failure = f"{normalized}: {exc}"
+            result.failures.append(failure)
+            self._save_failed(normalized, str(exc))
+            logger.warning(f"[GovernmentScraper] {failure}")
+
+    def _limiter(self, url: str, target: ScrapeTarget) -> AsyncRateLimiter:
+        """Politeness is per host, shared by every worker and target that reaches it."""
+        host = urlparse(url).netloc.lower()
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            limiter = self._limiters[host] = AsyncRateLimiter(target.rate_limit_per_second, burst=settings.CRAWL_HOST_BURST)
+        return limiter
 
     @retry(
         retry=retry_if_exception_type((aiohttp.ClientError, asyncio.TimeoutError)),
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=8),
     )
-    async def _fetch(self, session: aiohttp.ClientSession, url: str) -> tuple[bytes, str]:
-        async with session.get(url, allow_redirects=True) as response:
-            response.raise_for_status()
+    async def _fetch(self, session: aiohttp.ClientSession, url: str, *, headers: dict[str, str] | None = None) -> FetchResult:
+        async with session.get(url, allow_redirects=True, headers=headers) as response:
             content_type = response.headers.get("content-type", "")
+            etag, last_modified = response.headers.get("ETag"), response.headers.get("Last-Modified")
+            if response.status == 304:
+                return FetchResult(b"", content_type, 304, etag, last_modified)
+            response.raise_for_status()
+            if not _is_pdf_url(url, content_type):
+                data = await response.read()
+                return FetchResult(data, content_type, response.status, etag, last_modified, _hash_bytes(data))
+
             max_pdf_bytes = getattr(settings, "MAX_PDF_SIZE_MB", 25) * 1024 * 1024
             content_length = int(response.headers.get("content-length") or 0)
-            if _is_pdf_url(url, content_type) and content_length > max_pdf_bytes:
+            if content_length > max_pdf_bytes:
                 raise ValueError(f"PDF exceeds MAX_PDF_SIZE_MB: {content_length}")
-            data = await response.read()
-            if _is_pdf_url(url, content_type) and len(data) > max_pdf_bytes:
-                raise ValueError(f"PDF exceeds MAX_PDF_SIZE_MB after download: {len(data)}")
-            return data, content_type
-
-    async def _robots_allowed(self, session: aiohttp.ClientSession, url: str) -> bool:
+            partial_dir = self.raw_dir / ".partial"
+            partial_dir.mkdir(parents=True, exist_ok=True)
+            path = partial_dir / f"{_hash(url)[:16]}-{time.monotonic_ns()}.pdf"
+            digest = hashlib.sha256()
+            size = 0
+            try:
+                with path.open("wb") as handle:
+                    async for block in response.content.iter_chunked(64 * 1024):
+                        size += len(block)
+                        if size > max_pdf_bytes:
+                            raise ValueError(f"PDF exceeds MAX_PDF_SIZE_MB after download: {size}")
+                        digest.update(block)
+                        handle.write(block)
+            except BaseException:
+                path.unlink(missing_ok=True)
+                raise
+            return FetchResult(b"", content_type, response.status, etag, last_modified, digest.hexdigest(), path)
+
+    async def _robots_parser(self, session: aiohttp.ClientSession, url: str) -> RobotFileParser:
         parsed = urlparse(url)
         domain = parsed.netloc.lower()
+        # Workers share one in-flight robots.txt fetch per domain
         if domain not in self._robots:
-            robots_url = f"{parsed.scheme}://{domain}/robots.txt"
-            parser = RobotFileParser()
-            parser.set_url(robots_url)
+            self._robots[domain] = asyncio.ensure_future(self._load_robots(session, f"{parsed.scheme}://{domain}/robots.txt"))
+        return await asyncio.shield(self._robots[domain])
+
+    async def _load_robots(self, session: aiohttp.ClientSession, robots_url: str) -> RobotFileParser:
+        parser = RobotFileParser()
+        parser.set_url(robots_url)
+        try:
+            fetched = await self._fetch(session, robots_url)
+            parser.parse(fetched.content.decode("utf-8", errors="ignore").splitlines())
+        except Exception:
+            parser.parse([])
+        return parser
+
+    async def _robots_allowed(self, session: aiohttp.ClientSession, url: str) -> bool:
+        return (await self._robots_parser(session, url)).can_fetch(self.user_agent, url)
+
+    async def _discover_feed_urls(
+        self,
+        session: aiohttp.ClientSession,
+        target: ScrapeTarget,
+        result: ScrapeResult,
+    ) -> list[str]:
+        """Collects page URLs from the target's sitemaps and RSS/Atom feeds.
+
+        Entries whose ``lastmod`` is older than their last crawl are skipped
+        without a request when crawling incrementally.
+        """
+        base = str(target.base_url).rstrip("/")
+        robots = await self._robots_parser(session, base)
+        pending = [urljoin(base + "/", path.lstrip("/")) for path in [*target.sitemaps, *target.feeds]]
+        pending.extend(robots.site_maps() or [])
+        urls: list[str] = []
+        fetched_feeds: set[str] = set()
+        while pending and len(urls) < settings.CRAWL_MAX_FEED_URLS:
+            feed_url = _normalize_url(pending.pop(0))
+            if feed_url in fetched_feeds or not self._allowed_domain(feed_url, target):
+                continue
+            fetched_feeds.add(feed_url)
             try:
-                content, _content_type = await self._fetch(session, robots_url)
-                parser.parse(content.decode("utf-8", errors="ignore").splitlines())
-            except Exception:
-                parser.parse([])
-            self._robots[domain] = parser
-        return self._robots[domain].can_fetch(self.user_agent, url)
+                await self._limiter(feed_url, target).wait()
+                entries, nested = await asyncio.to_thread(_parse_feed, (await self._fetch(session, feed_url)).content)
+            except Exception as exc:
+                logger.warning(f"[GovernmentScraper] Feed {feed_url} unusable: {exc}")
+                continue
+            pending.extend(nested)
+            for url, updated_at in entries:
+                url = _normalize_url(url)
+                if not self._allowed_domain(url, target):
+                    continue
+                if self.incremental and updated_at is not None and self.frontier.crawled_since(url, updated_at):
+                    result.unchanged += 1
+                    continue
+                urls.append(url)
+        return list(dict.fromkeys(urls))[: settings.CRAWL_MAX_FEED_URLS]
+
+    async def _enqueue_links(self, queue: asyncio.Queue, html: str, url: str, target: ScrapeTarget, depth: int) -> None:
+        if not html:
+            return
+        for link in await asyncio.to_thread(self._discover_links, html, url, target):
+            queue.put_nowait((link, depth + 1))
+
+    def _cached_html(self, url: str) -> str:
+        entry = self.frontier.get(url)
+        if not entry or not entry["raw_path"] or not entry["raw_path"].endswith(".html"):
+            return ""
+        try:
+            return Path(entry["raw_path"]).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return ""
+
+    def _remember(
+        self,
+        url: str,
+        target: ScrapeTarget,
+        fetched: FetchResult,
+        raw_path: Path | None = None,
+        *,
+        defer: bool = False,
+    ) -> None:
+        record = {
+            "target": target.name,
+            "content_hash": fetched.content_hash,
+            "etag": fetched.etag,
+            "last_modified": fetched.last_modified,
+            "raw_path": raw_path,
+        }
+        if defer:
+            self._pending[url] = record
+        else:
+            self.frontier.record_fetch(url, **record)
 
     def _discover_links(self, html: str, base_url: str, target: ScrapeTarget) -> list[str]:
-        soup = BeautifulSoup(html, "html.parser")
         links: list[str] = []
-        for anchor in soup.find_all("a", href=True):
-            href = anchor.get("href", "").strip()
+        for href in _extract_hrefs(html):
+            href = href.strip()
             if not href or href.startswith(("mailto:", "tel:", "javascript:")):
                 continue
             candidate = _normalize_url(urljoin(base_url, href))
@@ -199,31 +420,41 @@ class GovernmentScraper:
         allowed = target.allowed_domains or [urlparse(str(target.base_url)).netloc.lower()]
         return any(domain == item.lower() or domain.endswith("." + item.lower()) for item in allowed)
 
-    async def _save_and_load_pdf(self, content: bytes, url: str, target: ScrapeTarget) -> list[LoadedDocument]:
-        pdf_hash = _hash_bytes(content)
-        if pdf_hash in self._seen_hashes:
-            return []
-        self._seen_hashes.add(pdf_hash)
-        path = self._save_raw(url, content, suffix=".pdf")
-        return await load_pdf(path, source_url=url, department=target.department, title=Path(urlparse(url).path).stem)
-
-    def _save_raw(self, url: str, content: bytes, *, suffix: str) -> Path:
+    async def _save_and_load_pdf(self, fetched: FetchResult, url: str, target: ScrapeTarget) -> tuple[list[LoadedDocument], Path | None]:
+        if fetched.content_hash in self._seen_hashes:
+            fetched.discard()
+            return [], None
+        self._seen_hashes.add(fetched.content_hash)
+        path = self._raw_path(url, suffix=".pdf")
+        os.replace(fetched.path, path)
+        size = path.stat().st_size
+        await asyncio.to_thread(self._write_raw_meta, path, url, size, fetched.content_hash)
+        docs = await load_pdf(path, source_url=url, department=target.department, title=Path(urlparse(url).path).stem)
+        return docs, path
+
+    def _raw_path(self, url: str, *, suffix: str) -> Path:
         parsed = urlparse(url)
         safe_domain = parsed.netloc.replace(":", "_")
         digest = _hash(url)[:16]
         day = datetime.now(timezone.utc).strftime("%Y%m%d")
         directory = self.raw_dir / safe_domain / day
         directory.mkdir(parents=True, exist_ok=True)
-        path = directory / f"{digest}{suffix}"
+        return directory / f"{digest}{suffix}"
+
+    def _save_raw(self, url: str, content: bytes, *, suffix: str) -> Path:
+        path = self._raw_path(url, suffix=suffix)
         path.write_bytes(content)
+        self._write_raw_meta(path, url, len(content), _hash_bytes(content))
+        return path
+
+    def _write_raw_meta(self, path: Path, url: str, size: int, digest: str) -> None:
         meta = {
             "url": url,
             "saved_at": datetime.now(timezone.utc).isoformat(),
-            "bytes": len(content),
-            "content_hash": _hash_bytes(content),
+            "bytes": size,
+            "content_hash": digest,
         }
         path.with_suffix(path.suffix + ".json").write_text(json.dumps(meta, indent=2), encoding="utf-8")
-        return path
 
     def _save_failed(self, url: str, reason: str) -> None:
         payload = {"url": url, "reason": reason, "failed_at": datetime.now(timezone.utc).isoformat()}
@@ -253,3 +484,65 @@ def _guess_encoding(content_type: str) -> str:
         return content_type.split("charset=", 1)[1].split(";", 1)[0].strip()
     return "utf-8"
 
+
+def _extract_hrefs(html: str) -> list[str]:
+    try:
+        tree = lxml.html.fromstring(html.encode("utf-8"), parser=lxml.html.HTMLParser(encoding="utf-8"))
+    except (ParserError, ValueError):
+        return []
+    return [str(href) for href in tree.xpath("//a/@href")]
+
+
+def _parse_feed(content: bytes) -> tuple[list[tuple[str, float | None]], list[str]]:
+    """Parses a sitemap, sitemap index, RSS or Atom document.
+
+    Returns ``(entries, nested_sitemaps)`` where each entry is ``(url, updated_at)``.
+    """
+    root = ElementTree.fromstring(content)
+    kind = _local_name(root.tag)
+    entries: list[tuple[str, float | None]] = []
+    nested: list[str] = []
+    if kind == "sitemapindex":
+        nested = [loc for node in root if (loc := _child_text(node, "loc"))]
+    elif kind == "urlset":
+        for node in root:
+            if loc := _child_text(node, "loc"):
+                entries.append((loc, _parse_timestamp(_child_text(node, "lastmod"))))
+    elif kind in {"rss", "RDF"}:
+        for node in root.iter():
+            if _local_name(node.tag) == "item" and (link := _child_text(node, "link")):
+                entries.append((link, _parse_timestamp(_child_text(node, "pubDate") or _child_text(node, "date"))))
+    elif kind == "feed":
+        for node in root:
+            if _local_name(node.tag) != "entry":
+                continue
+            link = next((child.get("href") for child in node if _local_name(child.tag) == "link" and child.get("href")), None)
+            if link:
+                entries.append((link, _parse_timestamp(_child_text(node, "updated") or _child_text(node, "published"))))
+    return entries, nested
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(node: ElementTree.Element, name: str) -> str:
+    for child in node:
+        if _local_name(child.tag) == name and child.text:
+            return child.text.strip()
+    return ""
+
+
+def _parse_timestamp(value: str) -> float | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            parsed = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
@@ -1,7 +1,13 @@
-"""HTML extraction and cleanup loader."""
+"""HTML extraction and cleanup loader.
+
+Parsing uses lxml through BeautifulSoup and runs in a worker thread, so a
+crawler fetching pages concurrently is not blocked on extraction.
+"""
 
 from __future__ import annotations
 
+import asyncio
+
 from bs4 import BeautifulSoup
 
 try:
@@ -15,10 +21,14 @@ from rag.types import LoadedDocument
 
 
 REMOVE_SELECTORS = ["script", "style", "noscript", "nav", "header", "footer", "form", "aside"]
+PARSER = "lxml"
 
 
 def extract_title(html: str) -> str:
-    soup = BeautifulSoup(html, "html.parser")
+    return _title(BeautifulSoup(html, PARSER))
+
+
+def _title(soup: BeautifulSoup) -> str:
     if soup.title and soup.title.string:
         return soup.title.string.strip()
     h1 = soup.find("h1")
@@ -26,12 +36,16 @@ def extract_title(html: str) -> str:
 
 
 def extract_text_from_html(html: str) -> str:
+    return _text(html, None)
+
+
+def _text(html: str, soup: BeautifulSoup | None) -> str:
     if trafilatura is not None:
         extracted = trafilatura.extract(html, include_tables=True, favor_recall=True)
         if extracted:
             return clean_text(extracted)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = soup or BeautifulSoup(html, PARSER)
     for selector in REMOVE_SELECTORS:
         for tag in soup.select(selector):
             tag.decompose()
@@ -39,9 +53,14 @@ def extract_text_from_html(html: str) -> str:
     return clean_text(main.get_text("\n", strip=True))
 
 
+def _extract(html: str) -> tuple[str, str]:
+    # One parse serves both the title and the fallback text extraction
+    soup = BeautifulSoup(html, PARSER)
+    return _title(soup), _text(html, soup)
+
+
 async def load_html(html: str, *, source_url: str = "", department: str = "", document_type: str = "html") -> LoadedDocument:
-    title = extract_title(html)
-    text = extract_text_from_html(html)
+    title, text = await asyncio.to_thread(_extract, html)
     metadata = build_metadata(
         text=text,
         source_url=source_url,
@@ -1,46 +1,158 @@
-"""Async PDF loader backed by PyMuPDF."""
+"""Async PDF loader backed by PyMuPDF.
+
+Text extraction and OCR are CPU-bound and hold the GIL, so large PDFs are
+split into page ranges parsed in a process pool. Pages too sparse for text
+extraction go to a separate OCR pool as soon as their shard returns, which
+keeps OCR of early pages overlapping with parsing of later ones.
+"""
 
 from __future__ import annotations
 
 import asyncio
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Any
 
 import fitz
 
+from config.settings import settings
+from observability.structured_logger import get_logger
 from rag.ingestion.cleaners.metadata_cleaner import build_metadata
 from rag.ingestion.cleaners.text_cleaner import clean_text
+from rag.ocr.ocr_router import OCRRouter, RoutedOCRResult
+from rag.ocr.text_quality_detector import TextQualityDetector
 from rag.types import LoadedDocument
 
+logger = get_logger(__name__)
+
+_parse_executor: ProcessPoolExecutor | None = None
+_ocr_executor: ProcessPoolExecutor | None = None
+
+
+@dataclass
+class PageExtraction:
+    page_number: int
+    text: str
+    needs_ocr: bool
+    meta: dict[str, Any] = field(default_factory=dict)
 
-def _extract_pdf_pages(path: Path) -> list[tuple[int, str, dict]]:
-    from rag.ocr.ocr_router import OCRRouter
-    pages: list[tuple[int, str, dict]] = []
+
+def _parse_page_range(path: str, start: int, stop: int) -> list[PageExtraction]:
+    pages: list[PageExtraction] = []
     with fitz.open(path) as doc:
-        for index, page in enumerate(doc, start=1):
-            raw_text = page.get_text("text")
-            ocr_result = OCRRouter.process_page(page, raw_text)
-            
-            page_meta = {}
-            final_text = raw_text
-            if ocr_result:
-                final_text = ocr_result["text"]
-                page_meta = {
-                    "ocr_confidence": ocr_result["confidence"],
-                    "ocr_engine_used": ocr_result["engine"],
-                    "ocr_page_count": 1,
-                    "raw_text": raw_text,
-                    "ocr_corrected_text": final_text
-                }
-            pages.append((index, final_text, page_meta))
+        for index in range(start, stop):
+            started = time.perf_counter()
+            raw_text = doc[index].get_text("text")
+            pages.append(
+                PageExtraction(
+                    page_number=index + 1,
+                    text=raw_text,
+                    needs_ocr=TextQualityDetector.needs_ocr(raw_text),
+                    meta={"parse_ms": _elapsed_ms(started)},
+                )
+            )
+    return pages
+
+
+def _ocr_page(path: str, page_number: int, raw_text: str) -> tuple[RoutedOCRResult | None, float]:
+    started = time.perf_counter()
+    with fitz.open(path) as doc:
+        result = OCRRouter.process_page(doc[page_number - 1], raw_text)
+    return result, _elapsed_ms(started)
+
+
+def _apply_ocr(page: PageExtraction, result: RoutedOCRResult | None, ocr_ms: float) -> None:
+    page.meta["ocr_ms"] = ocr_ms
+    if result:
+        page.meta.update(
+            {
+                "ocr_confidence": result["confidence"],
+                "ocr_engine_used": result["engine"],
+                "ocr_dpi": result["dpi"],
+                "ocr_page_count": 1,
+                "raw_text": page.text,
+                "ocr_corrected_text": result["text"],
+            }
+        )
+        page.text = result["text"]
+
+
+def _page_count(path: Path) -> int:
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def _workers(configured: int) -> int:
+    return configured or os.cpu_count() or 1
+
+
+def _parse_pool() -> ProcessPoolExecutor:
+    global _parse_executor
+    if _parse_executor is None:
+        # spawn: forking a process that already runs an event loop and thread pools is unsafe
+        _parse_executor = ProcessPoolExecutor(_workers(settings.PDF_PARSE_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+    return _parse_executor
+
+
+def _ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_executor
+    if _ocr_executor is None:
+        _ocr_executor = ProcessPoolExecutor(_workers(settings.OCR_WORKERS), mp_context=multiprocessing.get_context("spawn"))
+    return _ocr_executor
+
+
+async def extract_pdf_pages(path: str | Path) -> list[PageExtraction]:
+    """Extracts every page of ``path`` in page order, OCRing the ones that need it.
+
+    PDFs up to ``PDF_PAGES_PER_SHARD`` pages are parsed in a thread; larger ones
+    are sharded across the parse pool, one contiguous page range per worker.
+    """
+    pdf_path = Path(path)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    page_count = await asyncio.to_thread(_page_count, pdf_path)
+
+    if page_count <= settings.PDF_PAGES_PER_SHARD:
+        parse_jobs = [asyncio.to_thread(_parse_page_range, str(pdf_path), 0, page_count)]
+    else:
+        shard = max(settings.PDF_PAGES_PER_SHARD, math.ceil(page_count / _workers(settings.PDF_PARSE_WORKERS)))
+        parse_jobs = [
+            loop.run_in_executor(_parse_pool(), _parse_page_range, str(pdf_path), start, min(start + shard, page_count))
+            for start in range(0, page_count, shard)
+        ]
+
+    pages: list[PageExtraction] = []
+    ocr_pages: list[PageExtraction] = []
+    ocr_jobs: list[asyncio.Future] = []
+    for finished in asyncio.as_completed(parse_jobs):
+        for page in await finished:
+            pages.append(page)
+            if page.needs_ocr:
+                ocr_pages.append(page)
+                ocr_jobs.append(loop.run_in_executor(_ocr_pool(), _ocr_page, str(pdf_path), page.page_number, page.text))
+    for page, (result, ocr_ms) in zip(ocr_pages, await asyncio.gather(*ocr_jobs)):
+        _apply_ocr(page, result, ocr_ms)
+
+    pages.sort(key=lambda page: page.page_number)
+    logger.info(f"[PdfLoader] {pdf_path.name}: {page_count} pages, {len(ocr_pages)} OCR | {_elapsed_ms(started)}ms")
     return pages
 
 
 async def load_pdf(path: str | Path, *, source_url: str = "", department: str = "", title: str = "") -> list[LoadedDocument]:
     pdf_path = Path(path)
-    pages = await asyncio.to_thread(_extract_pdf_pages, pdf_path)
+    pages = await extract_pdf_pages(pdf_path)
     documents: list[LoadedDocument] = []
-    for page_number, raw_text, page_meta in pages:
-        text = clean_text(raw_text)
+    for page in pages:
+        text = clean_text(page.text)
         if not text:
             continue
         metadata = build_metadata(
@@ -51,9 +163,8 @@ async def load_pdf(path: str | Path, *, source_url: str = "", department: str =
             document_type="pdf",
             title=title or pdf_path.stem,
             mime_type="application/pdf",
-            page_number=page_number,
-            extra=page_meta,
+            page_number=page.page_number,
+            extra=page.meta,
         )
         documents.append(LoadedDocument(text=text, metadata=metadata))
     return documents
-
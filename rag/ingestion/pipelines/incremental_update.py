@@ -1,12 +1,23 @@
-"""Incremental RAG update entry point."""
+"""Incremental RAG update entry point.
+
+Scrapes go through the crawl frontier, so a scheduled re-crawl of
+``config/gov_sources.json`` only downloads, versions and embeds documents
+that changed since the previous run.
+"""
 
 from __future__ import annotations
 
+import asyncio
 from pathlib import Path
 
+from config.settings import settings
+from observability.structured_logger import get_logger
+
 from rag.ingestion.pipelines.ingest_documents import ingest_documents
 from rag.ingestion.pipelines.scrape_and_ingest import scrape_and_ingest
 
+logger = get_logger(__name__)
+
 
 async def incremental_update(
     *,
@@ -21,3 +32,26 @@ async def incremental_update(
         reports["scrape"] = await scrape_and_ingest(target_names=target_names, max_depth=max_depth, rebuild=False)
     return reports
 
+
+async def run_recrawl_schedule(*, interval_hours: float | None = None, target_names: list[str] | None = None) -> None:
+    """Re-crawls every ``interval_hours`` (``SCRAPE_INTERVAL_HOURS`` by default) until cancelled."""
+    interval = (interval_hours or settings.SCRAPE_INTERVAL_HOURS) * 3600
+    while True:
+        try:
+            report = await scrape_and_ingest(target_names=target_names, rebuild=False)
+            changed = report["ingestion"]["documents_loaded"]
+            unchanged = sum(item.get("unchanged", 0) for item in report["scrape"])
+            logger.info(f"[IncrementalUpdate] Re-crawl finished | changed_documents={changed} | unchanged_urls={unchanged}")
+        except Exception as exc:
+            logger.error(f"[IncrementalUpdate] Re-crawl failed: {exc}")
+        await asyncio.sleep(interval)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incrementally re-crawl government sources on a schedule.")
+    parser.add_argument("--target", action="append", dest="targets")
+    parser.add_argument("--every-hours", type=float, default=None)
+    args = parser.parse_args()
+    asyncio.run(run_recrawl_schedule(interval_hours=args.every_hours, target_names=args.targets))
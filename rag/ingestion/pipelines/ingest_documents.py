@@ -10,12 +10,31 @@ from rag.ingestion.cleaners.text_cleaner import clean_text
 from rag.ingestion.loaders.html_loader import load_html
 from rag.ingestion.loaders.json_loader import load_json
 from rag.ingestion.loaders.pdf_loader import load_pdf
+from rag.ingestion.pipelines.streaming_pipeline import stream_ingest
 from rag.types import IngestionReport, LoadedDocument
-from rag.vectorstore.vector_manager import VectorManager
 
 PROCESSED_DIR = Path("rag/ingestion/corpus/processed")
 
 
+async def load_path(path: Path, *, department: str = "") -> list[LoadedDocument]:
+    """Loads one file with the loader for its suffix; unsupported files yield nothing."""
+    suffix = path.suffix.lower()
+    if suffix == ".pdf":
+        return await load_pdf(path, department=department)
+    if suffix in {".html", ".htm"}:
+        html = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="ignore")
+        return [await load_html(html, source_url="", department=department)]
+    if suffix == ".json":
+        return await load_json(path, default_department=department)
+    if suffix in {".txt", ".md"}:
+        raw = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="ignore")
+        text = clean_text(raw)
+        if text:
+            metadata = build_metadata(text=text, source_path=str(path), department=department, title=path.stem)
+            return [LoadedDocument(text=text, metadata=metadata)]
+    return []
+
+
 async def load_documents_from_paths(paths: list[str | Path], *, department: str = "") -> list[LoadedDocument]:
     documents: list[LoadedDocument] = []
     for input_path in paths:
@@ -24,26 +43,12 @@ async def load_documents_from_paths(paths: list[str | Path], *, department: str
             nested = [item for item in path.rglob("*") if item.is_file()]
             documents.extend(await load_documents_from_paths(nested, department=department))
             continue
-        suffix = path.suffix.lower()
-        if suffix == ".pdf":
-            documents.extend(await load_pdf(path, department=department))
-        elif suffix in {".html", ".htm"}:
-            html = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="ignore")
-            documents.append(await load_html(html, source_url="", department=department))
-        elif suffix == ".json":
-            documents.extend(await load_json(path, default_department=department))
-        elif suffix in {".txt", ".md"}:
-            raw = await asyncio.to_thread(path.read_text, encoding="utf-8", errors="ignore")
-            text = clean_text(raw)
-            if text:
-                metadata = build_metadata(text=text, source_path=str(path), department=department, title=path.stem)
-                documents.append(LoadedDocument(text=text, metadata=metadata))
+        documents.extend(await load_path(path, department=department))
     return documents
 
 
 async def ingest_documents(paths: list[str | Path], *, department: str = "", rebuild: bool = False) -> IngestionReport:
-    documents = await load_documents_from_paths(paths, department=department)
-    report = await VectorManager().ingest_documents(documents, rebuild=rebuild)
+    report = await stream_ingest(paths, department=department, rebuild=rebuild)
     PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
     return report
 
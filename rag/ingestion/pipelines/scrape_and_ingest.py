@@ -3,10 +3,32 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+from dataclasses import dataclass
 
+from observability.structured_logger import get_logger
+from rag.ingestion.loaders.crawl_frontier import CrawlFrontier
 from rag.ingestion.loaders.gov_scraper import GovernmentScraper
-from rag.types import IngestionReport
+from rag.types import DocumentChunk, DocumentMetadata, IngestionReport, LoadedDocument
+from rag.vectorstore.base import BaseVectorStore
 from rag.vectorstore.vector_manager import VectorManager
+from rag.versioning.version_manager import VersionManager
+
+logger = get_logger(__name__)
+
+_VERSION_FIELDS = (
+    "document_id", "version", "is_latest", "lineage_id", "supersedes",
+    "version_reason", "change_summary", "content_delta_hash",
+)
+
+
+@dataclass
+class SourceVersion:
+    """A version assigned to a changed source URL, committed once its chunks are ingested."""
+
+    url: str
+    metadata: DocumentMetadata
+    superseded_document_id: str | None = None
 
 
 async def scrape_and_ingest(
@@ -15,16 +37,90 @@ async def scrape_and_ingest(
     max_depth: int | None = None,
     rebuild: bool = False,
 ) -> dict:
-    scraper = GovernmentScraper()
+    # A rebuild needs every document, so it skips conditional requests
+    scraper = GovernmentScraper(incremental=not rebuild)
     scrape_results = await scraper.scrape_targets(names=target_names, max_depth=max_depth)
     documents = [document for result in scrape_results for document in result.documents]
-    ingestion_report: IngestionReport = await VectorManager().ingest_documents(documents, rebuild=rebuild)
+    manager = VectorManager()
+    versions: list[SourceVersion] = []
+    if not rebuild:
+        documents, versions = version_changed_documents(documents, scraper.frontier)
+    chunks = manager.chunker.chunk_documents(documents)
+    ingestion_report: IngestionReport = await manager.ingest_chunks(chunks, documents_loaded=len(documents), rebuild=rebuild)
+    # Only reached when the ingest succeeded: remember what was crawled, then retire superseded versions
+    scraper.commit_frontier()
+    await commit_versions(versions, scraper.frontier, manager.store, chunks)
     return {
         "scrape": [result.model_dump() | {"documents": len(result.documents)} for result in scrape_results],
         "ingestion": ingestion_report.model_dump(),
     }
 
 
+def version_changed_documents(
+    documents: list[LoadedDocument],
+    frontier: CrawlFrontier,
+) -> tuple[list[LoadedDocument], list[SourceVersion]]:
+    """Runs each changed source URL through ``VersionManager`` once.
+
+    A URL is versioned on a hash over the text of all its pages, so an edit
+    past the first page of a PDF still yields a new version, and every page
+    shares that version. Nothing is persisted here: pass the returned
+    versions to ``commit_versions`` after the documents are ingested.
+    """
+    by_url: dict[str, list[LoadedDocument]] = {}
+    for document in documents:
+        by_url.setdefault(document.metadata.source_url, []).append(document)
+
+    changed: list[LoadedDocument] = []
+    versions: list[SourceVersion] = []
+    for url, group in by_url.items():
+        # Pages keep their own source_hash (retrieval dedups on it); the version compares the whole body
+        version = group[0].metadata.model_copy(update={"source_hash": _body_hash(group)})
+        outcome = VersionManager(frontier.manifest(url)).process_document(version)
+        if outcome["status"] == "unchanged":
+            continue
+        for document in group:
+            for name in _VERSION_FIELDS:
+                setattr(document.metadata, name, getattr(version, name))
+        logger.info(f"[ScrapeAndIngest] {outcome['status']} v{version.version}: {url}")
+        versions.append(SourceVersion(url, version, outcome.get("superseded_document_id")))
+        changed.extend(group)
+    return changed, versions
+
+
+async def commit_versions(
+    versions: list[SourceVersion],
+    frontier: CrawlFrontier,
+    store: BaseVectorStore,
+    chunks: list[DocumentChunk],
+) -> None:
+    """Retires superseded versions and records the new ones, once their chunks are in the store.
+
+    ``chunks`` are the chunks just ingested. Those of a new version that the
+    store skipped as duplicates of the old version's chunks are carried over
+    to the new version rather than retired with it.
+    """
+    hashes: dict[str, set[str]] = {}
+    for chunk in chunks:
+        hashes.setdefault(chunk.metadata.document_id, set()).add(chunk.content_hash)
+    for version in versions:
+        if version.superseded_document_id:
+            successor = {name: getattr(version.metadata, name) for name in _VERSION_FIELDS}
+            await store.asupersede_document(
+                version.superseded_document_id, successor, hashes.get(version.metadata.document_id, set())
+            )
+        if version.url:
+            frontier.record_version(version.url, version.metadata)
+
+
+def _body_hash(pages: list[LoadedDocument]) -> str:
+    digest = hashlib.sha256()
+    for page in pages:
+        digest.update(page.text.encode("utf-8", errors="ignore"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
 def run(target_names: list[str] | None = None, *, max_depth: int | None = None, rebuild: bool = False) -> dict:
     return asyncio.run(scrape_and_ingest(target_names=target_names, max_depth=max_depth, rebuild=rebuild))
 
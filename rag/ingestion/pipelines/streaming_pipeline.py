@@ -0,0 +1,157 @@
+"""Streaming, bounded-concurrency ingestion pipeline.
+
+Stages run concurrently and hand work over bounded queues, so a bulk
+rebuild keeps every stage busy while only ``INGEST_QUEUE_SIZE`` files and one
+index batch are ever held in memory::
+
+    discover ──► load/parse (N workers) ──► clean/chunk ──► embed + index (batched)
+
+Each file is tracked by an ``IngestionLifecycle`` moving through
+``DISCOVERED → PARSED | OCR_COMPLETE → CHUNKED → EMBEDDED → INDEXED``, or
+``FAILED`` when its loader raises.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from config.settings import settings
+from observability.metrics import documents_ingested_total
+from observability.structured_logger import get_logger
+from rag.ingestion.chunking.chunker import SmartChunker
+from rag.ingestion.state_machine import IngestionLifecycle, IngestionState
+from rag.types import DocumentChunk, IngestionReport
+from rag.vectorstore import get_vector_store
+from rag.vectorstore.base import BaseVectorStore
+
+logger = get_logger(__name__)
+
+_DONE = object()
+
+
+@dataclass
+class _IndexBatch:
+    chunks: list[DocumentChunk] = field(default_factory=list)
+    # Files whose chunks are all in this or earlier batches; INDEXED once it lands
+    completed: list[IngestionLifecycle] = field(default_factory=list)
+
+
+class StreamingIngestionPipeline:
+    def __init__(
+        self,
+        *,
+        department: str = "",
+        rebuild: bool = False,
+        store: BaseVectorStore | None = None,
+        chunker: SmartChunker | None = None,
+        load_concurrency: int | None = None,
+        queue_size: int | None = None,
+        index_batch_size: int | None = None,
+    ):
+        self.department = department
+        self.rebuild = rebuild
+        self.store = store or get_vector_store()
+        self.chunker = chunker or SmartChunker()
+        self.load_concurrency = load_concurrency or settings.INGEST_LOAD_CONCURRENCY or os.cpu_count() or 4
+        self.queue_size = queue_size or settings.INGEST_QUEUE_SIZE
+        self.index_batch_size = index_batch_size or settings.INGEST_INDEX_BATCH_SIZE
+        self.report = IngestionReport(vector_store_path=str(getattr(self.store, "index_path", "mongodb_cloud")))
+        self.states: Counter[str] = Counter()
+        self._rebuilt = False
+
+    async def run(self, paths: list[str | Path]) -> IngestionReport:
+        discovered: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        batches: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        async with asyncio.TaskGroup() as group:
+            group.create_task(self._discover(paths, discovered))
+            loaders = [group.create_task(self._load(discovered, parsed)) for _ in range(self.load_concurrency)]
+            group.create_task(self._close_after(loaders, parsed))
+            group.create_task(self._chunk(parsed, batches))
+            group.create_task(self._index(batches))
+
+        if self.rebuild and not self._rebuilt:
+            # Nothing to index: a rebuild still has to reset the store
+            await self.store.arebuild([])
+        documents_ingested_total.labels(source="rag_pipeline").inc(self.report.chunks_indexed)
+        logger.info(f"[StreamingIngestion] Finished | states={dict(self.states)} | report={self.report.model_dump()}")
+        return self.report
+
+    async def _discover(self, paths: list[str | Path], discovered: asyncio.Queue) -> None:
+        for input_path in paths:
+            path = Path(input_path)
+            files = await asyncio.to_thread(lambda: sorted(item for item in path.rglob("*") if item.is_file())) if path.is_dir() else [path]
+            for file_path in files:
+                lifecycle = IngestionLifecycle(document_id=str(file_path))
+                self.states[IngestionState.DISCOVERED.value] += 1
+                await discovered.put((file_path, lifecycle))
+        for _ in range(self.load_concurrency):
+            await discovered.put(_DONE)
+
+    async def _load(self, discovered: asyncio.Queue, parsed: asyncio.Queue) -> None:
+        from rag.ingestion.pipelines.ingest_documents import load_path
+
+        while (item := await discovered.get()) is not _DONE:
+            file_path, lifecycle = item
+            try:
+                documents = await load_path(file_path, department=self.department)
+            except Exception as exc:
+                logger.warning(f"[StreamingIngestion] Failed to load {file_path}: {exc}")
+                self._transition(lifecycle, IngestionState.FAILED, str(exc))
+                self.report.failed_files.append(str(file_path))
+                continue
+            ocr = any(document.metadata.extra.get("ocr_engine_used") for document in documents)
+            self._transition(lifecycle, IngestionState.OCR_COMPLETE if ocr else IngestionState.PARSED)
+            await parsed.put((lifecycle, documents))
+
+    async def _close_after(self, loaders: list[asyncio.Task], parsed: asyncio.Queue) -> None:
+        await asyncio.gather(*loaders)
+        await parsed.put(_DONE)
+
+    async def _chunk(self, parsed: asyncio.Queue, batches: asyncio.Queue) -> None:
+        batch = _IndexBatch()
+        while (item := await parsed.get()) is not _DONE:
+            lifecycle, documents = item
+            chunks = await asyncio.to_thread(self.chunker.chunk_documents, documents)
+            self.report.documents_loaded += len(documents)
+            self.report.chunks_created += len(chunks)
+            self._transition(lifecycle, IngestionState.CHUNKED, f"{len(chunks)} chunks")
+            for chunk in chunks:
+                batch.chunks.append(chunk)
+                if len(batch.chunks) >= self.index_batch_size:
+                    await batches.put(batch)
+                    batch = _IndexBatch()
+            # Marked with the batch holding (or following) the file's last chunk, never before it lands
+            batch.completed.append(lifecycle)
+        if batch.chunks or batch.completed:
+            await batches.put(batch)
+        await batches.put(_DONE)
+
+    async def _index(self, batches: asyncio.Queue) -> None:
+        while (batch := await batches.get()) is not _DONE:
+            if batch.chunks:
+                if self.rebuild and not self._rebuilt:
+                    result = await self.store.arebuild(batch.chunks)
+                    self._rebuilt = True
+                else:
+                    result = await self.store.aadd_chunks(batch.chunks)
+                self.report.chunks_indexed += result["indexed"]
+                self.report.duplicates_skipped += result["duplicates"]
+            for lifecycle in batch.completed:
+                self._transition(lifecycle, IngestionState.EMBEDDED)
+                self._transition(lifecycle, IngestionState.INDEXED)
+
+    def _transition(self, lifecycle: IngestionLifecycle, state: IngestionState, reason: str = "") -> None:
+        self.states[lifecycle.state.value] -= 1
+        lifecycle.transition(state, reason)
+        self.states[state.value] += 1
+
+
+async def stream_ingest(paths: list[str | Path], *, department: str = "", rebuild: bool = False, **options) -> IngestionReport:
+    return await StreamingIngestionPipeline(department=department, rebuild=rebuild, **options).run(paths)
+
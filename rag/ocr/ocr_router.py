@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from config.settings import settings
 from rag.ocr.image_preprocessor import get_image_from_pdf_page
 from rag.ocr.pytesseract_engine import OCRResult, run_ocr as run_pytesseract
 from rag.ocr.text_quality_detector import TextQualityDetector
@@ -11,22 +12,34 @@ from observability.structured_logger import get_logger
 
 logger = get_logger(__name__)
 
+
+class RoutedOCRResult(OCRResult):
+    dpi: int
+
+
 class OCRRouter:
     @staticmethod
-    def process_page(page: Any, raw_text: str) -> OCRResult | None:
+    def process_page(page: Any, raw_text: str) -> RoutedOCRResult | None:
         """
         Checks if a PyMuPDF page needs OCR and runs it if necessary.
         Returns OCRResult if OCR was run, else None.
+
+        The page is rendered at ``OCR_LOW_DPI`` first and only re-rendered at
+        ``OCR_HIGH_DPI`` when confidence falls below ``OCR_RERENDER_CONFIDENCE``.
         """
         if not TextQualityDetector.needs_ocr(raw_text):
             return None
-            
+
         logger.info(f"Page quality too low (chars: {len(raw_text)}). Triggering OCR fallback.")
-        
+
         try:
-            image_bytes = get_image_from_pdf_page(page)
-            result = run_pytesseract(image_bytes)
-            return result
+            dpi = settings.OCR_LOW_DPI
+            result = run_pytesseract(get_image_from_pdf_page(page, dpi=dpi))
+            if result["confidence"] < settings.OCR_RERENDER_CONFIDENCE and settings.OCR_HIGH_DPI > dpi:
+                retry = run_pytesseract(get_image_from_pdf_page(page, dpi=settings.OCR_HIGH_DPI))
+                if retry["confidence"] >= result["confidence"]:
+                    result, dpi = retry, settings.OCR_HIGH_DPI
+            return {**result, "dpi": dpi}
         except Exception as exc:
             logger.error(f"OCR Router failed to process page: {exc}")
             return None
@@ -29,10 +29,22 @@ def run_ocr(image_bytes: bytes, language: str = "eng+hin+mar") -> OCRResult:
         
     try:
         image = Image.open(io.BytesIO(image_bytes))
-        text = pytesseract.image_to_string(image, lang=language)
+        # One pass yields both the words and their confidences; rebuild lines in reading order
+        data = pytesseract.image_to_data(image, lang=language, output_type=pytesseract.Output.DICT)
+        lines: dict[tuple[int, int, int], list[str]] = {}
+        confidences: list[float] = []
+        for index, word in enumerate(data["text"]):
+            if not word.strip():
+                continue
+            key = (data["block_num"][index], data["par_num"][index], data["line_num"][index])
+            lines.setdefault(key, []).append(word)
+            confidence = float(data["conf"][index])
+            if confidence >= 0:
+                confidences.append(confidence)
+        text = "\n".join(" ".join(words) for words in lines.values())
         return {
             "text": text.strip(),
-            "confidence": 0.85 if text.strip() else 0.0,
+            "confidence": round(sum(confidences) / len(confidences) / 100, 3) if confidences else 0.0,
             "engine": "pytesseract"
         }
     except Exception as exc:
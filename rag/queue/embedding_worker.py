@@ -0,0 +1,134 @@
+"""Worker pool that drains the persistent queue of embedding jobs.
+
+A job payload is ``{"path": ..., "department": ...}``. Each worker claims a
+batch of jobs, loads and chunks the files, and indexes them with one batched
+``aadd_chunks`` call so the embedder sees a full batch per round trip. Failed
+jobs are retried with backoff by the queue; jobs that keep failing end up
+dead-lettered.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+
+from config.settings import settings
+from observability.structured_logger import get_logger
+from rag.queue.persistent_queue import PersistentQueue
+
+logger = get_logger(__name__)
+
+# Returns ``{job_id: reason}`` for jobs that failed; the rest are completed
+JobHandler = Callable[[list[dict[str, Any]]], Awaitable[dict[str, str]]]
+
+
+class QueueWorker:
+    def __init__(
+        self,
+        queue: PersistentQueue,
+        handler: JobHandler,
+        *,
+        worker_id: str | None = None,
+        batch_size: int | None = None,
+        poll_interval: float = 1.0,
+    ):
+        self.queue = queue
+        self.handler = handler
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.batch_size = batch_size or settings.QUEUE_CLAIM_BATCH_SIZE
+        self.poll_interval = poll_interval
+
+    async def run(self, *, drain: bool = False) -> int:
+        """Processes jobs until cancelled, or until none are claimable when ``drain`` is set."""
+        processed = 0
+        while True:
+            jobs = self.queue.claim_batch(self.worker_id, self.batch_size)
+            if not jobs:
+                if drain:
+                    return processed
+                await asyncio.sleep(self.poll_interval)
+                continue
+            try:
+                failures = await self.handler(jobs)
+            except Exception as exc:
+                logger.error(f"[QueueWorker] {self.worker_id} batch of {len(jobs)} failed: {exc}")
+                failures = {job["job_id"]: str(exc) for job in jobs}
+            for job_id, reason in failures.items():
+                status = self.queue.fail(job_id, self.worker_id, reason, retryable=True)
+                logger.warning(f"[QueueWorker] Job {job_id} failed ({status}): {reason}")
+            completed = [job["job_id"] for job in jobs if job["job_id"] not in failures]
+            if completed:
+                self.queue.complete_many(completed, self.worker_id)
+            processed += len(jobs)
+
+
+async def index_files(jobs: list[dict[str, Any]]) -> dict[str, str]:
+    from rag.ingestion.chunking.chunker import SmartChunker
+    from rag.ingestion.pipelines.ingest_documents import load_path
+    from rag.vectorstore import get_vector_store
+
+    chunker = SmartChunker()
+    failures: dict[str, str] = {}
+    chunks = []
+    for job in jobs:
+        payload = json.loads(job["payload"])
+        try:
+            documents = await load_path(Path(payload["path"]), department=payload.get("department", ""))
+        except Exception as exc:
+            failures[job["job_id"]] = str(exc)
+            continue
+        chunks.extend(await asyncio.to_thread(chunker.chunk_documents, documents))
+    if chunks:
+        await get_vector_store().aadd_chunks(chunks)
+    return failures
+
+
+def _worker_main(db_path: str, handler: JobHandler, drain: bool) -> None:
+    queue = PersistentQueue(db_path)
+    try:
+        asyncio.run(QueueWorker(queue, handler).run(drain=drain))
+    finally:
+        queue.close()
+
+
+def run_embedding_workers(
+    processes: int = 1,
+    *,
+    db_path: str | None = None,
+    handler: JobHandler = index_files,
+    drain: bool = False,
+) -> None:
+    """Runs ``processes`` worker processes against the queue and waits for them.
+
+    Local FAISS stores hold their index in process memory and have a single
+    writer, so ``index_files`` is limited to one process unless the vector
+    store is MongoDB.
+    """
+    if handler is index_files and processes > 1 and settings.VECTORSTORE_TYPE != "mongodb":
+        logger.warning(f"[QueueWorker] {settings.VECTORSTORE_TYPE} index is single-writer; running 1 process instead of {processes}")
+        processes = 1
+    context = multiprocessing.get_context("spawn")
+    workers = [
+        context.Process(target=_worker_main, args=(db_path or settings.QUEUE_DB_PATH, handler, drain), daemon=False)
+        for _ in range(processes)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Drain queued embedding jobs into the vector store.")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--db", default=None)
+    parser.add_argument("--drain", action="store_true", help="Exit once no job is claimable")
+    args = parser.parse_args()
+    run_embedding_workers(args.processes, db_path=args.db, drain=args.drain)
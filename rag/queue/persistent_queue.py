@@ -1,12 +1,23 @@
-"""SQLite-backed persistent queue for incremental embedding jobs."""
+"""SQLite-backed persistent queue for incremental embedding jobs.
+
+Each thread keeps one WAL-mode connection. Claims are a single
+``UPDATE ... RETURNING`` inside ``BEGIN IMMEDIATE``, so concurrent workers can
+never receive the same job. A claimed job holds a lease. If the lease expires
+(the worker died or stalled), the next claim returns the job to ``PENDING``.
+Retryable failures back off exponentially, and once ``max_attempts`` is
+exhausted the job moves to the ``DEAD`` letter state. Completing or failing a
+job only takes effect while the caller still holds its lease; a worker whose
+lease expired and was re-claimed cannot overwrite the new owner's outcome.
+"""
 
 from __future__ import annotations
 
 import sqlite3
-import contextlib
 import json
+import threading
 import time
-from typing import Any
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
 from pathlib import Path
 
 from config.settings import settings
@@ -14,69 +25,218 @@ from observability.structured_logger import get_logger
 
 logger = get_logger(__name__)
 
+_REQUEUE_EXPIRED = """
+    UPDATE jobs
+       SET status = CASE WHEN attempts >= max_attempts THEN 'DEAD' ELSE 'PENDING' END,
+           failure_reason = 'lease expired', worker_id = NULL, lease_expires_at = NULL
+     WHERE status = 'PROCESSING' AND lease_expires_at < ?
+    RETURNING job_id
+"""
+
+_MIGRATIONS = {
+    "attempts": "INTEGER NOT NULL DEFAULT 0",
+    "max_attempts": "INTEGER NOT NULL DEFAULT 5",
+    "available_at": "REAL NOT NULL DEFAULT 0",
+    "lease_expires_at": "REAL",
+}
+
+
 class PersistentQueue:
-    def __init__(self, db_path: str = "data/queue.db"):
-        self.db_path = Path(db_path)
+    def __init__(self, db_path: str | None = None):
+        self.db_path = Path(db_path or settings.QUEUE_DB_PATH)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
         self._init_db()
-        
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode: transactions are opened explicitly with BEGIN IMMEDIATE
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        # IMMEDIATE takes the write lock up front, so read-then-write never races
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _write(self, sql: str, params: Iterable[Any] = ()) -> list[sqlite3.Row]:
+        with self._transaction() as conn:
+            return conn.execute(sql, tuple(params)).fetchall()
+
     def _init_db(self) -> None:
-        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
-            with conn:
-                conn.execute("""
-                    CREATE TABLE IF NOT EXISTS jobs (
-                        job_id TEXT PRIMARY KEY,
-                        payload TEXT NOT NULL,
-                        status TEXT NOT NULL,
-                        created_at REAL NOT NULL,
-                        started_at REAL,
-                        completed_at REAL,
-                        failure_reason TEXT,
-                        worker_id TEXT
-                    )
-                """)
-            
-    def push(self, job_id: str, payload: dict[str, Any]) -> None:
-        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
-            with conn:
-                conn.execute(
-                    "INSERT INTO jobs (job_id, payload, status, created_at) VALUES (?, ?, ?, ?)",
-                    (job_id, json.dumps(payload), "PENDING", time.time())
-                )
-            
-    def claim(self, worker_id: str) -> dict[str, Any] | None:
+        conn = self._connection()
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                completed_at REAL,
+                failure_reason TEXT,
+                worker_id TEXT
+            )
+        """)
+        existing = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+        for column, definition in _MIGRATIONS.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {definition}")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, available_at, created_at)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires_at)")
+
+    def push(self, job_id: str, payload: dict[str, Any], *, max_attempts: int | None = None) -> None:
+        self.push_many([(job_id, payload)], max_attempts=max_attempts)
+
+    def push_many(self, jobs: Iterable[tuple[str, dict[str, Any]]], *, max_attempts: int | None = None) -> int:
+        now = time.time()
+        attempts = max_attempts or settings.QUEUE_MAX_ATTEMPTS
+        rows = [(job_id, json.dumps(payload), "PENDING", now, attempts, now) for job_id, payload in jobs]
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT INTO jobs (job_id, payload, status, created_at, max_attempts, available_at) VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def claim(self, worker_id: str, *, lease_seconds: float | None = None) -> dict[str, Any] | None:
         """Claims a pending job for a worker."""
-        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
-            with conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute("SELECT * FROM jobs WHERE status = 'PENDING' ORDER BY created_at ASC LIMIT 1")
-                row = cursor.fetchone()
-                if not row:
-                    return None
-                    
-                job_id = row["job_id"]
-                cursor.execute(
-                    "UPDATE jobs SET status = 'PROCESSING', started_at = ?, worker_id = ? WHERE job_id = ?",
-                    (time.time(), worker_id, job_id)
-                )
-            job_dict = dict(row)
-            job_dict["status"] = "PROCESSING"
-            job_dict["worker_id"] = worker_id
-            return job_dict
-            
-    def complete(self, job_id: str) -> None:
-        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
-            with conn:
-                conn.execute(
-                    "UPDATE jobs SET status = 'COMPLETED', completed_at = ? WHERE job_id = ?",
-                    (time.time(), job_id)
-                )
-            
-    def fail(self, job_id: str, reason: str) -> None:
-        with contextlib.closing(sqlite3.connect(self.db_path)) as conn:
-            with conn:
-                conn.execute(
-                    "UPDATE jobs SET status = 'FAILED', completed_at = ?, failure_reason = ? WHERE job_id = ?",
-                    (time.time(), reason, job_id)
-                )
+        jobs = self.claim_batch(worker_id, 1, lease_seconds=lease_seconds)
+        return jobs[0] if jobs else None
+
+    def claim_batch(self, worker_id: str, limit: int, *, lease_seconds: float | None = None) -> list[dict[str, Any]]:
+        """Atomically claims up to ``limit`` of the oldest available jobs."""
+        now = time.time()
+        lease = lease_seconds or settings.QUEUE_LEASE_SECONDS
+        with self._transaction() as conn:
+            expired = conn.execute(_REQUEUE_EXPIRED, (now,)).fetchall()
+            rows = conn.execute(
+                """
+            UPDATE jobs
+               SET status = 'PROCESSING', started_at = ?, worker_id = ?, attempts = attempts + 1, lease_expires_at = ?
+             WHERE job_id IN (
+                   SELECT job_id FROM jobs
+                    WHERE status = 'PENDING' AND available_at <= ?
+                    ORDER BY created_at ASC
+                    LIMIT ?)
+            RETURNING *
+            """,
+                (now, worker_id, now + lease, now, limit),
+            ).fetchall()
+        if expired:
+            logger.warning(f"[PersistentQueue] Requeued {len(expired)} jobs with expired leases")
+        return sorted((dict(row) for row in rows), key=lambda job: job["created_at"])
+
+    def extend_lease(self, job_id: str, worker_id: str, *, lease_seconds: float | None = None) -> bool:
+        """Heartbeat for long jobs; False if the lease was lost to another worker."""
+        expires = time.time() + (lease_seconds or settings.QUEUE_LEASE_SECONDS)
+        rows = self._write(
+            "UPDATE jobs SET lease_expires_at = ? WHERE job_id = ? AND worker_id = ? AND status = 'PROCESSING' RETURNING job_id",
+            (expires, job_id, worker_id),
+        )
+        return bool(rows)
+
+    def requeue_expired(self, *, now: float | None = None) -> int:
+        """Returns jobs whose lease ran out to PENDING, or DEAD once out of attempts."""
+        rows = self._write(_REQUEUE_EXPIRED, (now or time.time(),))
+        if rows:
+            logger.warning(f"[PersistentQueue] Requeued {len(rows)} jobs with expired leases")
+        return len(rows)
+
+    def complete(self, job_id: str, worker_id: str) -> bool:
+        """False if ``worker_id`` no longer holds the job's lease."""
+        return not self.complete_many([job_id], worker_id)
+
+    def complete_many(self, job_ids: list[str], worker_id: str) -> list[str]:
+        """Completes the jobs ``worker_id`` still holds and returns the ids it had lost."""
+        if not job_ids:
+            return []
+        placeholders = ", ".join("?" for _ in job_ids)
+        rows = self._write(
+            f"""
+            UPDATE jobs SET status = 'COMPLETED', completed_at = ?, lease_expires_at = NULL
+             WHERE job_id IN ({placeholders}) AND status = 'PROCESSING' AND worker_id = ?
+            RETURNING job_id
+            """,
+            (time.time(), *job_ids, worker_id),
+        )
+        completed = {row["job_id"] for row in rows}
+        lost = [job_id for job_id in job_ids if job_id not in completed]
+        if lost:
+            logger.warning(f"[PersistentQueue] {worker_id} lost the lease on {len(lost)} jobs before completing them")
+        return lost
+
+    def fail(self, job_id: str, worker_id: str, reason: str, *, retryable: bool = False) -> str:
+        """Records a failure and returns the job's new status.
+
+        Non-retryable failures are final (``FAILED``). Retryable ones go back to
+        ``PENDING`` after an exponential backoff, or to ``DEAD`` once
+        ``max_attempts`` claims have been used. Returns ``LOST`` without
+        touching the job if ``worker_id`` no longer holds its lease.
+        """
+        now = time.time()
+        if not retryable:
+            rows = self._write(
+                """
+                UPDATE jobs SET status = 'FAILED', completed_at = ?, failure_reason = ?, lease_expires_at = NULL
+                 WHERE job_id = ? AND status = 'PROCESSING' AND worker_id = ?
+                RETURNING status
+                """,
+                (now, reason, job_id, worker_id),
+            )
+        else:
+            rows = self._write(
+                """
+                UPDATE jobs
+                   SET status = CASE WHEN attempts >= max_attempts THEN 'DEAD' ELSE 'PENDING' END,
+                       available_at = ? + MIN(? * (1 << MAX(attempts - 1, 0)), ?),
+                       failure_reason = ?, worker_id = NULL, lease_expires_at = NULL
+                 WHERE job_id = ? AND status = 'PROCESSING' AND worker_id = ?
+                RETURNING status
+                """,
+                (now, settings.QUEUE_RETRY_BASE_SECONDS, settings.QUEUE_RETRY_MAX_SECONDS, reason, job_id, worker_id),
+            )
+        if not rows:
+            logger.warning(f"[PersistentQueue] {worker_id} lost the lease on {job_id} before failing it")
+            return "LOST"
+        return rows[0]["status"]
+
+    def dead_letters(self, limit: int = 100) -> list[dict[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT * FROM jobs WHERE status = 'DEAD' ORDER BY created_at ASC LIMIT ?", (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def requeue_dead(self, job_ids: list[str] | None = None) -> int:
+        """Gives dead-lettered jobs a fresh set of attempts."""
+        where = "status = 'DEAD'"
+        params: list[Any] = [time.time()]
+        if job_ids:
+            where += f" AND job_id IN ({', '.join('?' for _ in job_ids)})"
+            params.extend(job_ids)
+        rows = self._write(
+            f"UPDATE jobs SET status = 'PENDING', attempts = 0, available_at = ?, failure_reason = NULL WHERE {where} RETURNING job_id",
+            params,
+        )
+        return len(rows)
+
+    def counts(self) -> dict[str, int]:
+        rows = self._connection().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
@@ -48,6 +48,15 @@ async def retrieve_rag_results(
     return await get_hybrid_retriever().retrieve(query, department=department, language=language, k=k)
 
 
+async def retrieve_rag_results_many(
+    queries: list[str],
+    department: str = "",
+    languages: list[str] | None = None,
+    k: int | None = None,
+) -> tuple[list[RetrievalResult], bool, float]:
+    return await get_hybrid_retriever().retrieve_many(queries, department=department, languages=languages, k=k)
+
+
 async def retrieve_multilingual_results(
     query: str,
     department: str = "",
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import time
@@ -12,7 +13,7 @@ from observability.structured_logger import get_logger
 from rag.retrievers.metadata_filter import apply_recency_boost, infer_department, keyword_overlap_score
 from rag.retrievers.semantic_retriever import SemanticRetriever
 from rag.types import RetrievalResult
-from rag.vectorstore.semantic_cache import get_semantic_cache
+from rag.vectorstore.semantic_cache import get_semantic_cache, get_semantic_query_cache
 
 logger = get_logger(__name__)
 
@@ -20,6 +21,7 @@ logger = get_logger(__name__)
 class HybridRetriever:
     def __init__(self, semantic_retriever: SemanticRetriever | None = None):
         self.semantic = semantic_retriever or SemanticRetriever()
+        self.query_cache = get_semantic_query_cache()
 
     async def retrieve(
         self,
@@ -35,8 +37,13 @@ class HybridRetriever:
         normalized_department = infer_department(query, department)
         cache_key = _cache_key(query, normalized_department, language, k)
 
+        query_embedding: list[float] | None = None
         if use_cache:
             cached = await self._cache_get(cache_key)
+            if cached is None:
+                query_embedding = await self._embed_query(query)
+                if query_embedding is not None:
+                    cached = self.query_cache.get(query_embedding, department=normalized_department, language=language, k=k)
             if cached is not None:
                 rag_retrieval_latency.observe(time.perf_counter() - started)
                 retrieval_hit_rate.labels(source="cache").inc()
@@ -47,19 +54,109 @@ class HybridRetriever:
             department=normalized_department,
             language=language,
             k=max(k * 4, k),
+            query_embedding=query_embedding,
         )
         if not candidates and normalized_department:
-            candidates = await self.semantic.retrieve(query, language=language, k=max(k * 4, k))
+            candidates = await self.semantic.retrieve(query, language=language, k=max(k * 4, k), query_embedding=query_embedding)
 
         reranked = self._rerank(query, candidates, normalized_department)[:k]
         if reranked:
             retrieval_hit_rate.labels(source="faiss").inc()
             await self._cache_set(cache_key, reranked)
+            if query_embedding is not None:
+                self.query_cache.set(query_embedding, reranked, department=normalized_department, language=language, k=k)
         else:
             retrieval_hit_rate.labels(source="miss").inc()
         rag_retrieval_latency.observe(time.perf_counter() - started)
         return reranked, False, _confidence(reranked)
 
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        *,
+        department: str = "",
+        languages: list[str] | None = None,
+        k: int | None = None,
+        use_cache: bool = True,
+    ) -> tuple[list[RetrievalResult], bool, float]:
+        """Retrieves and merges every ``(query, language)`` variant in one batched pass.
+
+        Behaves like merging ``retrieve`` over the cross product, but the store
+        receives one ``(n, d)`` query matrix per inferred department instead of
+        ``len(queries) * len(languages)`` independent searches.
+        """
+        started = time.perf_counter()
+        k = k or getattr(settings, "FAISS_TOP_K", settings.RAG_TOP_K)
+        languages = list(dict.fromkeys(languages or [""]))
+        departments = [infer_department(query, department) for query in queries]
+        cache_key = _cache_key("\n".join(queries), "|".join(departments), ",".join(languages), k)
+
+        if use_cache:
+            cached = await self._cache_get(cache_key)
+            if cached is not None:
+                rag_retrieval_latency.observe(time.perf_counter() - started)
+                retrieval_hit_rate.labels(source="cache").inc()
+                return cached, True, _confidence(cached)
+
+        fetch_k = max(k * 4, k)
+        candidates = await self._retrieve_grouped(queries, departments, languages, fetch_k)
+        # Mirrors `retrieve`: a (query, language) pair with no hits under its department retries unfiltered
+        retry = [
+            index
+            for index, partitions in enumerate(candidates)
+            if departments[index] and any(not partitions[language] for language in languages)
+        ]
+        if retry:
+            fallback = await self._retrieve_grouped([queries[index] for index in retry], [""] * len(retry), languages, fetch_k)
+            for index, partitions in zip(retry, fallback):
+                for language in languages:
+                    if not candidates[index][language]:
+                        candidates[index][language] = partitions[language]
+
+        merged: dict[str, RetrievalResult] = {}
+        confidence = 0.0
+        for query, query_department, partitions in zip(queries, departments, candidates):
+            for language in languages:
+                # The same hit can appear under several languages; rerank mutates scores, so copy.
+                copies = [result.model_copy() for result in partitions[language]]
+                reranked = self._rerank(query, copies, query_department)[:k]
+                confidence = max(confidence, _confidence(reranked))
+                for result in reranked:
+                    key = _merge_key(result)
+                    if key not in merged or result.score > merged[key].score:
+                        merged[key] = result
+        ranked = sorted(merged.values(), key=lambda item: item.score, reverse=True)[:k]
+
+        if ranked:
+            retrieval_hit_rate.labels(source="faiss").inc()
+            await self._cache_set(cache_key, ranked)
+        else:
+            retrieval_hit_rate.labels(source="miss").inc()
+        rag_retrieval_latency.observe(time.perf_counter() - started)
+        return ranked, False, round(confidence, 4)
+
+    async def _retrieve_grouped(
+        self,
+        queries: list[str],
+        departments: list[str],
+        languages: list[str],
+        k: int,
+    ) -> list[dict[str, list[RetrievalResult]]]:
+        groups: dict[str, list[int]] = {}
+        for index, query_department in enumerate(departments):
+            groups.setdefault(query_department, []).append(index)
+        batches = await asyncio.gather(
+            *(
+                self.semantic.retrieve_many([queries[index] for index in indexes], department=group, languages=languages, k=k)
+                for group, indexes in groups.items()
+            )
+        )
+        candidates: list[dict[str, list[RetrievalResult]]] = [{} for _query in queries]
+        for indexes, batch in zip(groups.values(), batches):
+            for index, partitions in zip(indexes, batch):
+                candidates[index] = partitions
+        return candidates
+
     def _rerank(self, query: str, results: list[RetrievalResult], department: str) -> list[RetrievalResult]:
         deduped: dict[str, RetrievalResult] = {}
         for result in results:
@@ -79,6 +176,20 @@ class HybridRetriever:
             ranked.append(result)
         return sorted(ranked, key=lambda item: item.score, reverse=True)
 
+    async def _embed_query(self, query: str) -> list[float] | None:
+        """Embeds the query for the similarity cache using the vector store's embedder.
+
+        The vector is handed to the store search on a cache miss, so the query is embedded once.
+        """
+        embedder = getattr(self.semantic.store, "embedder", None)
+        if embedder is None or not getattr(settings, "RAG_SEMANTIC_CACHE_ENABLED", True):
+            return None
+        try:
+            return await asyncio.to_thread(embedder.embed_query, query)
+        except Exception as exc:
+            logger.warning(f"[HybridRetriever] Query embedding for semantic cache failed: {exc}")
+            return None
+
     async def _cache_get(self, key: str) -> list[RetrievalResult] | None:
         try:
             cache = await get_semantic_cache()
@@ -104,6 +215,12 @@ def _cache_key(query: str, department: str, language: str, k: int) -> str:
     return f"rti:rag:{hashlib.sha256(content.encode()).hexdigest()[:24]}"
 
 
+def _merge_key(result: RetrievalResult) -> str:
+    return result.metadata.source_hash or hashlib.sha256(
+        (result.text[:300] + result.citation).encode("utf-8", errors="ignore")
+    ).hexdigest()
+
+
 def _confidence(results: list[RetrievalResult]) -> float:
     if not results:
         return 0.0
@@ -20,13 +20,51 @@ class SemanticRetriever:
         language: str = "",
         document_type: str = "",
         k: int | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[RetrievalResult]:
         filters = build_filters(department=department, language=language, document_type=document_type)
+        search_kwargs = {"query_embedding": query_embedding} if query_embedding is not None else {}
         results = await self.store.asimilarity_search_with_score(
             query,
             k=k or getattr(settings, "FAISS_TOP_K", settings.RAG_TOP_K),
             filters=filters or None,
+            **search_kwargs,
         )
         threshold = settings.RAG_SIMILARITY_THRESHOLD
         return [result for result, _distance in results if result.score >= threshold]
 
+
+    async def retrieve_many(
+        self,
+        queries: list[str],
+        *,
+        department: str = "",
+        languages: list[str] | None = None,
+        document_type: str = "",
+        k: int | None = None,
+    ) -> list[dict[str, list[RetrievalResult]]]:
+        """Retrieves every query under every language with one batched store search.
+
+        The store is searched once over the union of ``languages`` (``""`` means
+        unfiltered) and each query's hits are then split into per-language
+        candidate lists of at most ``k``.
+        """
+        k = k or getattr(settings, "FAISS_TOP_K", settings.RAG_TOP_K)
+        languages = list(dict.fromkeys(languages or [""]))
+        filters = build_filters(department=department, document_type=document_type)
+        if "" not in languages:
+            filters["language"] = languages
+        batches = await self.store.asimilarity_search_many(queries, k=k * len(languages), filters=filters or None)
+        threshold = settings.RAG_SIMILARITY_THRESHOLD
+        partitioned: list[dict[str, list[RetrievalResult]]] = []
+        for results in batches:
+            kept = [result for result, _distance in results if result.score >= threshold]
+            partitioned.append(
+                {
+                    language: [
+                        result for result in kept if not language or result.metadata.language.lower() == language.lower()
+                    ][:k]
+                    for language in languages
+                }
+            )
+        return partitioned
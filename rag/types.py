@@ -73,6 +73,8 @@ class ScrapeTarget(BaseModel):
     department: str = ""
     allowed_domains: list[str] = Field(default_factory=list)
     start_paths: list[str] = Field(default_factory=lambda: ["/"])
+    sitemaps: list[str] = Field(default_factory=list)
+    feeds: list[str] = Field(default_factory=list)
     document_types: list[str] = Field(default_factory=list)
     max_depth: int = 1
     rate_limit_per_second: float = 0.5
@@ -85,6 +87,7 @@ class ScrapeResult(BaseModel):
     pages_saved: int = 0
     pdfs_saved: int = 0
     duplicates: int = 0
+    unchanged: int = 0
     failures: list[str] = Field(default_factory=list)
     documents: list[LoadedDocument] = Field(default_factory=list)
 
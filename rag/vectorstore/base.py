@@ -2,8 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Collection
 
 from rag.types import DocumentChunk, RetrievalResult
 
@@ -29,6 +30,37 @@ class BaseVectorStore(ABC):
         """Performs a similarity search returning results and scores."""
         pass
         
+    def similarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        """Searches several queries under one filter; backends override to embed and search in one batch."""
+        return [self.similarity_search_with_score(query, k=k, filters=filters) for query in queries]
+
+    async def asimilarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        return await asyncio.to_thread(self.similarity_search_many, queries, k=k, filters=filters)
+
+    def supersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        """Retires the latest chunks of ``document_id`` in favour of a new version.
+
+        Chunks whose ``content_hash`` is in ``carried_hashes`` were deduplicated
+        against the new version, so they take the ``successor`` metadata and stay
+        served; the rest stop matching searches. Returns the number retired.
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot retire superseded documents")
+
+    async def asupersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        return await asyncio.to_thread(self.supersede_document, document_id, successor, carried_hashes)
+
     @abstractmethod
     def stats(self) -> dict[str, Any]:
         """Returns the health and statistics of the vector store."""
@@ -0,0 +1,80 @@
+"""Integer-coded metadata columns shared by the in-process vector backends."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+# Metadata keys kept as integer-coded columns, and boolean flag columns
+CODED_COLUMNS = ("department", "language", "document_type", "document_id")
+FLAG_COLUMNS = ("is_active", "is_latest")
+
+
+class Vocabulary:
+    """Case-insensitive string <-> integer code mapping for one metadata column."""
+
+    def __init__(self, labels: list[str] | None = None):
+        self.labels: list[str] = list(labels or [])
+        self.codes: dict[str, int] = {label.lower(): code for code, label in enumerate(self.labels)}
+
+    def encode(self, value: Any) -> int:
+        label = "" if value is None else str(value)
+        key = label.lower()
+        code = self.codes.get(key)
+        if code is None:
+            code = len(self.labels)
+            self.labels.append(label)
+            self.codes[key] = code
+        return code
+
+    def lookup(self, value: Any) -> int | None:
+        return self.codes.get(str(value).lower())
+
+
+def empty_columns() -> tuple[dict[str, Vocabulary], dict[str, np.ndarray], dict[str, np.ndarray]]:
+    """Fresh ``(vocab, coded, flags)`` for an empty store."""
+    return (
+        {name: Vocabulary() for name in CODED_COLUMNS},
+        {name: np.empty(0, dtype=np.int32) for name in CODED_COLUMNS},
+        {name: np.empty(0, dtype=bool) for name in FLAG_COLUMNS},
+    )
+
+
+def append_columns(
+    vocab: dict[str, Vocabulary],
+    coded: dict[str, np.ndarray],
+    flags: dict[str, np.ndarray],
+    metadatas: Iterable[dict[str, Any]],
+) -> None:
+    """Appends one row per metadata dict; arrays are replaced, never resized in place."""
+    metadatas = list(metadatas)
+    for name in CODED_COLUMNS:
+        codes = np.fromiter((vocab[name].encode(metadata.get(name, "")) for metadata in metadatas), dtype=np.int32, count=len(metadatas))
+        coded[name] = np.concatenate([coded[name], codes])
+    for name in FLAG_COLUMNS:
+        values = np.fromiter((bool(metadata.get(name, True)) for metadata in metadatas), dtype=bool, count=len(metadatas))
+        flags[name] = np.concatenate([flags[name], values])
+
+
+def columnar_mask(
+    vocab: dict[str, Vocabulary],
+    coded: dict[str, np.ndarray],
+    flags: dict[str, np.ndarray],
+    filters: dict[str, Any] | None,
+) -> tuple[np.ndarray, dict[str, Any]]:
+    """Returns the active-row mask for the columnar keys of ``filters`` and the filters it could not apply."""
+    mask = flags["is_active"].copy()
+    residual: dict[str, Any] = {}
+    for key, expected in (filters or {}).items():
+        if expected in (None, "", []):
+            continue
+        values = expected if isinstance(expected, list) else [expected]
+        if key in CODED_COLUMNS:
+            codes = [code for code in (vocab[key].lookup(value) for value in values) if code is not None]
+            mask &= np.isin(coded[key], codes)
+        elif key in FLAG_COLUMNS:
+            mask &= np.isin(flags[key], [str(value).lower() == "true" for value in values])
+        else:
+            residual[key] = expected
+    return mask, residual
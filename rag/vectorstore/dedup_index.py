@@ -0,0 +1,113 @@
+"""Persistent chunk-id / content-hash index for ingestion duplicate control."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import Iterable
+from pathlib import Path
+
+from observability.structured_logger import get_logger
+from rag.types import DocumentChunk
+
+logger = get_logger(__name__)
+
+
+def partition_new_chunks(
+    chunks: list[DocumentChunk],
+    known_ids: set[str],
+    known_hashes: set[str],
+) -> list[DocumentChunk]:
+    """Returns chunks that are neither known nor repeated earlier in the same batch."""
+    fresh: list[DocumentChunk] = []
+    batch_ids: set[str] = set()
+    batch_hashes: set[str] = set()
+    for chunk in chunks:
+        if chunk.chunk_id in known_ids or chunk.chunk_id in batch_ids:
+            continue
+        if chunk.content_hash in known_hashes or chunk.content_hash in batch_hashes:
+            continue
+        batch_ids.add(chunk.chunk_id)
+        batch_hashes.add(chunk.content_hash)
+        fresh.append(chunk)
+    return fresh
+
+
+class ChunkHashIndex:
+    """SQLite set of indexed ``(chunk_id, content_hash)`` pairs with bulk membership checks.
+
+    Membership for a whole batch is resolved with one query per key column by
+    passing the batch as a JSON array to ``json_each``, so the cost of dedup is
+    independent of corpus size and does not hit SQLite's parameter limit.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._init_db()
+
+    def _init_db(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_chunks_content_hash ON chunks (content_hash)")
+
+    def known(self, chunk_ids: Iterable[str], content_hashes: Iterable[str]) -> tuple[set[str], set[str]]:
+        """Returns the subsets of ``chunk_ids`` and ``content_hashes`` already indexed."""
+        ids_json = json.dumps(list(chunk_ids))
+        hashes_json = json.dumps(list(content_hashes))
+        with self._lock:
+            known_ids = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT chunk_id FROM chunks WHERE chunk_id IN (SELECT value FROM json_each(?))", (ids_json,)
+                )
+            }
+            known_hashes = {
+                row[0]
+                for row in self._conn.execute(
+                    "SELECT content_hash FROM chunks WHERE content_hash IN (SELECT value FROM json_each(?))", (hashes_json,)
+                )
+            }
+        return known_ids, known_hashes
+
+    def filter_new(self, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        known_ids, known_hashes = self.known(
+            (chunk.chunk_id for chunk in chunks),
+            (chunk.content_hash for chunk in chunks),
+        )
+        return partition_new_chunks(chunks, known_ids, known_hashes)
+
+    def add(self, pairs: Iterable[tuple[str, str]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR IGNORE INTO chunks (chunk_id, content_hash) VALUES (?, ?)", pairs)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0])
+
+    def resync(self, pairs: Iterable[tuple[str, str]], expected: int) -> None:
+        """Rebuilds the index from the store's own records when the counts disagree."""
+        if self.count() == expected:
+            return
+        logger.warning(f"[ChunkHashIndex] Resyncing {self.db_path} from store records")
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM chunks")
+            self._conn.executemany("INSERT OR IGNORE INTO chunks (chunk_id, content_hash) VALUES (?, ?)", pairs)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,147 @@
+"""Process-local embedding matrix used when MongoDB `$vectorSearch` is unavailable.
+
+Embeddings are pulled from Mongo once into a normalized float32 matrix plus
+integer-coded filter columns. Each query is then one matrix-vector product and
+an ``argpartition``; only the top-k documents are fetched back from Mongo.
+
+Freshness is tracked through a small version document that
+``MongoDBVectorStore`` bumps on every write: ``version`` for appends (pulled
+incrementally by ``created_at``) and ``epoch`` for destructive changes
+(full reload). Writers that update chunk metadata in place outside the store
+should bump ``epoch`` as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+import numpy as np
+
+from config.settings import settings
+from observability.structured_logger import get_logger
+from rag.vectorstore.columns import CODED_COLUMNS, FLAG_COLUMNS, append_columns, columnar_mask, empty_columns
+
+logger = get_logger(__name__)
+
+META_COLLECTION = "vector_store_meta"
+
+
+class LocalEmbeddingMatrix:
+    def __init__(self, collection_name: str):
+        self.collection_name = collection_name
+        self._lock = asyncio.Lock()
+        self._checked_at = 0.0
+        self._reset()
+
+    def _reset(self) -> None:
+        self.ids: list[str] = []
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.vocab, self.coded, self.flags = empty_columns()
+        self.epoch: int | None = None
+        self.version: int | None = None
+        self.watermark = 0.0
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    async def sync(self, db) -> None:
+        """Brings the matrix up to date with the collection's version document."""
+        if time.monotonic() - self._checked_at < settings.MONGO_LOCAL_INDEX_REFRESH_SECONDS and self.epoch is not None:
+            return
+        async with self._lock:
+            meta = await db[META_COLLECTION].find_one({"_id": self.collection_name}) or {}
+            epoch, version = int(meta.get("epoch", 0)), int(meta.get("version", 0))
+            if epoch != self.epoch:
+                self._reset()
+                await self._pull(db[self.collection_name], {})
+            elif version != self.version:
+                # Overlap the watermark slightly; already-loaded ids are skipped.
+                await self._pull(db[self.collection_name], {"created_at": {"$gte": self.watermark - 1.0}})
+            self.epoch, self.version = epoch, version
+            self._checked_at = time.monotonic()
+
+    async def _pull(self, collection, query: dict[str, Any]) -> None:
+        started = time.perf_counter()
+        projection = {"_id": 1, "embedding": 1, "created_at": 1, **{f"metadata.{name}": 1 for name in (*CODED_COLUMNS, *FLAG_COLUMNS)}}
+        known = set(self.ids)
+        ids: list[str] = []
+        vectors: list[list[float]] = []
+        metadatas: list[dict[str, Any]] = []
+        async for document in collection.find(query, projection):
+            if document["_id"] in known or not document.get("embedding"):
+                continue
+            ids.append(document["_id"])
+            vectors.append(document["embedding"])
+            metadatas.append(document.get("metadata") or {})
+            self.watermark = max(self.watermark, float(document.get("created_at") or 0.0))
+        if ids:
+            self._append(ids, vectors, metadatas)
+        logger.info(
+            f"[LocalEmbeddingMatrix] Pulled {len(ids)} embeddings in {time.perf_counter() - started:.2f}s "
+            f"(total {self.size})"
+        )
+
+    def _append(self, ids: list[str], vectors: list[list[float]], metadatas: list[dict[str, Any]]) -> None:
+        block = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+        block /= np.where(norms == 0, 1.0, norms)
+        self.matrix = block if self.size == 0 else np.vstack([self.matrix, block])
+        # Rebound, not extended: queries keep using the list they snapshotted
+        self.ids = self.ids + ids
+        append_columns(self.vocab, self.coded, self.flags, metadatas)
+
+    async def query(
+        self,
+        db,
+        query_embedding: list[float],
+        *,
+        k: int,
+        filters: dict[str, Any] | None,
+        mongo_filter: dict[str, Any],
+    ) -> list[tuple[str, float]]:
+        """Returns ``(chunk_id, cosine score)`` pairs for the top-k filtered rows."""
+        await self.sync(db)
+        # Syncs replace the arrays instead of mutating them, so a snapshot taken
+        # under the lock stays consistent while the scan runs without it.
+        async with self._lock:
+            mask, residual = self.filter_mask(filters)
+            matrix, ids = self.matrix, self.ids
+        if residual and mask.any():
+            cursor = db[self.collection_name].find(mongo_filter, {"_id": 1})
+            mask = self.restrict(mask, {document["_id"] async for document in cursor}, ids)
+        return await asyncio.to_thread(self.top_k, query_embedding, mask, k, matrix, ids)
+
+    def filter_mask(self, filters: dict[str, Any] | None) -> tuple[np.ndarray, dict[str, Any]]:
+        """Returns the row mask for columnar filters and the filters it could not apply."""
+        return columnar_mask(self.vocab, self.coded, self.flags, filters)
+
+    def restrict(self, mask: np.ndarray, allowed_ids: set[str], ids: list[str] | None = None) -> np.ndarray:
+        ids = self.ids if ids is None else ids
+        return mask & np.fromiter((chunk_id in allowed_ids for chunk_id in ids), dtype=bool, count=len(ids))
+
+    def top_k(
+        self,
+        query_embedding: list[float],
+        mask: np.ndarray,
+        k: int,
+        matrix: np.ndarray | None = None,
+        ids: list[str] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Scores the masked rows; ``matrix`` and ``ids`` default to the live arrays."""
+        matrix = self.matrix if matrix is None else matrix
+        ids = self.ids if ids is None else ids
+        candidates = np.flatnonzero(mask)
+        if candidates.size == 0 or k <= 0:
+            return []
+        query = np.asarray(query_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if norm == 0.0:
+            return []
+        scores = matrix[candidates] @ (query / norm) if candidates.size < len(ids) else matrix @ (query / norm)
+        k = min(k, candidates.size)
+        top = np.argpartition(-scores, k - 1)[:k] if k < candidates.size else np.arange(candidates.size)
+        top = top[np.argsort(-scores[top])]
+        return [(ids[int(candidates[position])], float(scores[position])) for position in top]
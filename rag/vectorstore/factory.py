@@ -13,9 +13,13 @@ def get_vector_store() -> BaseVectorStore:
     """Gets the active vector store singleton configured in settings."""
     global _vector_store
     if _vector_store is None:
-        if getattr(settings, "VECTORSTORE_TYPE", "faiss") == "mongodb":
+        store_type = getattr(settings, "VECTORSTORE_TYPE", "faiss")
+        if store_type == "mongodb":
             from rag.vectorstore.mongo_store import get_mongo_store
             _vector_store = get_mongo_store()
+        elif store_type == "faiss_native":
+            from rag.vectorstore.native_faiss_store import get_native_faiss_store
+            _vector_store = get_native_faiss_store()
         else:
             _vector_store = get_faiss_store()
     return _vector_store
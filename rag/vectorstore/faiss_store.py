@@ -1,28 +1,50 @@
-"""Persistent FAISS vector store with metadata manifest and duplicate control."""
+"""Persistent FAISS vector store with metadata manifest and duplicate control.
+
+On-disk layout under ``FAISS_INDEX_PATH``:
+
+- ``index.faiss`` / ``index.pkl`` / ``manifest.json``: the compacted base snapshot;
+- ``segments/<seq>/``: small delta indexes written by each ``add_chunks`` call;
+- ``manifest.log.jsonl``: append-only log of segment additions and metadata
+  updates. A log line is the commit point for a segment; a torn trailing line
+  or a segment directory without a log line is ignored on load.
+
+Ingestion therefore costs O(batch) on disk. A background compactor folds the
+segments and log into a new base snapshot using directory renames so that a
+crash at any point either keeps the old snapshot or rolls the new one forward.
+"""
 
 from __future__ import annotations
 
 import asyncio
 import json
 import os
+import shutil
+import threading
 import time
+import uuid
 from pathlib import Path
-from typing import Any
+from typing import Any, Collection
 
+import faiss
+import numpy as np
 from langchain_core.documents import Document
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.vectorstores import FAISS
 
 from config.settings import settings
 from observability.metrics import faiss_search_duration
 from observability.structured_logger import get_logger
-from rag.embeddings.embedding_router import get_embedder
+from rag.embeddings.embedding_router import embed_queries, get_embedder
 from rag.types import DocumentChunk, DocumentMetadata, RetrievalResult
 from rag.vectorstore.base import BaseVectorStore
+from rag.vectorstore.dedup_index import ChunkHashIndex, partition_new_chunks
 
 logger = get_logger(__name__)
 
 _store: "RealFaissStore | None" = None
 
+BASE_FILES = ("index.faiss", "index.pkl", "manifest.json")
+
 
 class RealFaissStore(BaseVectorStore):
     def __init__(self, index_path: str | Path | None = None):
@@ -31,14 +53,32 @@ class RealFaissStore(BaseVectorStore):
         self.embedder = get_embedder().get_langchain_embedder()
         self.store: FAISS | None = None
         self.manifest: dict[str, dict[str, Any]] = {}
+        self._seq = 0
+        self._segment_count = 0
+        # Bumped whenever the base is replaced wholesale; a compaction cloned from an older base is discarded
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._compactor: threading.Thread | None = None
         self.index_path.mkdir(parents=True, exist_ok=True)
+        self.hash_index = ChunkHashIndex(self.index_path / "chunk_hashes.db")
+        self._recover()
         self._load_manifest()
         self._load_index()
+        self._replay_log()
+        self.hash_index.resync(_hash_pairs(self.manifest.items()), len(self.manifest))
 
     @property
     def is_loaded(self) -> bool:
         return self.store is not None
 
+    @property
+    def log_path(self) -> Path:
+        return self.index_path / "manifest.log.jsonl"
+
+    @property
+    def segments_path(self) -> Path:
+        return self.index_path / "segments"
+
     def _load_manifest(self) -> None:
         if self.manifest_path.exists():
             try:
@@ -48,70 +88,234 @@ class RealFaissStore(BaseVectorStore):
                 self.manifest = {}
 
     def _save_manifest(self) -> None:
-        self.manifest_path.write_text(json.dumps(self.manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        _atomic_write_text(self.manifest_path, json.dumps(self.manifest, ensure_ascii=False))
 
     def _load_index(self) -> None:
         if not (self.index_path / "index.faiss").exists():
-            logger.warning(f"[FAISSStore] No FAISS index found at {self.index_path}")
+            if not self.log_path.exists():
+                logger.warning(f"[FAISSStore] No FAISS index found at {self.index_path}")
             return
+        self.store = self._load_faiss(self.index_path)
+
+    def _load_faiss(self, path: Path) -> FAISS | None:
         try:
             trusted_local_index = self._is_trusted_local_index()
-            self.store = FAISS.load_local(
-                str(self.index_path),
+            store = FAISS.load_local(
+                str(path),
                 self.embedder,
                 allow_dangerous_deserialization=(
                     getattr(settings, "FAISS_ALLOW_DANGEROUS_DESERIALIZATION", False)
                     or trusted_local_index
                 ),
             )
-            logger.info(f"[FAISSStore] Loaded index from {self.index_path}")
+            logger.info(f"[FAISSStore] Loaded index from {path}")
+            return store
         except ValueError as exc:
             logger.error(
                 "[FAISSStore] Refused unsafe FAISS docstore deserialization. "
                 "Set FAISS_ALLOW_DANGEROUS_DESERIALIZATION=true only for trusted local indexes."
             )
             logger.debug(str(exc))
-            self.store = None
         except Exception as exc:
             logger.error(f"[FAISSStore] Failed to load index: {exc}")
-            self.store = None
+        return None
 
     def _is_trusted_local_index(self) -> bool:
         """Only auto-load LangChain's pickle docstore for indexes created inside this workspace."""
         try:
             root = Path.cwd().resolve()
             resolved = self.index_path.resolve()
-            return self.manifest_path.exists() and resolved.is_relative_to(root)
+            return (self.manifest_path.exists() or self.log_path.exists()) and resolved.is_relative_to(root)
         except Exception:
             return False
 
+    # ── Append-only segment log ───────────────────────────────────
+
+    def _replay_log(self) -> None:
+        for record in _read_log(self.log_path):
+            self._seq = max(self._seq, record["seq"])
+            if record["op"] == "add":
+                for metadata in record["chunks"]:
+                    self.manifest[metadata["chunk_id"]] = metadata
+                if self.store is not None and record["chunks"][0]["chunk_id"] in self.store.docstore._dict:
+                    continue
+                segment = self._load_faiss(self.segments_path / _segment_name(record["seq"]))
+                if segment is not None:
+                    self._merge(segment)
+                    self._segment_count += 1
+            elif record["op"] == "update":
+                for chunk_id in record["chunk_ids"]:
+                    if chunk_id in self.manifest:
+                        self.manifest[chunk_id].update(record["fields"])
+
+    def _append_log(self, record: dict[str, Any]) -> None:
+        self._seq += 1
+        line = json.dumps({"seq": self._seq, **record}, ensure_ascii=False)
+        with self.log_path.open("a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+            handle.flush()
+            os.fsync(handle.fileno())
+
+    def _merge(self, segment: FAISS) -> None:
+        if self.store is None:
+            self.store = segment
+        else:
+            self.store.merge_from(segment)
+
+    def update_metadata(self, chunk_ids: list[str], fields: dict[str, Any]) -> None:
+        """Applies ``fields`` to manifest entries and records the change in the log."""
+        with self._lock:
+            chunk_ids = [chunk_id for chunk_id in chunk_ids if chunk_id in self.manifest]
+            if not chunk_ids:
+                return
+            for chunk_id in chunk_ids:
+                self.manifest[chunk_id].update(fields)
+            self._append_log({"op": "update", "chunk_ids": chunk_ids, "fields": fields})
+
+    def deactivate_document(self, document_id: str) -> int:
+        """Marks the latest chunks of a document inactive (used on supersession)."""
+        return self.supersede_document(document_id, {}, ())
+
+    def supersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        with self._lock:
+            carried: list[str] = []
+            retired: list[str] = []
+            for chunk_id, metadata in self.manifest.items():
+                if metadata.get("document_id") != document_id or metadata.get("is_latest") is not True:
+                    continue
+                (carried if metadata.get("content_hash") in carried_hashes else retired).append(chunk_id)
+            self.update_metadata(retired, {"is_latest": False, "is_active": False})
+            if successor:
+                self.update_metadata(carried, successor)
+        return len(retired)
+
+    # ── Compaction ─────────────────────────────────────────────────
+
+    def _recover(self) -> None:
+        for tmp in self.index_path.glob(".compact-tmp*"):
+            shutil.rmtree(tmp, ignore_errors=True)
+        if (self.index_path / ".compact-ready").exists():
+            logger.warning("[FAISSStore] Rolling forward interrupted compaction")
+            self._finish_compaction()
+        self._remove_orphan_segments()
+
+    def _remove_orphan_segments(self) -> None:
+        if not self.segments_path.exists():
+            return
+        committed = {_segment_name(record["seq"]) for record in _read_log(self.log_path) if record["op"] == "add"}
+        for path in self.segments_path.iterdir():
+            if path.name not in committed:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _write_snapshot(self, store: FAISS | None, manifest: dict[str, dict[str, Any]], cut_seq: int) -> Path:
+        """Writes a complete snapshot into a private temp directory; ``_publish_snapshot`` makes it live."""
+        tmp = self.index_path / f".compact-tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+        files = ["manifest.json"]
+        if store is not None:
+            store.save_local(str(tmp))
+            files += ["index.faiss", "index.pkl"]
+        (tmp / "manifest.json").write_text(json.dumps(manifest, ensure_ascii=False), encoding="utf-8")
+        (tmp / "snapshot.json").write_text(json.dumps({"seq": cut_seq, "files": files}), encoding="utf-8")
+        for name in [*files, "snapshot.json"]:
+            _fsync(tmp / name)
+        return tmp
+
+    def _publish_snapshot(self, tmp: Path) -> None:
+        """Rename + roll-forward of a written snapshot; the caller holds the lock."""
+        tmp.rename(self.index_path / ".compact-ready")
+        self._finish_compaction()
+
+    def _finish_compaction(self) -> None:
+        ready = self.index_path / ".compact-ready"
+        snapshot = json.loads((ready / "snapshot.json").read_text(encoding="utf-8"))
+        for name in BASE_FILES:
+            if name not in snapshot["files"]:
+                (self.index_path / name).unlink(missing_ok=True)
+            elif (ready / name).exists():
+                os.replace(ready / name, self.index_path / name)
+        remaining = [record for record in _read_log(self.log_path) if record["seq"] > snapshot["seq"]]
+        _atomic_write_text(self.log_path, "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in remaining))
+        if self.segments_path.exists():
+            for path in self.segments_path.iterdir():
+                if path.name.isdigit() and int(path.name) <= snapshot["seq"]:
+                    shutil.rmtree(path, ignore_errors=True)
+        shutil.rmtree(ready, ignore_errors=True)
+
+    def compact(self) -> None:
+        """Folds segments and log records into a new base snapshot.
+
+        The index is cloned under the lock and written outside it, so ingestion
+        only waits for the in-memory copy, not for the disk write. The snapshot
+        is published under the lock, and dropped if ``rebuild`` replaced the
+        base in the meantime.
+        """
+        with self._lock:
+            if self.store is None or not _read_log(self.log_path):
+                return
+            cut_seq = self._seq
+            generation = self._generation
+            snapshot = FAISS(
+                self.embedder,
+                faiss.clone_index(self.store.index),
+                InMemoryDocstore(dict(self.store.docstore._dict)),
+                dict(self.store.index_to_docstore_id),
+            )
+            manifest = {chunk_id: dict(metadata) for chunk_id, metadata in self.manifest.items()}
+        tmp = self._write_snapshot(snapshot, manifest, cut_seq)
+        with self._lock:
+            if generation != self._generation:
+                shutil.rmtree(tmp, ignore_errors=True)
+                logger.info("[FAISSStore] Discarded compaction superseded by a rebuild")
+                return
+            self._publish_snapshot(tmp)
+            self._segment_count = sum(1 for record in _read_log(self.log_path) if record["op"] == "add")
+        logger.info(f"[FAISSStore] Compacted segments up to seq {cut_seq}")
+
+    def _maybe_compact(self) -> None:
+        threshold = getattr(settings, "FAISS_COMPACT_SEGMENT_THRESHOLD", 32)
+        if self._segment_count < threshold or (self._compactor is not None and self._compactor.is_alive()):
+            return
+        self._compactor = threading.Thread(target=self._compact_in_background, name="faiss-compactor", daemon=True)
+        self._compactor.start()
+
+    def _compact_in_background(self) -> None:
+        try:
+            self.compact()
+        except Exception as exc:
+            logger.error(f"[FAISSStore] Background compaction failed: {exc}")
+
     def rebuild(self, chunks: list[DocumentChunk]) -> dict[str, int]:
-        docs, ids = self._chunks_to_documents(chunks, skip_existing=False)
-        if not docs:
-            self.store = None
-            self.manifest = {}
-            self._save_manifest()
-            return {"indexed": 0, "duplicates": 0}
-        self.store = FAISS.from_documents(docs, self.embedder, ids=ids)
-        self.store.save_local(str(self.index_path))
-        self.manifest = {doc.metadata["chunk_id"]: doc.metadata for doc in docs}
-        self._save_manifest()
+        with self._lock:
+            docs, ids = self._chunks_to_documents(chunks, skip_existing=False)
+            self.store = FAISS.from_documents(docs, self.embedder, ids=ids) if docs else None
+            self.manifest = {doc.metadata["chunk_id"]: doc.metadata for doc in docs}
+            self._publish_snapshot(self._write_snapshot(self.store, self.manifest, self._seq))
+            self._generation += 1
+            self.hash_index.clear()
+            self.hash_index.add(_hash_pairs(self.manifest.items()))
+            self._segment_count = 0
         logger.info(f"[FAISSStore] Rebuilt index with {len(docs)} chunks")
         return {"indexed": len(docs), "duplicates": len(chunks) - len(docs)}
 
     def add_chunks(self, chunks: list[DocumentChunk]) -> dict[str, int]:
-        docs, ids = self._chunks_to_documents(chunks, skip_existing=True)
-        duplicates = len(chunks) - len(docs)
-        if not docs:
-            return {"indexed": 0, "duplicates": duplicates}
-        if self.store is None:
-            self.store = FAISS.from_documents(docs, self.embedder, ids=ids)
-        else:
-            self.store.add_documents(docs, ids=ids)
-        self.store.save_local(str(self.index_path))
-        for doc in docs:
-            self.manifest[doc.metadata["chunk_id"]] = doc.metadata
-        self._save_manifest()
+        with self._lock:
+            docs, ids = self._chunks_to_documents(chunks, skip_existing=True)
+            duplicates = len(chunks) - len(docs)
+            if not docs:
+                return {"indexed": 0, "duplicates": duplicates}
+            segment = FAISS.from_documents(docs, self.embedder, ids=ids)
+            name = _segment_name(self._seq + 1)
+            tmp = self.segments_path / f".{name}.tmp"
+            segment.save_local(str(tmp))
+            os.replace(tmp, self.segments_path / name)
+            self._append_log({"op": "add", "chunks": [doc.metadata for doc in docs]})
+            self.hash_index.add(_hash_pairs((doc.metadata["chunk_id"], doc.metadata) for doc in docs))
+            self._merge(segment)
+            self._segment_count += 1
+            for doc in docs:
+                self.manifest[doc.metadata["chunk_id"]] = doc.metadata
+            self._maybe_compact()
         logger.info(f"[FAISSStore] Added {len(docs)} chunks, skipped {duplicates} duplicates")
         return {"indexed": len(docs), "duplicates": duplicates}
 
@@ -136,21 +340,62 @@ class RealFaissStore(BaseVectorStore):
         *,
         k: int = 5,
         filters: dict[str, Any] | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[tuple[RetrievalResult, float]]:
         if self.store is None:
             return []
         started = time.perf_counter()
         fetch_k = max(k * 5, k)
-        raw_results = self.store.similarity_search_with_score(query, k=fetch_k)
+        if query_embedding is None:
+            raw_results = self.store.similarity_search_with_score(query, k=fetch_k)
+        else:
+            raw_results = self.store.similarity_search_with_score_by_vector(query_embedding, k=fetch_k)
         faiss_search_duration.observe(time.perf_counter() - started)
+        return self._filter_hits(raw_results, k=k, filters=filters)
+
+    def similarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        """Embeds all queries in one batch and searches the index with a single ``(n, d)`` matrix."""
+        if self.store is None or not queries:
+            return [[] for _query in queries]
+        vectors = np.asarray(embed_queries(self.embedder, queries), dtype=np.float32)
+        if self.store._normalize_L2:
+            faiss.normalize_L2(vectors)
+        started = time.perf_counter()
+        distances, rows = self.store.index.search(vectors, max(k * 5, k))
+        faiss_search_duration.observe(time.perf_counter() - started)
+        results: list[list[tuple[RetrievalResult, float]]] = []
+        for query_rows, query_distances in zip(rows, distances):
+            raw_results = [
+                (self.store.docstore.search(self.store.index_to_docstore_id[int(row)]), float(distance))
+                for row, distance in zip(query_rows, query_distances)
+                if row >= 0
+            ]
+            results.append(self._filter_hits(raw_results, k=k, filters=filters))
+        return results
+
+    def _filter_hits(
+        self,
+        raw_results: list[tuple[Document, float]],
+        *,
+        k: int,
+        filters: dict[str, Any] | None,
+    ) -> list[tuple[RetrievalResult, float]]:
         filtered: list[tuple[RetrievalResult, float]] = []
         for doc, distance in raw_results:
-            if doc.metadata.get("is_active") is False:
+            # The docstore keeps the metadata a chunk was indexed with; later updates live in the manifest
+            fields = self.manifest.get(doc.metadata.get("chunk_id"), doc.metadata)
+            if fields.get("is_active") is False:
                 continue
-            if filters and not _matches_filter(doc.metadata, filters):
+            if filters and not _matches_filter(fields, filters):
                 continue
             score = _distance_to_similarity(float(distance))
-            metadata = DocumentMetadata.model_validate(_metadata_for_model(doc.metadata))
+            metadata = DocumentMetadata.model_validate(_metadata_for_model(fields))
             filtered.append(
                 (
                     RetrievalResult(
@@ -173,8 +418,21 @@ class RealFaissStore(BaseVectorStore):
         *,
         k: int = 5,
         filters: dict[str, Any] | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[tuple[RetrievalResult, float]]:
-        return await asyncio.to_thread(self.similarity_search_with_score, query, k=k, filters=filters)
+        """``query_embedding``, when the caller already embedded ``query``, skips the embedding call."""
+        return await asyncio.to_thread(
+            self.similarity_search_with_score, query, k=k, filters=filters, query_embedding=query_embedding
+        )
+
+    async def asimilarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        return await asyncio.to_thread(self.similarity_search_many, queries, k=k, filters=filters)
 
     def stats(self) -> dict[str, Any]:
         return {
@@ -188,10 +446,8 @@ class RealFaissStore(BaseVectorStore):
     def _chunks_to_documents(self, chunks: list[DocumentChunk], *, skip_existing: bool) -> tuple[list[Document], list[str]]:
         docs: list[Document] = []
         ids: list[str] = []
-        seen_hashes = {item.get("content_hash") for item in self.manifest.values() if item.get("content_hash")}
-        for chunk in chunks:
-            if skip_existing and (chunk.chunk_id in self.manifest or chunk.content_hash in seen_hashes):
-                continue
+        fresh = self.hash_index.filter_new(chunks) if skip_existing else partition_new_chunks(chunks, set(), set())
+        for chunk in fresh:
             metadata = chunk.metadata.model_dump()
             metadata.update(
                 {
@@ -204,10 +460,45 @@ class RealFaissStore(BaseVectorStore):
             )
             docs.append(Document(page_content=chunk.text, metadata=metadata))
             ids.append(chunk.chunk_id)
-            seen_hashes.add(chunk.content_hash)
         return docs, ids
 
 
+def _hash_pairs(items) -> list[tuple[str, str]]:
+    return [(chunk_id, metadata.get("content_hash") or "") for chunk_id, metadata in items]
+
+
+def _segment_name(seq: int) -> str:
+    return f"{seq:012d}"
+
+
+def _read_log(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    records = []
+    with path.open(encoding="utf-8") as handle:
+        for line in handle:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logger.warning(f"[FAISSStore] Ignoring torn manifest log line in {path}")
+                break
+    return records
+
+
+def _fsync(path: Path) -> None:
+    with path.open("rb") as handle:
+        os.fsync(handle.fileno())
+
+
+def _atomic_write_text(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
+        handle.write(text)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
 def _metadata_for_model(metadata: dict[str, Any]) -> dict[str, Any]:
     allowed = set(DocumentMetadata.model_fields)
     return {key: value for key, value in metadata.items() if key in allowed}
@@ -250,16 +541,7 @@ def build_and_save_faiss_store(chunks: list[DocumentChunk]) -> RealFaissStore:
 
 def deactivate_document_chunks(document_id: str) -> int:
     """Marks chunks of a document as inactive due to supersession."""
-    store = get_faiss_store()
-    count = 0
-    for chunk_id, metadata in store.manifest.items():
-        if metadata.get("document_id") == document_id and metadata.get("is_latest") is True:
-            metadata["is_latest"] = False
-            metadata["is_active"] = False
-            count += 1
-    if count > 0:
-        store._save_manifest()
-    return count
+    return get_faiss_store().deactivate_document(document_id)
 
 
 def add_documents_to_store(chunks: list[DocumentChunk]) -> dict[str, int]:
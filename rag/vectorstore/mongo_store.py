@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 import asyncio
-import math
 import time
-from typing import Any
+from typing import Any, Collection
+
+from pymongo.errors import BulkWriteError
 
 from config.settings import settings
 from mcp_clients.mongo_client import get_mongo_client
 from observability.structured_logger import get_logger
-from rag.embeddings.embedding_router import get_embedder
+from rag.embeddings.embedding_router import embed_queries, get_embedder
 from rag.types import DocumentChunk, DocumentMetadata, RetrievalResult
 from rag.vectorstore.base import BaseVectorStore
+from rag.vectorstore.dedup_index import partition_new_chunks
+from rag.vectorstore.embedding_matrix import META_COLLECTION, LocalEmbeddingMatrix
 
 logger = get_logger(__name__)
 
@@ -23,11 +26,21 @@ class MongoDBVectorStore(BaseVectorStore):
     def __init__(self):
         self.embedder = get_embedder().get_langchain_embedder()
         self.collection_name = "vector_chunks"
+        self.local_matrix = LocalEmbeddingMatrix(self.collection_name)
 
     async def _get_collection(self):
         mongo = await get_mongo_client()
         return mongo.db[self.collection_name]
 
+    async def _bump_version(self, field: str) -> None:
+        """Signals local embedding matrices that the collection changed (`version`: appended, `epoch`: reset)."""
+        mongo = await get_mongo_client()
+        await mongo.db[META_COLLECTION].update_one(
+            {"_id": self.collection_name},
+            {"$inc": {field: 1}},
+            upsert=True,
+        )
+
     def add_chunks(self, chunks: list[DocumentChunk]) -> dict[str, int]:
         """Sync wrapper for adding chunks."""
         try:
@@ -45,27 +58,17 @@ class MongoDBVectorStore(BaseVectorStore):
             return {"indexed": 0, "duplicates": 0}
 
         collection = await self._get_collection()
-        texts = [chunk.text for chunk in chunks]
-        
-        # Embed all texts concurrently
-        embeddings = await asyncio.to_thread(self.embedder.embed_documents, texts)
+        fresh = await self._filter_new_chunks(collection, chunks)
+        duplicates = len(chunks) - len(fresh)
+        if not fresh:
+            logger.info(f"[MongoDBStore] Ingested 0 chunks, skipped {duplicates} duplicates.")
+            return {"indexed": 0, "duplicates": duplicates}
 
-        operations = []
-        duplicates = 0
-        indexed = 0
-
-        for chunk, embedding in zip(chunks, embeddings):
-            # Check for duplicates by chunk_id or content_hash
-            existing = await collection.find_one({
-                "$or": [
-                    {"chunk_id": chunk.chunk_id},
-                    {"content_hash": chunk.content_hash}
-                ]
-            })
-            if existing:
-                duplicates += 1
-                continue
+        # Only chunks that survived dedup are embedded
+        embeddings = await asyncio.to_thread(self.embedder.embed_documents, [chunk.text for chunk in fresh])
 
+        documents = []
+        for chunk, embedding in zip(fresh, embeddings):
             metadata = chunk.metadata.model_dump()
             metadata.update({
                 "chunk_id": chunk.chunk_id,
@@ -74,24 +77,54 @@ class MongoDBVectorStore(BaseVectorStore):
                 "is_active": True,
                 "source": chunk.metadata.source_url or chunk.metadata.source_path,
             })
-
-            doc = {
+            documents.append({
                 "_id": chunk.chunk_id,
                 "chunk_id": chunk.chunk_id,
+                "content_hash": chunk.content_hash,
                 "text": chunk.text,
                 "embedding": embedding,
                 "metadata": metadata,
                 "created_at": time.time(),
-            }
-            operations.append(collection.insert_one(doc))
-            indexed += 1
+            })
 
-        if operations:
-            await asyncio.gather(*operations)
+        try:
+            result = await collection.insert_many(documents, ordered=False)
+            indexed = len(result.inserted_ids)
+        except BulkWriteError as exc:
+            # A concurrent writer may have inserted some chunks since the $in check
+            write_errors = exc.details.get("writeErrors", [])
+            if any(error.get("code") != 11000 for error in write_errors):
+                raise
+            indexed = exc.details.get("nInserted", 0)
+            duplicates += len(write_errors)
+
+        if indexed:
+            await self._bump_version("version")
 
         logger.info(f"[MongoDBStore] Ingested {indexed} chunks, skipped {duplicates} duplicates.")
         return {"indexed": indexed, "duplicates": duplicates}
 
+    async def _filter_new_chunks(self, collection, chunks: list[DocumentChunk]) -> list[DocumentChunk]:
+        """Resolves duplicates for the whole batch with a single `$in` round-trip."""
+        chunk_ids = [chunk.chunk_id for chunk in chunks]
+        content_hashes = [chunk.content_hash for chunk in chunks]
+        cursor = collection.find(
+            {
+                "$or": [
+                    {"_id": {"$in": chunk_ids}},
+                    {"content_hash": {"$in": content_hashes}},
+                    {"metadata.content_hash": {"$in": content_hashes}},
+                ]
+            },
+            {"_id": 1, "content_hash": 1, "metadata.content_hash": 1},
+        )
+        known_ids: set[str] = set()
+        known_hashes: set[str] = set()
+        for document in await cursor.to_list(length=None):
+            known_ids.add(document["_id"])
+            known_hashes.add(document.get("content_hash") or (document.get("metadata") or {}).get("content_hash", ""))
+        return partition_new_chunks(chunks, known_ids, known_hashes)
+
     def rebuild(self, chunks: list[DocumentChunk]) -> dict[str, int]:
         """Sync wrapper for rebuilding index."""
         try:
@@ -108,9 +141,40 @@ class MongoDBVectorStore(BaseVectorStore):
         collection = await self._get_collection()
         # Drop existing chunks for rebuilding
         await collection.delete_many({})
+        await self._bump_version("epoch")
         logger.info("[MongoDBStore] Cleared vector collection for complete rebuild.")
         return await self.aadd_chunks(chunks)
 
+    def supersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        """Sync wrapper for retiring a superseded document."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop and loop.is_running():
+            raise RuntimeError("MongoDBVectorStore.supersede_document cannot run inside an active event loop; use asupersede_document instead.")
+        else:
+            return asyncio.run(self.asupersede_document(document_id, successor, carried_hashes))
+
+    async def asupersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        """Re-keys carried-over chunks to the successor, then deactivates the rest of the old version."""
+        collection = await self._get_collection()
+        latest = {"metadata.document_id": document_id, "metadata.is_latest": True}
+        changed = 0
+        if successor and carried_hashes:
+            result = await collection.update_many(
+                {**latest, "content_hash": {"$in": list(carried_hashes)}},
+                {"$set": {f"metadata.{name}": value for name, value in successor.items()}},
+            )
+            changed += result.modified_count
+        result = await collection.update_many(latest, {"$set": {"metadata.is_latest": False, "metadata.is_active": False}})
+        changed += result.modified_count
+        if changed:
+            # Metadata changed in place, so local embedding matrices reload their columns
+            await self._bump_version("epoch")
+        logger.info(f"[MongoDBStore] Retired {result.modified_count} chunks of superseded document {document_id}")
+        return result.modified_count
+
     def similarity_search_with_score(
         self,
         query: str,
@@ -136,13 +200,40 @@ class MongoDBVectorStore(BaseVectorStore):
         query: str,
         *,
         k: int = 5,
-        filters: dict[str, Any] | None = None
+        filters: dict[str, Any] | None = None,
+        query_embedding: list[float] | None = None,
     ) -> list[tuple[RetrievalResult, float]]:
         """Async similarity search utilizing MongoDB `$vectorSearch` with high-performance python fallback."""
+        # Embed the search query unless the caller already did
+        if query_embedding is None:
+            query_embedding = await asyncio.to_thread(self.embedder.embed_query, query)
+        return await self._search_by_embedding(query_embedding, k=k, filters=filters)
+
+    async def asimilarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        """Embeds all queries in one batch, then runs the per-query vector searches concurrently."""
+        if not queries:
+            return []
+        embeddings = await asyncio.to_thread(embed_queries, self.embedder, queries)
+        return list(
+            await asyncio.gather(
+                *(self._search_by_embedding(embedding, k=k, filters=filters) for embedding in embeddings)
+            )
+        )
+
+    async def _search_by_embedding(
+        self,
+        query_embedding: list[float],
+        *,
+        k: int,
+        filters: dict[str, Any] | None
+    ) -> list[tuple[RetrievalResult, float]]:
         collection = await self._get_collection()
-        
-        # Embed the search query
-        query_embedding = await asyncio.to_thread(self.embedder.embed_query, query)
 
         # Standard MongoDB filter preparation
         mongo_filter: dict[str, Any] = {"metadata.is_active": True}
@@ -202,42 +293,53 @@ class MongoDBVectorStore(BaseVectorStore):
             return filtered
 
         except Exception as exc:
-            # 2. Fallback path: local cosine similarity calculation if `$vectorSearch` index is not configured (e.g. offline testing)
+            # 2. Fallback path: process-local embedding matrix if `$vectorSearch` is not configured (e.g. offline testing)
             logger.warning(
                 f"[MongoDBStore] Cloud search index missing or failed: {exc}. "
-                "Executing local cosine similarity fallback calculations..."
+                "Executing local embedding matrix fallback search..."
             )
-            
-            # Retrieve active documents matching criteria
-            cursor = collection.find(mongo_filter)
-            documents = await cursor.to_list(length=1000) # Cap for performance
-            
-            # Offload CPU-heavy cosine calculation to separate thread to prevent event loop blocking
-            scored_docs = await asyncio.to_thread(
-                _calculate_similarities, query_embedding, documents
-            )
-                
-            # Sort by descending score
-            scored_docs.sort(key=lambda x: x[1], reverse=True)
-            top_k = scored_docs[:k]
-            
-            filtered = []
-            for doc, score in top_k:
-                metadata = DocumentMetadata.model_validate(_metadata_for_model(doc.get("metadata", {})))
-                filtered.append(
-                    (
-                        RetrievalResult(
-                            text=doc.get("text", ""),
-                            score=score,
-                            metadata=metadata,
-                            source="mongodb_vector_fallback",
-                            citation=_citation(metadata),
-                        ),
-                        1.0 - score
-                    )
+            return await self._local_similarity_search(query_embedding, k=k, filters=filters, mongo_filter=mongo_filter)
+
+    async def _local_similarity_search(
+        self,
+        query_embedding: list[float],
+        *,
+        k: int,
+        filters: dict[str, Any] | None,
+        mongo_filter: dict[str, Any],
+    ) -> list[tuple[RetrievalResult, float]]:
+        mongo = await get_mongo_client()
+        top = await self.local_matrix.query(mongo.db, query_embedding, k=k, filters=filters, mongo_filter=mongo_filter)
+        if not top:
+            return []
+
+        # Only the winning chunks travel over the wire, without their embeddings
+        cursor = mongo.db[self.collection_name].find({"_id": {"$in": [chunk_id for chunk_id, _score in top]}}, {"embedding": 0})
+        documents = {doc["_id"]: doc for doc in await cursor.to_list(length=len(top))}
+
+        filtered = []
+        for chunk_id, score in top:
+            doc = documents.get(chunk_id)
+            if doc is None:
+                continue
+            metadata = DocumentMetadata.model_validate(_metadata_for_model(doc.get("metadata", {})))
+            filtered.append(
+                (
+                    RetrievalResult(
+                        text=doc.get("text", ""),
+                        score=score,
+                        metadata=metadata,
+                        source="mongodb_vector_fallback",
+                        citation=_citation(metadata),
+                    ),
+                    1.0 - score
                 )
-            logger.info(f"[MongoDBStore] Vector search query completed via Python Cosine Fallback. Found: {len(filtered)}")
-            return filtered
+            )
+        logger.info(
+            f"[MongoDBStore] Vector search query completed via local embedding matrix "
+            f"({self.local_matrix.size} vectors). Found: {len(filtered)}"
+        )
+        return filtered
 
     def stats(self) -> dict[str, Any]:
         """Sync stats wrapper."""
@@ -333,26 +435,6 @@ def _metadata_for_model(metadata: dict[str, Any]) -> dict[str, Any]:
     return {key: value for key, value in metadata.items() if key in allowed}
 
 
-def _cosine_similarity(v1: list[float], v2: list[float]) -> float:
-    dot_product = sum(a * b for a, b in zip(v1, v2))
-    magnitude_v1 = math.sqrt(sum(a * a for a in v1))
-    magnitude_v2 = math.sqrt(sum(b * b for b in v2))
-    if magnitude_v1 == 0 or magnitude_v2 == 0:
-        return 0.0
-    return dot_product / (magnitude_v1 * magnitude_v2)
-
-
-def _calculate_similarities(query_embedding: list[float], documents: list[dict[str, Any]]) -> list[tuple[dict[str, Any], float]]:
-    scored_docs = []
-    for doc in documents:
-        doc_embedding = doc.get("embedding")
-        if not doc_embedding:
-            continue
-        score = _cosine_similarity(query_embedding, doc_embedding)
-        scored_docs.append((doc, score))
-    return scored_docs
-
-
 def _citation(metadata: DocumentMetadata) -> str:
     source = metadata.source_url or metadata.source_path or metadata.title or "unknown source"
     page = f", page {metadata.page_number}" if metadata.page_number else ""
@@ -0,0 +1,419 @@
+"""Native FAISS vector store with columnar metadata and pre-filtered search.
+
+Unlike ``RealFaissStore`` this backend talks to a raw faiss index directly:
+
+- vectors live in a flat, IVF or HNSW inner-product index (``FAISS_INDEX_TYPE``);
+- filterable metadata (department, language, document type, document id,
+  is_active, is_latest) is kept as integer-coded NumPy columns, so a filter
+  becomes a boolean mask that is handed to faiss as an ``IDSelectorBitmap``;
+- chunk text and full metadata are appended to a JSONL record file and read
+  back by byte offset, so no pickle docstore is ever deserialized.
+
+Filtered queries therefore return exactly ``k`` hits whenever at least ``k``
+rows match, instead of over-fetching and filtering in Python.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Collection
+
+import faiss
+import numpy as np
+
+from config.settings import settings
+from observability.metrics import faiss_search_duration
+from observability.structured_logger import get_logger
+from rag.embeddings.embedding_router import embed_queries, get_embedder
+from rag.types import DocumentChunk, DocumentMetadata, RetrievalResult
+from rag.vectorstore.base import BaseVectorStore
+from rag.vectorstore.columns import CODED_COLUMNS, FLAG_COLUMNS, Vocabulary, append_columns, columnar_mask, empty_columns
+from rag.vectorstore.dedup_index import ChunkHashIndex
+from rag.vectorstore.faiss_store import _citation, _matches_filter, _metadata_for_model
+
+logger = get_logger(__name__)
+
+_store: "NativeFaissStore | None" = None
+
+
+class NativeFaissStore(BaseVectorStore):
+    def __init__(self, index_path: str | Path | None = None):
+        self.index_path = Path(index_path or settings.FAISS_INDEX_PATH) / "native"
+        self.index_file = self.index_path / "index.faiss"
+        self.columns_file = self.index_path / "columns.npz"
+        self.vocab_file = self.index_path / "vocab.json"
+        self.records_file = self.index_path / "records.jsonl"
+        self.index_type = getattr(settings, "FAISS_INDEX_TYPE", "flat").lower()
+        self.embedder = get_embedder().get_langchain_embedder()
+        self.index: Any = None
+        self._lock = threading.RLock()
+        self.index_path.mkdir(parents=True, exist_ok=True)
+        self.hash_index = ChunkHashIndex(self.index_path / "chunk_hashes.db")
+        self._reset_columns()
+        self._load()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self.index is not None
+
+    @property
+    def size(self) -> int:
+        return int(self.offsets.shape[0])
+
+    # ── Persistence ────────────────────────────────────────────────
+
+    def _reset_columns(self) -> None:
+        self.index = None
+        self.vocab, self.coded, self.flags = empty_columns()
+        self.offsets = np.empty(0, dtype=np.int64)
+
+    def _load(self) -> None:
+        if not self.index_file.exists():
+            logger.warning(f"[NativeFaissStore] No native FAISS index found at {self.index_path}")
+            self.hash_index.resync([], 0)
+            return
+        try:
+            self.index = faiss.read_index(str(self.index_file))
+            with np.load(self.columns_file, allow_pickle=False) as columns:
+                self.coded = {name: columns[name].astype(np.int32) for name in CODED_COLUMNS}
+                self.flags = {name: columns[name].astype(bool) for name in FLAG_COLUMNS}
+                self.offsets = columns["offsets"].astype(np.int64)
+            vocab = json.loads(self.vocab_file.read_text(encoding="utf-8"))
+            self.vocab = {name: Vocabulary(vocab.get(name, [])) for name in CODED_COLUMNS}
+            if self.hash_index.count() != self.size:
+                self.hash_index.resync(self._record_keys(), self.size)
+            self._configure_search(self.index)
+            logger.info(f"[NativeFaissStore] Loaded {self.size} chunks from {self.index_path}")
+        except Exception as exc:
+            logger.error(f"[NativeFaissStore] Failed to load index: {exc}")
+            self._reset_columns()
+            # The hashes belong to the discarded index; keeping them would skip every re-ingested chunk
+            self.hash_index.clear()
+
+    def _record_keys(self) -> list[tuple[str, str]]:
+        keys = []
+        with self.records_file.open("rb") as handle:
+            for offset in self.offsets.tolist():
+                handle.seek(offset)
+                record = json.loads(handle.readline())
+                keys.append((record["chunk_id"], record.get("content_hash") or ""))
+        return keys
+
+    def _save(self) -> None:
+        _atomic_write(self.index_file, lambda path: faiss.write_index(self.index, str(path)))
+        _atomic_write(
+            self.columns_file,
+            lambda path: _savez(path, offsets=self.offsets, **self.coded, **self.flags),
+        )
+        vocab = {name: self.vocab[name].labels for name in CODED_COLUMNS}
+        _atomic_write(self.vocab_file, lambda path: path.write_text(json.dumps(vocab, ensure_ascii=False), encoding="utf-8"))
+
+    def _append_records(self, records: list[dict[str, Any]]) -> np.ndarray:
+        offsets = np.empty(len(records), dtype=np.int64)
+        with self.records_file.open("ab") as handle:
+            for position, record in enumerate(records):
+                offsets[position] = handle.tell()
+                handle.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+        return offsets
+
+    def _read_record(self, row: int) -> dict[str, Any]:
+        with self.records_file.open("rb") as handle:
+            handle.seek(int(self.offsets[row]))
+            return json.loads(handle.readline())
+
+    # ── Index construction ────────────────────────────────────────
+
+    def _new_index(self, vectors: np.ndarray) -> Any:
+        dimension = vectors.shape[1]
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dimension, settings.FAISS_HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = settings.FAISS_HNSW_EF_CONSTRUCTION
+        elif self.index_type == "ivf":
+            nlist = min(settings.FAISS_IVF_NLIST, vectors.shape[0] // 39)
+            if nlist < 1:
+                logger.info("[NativeFaissStore] Too few vectors to train IVF; using a flat index until rebuild")
+                index = faiss.IndexFlatIP(dimension)
+            else:
+                quantizer = faiss.IndexFlatIP(dimension)
+                index = faiss.IndexIVFFlat(quantizer, dimension, nlist, faiss.METRIC_INNER_PRODUCT)
+                index.train(vectors)
+                index.make_direct_map()
+        else:
+            index = faiss.IndexFlatIP(dimension)
+        self._configure_search(index)
+        return index
+
+    @staticmethod
+    def _configure_search(index: Any) -> None:
+        if isinstance(index, faiss.IndexHNSW):
+            index.hnsw.efSearch = settings.FAISS_HNSW_EF_SEARCH
+        elif isinstance(index, faiss.IndexIVF):
+            index.nprobe = settings.FAISS_IVF_NPROBE
+
+    def _embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.asarray(self.embedder.embed_documents(texts), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _embed_queries(self, queries: list[str]) -> np.ndarray:
+        vectors = np.asarray(embed_queries(self.embedder, queries), dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    # ── Writes ─────────────────────────────────────────────────────
+
+    def rebuild(self, chunks: list[DocumentChunk]) -> dict[str, int]:
+        with self._lock:
+            self._reset_columns()
+            self.hash_index.clear()
+            self.records_file.unlink(missing_ok=True)
+            for path in (self.index_file, self.columns_file, self.vocab_file):
+                path.unlink(missing_ok=True)
+            indexed = self._add(chunks)
+        logger.info(f"[NativeFaissStore] Rebuilt {self.index_type} index with {indexed} chunks")
+        return {"indexed": indexed, "duplicates": len(chunks) - indexed}
+
+    def add_chunks(self, chunks: list[DocumentChunk]) -> dict[str, int]:
+        with self._lock:
+            indexed = self._add(chunks)
+        duplicates = len(chunks) - indexed
+        logger.info(f"[NativeFaissStore] Added {indexed} chunks, skipped {duplicates} duplicates")
+        return {"indexed": indexed, "duplicates": duplicates}
+
+    def _add(self, chunks: list[DocumentChunk]) -> int:
+        fresh = self.hash_index.filter_new(chunks)
+        if not fresh:
+            return 0
+
+        vectors = self._embed([chunk.text for chunk in fresh])
+        if self.index is None:
+            self.index = self._new_index(vectors)
+        self.index.add(vectors)
+
+        records = [_record(chunk) for chunk in fresh]
+        self.offsets = np.concatenate([self.offsets, self._append_records(records)])
+        append_columns(self.vocab, self.coded, self.flags, (record["metadata"] for record in records))
+        self._save()
+        self.hash_index.add((chunk.chunk_id, chunk.content_hash) for chunk in fresh)
+        return len(fresh)
+
+    def deactivate_document(self, document_id: str) -> int:
+        """Marks the latest chunks of a document inactive (used on supersession)."""
+        return self.supersede_document(document_id, {}, ())
+
+    def supersede_document(self, document_id: str, successor: dict[str, Any], carried_hashes: Collection[str]) -> int:
+        with self._lock:
+            code = self.vocab["document_id"].lookup(document_id)
+            if code is None:
+                return 0
+            rows = np.flatnonzero((self.coded["document_id"] == code) & self.flags["is_latest"])
+            carried: dict[int, dict[str, Any]] = {}
+            if successor and carried_hashes:
+                for row in rows.tolist():
+                    record = self._read_record(row)
+                    if record["content_hash"] in carried_hashes:
+                        record["metadata"].update(successor)
+                        carried[row] = record
+            retired = np.setdiff1d(rows, list(carried))
+            self.flags["is_latest"][retired] = False
+            self.flags["is_active"][retired] = False
+            if carried:
+                # Records are append-only: write the re-keyed copies and repoint their rows
+                carried_rows = np.fromiter(carried, dtype=np.int64, count=len(carried))
+                self.offsets[carried_rows] = self._append_records(list(carried.values()))
+                for name in CODED_COLUMNS:
+                    self.coded[name][carried_rows] = [self.vocab[name].encode(record["metadata"].get(name, "")) for record in carried.values()]
+            if retired.size or carried:
+                self._save()
+            return int(retired.size)
+
+    async def aadd_chunks(self, chunks: list[DocumentChunk]) -> dict[str, int]:
+        return await asyncio.to_thread(self.add_chunks, chunks)
+
+    async def arebuild(self, chunks: list[DocumentChunk]) -> dict[str, int]:
+        return await asyncio.to_thread(self.rebuild, chunks)
+
+    # ── Search ─────────────────────────────────────────────────────
+
+    def similarity_search(
+        self,
+        query: str,
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[RetrievalResult]:
+        return [result for result, _distance in self.similarity_search_with_score(query, k=k, filters=filters)]
+
+    def similarity_search_with_score(
+        self,
+        query: str,
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[tuple[RetrievalResult, float]]:
+        if self.index is None or self.size == 0:
+            return []
+        return self.similarity_search_many([query], k=k, filters=filters)[0]
+
+    def similarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        """Embeds all queries in one batch and answers them with a single index search."""
+        if self.index is None or self.size == 0 or not queries:
+            return [[] for _query in queries]
+        return self._search_vectors(self._embed_queries(queries), k=k, filters=filters)
+
+    def _search_vectors(self, vectors: np.ndarray, *, k: int, filters: dict[str, Any] | None) -> list[list[tuple[RetrievalResult, float]]]:
+        with self._lock:
+            started = time.perf_counter()
+            mask = self.filter_mask(filters)
+            hits = self._search(vectors, mask, k)
+            faiss_search_duration.observe(time.perf_counter() - started)
+            return [[self._result(row, similarity) for row, similarity in zip(rows, similarities)] for rows, similarities in hits]
+
+    async def asimilarity_search_with_score(
+        self,
+        query: str,
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+        query_embedding: list[float] | None = None,
+    ) -> list[tuple[RetrievalResult, float]]:
+        """``query_embedding``, when the caller already embedded ``query``, skips the embedding call."""
+        if query_embedding is None:
+            return await asyncio.to_thread(self.similarity_search_with_score, query, k=k, filters=filters)
+        if self.index is None or self.size == 0:
+            return []
+        vectors = np.asarray([query_embedding], dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return (await asyncio.to_thread(self._search_vectors, vectors, k=k, filters=filters))[0]
+
+    async def asimilarity_search_many(
+        self,
+        queries: list[str],
+        *,
+        k: int = 5,
+        filters: dict[str, Any] | None = None,
+    ) -> list[list[tuple[RetrievalResult, float]]]:
+        return await asyncio.to_thread(self.similarity_search_many, queries, k=k, filters=filters)
+
+    def filter_mask(self, filters: dict[str, Any] | None) -> np.ndarray:
+        """Builds the boolean row mask for ``filters`` from the metadata columns."""
+        mask, residual = columnar_mask(self.vocab, self.coded, self.flags, filters)
+        if residual and mask.any():
+            # Non-columnar keys are rare; only rows that survived the columnar mask are read.
+            for row in np.flatnonzero(mask):
+                if not _matches_filter(self._read_record(int(row))["metadata"], residual):
+                    mask[row] = False
+        return mask
+
+    def _search(self, vectors: np.ndarray, mask: np.ndarray, k: int) -> list[tuple[list[int], list[float]]]:
+        """Returns ``(rows, similarities)`` for each row of the ``(n, d)`` query matrix."""
+        selected = int(mask.sum())
+        k = min(k, selected)
+        if k == 0:
+            return [([], []) for _vector in vectors]
+        if selected == self.size:
+            similarities, rows = self.index.search(vectors, k)
+        elif selected <= settings.FAISS_EXACT_FILTER_THRESHOLD:
+            return self._exact_search(vectors, np.flatnonzero(mask), k)
+        else:
+            bitmap = np.packbits(mask, bitorder="little")
+            selector = faiss.IDSelectorBitmap(self.size, faiss.swig_ptr(bitmap))
+            similarities, rows = self.index.search(vectors, k, params=self._search_params(selector))
+            if int((rows >= 0).sum(axis=1).min()) < k:
+                similarities, rows = self.index.search(vectors, k, params=self._search_params(selector, widen=4))
+        hits = rows >= 0
+        return [(rows[i][hits[i]].tolist(), similarities[i][hits[i]].tolist()) for i in range(len(vectors))]
+
+    def _exact_search(self, vectors: np.ndarray, candidates: np.ndarray, k: int) -> list[tuple[list[int], list[float]]]:
+        scores = vectors @ self.index.reconstruct_batch(candidates).T
+        results: list[tuple[list[int], list[float]]] = []
+        for similarities in scores:
+            top = np.argpartition(-similarities, k - 1)[:k] if k < len(candidates) else np.arange(len(candidates))
+            top = top[np.argsort(-similarities[top])]
+            results.append((candidates[top].tolist(), similarities[top].tolist()))
+        return results
+
+    def _search_params(self, selector: Any, widen: int = 1) -> Any:
+        if isinstance(self.index, faiss.IndexHNSW):
+            return faiss.SearchParametersHNSW(sel=selector, efSearch=settings.FAISS_HNSW_EF_SEARCH * widen)
+        if isinstance(self.index, faiss.IndexIVF):
+            nprobe = min(settings.FAISS_IVF_NPROBE * widen, self.index.nlist)
+            return faiss.SearchParametersIVF(sel=selector, nprobe=nprobe)
+        return faiss.SearchParameters(sel=selector)
+
+    def _result(self, row: int, similarity: float) -> tuple[RetrievalResult, float]:
+        record = self._read_record(row)
+        score = max(0.0, min(1.0, float(similarity)))
+        metadata = DocumentMetadata.model_validate(_metadata_for_model(record["metadata"]))
+        return (
+            RetrievalResult(
+                text=record["text"],
+                score=score,
+                metadata=metadata,
+                source="faiss_native",
+                citation=_citation(metadata),
+            ),
+            1.0 - score,
+        )
+
+    def stats(self) -> dict[str, Any]:
+        active = self.flags["is_active"]
+
+        def present(name: str) -> list[str]:
+            codes = np.unique(self.coded[name][active]) if active.any() else []
+            return sorted(label for label in (self.vocab[name].labels[code] for code in codes) if label)
+
+        return {
+            "type": "faiss_native",
+            "index_type": type(self.index).__name__ if self.index is not None else None,
+            "index_path": str(self.index_path),
+            "loaded": self.index is not None,
+            "chunks": self.size,
+            "active_chunks": int(active.sum()),
+            "departments": present("department"),
+            "languages": present("language"),
+        }
+
+
+def _record(chunk: DocumentChunk) -> dict[str, Any]:
+    metadata = chunk.metadata.model_dump()
+    metadata.update(
+        {
+            "chunk_id": chunk.chunk_id,
+            "chunk_index": chunk.chunk_index,
+            "content_hash": chunk.content_hash,
+            "is_active": True,
+            "source": chunk.metadata.source_url or chunk.metadata.source_path,
+        }
+    )
+    return {"chunk_id": chunk.chunk_id, "content_hash": chunk.content_hash, "text": chunk.text, "metadata": metadata}
+
+
+def _atomic_write(path: Path, write) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    write(tmp)
+    os.replace(tmp, path)
+
+
+def _savez(path: Path, **arrays: np.ndarray) -> None:
+    # Writing through a handle stops NumPy from appending its own ".npz" suffix.
+    with path.open("wb") as handle:
+        np.savez(handle, **arrays)
+
+
+def get_native_faiss_store() -> NativeFaissStore:
+    global _store
+    if _store is None:
+        _store = NativeFaissStore()
+    return _store
@@ -1,13 +1,22 @@
 """
 rag/vectorstore/semantic_cache.py
 ----------------------------------
-Redis-backed semantic cache for retrieval results.
+Two-tier cache for retrieval results:
+- SemanticCache: Redis-backed exact-key cache shared across workers.
+- SemanticQueryCache: in-process embedding-similarity cache for paraphrases.
 Avoids redundant FAISS calls for identical/similar queries.
 """
 
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
 import redis.asyncio as aioredis
 from config.settings import settings
+from observability.metrics import semantic_cache_lookups_total, semantic_cache_similarity
 from observability.structured_logger import get_logger
+from rag.types import RetrievalResult
 
 logger = get_logger(__name__)
 
@@ -49,6 +58,26 @@ class SemanticCache:
         except Exception as e:
             logger.warning(f"[SemanticCache] SET failed: {e}")
 
+    async def mget(self, keys: list[str]) -> list[str | None]:
+        if not self._client or not keys:
+            return [None] * len(keys)
+        try:
+            return await self._client.mget(keys)
+        except Exception as e:
+            logger.warning(f"[SemanticCache] MGET failed: {e}")
+            return [None] * len(keys)
+
+    async def mset(self, items: dict[str, str], ttl: int = None):
+        if not self._client or not items:
+            return
+        try:
+            async with self._client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, value, ex=ttl or settings.REDIS_SEMANTIC_CACHE_TTL)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"[SemanticCache] MSET failed: {e}")
+
     async def delete(self, key: str):
         if not self._client:
             return
@@ -69,3 +98,116 @@ async def get_semantic_cache() -> SemanticCache:
         _cache_instance = SemanticCache()
         await _cache_instance.connect()
     return _cache_instance
+
+
+class _QueryPartition:
+    """Bounded LRU of cached query embeddings for one (department, language, k) slice."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self.entries: OrderedDict[int, tuple[np.ndarray, list[RetrievalResult], float]] = OrderedDict()
+        self._matrix: np.ndarray | None = None
+        self._keys: list[int] = []
+        self._next_id = 0
+
+    def best_match(self, embedding: np.ndarray) -> tuple[int | None, float]:
+        if not self.entries:
+            return None, 0.0
+        if self._matrix is None:
+            self._keys = list(self.entries)
+            self._matrix = np.stack([self.entries[key][0] for key in self._keys])
+        similarities = self._matrix @ embedding
+        position = int(np.argmax(similarities))
+        return self._keys[position], float(similarities[position])
+
+    def put(self, embedding: np.ndarray, results: list[RetrievalResult], expires_at: float) -> None:
+        self.entries[self._next_id] = (embedding, results, expires_at)
+        self._next_id += 1
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+        self._matrix = None
+
+    def evict(self, key: int) -> None:
+        self.entries.pop(key, None)
+        self._matrix = None
+
+
+class SemanticQueryCache:
+    """In-process similarity-keyed cache of retrieval results.
+
+    Paraphrased queries ("road repair budget Pune" / "Pune road repair budget")
+    miss the exact Redis key but land close together in embedding space. Entries
+    are partitioned by department, language and k, so a lookup only compares
+    against queries that were retrieved under the same filters.
+    """
+
+    def __init__(
+        self,
+        threshold: float | None = None,
+        max_entries: int | None = None,
+        ttl: int | None = None,
+    ):
+        self.threshold = threshold if threshold is not None else settings.RAG_SEMANTIC_CACHE_THRESHOLD
+        self.near_hit_threshold = self.threshold - settings.RAG_SEMANTIC_CACHE_NEAR_HIT_MARGIN
+        self.max_entries = max_entries or settings.RAG_SEMANTIC_CACHE_MAX_ENTRIES
+        self.ttl = ttl or getattr(settings, "RAG_CACHE_TTL", settings.REDIS_SEMANTIC_CACHE_TTL)
+        self._partitions: dict[tuple[str, str, int], _QueryPartition] = {}
+        self._lock = threading.Lock()
+
+    def get(self, embedding: list[float], *, department: str, language: str, k: int) -> list[RetrievalResult] | None:
+        vector = _normalize(embedding)
+        if vector is None:
+            return None
+        with self._lock:
+            partition = self._partitions.get(_partition_key(department, language, k))
+            key, similarity = partition.best_match(vector) if partition else (None, 0.0)
+            if key is not None and similarity >= self.threshold:
+                _vector, results, expires_at = partition.entries[key]
+                if expires_at > time.monotonic():
+                    partition.entries.move_to_end(key)
+                    semantic_cache_lookups_total.labels(outcome="hit").inc()
+                    semantic_cache_similarity.observe(similarity)
+                    return [result.model_copy(deep=True) for result in results]
+                partition.evict(key)
+                key = None  # an expired match is a miss, not a near hit
+        outcome = "near_hit" if key is not None and similarity >= self.near_hit_threshold else "miss"
+        semantic_cache_lookups_total.labels(outcome=outcome).inc()
+        if key is not None:
+            semantic_cache_similarity.observe(similarity)
+        return None
+
+    def set(self, embedding: list[float], results: list[RetrievalResult], *, department: str, language: str, k: int) -> None:
+        vector = _normalize(embedding)
+        if vector is None or not results:
+            return
+        snapshot = [result.model_copy(deep=True) for result in results]
+        with self._lock:
+            partition = self._partitions.setdefault(_partition_key(department, language, k), _QueryPartition(self.max_entries))
+            partition.put(vector, snapshot, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._partitions.clear()
+
+
+def _partition_key(department: str, language: str, k: int) -> tuple[str, str, int]:
+    return department.lower().strip(), language.lower().strip(), k
+
+
+def _normalize(embedding: list[float]) -> np.ndarray | None:
+    vector = np.asarray(embedding, dtype=np.float32)
+    norm = float(np.linalg.norm(vector))
+    if not vector.size or norm == 0.0:
+        return None
+    return vector / norm
+
+
+_query_cache_instance: SemanticQueryCache | None = None
+
+
+def get_semantic_query_cache() -> SemanticQueryCache:
+    """Returns singleton SemanticQueryCache."""
+    global _query_cache_instance
+    if _query_cache_instance is None:
+        _query_cache_instance = SemanticQueryCache()
+    return _query_cache_instance
@@ -7,7 +7,7 @@ from pathlib import Path
 from config.settings import settings
 from observability.metrics import documents_ingested_total
 from rag.ingestion.chunking.chunker import SmartChunker
-from rag.types import IngestionReport, LoadedDocument
+from rag.types import DocumentChunk, IngestionReport, LoadedDocument
 from rag.vectorstore import get_vector_store
 
 
@@ -18,6 +18,9 @@ class VectorManager:
 
     async def ingest_documents(self, documents: list[LoadedDocument], *, rebuild: bool = False) -> IngestionReport:
         chunks = self.chunker.chunk_documents(documents)
+        return await self.ingest_chunks(chunks, documents_loaded=len(documents), rebuild=rebuild)
+
+    async def ingest_chunks(self, chunks: list[DocumentChunk], *, documents_loaded: int, rebuild: bool = False) -> IngestionReport:
         if rebuild:
             result = await self.store.arebuild(chunks)
         else:
@@ -26,7 +29,7 @@ class VectorManager:
         
         vector_path = str(getattr(self.store, "index_path", "mongodb_cloud"))
         return IngestionReport(
-            documents_loaded=len(documents),
+            documents_loaded=documents_loaded,
             chunks_created=len(chunks),
             chunks_indexed=result["indexed"],
             duplicates_skipped=result["duplicates"],
@@ -43,6 +46,9 @@ class VectorManager:
         return self.store.stats()
 
     def exists(self) -> bool:
+        is_loaded = getattr(self.store, "is_loaded", None)
+        if is_loaded is not None:
+            return bool(is_loaded)
         index_path = getattr(self.store, "index_path", None)
         if index_path is not None:
             return Path(index_path, "index.faiss").exists()
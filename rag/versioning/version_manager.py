@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import uuid
 from typing import Any
 
 from rag.types import DocumentMetadata
@@ -33,6 +34,7 @@ class VersionManager:
             new_metadata.lineage_id = existing_doc_metadata.get("lineage_id", "")
             return {"status": "unchanged"}
             
+        new_metadata.document_id = f"doc_{uuid.uuid4().hex[:12]}"
         SupersessionTracker.link_versions(existing_doc_metadata, new_metadata, reason="Source hash changed")
         new_metadata.change_summary = f"Content hash changed from {old_hash} to {new_metadata.source_hash}"
         new_metadata.content_delta_hash = new_metadata.source_hash
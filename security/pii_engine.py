@@ -0,0 +1,163 @@
+"""
+security/pii_engine.py
+-----------------------
+Single-pass PII detection shared by the masker, the log redactor and the
+PII redaction tool.
+- One compiled alternation with a named group per PII kind; a text is
+  scanned once for all kinds instead of once per pattern.
+- Every alternative starts on a digit, '+', '@' or an uppercase letter, so
+  the regex engine skips straight over ordinary prose between candidates.
+  The left context a kind needs (no digit before a number, a word boundary
+  before a PAN) is checked with lookbehinds after that first character.
+- Emails are matched from the '@' and widened back over the local part.
+- At a given position kinds are tried in PII_KINDS order, so a 16-digit
+  card is not half-matched as an Aadhaar number, nor a 10-digit mobile
+  number as a bank account.
+- Every kind needs a digit or an '@', so text without either returns
+  without running the scan.
+- Digits of any script (e.g. Devanagari १२३४) are mapped one-for-one to
+  ASCII before a non-ASCII text is scanned, so the patterns stay ASCII and
+  offsets still point into the original text.
+- Log redaction uses a stricter variant in which numbers must not touch a
+  letter or '_' either, so hex ids, hashes and names such as
+  doc_1234567890ab pass through log records unchanged.
+"""
+
+from __future__ import annotations
+
+import re
+import string
+import unicodedata
+from dataclasses import dataclass
+
+# Priority order: earlier kinds win when several match at the same position
+PII_KINDS = ("EMAIL", "PAN", "CARD", "AADHAAR", "PHONE", "ACCOUNT")
+
+# (group name, kind, pattern). Each pattern starts after the first character
+# of the match, which the combined regex consumes up front. EDGE is the class
+# of characters a number must not touch on either side.
+_ALTERNATIVES = [
+    ("EMAIL", "EMAIL", r"(?<=[A-Za-z0-9._%+-]@)[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}"),
+    ("PAN", "PAN", r"(?<=\b[A-Z])[A-Z]{4}[0-9]{4}[A-Z]\b"),
+    # Cards as written in four 4-digit groups; an unbroken run of digits counts as an account number
+    ("CARD", "CARD", r"(?<=(?<![EDGE])[0-9])[0-9]{3}[ -][0-9]{4}[ -][0-9]{4}[ -][0-9]{4}(?![EDGE])"),
+    ("AADHAAR", "AADHAAR", r"(?<=(?<![EDGE])[0-9])[0-9]{3}[ -]?[0-9]{4}[ -]?[0-9]{4}(?![EDGE])"),
+    ("PHONE_INTL", "PHONE", r"(?<=(?<![EDGE+])\+)91[ -]?[6-9][0-9]{9}(?![EDGE])"),
+    ("PHONE_TRUNK", "PHONE", r"(?<=(?<![EDGE+])0)[6-9][0-9]{9}(?![EDGE])"),
+    ("PHONE", "PHONE", r"(?<=(?<![EDGE+])[6-9])[0-9]{9}(?![EDGE])"),
+    ("ACCOUNT", "ACCOUNT", r"(?<=(?<![EDGE])[0-9])[0-9]{8,17}(?![EDGE])"),
+]
+
+
+def _compile(edge: str) -> re.Pattern[str]:
+    return re.compile(
+        "[0-9A-Z+@](?:"
+        + "|".join(f"(?P<{group}>{pattern.replace('EDGE', edge)})" for group, _kind, pattern in _ALTERNATIVES)
+        + ")"
+    )
+
+
+PII_REGEX = _compile("0-9")
+_LOG_REGEX = _compile("0-9A-Za-z_")
+_KIND_OF_GROUP = {group: kind for group, kind, _pattern in _ALTERNATIVES}
+_EMAIL_LOCAL = frozenset(string.ascii_letters + string.digits + "._%+-")
+# \d also matches non-ASCII digits, which are normalized before the scan
+_TRIGGER = re.compile(r"[\d@]")
+
+_MASKS = {kind: f"[{kind}_MASKED]" for kind in PII_KINDS}
+_REDACTIONS = {kind: f"[{kind}_REDACTED]" for kind in PII_KINDS}
+
+
+@dataclass(frozen=True)
+class PIIMatch:
+    kind: str
+    start: int
+    end: int
+    text: str
+
+
+class _AsciiDigits(dict):
+    """``str.translate`` table mapping every Unicode decimal digit to its ASCII digit, filled on first sight."""
+
+    def __missing__(self, codepoint: int) -> int:
+        digit = unicodedata.decimal(chr(codepoint), None)
+        self[codepoint] = value = codepoint if digit is None else ord("0") + digit
+        return value
+
+
+_ASCII_DIGITS = _AsciiDigits()
+
+
+def _may_contain_pii(text: str) -> bool:
+    return "@" in text or _TRIGGER.search(text) is not None
+
+
+def _scannable(text: str) -> str:
+    # One character for one, so spans found in the result are valid offsets into ``text``
+    return text if text.isascii() else text.translate(_ASCII_DIGITS)
+
+
+def _spans(text: str, regex: re.Pattern[str] = PII_REGEX) -> list[tuple[str, int, int]]:
+    text = _scannable(text)
+    spans: list[tuple[str, int, int]] = []
+    for match in regex.finditer(text):
+        kind = _KIND_OF_GROUP[match.lastgroup]
+        start, end = match.span()
+        if kind == "EMAIL":
+            while start > 0 and text[start - 1] in _EMAIL_LOCAL:
+                start -= 1
+            # Numbers inside the local part were matched on their own; the address wins
+            while spans and spans[-1][2] > start:
+                start = min(start, spans.pop()[1])
+        spans.append((kind, start, end))
+    return spans
+
+
+def detect_pii(text: str) -> list[PIIMatch]:
+    """All PII spans in ``text``, left to right, with offsets into the original string."""
+    if not text or not _may_contain_pii(text):
+        return []
+    return [PIIMatch(kind, start, end, text[start:end]) for kind, start, end in _spans(text)]
+
+
+def contains_pii(text: str) -> bool:
+    return bool(text) and _may_contain_pii(text) and PII_REGEX.search(_scannable(text)) is not None
+
+
+def replace_pii(text: str, replacements: dict[str, str], regex: re.Pattern[str] = PII_REGEX) -> str:
+    """Replaces every PII span with ``replacements[kind]``."""
+    if not text or not _may_contain_pii(text):
+        return text
+    return _replace(text, _spans(text, regex), replacements)
+
+
+def mask_matches(text: str, matches: list[PIIMatch]) -> str:
+    """``mask_text`` for spans ``detect_pii`` already found in ``text``, without scanning it again."""
+    return _replace(text, [(match.kind, match.start, match.end) for match in matches], _MASKS)
+
+
+def _replace(text: str, spans: list[tuple[str, int, int]], replacements: dict[str, str]) -> str:
+    if not spans:
+        return text
+    parts = []
+    position = 0
+    for kind, start, end in spans:
+        parts.append(text[position:start])
+        parts.append(replacements[kind])
+        position = end
+    parts.append(text[position:])
+    return "".join(parts)
+
+
+def mask_text(text: str) -> str:
+    """``[AADHAAR_MASKED]``-style placeholders, used before LLM calls and storage."""
+    return replace_pii(text, _MASKS)
+
+
+def redact_text(text: str) -> str:
+    """``[AADHAAR_REDACTED]``-style placeholders, used for log records.
+
+    Numbers must stand apart from letters and '_' as well as digits, so
+    identifiers in log lines are not mistaken for PII.
+    """
+    return replace_pii(text, _REDACTIONS, _LOG_REGEX)
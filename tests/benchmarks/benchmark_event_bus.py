@@ -0,0 +1,40 @@
+"""Benchmarks for event bus publish throughput with many concurrent subscribers."""
+
+import asyncio
+import time
+
+import pytest
+from communication.event_bus import EventBus
+
+SUBSCRIBERS = 1000
+EVENTS = 20000
+
+
+@pytest.mark.benchmark
+async def test_publish_throughput_with_1k_subscribers():
+    bus = EventBus()
+    received = [0] * SUBSCRIBERS
+
+    async def consume(index: int, subscription) -> None:
+        async for _event in subscription:
+            received[index] += 1
+
+    subscriptions = [bus.open_subscription("node.finished", request_id=f"req-{index}", maxsize=64) for index in range(SUBSCRIBERS)]
+    consumers = [asyncio.create_task(consume(index, subscription)) for index, subscription in enumerate(subscriptions)]
+
+    start = time.perf_counter()
+    for n in range(EVENTS):
+        await bus.publish("node.finished", {"n": n}, request_id=f"req-{n % SUBSCRIBERS}")
+        if n % 500 == 0:
+            await asyncio.sleep(0)
+    duration = time.perf_counter() - start
+    await asyncio.sleep(0.05)
+    for consumer in consumers:
+        consumer.cancel()
+
+    throughput = EVENTS / duration
+    delivered = sum(received) + sum(subscription.queue.qsize() for subscription in subscriptions)
+    dropped = sum(subscription.dropped for subscription in subscriptions)
+    print(f"EventBus publish: {throughput:,.0f} events/sec to {SUBSCRIBERS} subscribers (delivered={delivered}, dropped={dropped})")
+    assert delivered + dropped == EVENTS
+    assert throughput > 5000
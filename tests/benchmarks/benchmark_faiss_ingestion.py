@@ -0,0 +1,50 @@
+"""Benchmarks for FAISS incremental ingestion cost versus corpus size."""
+
+import os
+import time
+
+import pytest
+from rag.types import DocumentChunk, DocumentMetadata
+from rag.vectorstore.faiss_store import RealFaissStore
+
+BASE_CHUNKS = int(os.getenv("RTI_BENCH_BASE_CHUNKS", "20000"))
+BATCH_CHUNKS = 1000
+
+
+def _chunks(prefix: str, count: int) -> list[DocumentChunk]:
+    return [
+        DocumentChunk(
+            text=f"{prefix} chunk {i}",
+            chunk_id=f"{prefix}:{i}",
+            chunk_index=i,
+            content_hash=f"{prefix}-hash-{i}",
+            metadata=DocumentMetadata(department="Public Works Department"),
+        )
+        for i in range(count)
+    ]
+
+
+def _ingest_seconds(store: RealFaissStore) -> float:
+    start = time.perf_counter()
+    store.add_chunks(_chunks("batch", BATCH_CHUNKS))
+    return time.perf_counter() - start
+
+
+@pytest.mark.benchmark
+def test_batch_ingest_cost_independent_of_corpus_size(tmp_path, mock_env, monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "FAISS_COMPACT_SEGMENT_THRESHOLD", 10_000)
+
+    empty = RealFaissStore(index_path=tmp_path / "empty")
+    empty_seconds = _ingest_seconds(empty)
+
+    populated = RealFaissStore(index_path=tmp_path / "populated")
+    populated.rebuild(_chunks("base", BASE_CHUNKS))
+    populated_seconds = _ingest_seconds(populated)
+
+    ratio = populated_seconds / empty_seconds
+    print(
+        f"Ingest {BATCH_CHUNKS} chunks: empty={empty_seconds * 1000:.1f}ms "
+        f"populated({BASE_CHUNKS})={populated_seconds * 1000:.1f}ms ratio={ratio:.2f}"
+    )
+    assert ratio < 2.0
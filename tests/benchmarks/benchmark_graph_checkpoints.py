@@ -0,0 +1,96 @@
+"""Benchmarks checkpoint writes and bytes per RTI request with and without fused deterministic nodes."""
+
+import pytest
+from langgraph.checkpoint.memory import MemorySaver
+
+import graph.graph_builder as graph_builder
+import graph.nodes.info_fetcher_node as info_fetcher_module
+import graph.nodes.retrieval_node as retrieval_module
+import graph.nodes.tool_selection_node as tool_selection_module
+from graph.graph_builder import build_graph
+
+RUNS = 3
+
+
+class CountingSaver(MemorySaver):
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        self.put_count = 0
+        self.put_bytes = 0
+
+    def put(self, config, checkpoint, metadata, new_versions):
+        self.put_count += 1
+        self.put_bytes += len(self.serde.dumps_typed(checkpoint)[1])
+        for channel in new_versions:
+            if channel in checkpoint["channel_values"]:
+                self.put_bytes += len(self.serde.dumps_typed(checkpoint["channel_values"][channel])[1])
+        return super().put(config, checkpoint, metadata, new_versions)
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return self.put(config, checkpoint, metadata, new_versions)
+
+
+class EmptyCollection:
+    async def find_one(self, query):
+        return None
+
+
+class NoCacheMongo:
+    db = {"rti_requests": EmptyCollection()}
+
+
+class InstantRegistry:
+    async def execute_tool(self, name, payload, **kwargs):
+        return {"status": "success", "tool_name": name, "data": {}}
+
+
+async def _no_cache_mongo():
+    return NoCacheMongo()
+
+
+async def _retrieval(query, **kwargs):
+    return {"results": [], "cache_hit": False, "confidence": 0.0}
+
+
+@pytest.fixture
+def offline_graph(monkeypatch):
+    monkeypatch.setattr(graph_builder, "BatchedSqliteSaver", CountingSaver)
+    monkeypatch.setattr(info_fetcher_module, "get_mongo_client", _no_cache_mongo)
+    monkeypatch.setattr(tool_selection_module, "get_tool_registry", lambda: InstantRegistry())
+    monkeypatch.setattr(retrieval_module, "retrieve_multilingual_results", _retrieval)
+
+
+async def _run_request(graph, run: int) -> list[str]:
+    config = {"configurable": {"thread_id": f"ckpt-{run}"}}
+    state = {
+        "request_id": f"ckpt-{run}",
+        "raw_query": "Road construction budget details of Pune municipality for 2024",
+        "user_input": {"name": "Applicant", "state": "Maharashtra", "district": "Pune"},
+        "workflow_path": [],
+        "agent_durations": {},
+        "tools_used": [],
+        "reasoning_trace": [],
+    }
+    await graph.ainvoke(state, config)
+    await graph.aupdate_state(config, {"approval_status": "approved", "approved_by": "bench"})
+    result = await graph.ainvoke(None, config)
+    return result["workflow_path"]
+
+
+@pytest.mark.benchmark
+async def test_checkpoint_writes_per_request_fused_vs_unfused(offline_graph):
+    results = {}
+    for fused in (False, True):
+        graph = build_graph(enable_hitl=True, fuse_nodes_enabled=fused)
+        saver = graph.checkpointer
+        paths = [await _run_request(graph, run) for run in range(RUNS)]
+        results[fused] = (saver.put_count / RUNS, saver.put_bytes / RUNS, paths[0])
+
+    (plain_writes, plain_bytes, plain_path), (fused_writes, fused_bytes, fused_path) = results[False], results[True]
+    print(
+        f"Checkpoints per request: unfused={plain_writes:.0f} writes / {plain_bytes / 1024:.1f} KiB, "
+        f"fused={fused_writes:.0f} writes / {fused_bytes / 1024:.1f} KiB"
+    )
+    assert fused_path == plain_path
+    assert fused_writes <= plain_writes - 4
+    assert fused_bytes < plain_bytes
@@ -0,0 +1,99 @@
+"""Benchmarks /submit latency to the approval interrupt with sequential vs fanned-out analysis branches."""
+
+import asyncio
+import time
+
+import pytest
+
+import graph.nodes.classifier_node as classifier_module
+import graph.nodes.info_fetcher_node as info_fetcher_module
+import graph.nodes.retrieval_node as retrieval_module
+import graph.nodes.tool_selection_node as tool_selection_module
+from graph.graph_builder import build_graph
+from tests.mocks.mock_llm import MockLLM
+
+CLASSIFIER_S = 0.15
+TOOLS_S = 0.10
+RETRIEVAL_S = 0.20
+RUNS = 5
+
+
+class SlowLLM(MockLLM):
+    def with_structured_output(self, schema, *args, **kwargs):
+        structured = super().with_structured_output(schema, *args, **kwargs)
+
+        class Delayed:
+            async def ainvoke(self, messages, *args, **kwargs):
+                await asyncio.sleep(CLASSIFIER_S)
+                return await structured.ainvoke(messages, *args, **kwargs)
+
+        return Delayed()
+
+
+class SlowRegistry:
+    async def execute_tool(self, name, payload, **kwargs):
+        await asyncio.sleep(TOOLS_S)
+        return {"status": "success", "tool_name": name, "data": {}}
+
+
+class EmptyCollection:
+    async def find_one(self, query):
+        return None
+
+
+class NoCacheMongo:
+    db = {"rti_requests": EmptyCollection()}
+
+
+async def _slow_retrieval(query, **kwargs):
+    await asyncio.sleep(RETRIEVAL_S)
+    return {"results": [], "cache_hit": False, "confidence": 0.0}
+
+
+async def _no_cache_mongo():
+    return NoCacheMongo()
+
+
+@pytest.fixture
+def slow_branches(monkeypatch):
+    monkeypatch.setattr(info_fetcher_module, "get_mongo_client", _no_cache_mongo)
+    monkeypatch.setattr(classifier_module, "get_llm", lambda *args, **kwargs: SlowLLM())
+    monkeypatch.setattr(tool_selection_module, "get_tool_registry", lambda: SlowRegistry())
+    monkeypatch.setattr(tool_selection_module, "select_tools", lambda query, department: ["department_lookup", "rti_act_lookup"])
+    monkeypatch.setattr(retrieval_module, "retrieve_multilingual_results", _slow_retrieval)
+
+
+async def _latency_to_approval(graph, run: int) -> float:
+    config = {"configurable": {"thread_id": f"bench-{run}"}}
+    state = {
+        "request_id": f"bench-{run}",
+        "raw_query": "Road construction budget details of Pune municipality for 2024",
+        "user_input": {"name": "Applicant", "state": "Maharashtra", "district": "Pune"},
+        "workflow_path": [],
+        "agent_durations": {},
+        "tools_used": [],
+        "reasoning_trace": [],
+    }
+    started = time.perf_counter()
+    await graph.ainvoke(state, config)
+    elapsed = time.perf_counter() - started
+    snapshot = await graph.aget_state(config)
+    assert snapshot.next == ("approval_node",)
+    assert "branch_join_node" in snapshot.values["workflow_path"]
+    return elapsed
+
+
+@pytest.mark.benchmark
+async def test_submit_latency_sequential_vs_parallel_branches(slow_branches):
+    results = {}
+    for parallel in (False, True):
+        graph = build_graph(enable_hitl=True, parallel_branches=parallel)
+        timings = sorted([await _latency_to_approval(graph, run) for run in range(RUNS)])
+        results[parallel] = timings[len(timings) // 2]
+
+    sequential, parallel = results[False], results[True]
+    print(
+        f"Submit -> approval interrupt: sequential={sequential * 1000:.0f}ms "
+        f"parallel={parallel * 1000:.0f}ms ({sequential / parallel:.2f}x)"
+    )
+    assert parallel < sequential - (CLASSIFIER_S + TOOLS_S) * 0.5
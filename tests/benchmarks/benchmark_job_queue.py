@@ -0,0 +1,32 @@
+"""Benchmarks for job queue drain throughput versus worker process count."""
+
+import asyncio
+import time
+
+import pytest
+from rag.queue.embedding_worker import run_embedding_workers
+from rag.queue.persistent_queue import PersistentQueue
+
+JOBS = 6000
+EMBED_SECONDS_PER_JOB = 0.001
+
+
+async def _simulated_embedding(jobs):
+    await asyncio.sleep(EMBED_SECONDS_PER_JOB * len(jobs))
+    return {}
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("processes", [1, 2, 4])
+def test_queue_drain_throughput(temp_workspace, processes):
+    db_path = str(temp_workspace / f"bench_{processes}.db")
+    queue = PersistentQueue(db_path=db_path)
+    queue.push_many((f"job{i}", {"path": f"doc{i}.pdf"}) for i in range(JOBS))
+
+    start = time.perf_counter()
+    run_embedding_workers(processes, db_path=db_path, handler=_simulated_embedding, drain=True)
+    duration = time.perf_counter() - start
+
+    throughput = JOBS / duration
+    print(f"PersistentQueue drain: {throughput:,.0f} jobs/sec with {processes} worker processes")
+    assert queue.counts() == {"COMPLETED": JOBS}
@@ -0,0 +1,71 @@
+"""Benchmarks caller-side logging cost: inline handlers vs the queued log writer."""
+
+import logging
+import os
+import time
+
+import pytest
+
+from observability.json_formatter import TelemetryJsonFormatter
+from observability.logger import LogWriter, QueuedLogHandler
+
+RECORDS = 5000
+# Generous per-record bound on the caller's cost; the inline/queued numbers are printed, not compared
+MAX_QUEUED_CALLER_S = 0.001
+EXTRA = {
+    "event": "rag_retrieval",
+    "component": "retrieval",  # never sampled out
+    "operation": "retrieval_node",
+    "query": "Provide the sanctioned amount for road repair in Ward 12, contact 9876543210",
+    "latency_ms": 182.4,
+    "retrieved_documents": 8,
+    "cache_hit": False,
+}
+
+
+def _logger(name, handlers):
+    logger = logging.getLogger(name)
+    logger.handlers = handlers
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def _emit(logger):
+    started = time.perf_counter()
+    for index in range(RECORDS):
+        logger.info(f"[RetrievalNode] done | request_id=req-{index}", extra=EXTRA)
+    return time.perf_counter() - started
+
+
+@pytest.mark.benchmark
+def test_queued_logging_moves_formatting_off_the_caller():
+    devnull = open(os.devnull, "w")
+    try:
+        inline = []
+        for level in (logging.INFO, logging.INFO, logging.ERROR):
+            handler = logging.StreamHandler(devnull)
+            handler.setLevel(level)
+            handler.setFormatter(TelemetryJsonFormatter(fmt="%(asctime)s %(levelname)s %(name)s %(message)s"))
+            inline.append(handler)
+        inline_s = _emit(_logger("bench-inline", inline))
+
+        sinks = {name: logging.StreamHandler(devnull) for name in ("console", "app.log", "error.log")}
+        writer = LogWriter(maxsize=RECORDS * 2, batch_size=256, streams=sinks)
+        writer.start()
+        queued = QueuedLogHandler(writer, [("console", logging.INFO), ("app.log", logging.INFO), ("error.log", logging.ERROR)])
+        started = time.perf_counter()
+        queued_s = _emit(_logger("bench-queued", [queued]))
+        writer.flush(timeout=60)
+        drained_s = time.perf_counter() - started
+        writer.stop()
+    finally:
+        devnull.close()
+
+    print(
+        f"Logging {RECORDS} records: inline {inline_s / RECORDS * 1e6:.0f}us/record on the caller, "
+        f"queued {queued_s / RECORDS * 1e6:.0f}us/record on the caller "
+        f"({drained_s / RECORDS * 1e6:.0f}us/record until written, dropped={writer.dropped})"
+    )
+    assert writer.dropped == 0
+    assert queued_s / RECORDS < MAX_QUEUED_CALLER_S
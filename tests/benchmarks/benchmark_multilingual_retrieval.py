@@ -0,0 +1,114 @@
+"""Benchmarks for multilingual retrieval latency: per-variant fan-out versus one batched search."""
+
+import asyncio
+import os
+import statistics
+import time
+
+import pytest
+from rag.types import DocumentChunk, DocumentMetadata
+from rag.vectorstore.native_faiss_store import NativeFaissStore
+
+CORPUS_CHUNKS = int(os.getenv("RTI_BENCH_CORPUS_CHUNKS", "20000"))
+EMBED_CALL_MS = float(os.getenv("RTI_BENCH_EMBED_CALL_MS", "2"))
+ITERATIONS = 30
+QUERIES = ["road repair budget 2024", "सड़क मरम्मत बजट 2024", "रस्ता दुरुस्ती अंदाजपत्रक 2024"]
+
+
+class _ModelCostEmbedder:
+    """Adds a fixed per-call cost standing in for a model forward pass."""
+
+    def __init__(self, embedder):
+        self.embedder = embedder
+
+    def embed_query(self, text):
+        time.sleep(EMBED_CALL_MS / 1000)
+        return self.embedder.embed_query(text)
+
+    def embed_documents(self, texts):
+        time.sleep(EMBED_CALL_MS / 1000)
+        return self.embedder.embed_documents(texts)
+
+
+async def _legacy_search(self, queries, department="", languages=None, k=5):
+    """The pre-batching CrossLingualSearch: one retrieval per (query, language) pair."""
+    from rag.retrievers.hybrid_retriever import _merge_key
+    from rag.retriever import retrieve_rag_results
+
+    tasks = [
+        retrieve_rag_results(query, department=department, language=language, k=k)
+        for query in queries
+        for language in languages or ["", "en", "hi", "mr"]
+    ]
+    merged = {}
+    confidences = []
+    for results, _cache_hit, confidence in await asyncio.gather(*tasks):
+        confidences.append(confidence)
+        for result in results:
+            key = _merge_key(result)
+            if key not in merged or result.score > merged[key].score:
+                merged[key] = result
+    return sorted(merged.values(), key=lambda item: item.score, reverse=True)[:k], False, max(confidences or [0.0])
+
+
+async def _latencies(retriever) -> list[float]:
+    samples = []
+    for _ in range(ITERATIONS):
+        start = time.perf_counter()
+        await retriever.retrieve(QUERIES[0], k=5)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float]:
+    cuts = statistics.quantiles(samples, n=20)
+    return statistics.median(samples) * 1000, cuts[18] * 1000
+
+
+@pytest.mark.benchmark
+async def test_batched_multilingual_retrieval_latency(tmp_path, mock_env, monkeypatch):
+    import rag.retriever
+    from config.settings import settings
+    from multilingual.embeddings.cross_lingual_mapper import CrossLingualMapper
+    from multilingual.retrieval.crosslingual_search import CrossLingualSearch
+    from multilingual.retrieval.multilingual_retriever import MultilingualRetriever
+    from rag.retrievers.hybrid_retriever import HybridRetriever
+    from rag.retrievers.semantic_retriever import SemanticRetriever
+
+    monkeypatch.setattr(settings, "RAG_SEMANTIC_CACHE_ENABLED", False)
+    store = NativeFaissStore(index_path=tmp_path)
+    store.rebuild(
+        [
+            DocumentChunk(
+                text=f"Circular {i} on public works",
+                chunk_id=f"chunk{i}",
+                chunk_index=i,
+                content_hash=f"hash{i}",
+                metadata=DocumentMetadata(department="Public Works Department", language=("en", "hi", "mr")[i % 3]),
+            )
+            for i in range(CORPUS_CHUNKS)
+        ]
+    )
+    store.embedder = _ModelCostEmbedder(store.embedder)
+    semantic = SemanticRetriever()
+    semantic.store = store
+    retriever = HybridRetriever(semantic_retriever=semantic)
+    monkeypatch.setattr(rag.retriever, "_retriever", retriever)
+
+    async def _map_query(self, query, language, db=None):
+        return {"queries": QUERIES}
+
+    monkeypatch.setattr(CrossLingualMapper, "map_query", _map_query)
+    monkeypatch.setattr(HybridRetriever, "_cache_get", lambda self, key: asyncio.sleep(0, None))
+    monkeypatch.setattr(HybridRetriever, "_cache_set", lambda self, key, results: asyncio.sleep(0))
+
+    batched_p50, batched_p95 = _percentiles(await _latencies(MultilingualRetriever()))
+    monkeypatch.setattr(CrossLingualSearch, "search", _legacy_search)
+    legacy_p50, legacy_p95 = _percentiles(await _latencies(MultilingualRetriever()))
+
+    print(
+        f"MultilingualRetriever.retrieve over {CORPUS_CHUNKS} chunks, {len(QUERIES)} variants x 4 languages: "
+        f"fan-out p50={legacy_p50:.1f}ms p95={legacy_p95:.1f}ms | "
+        f"batched p50={batched_p50:.1f}ms p95={batched_p95:.1f}ms"
+    )
+    assert batched_p50 < legacy_p50
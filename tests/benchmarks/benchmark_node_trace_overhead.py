@@ -0,0 +1,77 @@
+"""Benchmarks the per-node cost of @trace_node in each instrumentation mode."""
+
+import logging
+import os
+import time
+from logging.handlers import TimedRotatingFileHandler
+
+import pytest
+
+from config.settings import settings
+from observability.node_logger import trace_node
+from observability.logger import get_log_writer
+from observability.telemetry import app_logger
+
+CALLS = 2000
+
+
+def _state():
+    return {
+        "request_id": "bench-1",
+        "raw_query": "Provide the sanctioned amount and status of road repair works in Ward 12 for 2023-24",
+        "department": "Public Works Department",
+        "retrieved_context": [f"Section {index} of the RTI Act 2005. " * 40 for index in range(8)],
+        "retrieval_metadata": [{"source_path": f"rti_act_{index}.pdf", "page": index, "title": "RTI Act"} for index in range(8)],
+        "multilingual_context": {"retrieval": {"results": [{"text": "Section 8(1)(j) " * 60, "score": 0.8}] * 8}},
+        "reasoning_trace": [{"node": f"node_{index}", "detail": "considered exemptions " * 10} for index in range(15)],
+        "workflow_path": [f"node_{index}" for index in range(15)],
+        "agent_durations": {f"node_{index}": 12.5 for index in range(15)},
+    }
+
+
+async def _critic(state):
+    return {
+        "reasoning_trace": [*state["reasoning_trace"], {"node": "critic_node", "detail": "grounded"}],
+        "workflow_path": [*state["workflow_path"], "critic_node"],
+        "agent_durations": {**state["agent_durations"], "critic_node": 3.0},
+        "department": state["department"],
+    }
+
+
+async def _per_call_us(node, state):
+    started = time.perf_counter()
+    for _ in range(CALLS):
+        await node(state)
+    return (time.perf_counter() - started) / CALLS * 1e6
+
+
+@pytest.fixture
+def quiet_handlers():
+    devnull = open(os.devnull, "w")
+    handlers = [handler for handler in app_logger.handlers if type(handler) in (logging.StreamHandler, TimedRotatingFileHandler)]
+    handlers += get_log_writer().handlers()
+    previous = [(handler, handler.setStream(devnull)) for handler in handlers]
+    yield
+    get_log_writer().flush()
+    for handler, stream in previous:
+        handler.setStream(stream)
+    devnull.close()
+
+
+@pytest.mark.benchmark
+async def test_trace_node_overhead_per_mode(quiet_handlers, monkeypatch):
+    state = _state()
+    bare = await _per_call_us(_critic, state)
+    traced = trace_node("critic_node")(_critic)
+
+    overhead = {}
+    for mode in ("light", "sampled", "full"):
+        monkeypatch.setattr(settings, "NODE_TRACE_MODE", mode)
+        overhead[mode] = await _per_call_us(traced, state) - bare
+
+    print(
+        "trace_node overhead per node: "
+        + ", ".join(f"{mode}={cost:.0f}us" for mode, cost in overhead.items())
+        + f" (sampled at {settings.NODE_TRACE_SAMPLE_RATE:.0%}, bare node {bare:.1f}us)"
+    )
+    assert overhead["light"] < overhead["full"]
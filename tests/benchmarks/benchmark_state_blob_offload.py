@@ -0,0 +1,141 @@
+"""Benchmarks checkpoint bytes and serialization time per request with and without state blob offload."""
+
+import sqlite3
+import time
+
+import pytest
+
+import graph.graph_builder as graph_builder
+import graph.nodes.info_fetcher_node as info_fetcher_module
+import graph.nodes.retrieval_node as retrieval_module
+import graph.nodes.tool_selection_node as tool_selection_module
+from config.settings import settings
+from graph.blob_store import OffloadingSerializer, SqliteBlobStore
+from graph.sqlite_checkpointer import BatchedSqliteSaver
+
+RUNS = 3
+CHUNKS = 8
+
+
+class EmptyCollection:
+    async def find_one(self, query):
+        return None
+
+
+class NoCacheMongo:
+    db = {"rti_requests": EmptyCollection()}
+
+
+class PortalRegistry:
+    async def execute_tool(self, name, payload, **kwargs):
+        rows = [{"office": f"Public Information Officer {index}", "address": "Shivajinagar, Pune " * 6} for index in range(10)]
+        return {"status": "success", "tool_name": name, "data": {"rows": rows}}
+
+
+async def _no_cache_mongo():
+    return NoCacheMongo()
+
+
+async def _retrieval(query, **kwargs):
+    results = [
+        {
+            "text": f"Chunk {index}: Section 4(1)(b) disclosure of road works budget for Pune Municipal Corporation. " * 15,
+            "score": 0.8,
+            "citation": {"title": f"PMC budget circular {index}", "url": f"https://pmc.gov.in/budget/{index}.pdf"},
+            "metadata": {"source_url": f"https://pmc.gov.in/budget/{index}.pdf", "department": "Municipal Corporation", "page": index},
+        }
+        for index in range(CHUNKS)
+    ]
+    return {"results": results, "cache_hit": False, "confidence": 0.8}
+
+
+class TimedSerializer:
+    """Times every checkpoint/write serialization done by the saver."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.seconds = 0.0
+
+    def dumps_typed(self, obj):
+        started = time.perf_counter()
+        try:
+            return self.inner.dumps_typed(obj)
+        finally:
+            self.seconds += time.perf_counter() - started
+
+    def loads_typed(self, data):
+        return self.inner.loads_typed(data)
+
+
+@pytest.fixture
+def realistic_payloads(monkeypatch):
+    monkeypatch.setattr(info_fetcher_module, "get_mongo_client", _no_cache_mongo)
+    monkeypatch.setattr(tool_selection_module, "get_tool_registry", lambda: PortalRegistry())
+    monkeypatch.setattr(tool_selection_module, "select_tools", lambda query, department: ["department_directory", "rti_act_lookup", "public_portal_lookup"])
+    monkeypatch.setattr(retrieval_module, "retrieve_multilingual_results", _retrieval)
+
+
+def _stored_bytes(*paths: str) -> int:
+    total = 0
+    for path in paths:
+        with sqlite3.connect(path) as conn:
+            tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            if "checkpoints" in tables:
+                total += conn.execute("SELECT COALESCE(SUM(LENGTH(checkpoint)), 0) FROM checkpoints").fetchone()[0]
+                total += conn.execute("SELECT COALESCE(SUM(LENGTH(value)), 0) FROM writes").fetchone()[0]
+            if "blobs" in tables:
+                total += conn.execute("SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs").fetchone()[0]
+    return total
+
+
+async def _run(offload: bool, workspace, monkeypatch) -> tuple[float, float, float]:
+    db_path = str(workspace / f"checkpoints-{offload}.db")
+    blob_path = str(workspace / f"blobs-{offload}.db")
+    serde = OffloadingSerializer(SqliteBlobStore(blob_path)) if offload else None
+    timed = TimedSerializer(serde or BatchedSqliteSaver.serde)
+    writer = {"seconds": 0.0}
+    commit = BatchedSqliteSaver._commit
+
+    def timed_commit(saver, jobs):
+        started = time.perf_counter()
+        commit(saver, jobs)
+        writer["seconds"] += time.perf_counter() - started
+
+    monkeypatch.setattr(BatchedSqliteSaver, "_commit", timed_commit)
+    monkeypatch.setattr(settings, "CHECKPOINTER_DB", db_path)
+    monkeypatch.setattr(graph_builder, "BatchedSqliteSaver", lambda path, **kwargs: BatchedSqliteSaver(path, serde=timed))
+    graph = graph_builder.build_graph(enable_hitl=True)
+    try:
+        for run in range(RUNS):
+            config = {"configurable": {"thread_id": f"offload-{offload}-{run}"}}
+            state = {
+                "request_id": f"offload-{run}",
+                "raw_query": "Road construction budget details of Pune municipality for 2024",
+                "user_input": {"name": "Applicant", "state": "Maharashtra", "district": "Pune"},
+                "workflow_path": [],
+                "agent_durations": {},
+                "tools_used": [],
+                "reasoning_trace": [],
+            }
+            await graph.ainvoke(state, config)
+            await graph.aupdate_state(config, {"approval_status": "approved", "approved_by": "bench"})
+            result = await graph.ainvoke(None, config)
+            assert len(result["retrieved_context"]) == CHUNKS
+    finally:
+        graph.checkpointer.close()
+        if serde is not None:
+            serde.close()
+    return _stored_bytes(db_path, blob_path) / RUNS, timed.seconds / RUNS, writer["seconds"] / RUNS
+
+
+@pytest.mark.benchmark
+async def test_checkpoint_bytes_with_state_blob_offload(realistic_payloads, temp_workspace, monkeypatch):
+    plain_bytes, plain_serialize, plain_commit = await _run(False, temp_workspace, monkeypatch)
+    offload_bytes, offload_serialize, offload_commit = await _run(True, temp_workspace, monkeypatch)
+    print(
+        f"Checkpoint storage per request: inline={plain_bytes / 1024:.0f} KiB "
+        f"(serialize {plain_serialize * 1000:.1f}ms, writer {plain_commit * 1000:.1f}ms), "
+        f"offloaded={offload_bytes / 1024:.0f} KiB (serialize {offload_serialize * 1000:.1f}ms, writer {offload_commit * 1000:.1f}ms), "
+        f"{plain_bytes / offload_bytes:.1f}x smaller"
+    )
+    assert offload_bytes * 5 < plain_bytes
@@ -0,0 +1,59 @@
+"""Tests for the request-indexed event bus."""
+
+import asyncio
+
+import pytest
+from communication.event_bus import EventBus
+
+
+@pytest.mark.unit
+async def test_concurrent_consumers_each_receive_every_matching_event():
+    bus = EventBus()
+    first = bus.open_subscription("node.finished", request_id="req-1")
+    second = bus.open_subscription("node.finished", request_id="req-1")
+    everything = bus.open_subscription()
+
+    await bus.publish("node.finished", {"n": 1}, request_id="req-1")
+    await bus.publish("node.finished", {"n": 2}, request_id="req-2")
+    await bus.publish("tool.finished", {"n": 3}, request_id="req-1")
+
+    assert [first.queue.get_nowait().payload["n"] for _ in range(first.queue.qsize())] == [1]
+    assert [second.queue.get_nowait().payload["n"] for _ in range(second.queue.qsize())] == [1]
+    assert everything.queue.qsize() == 3
+
+
+@pytest.mark.unit
+async def test_overflow_policies_bound_queues():
+    bus = EventBus()
+    oldest = bus.open_subscription(maxsize=2, policy="drop_oldest")
+    newest = bus.open_subscription(maxsize=2, policy="drop_newest")
+    for n in range(4):
+        await bus.publish("node.finished", {"n": n})
+
+    assert [oldest.queue.get_nowait().payload["n"] for _ in range(2)] == [2, 3]
+    assert [newest.queue.get_nowait().payload["n"] for _ in range(2)] == [0, 1]
+    assert oldest.dropped == newest.dropped == 2
+
+    blocking = bus.open_subscription(maxsize=1, policy="block")
+    oldest.close()
+    newest.close()
+    await bus.publish("node.finished", {"n": 4})
+    pending = asyncio.create_task(bus.publish("node.finished", {"n": 5}))
+    await asyncio.sleep(0)
+    assert not pending.done()
+    assert (await blocking.get()).payload["n"] == 4
+    await pending
+
+
+@pytest.mark.unit
+async def test_history_is_indexed_per_request_and_closed_subscriptions_are_released():
+    bus = EventBus(max_history_per_request=2, max_tracked_requests=2)
+    for request_id in ("a", "a", "a", "b", "c"):
+        await bus.publish("node.finished", {}, request_id=request_id)
+    assert len(bus.history(request_id="a")) == 0
+    assert len(bus.history(request_id="c")) == 1
+    assert len(bus.history()) == 5
+
+    with bus.open_subscription(request_id="c"):
+        assert bus._subscriptions
+    assert not bus._subscriptions
@@ -3,9 +3,16 @@
 import os
 import pytest
 from pathlib import Path
+import tempfile
 from tempfile import TemporaryDirectory
 from unittest.mock import MagicMock, AsyncMock
 
+# Runtime output goes to a scratch directory instead of the repo; set before settings is imported
+_RUNTIME_DIR = Path(tempfile.mkdtemp(prefix="rti-tests-"))
+os.environ["LOG_DIR"] = str(_RUNTIME_DIR / "logs")
+os.environ["CHECKPOINTER_DB"] = str(_RUNTIME_DIR / "checkpoints" / "rti_checkpoints.db")
+os.environ["STATE_BLOB_DIR"] = str(_RUNTIME_DIR / "checkpoints" / "blobs")
+
 # --- Module-Level Patches to prevent import-time binding bypass ---
 import llm_router.llm_router
 from tests.mocks.mock_llm import MockLLM
@@ -60,12 +67,15 @@ rag.embeddings.embedding_router.get_embedder = lambda: MockEmbeddingRouter()
 import rag.vectorstore.faiss_store
 rag.vectorstore.faiss_store.get_embedder = lambda: MockEmbeddingRouter()
 
+import rag.ingestion.loaders.gov_scraper
+rag.ingestion.loaders.gov_scraper.FAILED_DIR = _RUNTIME_DIR / "corpus" / "failed"
+
 from langgraph.checkpoint.memory import MemorySaver
 import graph.graph_builder
 class TestingCheckpointer(MemorySaver):
     def __init__(self, *args, **kwargs):
         super().__init__()
-graph.graph_builder.SqliteSaver = TestingCheckpointer
+graph.graph_builder.BatchedSqliteSaver = TestingCheckpointer
 # ------------------------------------------------------------------
 
 from tests.mocks.mock_vectorstore import MockVectorStore
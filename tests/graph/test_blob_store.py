@@ -0,0 +1,93 @@
+"""Tests for content-addressed offload of large state values from checkpoints."""
+
+import time
+
+import pytest
+
+from graph.blob_store import BLOB_LIST_KEY, FileBlobStore, OffloadingSerializer, SqliteBlobStore
+
+
+def _checkpoint(trace, context):
+    return {"v": 4, "id": "cp-1", "ts": "2026-01-01T00:00:00+00:00", "channel_values": {"reasoning_trace": trace, "multilingual_context": context, "status": "pending"}}
+
+
+@pytest.fixture(params=["sqlite", "filesystem"])
+def serializer(request, temp_workspace):
+    store = SqliteBlobStore(str(temp_workspace / "blobs.db")) if request.param == "sqlite" else FileBlobStore(str(temp_workspace / "blobs"))
+    return OffloadingSerializer(store, min_bytes=256)
+
+
+@pytest.mark.unit
+def test_large_values_round_trip_through_the_store(serializer):
+    trace = [{"node": f"node_{index}", "detail": "x" * 120} for index in range(6)]
+    context = {"retrieval": {"results": [{"text": "Section 8(1)(j) " * 40}]}}
+
+    type_, data = serializer.dumps_typed(_checkpoint(trace, context))
+
+    assert len(data) < 600
+    fresh = OffloadingSerializer(serializer.store, min_bytes=256)
+    assert fresh.loads_typed((type_, data))["channel_values"] == _checkpoint(trace, context)["channel_values"]
+
+
+@pytest.mark.unit
+def test_growing_lists_only_store_new_items(serializer, monkeypatch):
+    stored = []
+    put_many = serializer.store.put_many
+    monkeypatch.setattr(serializer.store, "put_many", lambda blobs, touched=(): stored.append(len(blobs)) or put_many(blobs, touched))
+    trace = [{"node": f"node_{index}", "detail": "x" * 120} for index in range(6)]
+
+    serializer.dumps_typed(_checkpoint(trace, {}))
+    serializer.dumps_typed(_checkpoint([*trace, {"node": "critic_node", "detail": "y" * 120}], {}))
+
+    assert stored == [6, 1]
+
+
+@pytest.mark.unit
+def test_small_values_stay_inline(serializer):
+    type_, data = serializer.dumps_typed(["router_node", "planner_node"])
+    assert serializer.inner.loads_typed((type_, data)) == ["router_node", "planner_node"]
+
+
+@pytest.mark.unit
+def test_inline_values_are_neither_hashed_nor_re_encoded(serializer, monkeypatch):
+    import graph.blob_store as blob_store
+
+    hashed, encoded = [], []
+    blob_hash, dumps_typed = blob_store.blob_hash, serializer.inner.dumps_typed
+    monkeypatch.setattr(blob_store, "blob_hash", lambda blob: hashed.append(blob) or blob_hash(blob))
+    monkeypatch.setattr(serializer.inner, "dumps_typed", lambda obj: encoded.append(obj) or dumps_typed(obj))
+    path, notes = ["router_node", "planner_node"], {"department": "Public Works Department"}
+
+    serializer.dumps_typed(_checkpoint(path, notes))
+    first = len(encoded)
+    serializer.dumps_typed(_checkpoint(path, notes))
+
+    assert hashed == []
+    # Only the envelope is encoded again
+    assert len(encoded) == first + 1 and first > 1
+
+
+@pytest.mark.unit
+def test_sweep_keeps_referenced_blobs(serializer):
+    live = serializer.dumps_typed([{"detail": "a" * 300}])
+    serializer.dumps_typed([{"detail": "b" * 300}])
+
+    refs = serializer.references(live)
+    assert serializer.sweep(refs, created_before=float("inf")) == 1
+    assert serializer.inner.loads_typed(live)[BLOB_LIST_KEY] == list(refs)
+    assert OffloadingSerializer(serializer.store, min_bytes=256).loads_typed(live) == [{"detail": "a" * 300}]
+
+
+@pytest.mark.unit
+def test_reused_blobs_survive_a_sweep_that_missed_their_checkpoint(serializer):
+    trace = [{"detail": "a" * 300}]
+    serializer.dumps_typed(_checkpoint(trace, {}))
+    time.sleep(0.01)
+    cutoff = time.time()
+    time.sleep(0.01)
+
+    # Written after the cutoff, so a concurrent reference scan may not have seen it
+    reused = serializer.dumps_typed(_checkpoint(trace, {"note": "b" * 300}))
+
+    assert serializer.sweep(set(), created_before=cutoff) == 0
+    assert OffloadingSerializer(serializer.store, min_bytes=256).loads_typed(reused)["channel_values"]["reasoning_trace"] == trace
@@ -0,0 +1,33 @@
+"""Tests for fused execution of consecutive deterministic graph nodes."""
+
+import pytest
+
+from graph.fused_nodes import fuse_nodes, stage_members
+from graph.state import merge_branch_list
+
+
+async def _debate(state):
+    return {"agent_debate": {"consensus": {}}, "workflow_path": [*state["workflow_path"], "debate_node"]}
+
+
+def _critic(state):
+    assert "agent_debate" in state
+    return {"critic_feedback": {"issues": []}, "workflow_path": [*state["workflow_path"], "critic_node"]}
+
+
+@pytest.mark.unit
+async def test_fused_members_see_earlier_updates_and_keep_their_path_entries():
+    fused = fuse_nodes([("debate_node", _debate), ("critic_node", _critic)])
+    state = {"workflow_path": ["retrieval_node"]}
+
+    update = await fused(state)
+
+    assert update["critic_feedback"] == {"issues": []}
+    assert merge_branch_list(state["workflow_path"], update["workflow_path"]) == ["retrieval_node", "debate_node", "critic_node"]
+    assert state == {"workflow_path": ["retrieval_node"]}
+
+
+@pytest.mark.unit
+def test_stage_members_expands_fused_steps_only():
+    assert stage_members("deliberation_node") == ("branch_join_node", "debate_node", "critic_node", "verifier_node")
+    assert stage_members("reviewer_node") == ("reviewer_node",)
@@ -5,10 +5,10 @@ from graph.graph_builder import build_graph
 from graph.state import RTIAgentState
 
 @pytest.fixture
-def mock_settings():
+def mock_settings(temp_workspace):
     from unittest.mock import patch
     with patch("config.settings.settings") as mock_set:
-        mock_set.CHECKPOINTER_DB = "data/checkpoints/test_checkpoints.db"
+        mock_set.CHECKPOINTER_DB = str(temp_workspace / "test_checkpoints.db")
         yield mock_set
 
 @pytest.mark.asyncio
@@ -0,0 +1,34 @@
+"""Tests for merging concurrent analysis-branch updates into RTIAgentState."""
+
+import pytest
+
+from graph.router import ANALYSIS_BRANCHES, route_to_analysis_branches
+from graph.state import merge_branch_dict, merge_branch_list
+
+
+@pytest.mark.unit
+def test_sequential_list_updates_replace_the_list():
+    base = ["router_node", "planner_node"]
+    assert merge_branch_list(base, [*base, "formatter_node"]) == ["router_node", "planner_node", "formatter_node"]
+    assert merge_branch_list(base, base) == base
+
+
+@pytest.mark.unit
+def test_concurrent_branch_updates_are_all_kept():
+    base = ["info_fetcher_node"]
+    merged = base
+    for branch in ANALYSIS_BRANCHES:
+        merged = merge_branch_list(merged, [*base, branch])
+    assert merged == ["info_fetcher_node", *ANALYSIS_BRANCHES]
+
+
+@pytest.mark.unit
+def test_branch_durations_are_merged():
+    merged = merge_branch_dict({"info_fetcher_node": 3.0, "classifier_node": 120.0}, {"info_fetcher_node": 3.0, "retrieval_node": 80.0})
+    assert merged == {"info_fetcher_node": 3.0, "classifier_node": 120.0, "retrieval_node": 80.0}
+
+
+@pytest.mark.unit
+def test_public_info_still_short_circuits_to_tracker():
+    assert route_to_analysis_branches({"info_available": True}) == "tracker_node"
+    assert route_to_analysis_branches({"info_available": False}) == ANALYSIS_BRANCHES
@@ -0,0 +1,174 @@
+"""Tests for the batched WAL SQLite checkpointer and its retention policy."""
+
+import asyncio
+import sqlite3
+import threading
+from typing import TypedDict
+
+import pytest
+from langgraph.graph import END, StateGraph
+
+from graph.blob_store import OffloadingSerializer, SqliteBlobStore
+from graph.sqlite_checkpointer import BatchedSqliteSaver
+
+
+class CountState(TypedDict):
+    count: int
+
+
+class TraceState(TypedDict):
+    trace: list[str]
+
+
+def _graph(saver):
+    builder = StateGraph(CountState)
+    for name in ("step_1", "step_2", "step_3", "approval_node"):
+        builder.add_node(name, lambda state: {"count": state["count"] + 1})
+    builder.set_entry_point("step_1")
+    builder.add_edge("step_1", "step_2")
+    builder.add_edge("step_2", "step_3")
+    builder.add_edge("step_3", "approval_node")
+    builder.add_edge("approval_node", END)
+    return builder.compile(checkpointer=saver, interrupt_before=["approval_node"])
+
+
+def _checkpoints(db_path, thread_id):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM checkpoints WHERE thread_id = ?", (thread_id,)).fetchone()[0]
+
+
+@pytest.fixture
+def saver(temp_workspace):
+    saver = BatchedSqliteSaver(str(temp_workspace / "checkpoints.db"), batch_size=16)
+    yield saver
+    saver.close()
+
+
+@pytest.mark.unit
+async def test_concurrent_runs_checkpoint_and_resume(saver):
+    graph = _graph(saver)
+    configs = [{"configurable": {"thread_id": f"t-{index}"}} for index in range(20)]
+
+    await asyncio.gather(*(graph.ainvoke({"count": 0}, config) for config in configs))
+    snapshots = [await graph.aget_state(config) for config in configs]
+    assert all(snapshot.next == ("approval_node",) and snapshot.values["count"] == 3 for snapshot in snapshots)
+
+    result = await graph.ainvoke(None, configs[0])
+    assert result["count"] == 4
+    assert (await saver.alist(configs[0]).__anext__()).checkpoint["channel_values"]["count"] == 4
+
+
+@pytest.mark.unit
+async def test_compaction_keeps_latest_for_finished_and_n_for_pending(saver):
+    graph = _graph(saver)
+    finished, waiting = {"configurable": {"thread_id": "done"}}, {"configurable": {"thread_id": "waiting"}}
+    await graph.ainvoke({"count": 0}, finished)
+    await graph.ainvoke(None, finished)
+    await graph.ainvoke({"count": 0}, waiting)
+
+    report = await saver.compact(keep_pending=2, vacuum_free_ratio=0.0)
+
+    assert _checkpoints(saver.db_path, "done") == 1
+    assert _checkpoints(saver.db_path, "waiting") == 2
+    assert report["vacuumed"] and report["db_bytes"] > 0
+    assert (await graph.aget_state(finished)).values["count"] == 4
+    assert (await graph.ainvoke(None, waiting))["count"] == 4
+
+
+@pytest.mark.unit
+async def test_compaction_only_inspects_threads_written_since_the_last_one(saver, monkeypatch):
+    graph = _graph(saver)
+    idle, active = {"configurable": {"thread_id": "idle"}}, {"configurable": {"thread_id": "active"}}
+    await graph.ainvoke({"count": 0}, idle)
+    await graph.ainvoke({"count": 0}, active)
+    await saver.compact(keep_pending=2, vacuum_free_ratio=0.0)
+
+    inspected = []
+    latest = saver._latest
+    monkeypatch.setattr(saver, "_latest", lambda threads: inspected.extend(threads) or latest(threads))
+    await graph.ainvoke(None, active)
+    await saver.compact(keep_pending=2, vacuum_free_ratio=0.0)
+
+    assert inspected == [("active", "")]
+    assert _checkpoints(saver.db_path, "active") == 1
+    assert _checkpoints(saver.db_path, "idle") == 2
+
+
+@pytest.mark.unit
+async def test_prune_keeps_checkpoints_written_after_the_scan(saver):
+    graph = _graph(saver)
+    config = {"configurable": {"thread_id": "racing"}}
+    await graph.ainvoke({"count": 0}, config)
+    scanned = await asyncio.to_thread(saver._latest, [("racing", "")])
+
+    await graph.ainvoke(None, config)
+    before = _checkpoints(saver.db_path, "racing")
+    await asyncio.wrap_future(saver._submit("compact", saver._prune, scanned, 1))
+
+    # Everything older than the scanned checkpoint goes; the scanned one and the newer ones stay
+    assert _checkpoints(saver.db_path, "racing") == 2 < before
+    assert (await graph.aget_state(config)).values["count"] == 4
+
+
+@pytest.mark.unit
+async def test_failed_write_does_not_roll_back_its_batch(saver):
+    def broken(_saver):
+        raise sqlite3.IntegrityError("boom")
+
+    ok = saver._submit("put", lambda _saver: saver.conn.execute("CREATE TABLE marker (id INTEGER)"), saver)
+    failed = saver._submit("put", broken, saver)
+
+    await asyncio.wrap_future(ok)
+    with pytest.raises(sqlite3.IntegrityError):
+        await asyncio.wrap_future(failed)
+    with sqlite3.connect(saver.db_path) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'marker'").fetchone()
+
+
+@pytest.mark.unit
+async def test_compaction_sweeps_unreferenced_state_blobs(temp_workspace):
+    serde = OffloadingSerializer(SqliteBlobStore(str(temp_workspace / "blobs.db")), min_bytes=64)
+    saver = BatchedSqliteSaver(str(temp_workspace / "offload.db"), serde=serde)
+    try:
+        builder = StateGraph(TraceState)
+        for index in range(3):
+            builder.add_node(f"step_{index}", lambda state, index=index: {"trace": [*state["trace"], f"step {index} " + "x" * 80]})
+        builder.set_entry_point("step_0")
+        builder.add_edge("step_0", "step_1")
+        builder.add_edge("step_1", "step_2")
+        builder.add_edge("step_2", END)
+        graph = builder.compile(checkpointer=saver)
+        config = {"configurable": {"thread_id": "offload"}}
+        await graph.ainvoke({"trace": ["seed " + "s" * 80]}, config)
+        scanned_on = set()
+        references = serde.references
+
+        def record_thread(row):
+            scanned_on.add(threading.current_thread())
+            return references(row)
+
+        serde.references = record_thread
+        report = await saver.compact()
+        assert scanned_on and saver._writer not in scanned_on
+
+        # Only the pruned checkpoints' writes (the graph input) referenced the deleted blob
+        assert report["blobs_deleted"] == 1
+        assert len((await graph.aget_state(config)).values["trace"]) == 4
+    finally:
+        saver.close()
+
+
+@pytest.mark.unit
+def test_saver_builds_and_closes_its_own_offload_store(temp_workspace, monkeypatch):
+    from config.settings import settings
+
+    monkeypatch.setattr(settings, "STATE_BLOB_OFFLOAD", True)
+    monkeypatch.setattr(settings, "STATE_BLOB_BACKEND", "sqlite")
+    monkeypatch.setattr(settings, "STATE_BLOB_DIR", str(temp_workspace / "blobs"))
+    saver = BatchedSqliteSaver(str(temp_workspace / "owned.db"), offload_state=True)
+    assert isinstance(saver.serde, OffloadingSerializer)
+
+    saver.close()
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        saver.serde.store._conn.execute("SELECT 1")
@@ -0,0 +1,67 @@
+"""Tests for event-driven SSE workflow streaming."""
+
+from typing import TypedDict
+
+import pytest
+from communication.workflow_stream import WorkflowStreamHub, run_graph_streaming
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, StateGraph
+
+
+class _State(TypedDict, total=False):
+    workflow_path: list[str]
+    tracking_id: str
+
+
+def _graph():
+    builder = StateGraph(_State)
+    builder.add_node("router_node", lambda state: {"workflow_path": [*state.get("workflow_path", []), "router_node"]})
+    builder.add_node("approval_node", lambda state: {"workflow_path": [*state["workflow_path"], "approval_node"]})
+    builder.add_node("tracker_node", lambda state: {"workflow_path": [*state["workflow_path"], "tracker_node"], "tracking_id": "RTI-1"})
+    builder.set_entry_point("router_node")
+    builder.add_edge("router_node", "approval_node")
+    builder.add_edge("approval_node", "tracker_node")
+    builder.add_edge("tracker_node", END)
+    return builder.compile(checkpointer=MemorySaver(), interrupt_before=["approval_node"])
+
+
+async def _collect(hub, request_id, last_event_id=None):
+    return [(event.event, event.data.get("agent")) async for event in hub.subscribe(request_id, last_event_id)]
+
+
+@pytest.mark.unit
+async def test_stream_replays_to_late_joiners_and_resumes_after_approval(monkeypatch):
+    import communication.workflow_stream as workflow_stream
+
+    hub = WorkflowStreamHub(replay_size=32, retention_seconds=60)
+    monkeypatch.setattr(workflow_stream, "_hub", hub)
+    graph = _graph()
+    config = {"configurable": {"thread_id": "req-1"}}
+
+    values = await run_graph_streaming(graph, {"workflow_path": []}, config, request_id="req-1")
+    assert values["workflow_path"] == ["router_node"]
+    assert await _collect(hub, "req-1") == [("agent_start", "router_node"), ("agent_done", "router_node"), ("approval_required", None)]
+
+    values = await run_graph_streaming(graph, None, config, request_id="req-1")
+    assert values["tracking_id"] == "RTI-1"
+
+    # A fresh subscriber skips the superseded approval pause; a reconnect resumes after its last id
+    fresh = await _collect(hub, "req-1")
+    assert ("approval_required", None) not in fresh and fresh[-1] == ("complete", None)
+    assert await _collect(hub, "req-1", last_event_id=3) == [
+        ("agent_start", "approval_node"),
+        ("agent_done", "approval_node"),
+        ("agent_start", "tracker_node"),
+        ("agent_done", "tracker_node"),
+        ("complete", None),
+    ]
+
+
+@pytest.mark.unit
+def test_replay_gap_is_detected():
+    hub = WorkflowStreamHub(replay_size=2, retention_seconds=60)
+    for index in range(5):
+        hub.publish("req-2", "agent_done", {"agent": str(index)})
+    assert hub.can_replay("req-2", 3)
+    assert not hub.can_replay("req-2", 1)
+    assert not hub.can_replay("unknown", None)
@@ -0,0 +1,104 @@
+"""Tests for concurrent per-host crawling in GovernmentScraper."""
+
+import asyncio
+import time
+
+import pytest
+from aiohttp import web
+from rag.ingestion.loaders.crawl_frontier import CrawlFrontier
+from rag.ingestion.loaders.gov_scraper import AsyncRateLimiter, GovernmentScraper, _extract_hrefs
+from rag.types import ScrapeTarget
+
+FILLER = "The district collectorate publishes land record mutation orders and hearing schedules every week. "
+PDF_BYTES = b"%PDF-1.4\n" + b"0" * (300 * 1024) + b"\n%%EOF\n"
+
+
+@pytest.fixture
+async def portal():
+    state = {"in_flight": 0, "peak": 0, "requests": []}
+    links = "".join(f'<a href="/page-{index}.html">Page {index}</a>' for index in range(8))
+
+    async def page(request):
+        state["requests"].append(time.monotonic())
+        state["in_flight"] += 1
+        state["peak"] = max(state["peak"], state["in_flight"])
+        await asyncio.sleep(0.05)
+        state["in_flight"] -= 1
+        name = request.path.strip("/") or "index"
+        extra = links + '<a href="/orders.pdf">Orders</a>' if name == "index" else ""
+        body = f"<html><head><title>{name}</title></head><body><p>{FILLER * 3}{name}</p>{extra}</body></html>"
+        return web.Response(text=body, content_type="text/html")
+
+    async def pdf(request):
+        return web.Response(body=PDF_BYTES, content_type="application/pdf")
+
+    app = web.Application()
+    app.router.add_get("/", page)
+    app.router.add_get("/page-{index}.html", page)
+    app.router.add_get("/orders.pdf", pdf)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", state
+    await runner.cleanup()
+
+
+def _target(base, rate):
+    return ScrapeTarget(name="collectorate", base_url=base, department="Revenue", allowed_domains=[base.split("//", 1)[1]], max_depth=1, rate_limit_per_second=rate)
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_workers_crawl_pages_concurrently_and_stream_pdfs(portal, temp_workspace, mock_env, monkeypatch):
+    base, state = portal
+    loaded = []
+
+    async def fake_load_pdf(path, **kwargs):
+        loaded.append(path.read_bytes())
+        return []
+
+    monkeypatch.setattr("rag.ingestion.loaders.gov_scraper.load_pdf", fake_load_pdf)
+    scraper = GovernmentScraper(raw_dir=temp_workspace / "raw", frontier=CrawlFrontier(temp_workspace / "frontier.db"))
+
+    [result] = await scraper.scrape_targets([_target(base, 0)], max_depth=1)
+
+    assert {doc.metadata.title for doc in result.documents} == {"index", *(f"page-{index}.html" for index in range(8))}
+    assert state["peak"] > 1
+    assert loaded == [PDF_BYTES]
+    assert list((temp_workspace / "raw").rglob("*.pdf"))
+    assert not list((temp_workspace / "raw" / ".partial").iterdir())
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_host_token_bucket_spaces_requests_across_workers(portal, temp_workspace, mock_env):
+    base, state = portal
+    scraper = GovernmentScraper(raw_dir=temp_workspace / "raw", frontier=CrawlFrontier(temp_workspace / "frontier.db"))
+
+    await scraper.scrape_targets([_target(base, 20)], max_depth=1)
+
+    gaps = [later - earlier for earlier, later in zip(state["requests"], state["requests"][1:])]
+    assert len(state["requests"]) == 9
+    assert min(gaps) >= 0.04
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_rate_limiter_allows_burst_then_refills():
+    limiter = AsyncRateLimiter(10, burst=3)
+    started = time.monotonic()
+    for _ in range(3):
+        await limiter.wait()
+    assert time.monotonic() - started < 0.05
+    await limiter.wait()
+    assert time.monotonic() - started >= 0.09
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+def test_extract_hrefs_handles_malformed_html():
+    html = '<div><a href="/a.html">A<a href="b.pdf">B</div><p><a name="x">no href'
+    assert _extract_hrefs(html) == ["/a.html", "b.pdf"]
+    assert _extract_hrefs("") == []
@@ -0,0 +1,212 @@
+"""Tests for incremental re-crawls through the persistent crawl frontier."""
+
+import pytest
+from aiohttp import web
+from rag.ingestion.chunking.chunker import SmartChunker
+from rag.ingestion.loaders.crawl_frontier import CrawlFrontier
+from rag.ingestion.loaders.gov_scraper import GovernmentScraper
+from rag.ingestion.pipelines.scrape_and_ingest import SourceVersion, commit_versions, version_changed_documents
+from rag.types import DocumentMetadata, LoadedDocument, ScrapeTarget
+
+BODY = "<html><head><title>{title}</title></head><body><p>{text}</p>{links}</body></html>"
+FILLER = "The municipal corporation publishes ward-wise road repair expenditure and contractor details every quarter. "
+
+
+@pytest.fixture
+async def portal():
+    state = {"notice": "Water supply notice for Ward 4.", "hits": {}}
+
+    def page(name, title, text, links=""):
+        etag = f'"{name}-{hash(text)}"'
+
+        async def handler(request):
+            state["hits"][name] = state["hits"].get(name, 0) + 1
+            if request.headers.get("If-None-Match") == etag:
+                return web.Response(status=304, headers={"ETag": etag})
+            body = BODY.format(title=title, text=FILLER * 3 + text(), links=links)
+            return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+        return handler
+
+    async def notice(request):
+        state["hits"]["notice"] = state["hits"].get("notice", 0) + 1
+        etag = f'"notice-{hash(state["notice"])}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        body = BODY.format(title="Notice", text=FILLER * 3 + state["notice"], links="")
+        return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+    async def robots(request):
+        return web.Response(text=f"User-agent: *\nAllow: /\nSitemap: {request.url.origin()}/sitemap.xml\n")
+
+    async def sitemap(request):
+        origin = request.url.origin()
+        return web.Response(
+            text=(
+                '<?xml version="1.0"?><urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                f"<url><loc>{origin}/archive.html</loc><lastmod>2020-01-01</lastmod></url>"
+                "</urlset>"
+            ),
+            content_type="application/xml",
+        )
+
+    app = web.Application()
+    app.router.add_get("/", page("index", "Home", lambda: "Portal home.", '<a href="/notice.html">Notice</a>'))
+    app.router.add_get("/notice.html", notice)
+    app.router.add_get("/archive.html", page("archive", "Archive", lambda: "Old circulars archive."))
+    app.router.add_get("/robots.txt", robots)
+    app.router.add_get("/sitemap.xml", sitemap)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", state
+    await runner.cleanup()
+
+
+class _Store:
+    def __init__(self):
+        self.deactivated = []
+
+    async def asupersede_document(self, document_id, successor, carried_hashes):
+        self.deactivated.append(document_id)
+        return 1
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_recrawl_fetches_and_versions_only_changed_pages(portal, temp_workspace, mock_env):
+    base, state = portal
+    target = ScrapeTarget(name="portal", base_url=base, department="Municipal Corporation", allowed_domains=[base.split("//", 1)[1]], max_depth=1, rate_limit_per_second=0)
+    frontier = CrawlFrontier(temp_workspace / "frontier.db")
+    store = _Store()
+
+    def scraper():
+        return GovernmentScraper(raw_dir=temp_workspace / "raw", frontier=frontier)
+
+    crawler = scraper()
+    first = (await crawler.scrape_targets([target], max_depth=1))[0]
+    assert {doc.metadata.title for doc in first.documents} == {"Home", "Notice", "Archive"}
+    versioned, versions = version_changed_documents(first.documents, frontier)
+    assert len(versioned) == 3 and all(doc.metadata.version == 1 for doc in versioned)
+    assert crawler.commit_frontier() == 3
+    await commit_versions(versions, frontier, store, [])
+
+    second = (await scraper().scrape_targets([target], max_depth=1))[0]
+    assert second.documents == []
+    assert second.unchanged == 3  # index + notice revalidated, archive skipped via sitemap lastmod
+    assert state["hits"]["archive"] == 1
+
+    state["notice"] = "Water supply notice for Ward 4, revised timings."
+    third = (await scraper().scrape_targets([target], max_depth=1))[0]
+    assert [doc.metadata.title for doc in third.documents] == ["Notice"]
+    notice_v1 = next(doc for doc in versioned if doc.metadata.title == "Notice").metadata
+
+    [updated], versions = version_changed_documents(third.documents, frontier)
+    assert store.deactivated == []
+    await commit_versions(versions, frontier, store, [])
+    assert updated.metadata.version == 2
+    assert updated.metadata.supersedes == notice_v1.document_id
+    assert updated.metadata.lineage_id == notice_v1.lineage_id
+    assert store.deactivated == [notice_v1.document_id]
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_failed_ingest_leaves_the_frontier_for_the_next_crawl(portal, temp_workspace, mock_env, monkeypatch):
+    from rag.ingestion.pipelines import scrape_and_ingest as pipeline
+
+    base, state = portal
+    target = ScrapeTarget(name="portal", base_url=base, department="Municipal Corporation", allowed_domains=[base.split("//", 1)[1]], max_depth=1, rate_limit_per_second=0)
+    frontier = CrawlFrontier(temp_workspace / "frontier.db")
+    monkeypatch.setattr(pipeline, "GovernmentScraper", lambda incremental: GovernmentScraper(raw_dir=temp_workspace / "raw", frontier=frontier))
+    monkeypatch.setattr(GovernmentScraper, "load_targets", lambda self, names=None: [target])
+
+    class FailingManager:
+        store = _Store()
+        chunker = SmartChunker()
+
+        async def ingest_chunks(self, chunks, documents_loaded, rebuild=False):
+            raise RuntimeError("embedder unavailable")
+
+    monkeypatch.setattr(pipeline, "VectorManager", FailingManager)
+    with pytest.raises(RuntimeError):
+        await pipeline.scrape_and_ingest(max_depth=1)
+
+    assert frontier.get(f"{base}/notice.html") is None
+    assert FailingManager.store.deactivated == []
+    retry = (await GovernmentScraper(raw_dir=temp_workspace / "raw", frontier=frontier).scrape_targets([target], max_depth=1))[0]
+    assert {doc.metadata.title for doc in retry.documents} >= {"Home", "Notice"}
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_change_past_the_first_page_is_a_new_version(temp_workspace):
+    frontier = CrawlFrontier(temp_workspace / "frontier.db")
+    frontier.record_fetch("https://gov.in/a.pdf", "portal", content_hash="h1")
+
+    def pages(last_page):
+        return [
+            LoadedDocument(text=text, metadata=DocumentMetadata(source_url="https://gov.in/a.pdf", source_hash=f"page{index}"))
+            for index, text in enumerate(["Budget circular, page one.", last_page])
+        ]
+
+    first, versions = version_changed_documents(pages("Annexure: Rs 10 lakh."), frontier)
+    await commit_versions(versions, frontier, _Store(), [])
+    assert [doc.metadata.source_hash for doc in first] == ["page0", "page1"]
+
+    assert version_changed_documents(pages("Annexure: Rs 10 lakh."), frontier)[0] == []
+    [head, tail], _versions = version_changed_documents(pages("Annexure: Rs 12 lakh."), frontier)
+    assert head.metadata.version == tail.metadata.version == 2
+    assert head.metadata.supersedes == first[0].metadata.document_id
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+@pytest.mark.parametrize("backend", ["faiss", "faiss_native"])
+async def test_superseded_version_stops_being_served(temp_workspace, mock_env, backend, monkeypatch):
+    from config.settings import settings
+    from rag.vectorstore.faiss_store import RealFaissStore
+    from rag.vectorstore.native_faiss_store import NativeFaissStore
+
+    monkeypatch.setattr(settings, "FAISS_ALLOW_DANGEROUS_DESERIALIZATION", True)
+    store_class = RealFaissStore if backend == "faiss" else NativeFaissStore
+    frontier = CrawlFrontier(temp_workspace / "frontier.db")
+    frontier.record_fetch("https://gov.in/a.pdf", "portal", content_hash="h1")
+    head = "Budget circular for the financial year, page one of the annexure."
+
+    def pages(tail):
+        return [
+            LoadedDocument(text=text, metadata=DocumentMetadata(source_url="https://gov.in/a.pdf", source_hash=f"page{index}"))
+            for index, text in enumerate([head, tail])
+        ]
+
+    async def ingest(documents):
+        store = store_class(index_path=temp_workspace / "index")
+        versioned, versions = version_changed_documents(documents, frontier)
+        chunks = SmartChunker().chunk_documents(versioned)
+        store.add_chunks(chunks)
+        await commit_versions(versions, frontier, store, chunks)
+        return versioned[0].metadata.document_id
+
+    await ingest(pages("Annexure: the sanctioned amount is Rs 10 lakh for ward repairs."))
+    current = await ingest(pages("Annexure: the sanctioned amount is Rs 12 lakh for ward repairs."))
+
+    reloaded = store_class(index_path=temp_workspace / "index")
+    hits = [result for result, _distance in reloaded.similarity_search_with_score("annexure budget", k=5)]
+    assert sorted(result.text for result in hits) == sorted([head, "Annexure: the sanctioned amount is Rs 12 lakh for ward repairs."])
+    assert {(result.metadata.document_id, result.metadata.version) for result in hits} == {(current, 2)}
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_store_that_cannot_retire_versions_fails_loudly(temp_workspace):
+    from rag.vectorstore.base import BaseVectorStore
+
+    class AppendOnlyStore(BaseVectorStore):
+        add_chunks = rebuild = similarity_search_with_score = stats = lambda self, *args, **kwargs: None
+
+    superseded = SourceVersion("https://gov.in/a.pdf", DocumentMetadata(document_id="doc2"), superseded_document_id="doc1")
+    with pytest.raises(NotImplementedError):
+        await commit_versions([superseded], CrawlFrontier(temp_workspace / "frontier.db"), AppendOnlyStore(), [])
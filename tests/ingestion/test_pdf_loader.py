@@ -0,0 +1,42 @@
+"""Tests for the sharded PDF loader."""
+
+import fitz
+import pytest
+from config.settings import settings
+from rag.ingestion.loaders.pdf_loader import extract_pdf_pages, load_pdf
+
+
+def _write_pdf(path, pages: int, blank: set[int] = frozenset()):
+    doc = fitz.open()
+    for number in range(1, pages + 1):
+        page = doc.new_page()
+        if number not in blank:
+            page.insert_text((72, 72), f"Page {number} of the Gazette notification on public works expenditure.")
+    doc.save(path)
+    doc.close()
+    return path
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+async def test_sharded_extraction_keeps_page_order(temp_workspace, mock_env, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PAGES_PER_SHARD", 3)
+    monkeypatch.setattr(settings, "PDF_PARSE_WORKERS", 2)
+    monkeypatch.setattr(settings, "OCR_WORKERS", 2)
+    pdf = _write_pdf(temp_workspace / "gazette.pdf", 10, blank={4})
+
+    pages = await extract_pdf_pages(pdf)
+
+    assert [page.page_number for page in pages] == list(range(1, 11))
+    assert all("parse_ms" in page.meta for page in pages)
+    assert [page.page_number for page in pages if page.needs_ocr] == [4]
+    assert "ocr_ms" in pages[3].meta and "ocr_ms" not in pages[0].meta
+    assert pages[6].text.startswith("Page 7 ")
+
+
+@pytest.mark.unit
+@pytest.mark.ocr
+async def test_load_pdf_small_file_parses_in_thread(temp_workspace, mock_env):
+    pdf = _write_pdf(temp_workspace / "notice.pdf", 2)
+    documents = await load_pdf(pdf, department="Public Works Department")
+    assert [document.metadata.page_number for document in documents] == [1, 2]
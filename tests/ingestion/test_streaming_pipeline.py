@@ -0,0 +1,59 @@
+"""Tests for the streaming ingestion pipeline."""
+
+import json
+
+import pytest
+from rag.ingestion.pipelines.streaming_pipeline import StreamingIngestionPipeline
+from rag.ingestion.state_machine import IngestionState
+from rag.vectorstore.native_faiss_store import NativeFaissStore
+
+PARAGRAPH = (
+    "The Public Works Department publishes its annual road maintenance budget every April. "
+    "Citizens may request the sanctioned amount, the contractor list, and completion certificates "
+    "for each ward under Section 6 of the Right to Information Act."
+)
+
+
+def _corpus(root):
+    corpus = root / "corpus"
+    corpus.mkdir()
+    for index in range(6):
+        (corpus / f"notice_{index}.txt").write_text(f"Notice {index}. {PARAGRAPH}\n\n{PARAGRAPH} Ward {index}.", encoding="utf-8")
+    (corpus / "circular.md").write_text(f"# Circular\n\n{PARAGRAPH} Circular copy.", encoding="utf-8")
+    (corpus / "faq.json").write_text(json.dumps([{"text": f"FAQ entry. {PARAGRAPH}"}]), encoding="utf-8")
+    (corpus / "broken.pdf").write_bytes(b"not a pdf")
+    return corpus
+
+
+@pytest.mark.unit
+@pytest.mark.queue
+async def test_streaming_pipeline_indexes_in_bounded_batches(temp_workspace, mock_env):
+    corpus = _corpus(temp_workspace)
+    store = NativeFaissStore(index_path=temp_workspace / "index")
+    pipeline = StreamingIngestionPipeline(store=store, rebuild=True, load_concurrency=3, queue_size=2, index_batch_size=3)
+
+    report = await pipeline.run([corpus])
+
+    assert report.failed_files == [str(corpus / "broken.pdf")]
+    assert report.chunks_indexed == store.size > 0
+    assert report.chunks_created == report.chunks_indexed + report.duplicates_skipped
+    assert pipeline.states[IngestionState.INDEXED.value] == 8
+    assert pipeline.states[IngestionState.FAILED.value] == 1
+    assert pipeline.states[IngestionState.DISCOVERED.value] == 0
+
+
+@pytest.mark.unit
+@pytest.mark.queue
+async def test_streaming_pipeline_rebuild_replaces_and_add_deduplicates(temp_workspace, mock_env):
+    corpus = _corpus(temp_workspace)
+    store = NativeFaissStore(index_path=temp_workspace / "index")
+    first = await StreamingIngestionPipeline(store=store, rebuild=True, index_batch_size=4).run([corpus])
+
+    again = await StreamingIngestionPipeline(store=store, index_batch_size=4).run([corpus])
+    assert again.chunks_indexed == 0
+    assert again.duplicates_skipped == first.chunks_indexed
+
+    (corpus / "notice_0.txt").unlink()
+    rebuilt = await StreamingIngestionPipeline(store=store, rebuild=True, index_batch_size=4).run([corpus])
+    assert 0 < rebuilt.chunks_indexed < first.chunks_indexed
+    assert store.size == rebuilt.chunks_indexed
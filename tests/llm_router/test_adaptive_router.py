@@ -0,0 +1,179 @@
+"""Tests for latency-aware provider selection, failover and hedging."""
+
+import asyncio
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from config.settings import settings
+from llm_router.adaptive_router import Candidate, ProviderRegistry, RoutedChatModel, is_rate_limited
+from llm_router.rate_governor import RateGovernor
+
+PROMPT = [{"role": "user", "content": "Classify: road repair budget Pune"}]
+
+
+class FakeProvider:
+    def __init__(self, name, delay=0.0, error=None):
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self.cancelled = 0
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.error:
+            raise self.error
+        return AIMessage(content=self.name, usage_metadata={"input_tokens": 30, "output_tokens": 10, "total_tokens": 40})
+
+
+def _routed(*providers, registry=None, governor=None):
+    candidates = [Candidate(provider.name, f"{provider.name}-model", provider) for provider in providers]
+    return RoutedChatModel(candidates, task="classification", registry=registry or ProviderRegistry(), governor=governor or RateGovernor())
+
+
+@pytest.fixture
+def routing_settings(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MIN_LATENCY_SAMPLES", 3)
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", False)
+    monkeypatch.setattr(settings, "LLM_HEDGE_MIN_DELAY_MS", 10)
+
+
+@pytest.mark.unit
+async def test_keeps_primary_and_orders_sampled_fallbacks(routing_settings):
+    groq = FakeProvider("groq", delay=0.03)
+    openai, local, gemini = FakeProvider("openai", delay=0.02), FakeProvider("local"), FakeProvider("gemini", delay=0.001)
+    model = _routed(groq, openai, local, gemini)
+    for provider in (groq, openai, gemini):
+        for _ in range(3):
+            model.registry.stats(provider.name, f"{provider.name}-model").record(provider.delay, True)
+
+    assert (await model.ainvoke(PROMPT)).content == "groq"
+    assert [item.provider for item in model.ranked()] == ["groq", "gemini", "local", "openai"]
+
+
+@pytest.mark.unit
+async def test_demoted_primary_recovers_once_its_errors_age_out(routing_settings, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_STATS_MAX_AGE_SECONDS", 0.05)
+    model = _routed(FakeProvider("groq"), FakeProvider("gemini"))
+    for _ in range(3):
+        model.registry.stats("groq", "groq-model").record(0.01, False)
+    assert [item.provider for item in model.ranked()] == ["gemini", "groq"]
+
+    await asyncio.sleep(0.06)
+    assert [item.provider for item in model.ranked()] == ["groq", "gemini"]
+
+
+@pytest.mark.unit
+async def test_failures_open_breaker_and_fail_over(routing_settings, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    groq, gemini = FakeProvider("groq", error=RuntimeError("429 Too Many Requests")), FakeProvider("gemini")
+    model = _routed(groq, gemini)
+
+    for _ in range(2):
+        assert (await model.ainvoke(PROMPT)).content == "gemini"
+    assert model.registry.breaker("groq").is_open
+    assert model.ranked()[0].provider == "gemini"
+
+    await model.ainvoke(PROMPT)
+    assert groq.calls == 2
+
+
+@pytest.mark.unit
+async def test_all_providers_failing_raises(routing_settings):
+    model = _routed(FakeProvider("groq", error=RuntimeError("boom")), FakeProvider("gemini", error=RuntimeError("down")))
+    with pytest.raises(RuntimeError, match="All LLM providers failed"):
+        await model.ainvoke(PROMPT)
+
+
+@pytest.mark.unit
+async def test_hedges_slow_leader_after_p95(routing_settings, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_HEDGE_ENABLED", True)
+    groq, gemini = FakeProvider("groq", delay=0.5), FakeProvider("gemini", delay=0.01)
+    model = _routed(groq, gemini)
+    for _ in range(3):
+        model.registry.stats("groq", "groq-model").record(0.02, True)
+
+    result = await model.ainvoke(PROMPT)
+
+    assert result.content == "gemini"
+    assert groq.calls == gemini.calls == 1
+    await asyncio.sleep(0)
+    assert groq.cancelled == 1
+
+
+@pytest.mark.unit
+async def test_concurrency_limit_is_enforced_per_provider(routing_settings, monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_MAX_CONCURRENCY", 2)
+    in_flight = peak = 0
+
+    class Tracking(FakeProvider):
+        async def ainvoke(self, messages):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            try:
+                return await super().ainvoke(messages)
+            finally:
+                in_flight -= 1
+
+    model = _routed(Tracking("groq", delay=0.02))
+    await asyncio.gather(*(model.ainvoke(PROMPT) for _ in range(6)))
+    assert peak == 2
+
+
+@pytest.mark.unit
+async def test_saturated_token_bucket_deprioritizes_provider(routing_settings, monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_TOKENS_PER_MINUTE", 1200)
+    monkeypatch.setattr(settings, "LLM_EXPECTED_COMPLETION_TOKENS", 0)
+    monkeypatch.setattr(settings, "LLM_RATE_MAX_POLL_SECONDS", 0.05)
+    governor = RateGovernor()
+    governor.buckets._state[("groq", "tokens")] = [0.0, time.monotonic()]
+    groq, gemini = FakeProvider("groq"), FakeProvider("gemini")
+    model = _routed(groq, gemini, governor=governor)
+
+    queued = asyncio.create_task(model.ainvoke(PROMPT))
+    await asyncio.sleep(0.01)
+    assert governor.saturated("groq")
+    assert (await model.ainvoke(PROMPT)).content == "gemini"
+    # The queued call waits for the bucket instead of failing over
+    assert (await queued).content == "groq"
+    assert not governor.saturated("groq")
+
+
+@pytest.mark.unit
+async def test_non_adaptive_client_still_waits_on_the_governor(monkeypatch):
+    import importlib.util
+    from pathlib import Path
+
+    # conftest replaces get_llm on the shared module, so load a private copy of the real one
+    spec = importlib.util.spec_from_file_location("llm_router_under_test", Path(__file__).parents[2] / "llm_router" / "llm_router.py")
+    llm_router = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(llm_router)
+
+    monkeypatch.setattr(settings, "LLM_ADAPTIVE_ROUTING", False)
+    monkeypatch.setattr(settings, "LLM_CACHE_ENABLED", False)
+    groq = FakeProvider("groq")
+    monkeypatch.setattr(llm_router, "_candidates", lambda task, temperature: [Candidate("groq", "groq-model", groq)])
+    acquired = []
+    governor = RateGovernor()
+    monkeypatch.setattr(governor, "acquire", lambda provider, tokens: acquired.append(provider) or asyncio.sleep(0))
+    monkeypatch.setattr("llm_router.adaptive_router.get_rate_governor", lambda: governor)
+
+    llm = llm_router.get_llm("classification")
+    assert isinstance(llm, RoutedChatModel)
+    assert (await llm.ainvoke(PROMPT)).content == "groq"
+    assert acquired == ["groq"]
+
+
+@pytest.mark.unit
+def test_is_rate_limited_recognises_quota_errors():
+    assert is_rate_limited(RuntimeError("Error code: 429 - rate limit reached"))
+    assert is_rate_limited(RuntimeError("Resource has been exhausted (e.g. check quota)."))
+    assert not is_rate_limited(RuntimeError("invalid api key"))
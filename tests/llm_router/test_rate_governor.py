@@ -0,0 +1,130 @@
+"""Tests for the per-provider LLM rate governor."""
+
+import asyncio
+import time
+
+import pytest
+
+from config.settings import settings
+from llm_router.rate_governor import LocalBuckets, RateGovernor, estimate_tokens, llm_priority
+
+
+@pytest.fixture
+def groq_limits(monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_REQUESTS_PER_MINUTE", 600)  # one request per 100 ms once the burst is spent
+    monkeypatch.setattr(settings, "GROQ_TOKENS_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "LLM_RATE_MAX_POLL_SECONDS", 0.05)
+
+
+@pytest.mark.unit
+async def test_local_buckets_take_all_kinds_or_none():
+    buckets = LocalBuckets()
+    assert await buckets.take("groq", {"requests": (60, 1), "tokens": (1000, 900)}) == 0.0
+    wait = await buckets.take("groq", {"requests": (60, 1), "tokens": (1000, 500)})
+    assert wait == pytest.approx(400 / (1000 / 60), rel=0.05)
+    # The request token was not consumed by the refused call
+    assert await buckets.take("groq", {"requests": (60, 59)}) == 0.0
+
+
+@pytest.mark.unit
+async def test_calls_queue_once_the_bucket_is_empty(groq_limits):
+    governor = RateGovernor()
+    governor.buckets._state[("groq", "requests")] = [2.0, time.monotonic()]
+
+    started = time.monotonic()
+    await asyncio.gather(*(governor.acquire("groq", 100) for _ in range(4)))
+
+    assert time.monotonic() - started >= 0.15
+
+
+@pytest.mark.unit
+async def test_high_priority_calls_are_served_before_bulk(groq_limits):
+    governor = RateGovernor()
+    governor.buckets._state[("groq", "requests")] = [0.0, time.monotonic()]
+    order = []
+
+    async def call(level, name):
+        with llm_priority(level):
+            await governor.acquire("groq", 100)
+        order.append(name)
+
+    bulk = [asyncio.create_task(call("bulk", f"eval-{index}")) for index in range(3)]
+    await asyncio.sleep(0)
+    urgent = asyncio.create_task(call("high", "approval"))
+    await asyncio.gather(*bulk, urgent)
+
+    assert order[0] == "approval"
+
+
+@pytest.mark.unit
+async def test_cancelled_waiters_leave_the_queue(groq_limits):
+    governor = RateGovernor()
+    governor.buckets._state[("groq", "requests")] = [0.0, time.monotonic()]
+
+    waiting = asyncio.create_task(governor.acquire("groq", 100))
+    await asyncio.sleep(0.01)
+    waiting.cancel()
+    await asyncio.wait_for(governor.acquire("groq", 100), timeout=1)
+    assert governor._lane("groq").heap == []
+
+
+class _RoundTripBuckets(LocalBuckets):
+    """Yields inside ``take`` the way the Redis round-trip does; the first ``failures`` calls raise."""
+
+    def __init__(self, failures: int = 0):
+        super().__init__()
+        self.failures = failures
+        self.taking = asyncio.Event()
+
+    async def take(self, provider, demand):
+        self.taking.set()
+        await asyncio.sleep(0.01)
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("bucket unavailable")
+        return await super().take(provider, demand)
+
+
+@pytest.mark.unit
+async def test_head_cancelled_during_take_is_refunded_and_the_queue_keeps_moving(groq_limits):
+    buckets = _RoundTripBuckets()
+    governor = RateGovernor(buckets)
+
+    head = asyncio.create_task(governor.acquire("groq", 100, priority="high"))
+    behind = asyncio.create_task(governor.acquire("groq", 100))
+    await buckets.taking.wait()
+    head.cancel()
+
+    await asyncio.wait_for(behind, timeout=1)
+    # Only the caller that was let through holds a request token
+    assert buckets._state[("groq", "requests")][0] == pytest.approx(599, abs=0.1)
+    assert governor._lane("groq").heap == []
+
+
+@pytest.mark.unit
+async def test_bucket_errors_do_not_end_the_pump(groq_limits):
+    governor = RateGovernor(_RoundTripBuckets(failures=2))
+    await asyncio.wait_for(asyncio.gather(*(governor.acquire("groq", 100) for _ in range(3))), timeout=1)
+
+
+@pytest.mark.unit
+async def test_settle_refunds_overestimated_tokens(monkeypatch):
+    monkeypatch.setattr(settings, "GROQ_TOKENS_PER_MINUTE", 1000)
+    governor = RateGovernor()
+    await governor.acquire("groq", 800)
+    await governor.settle("groq", 800, 200)
+    assert governor.buckets._state[("groq", "tokens")][0] == pytest.approx(800, abs=1)
+
+
+@pytest.mark.unit
+async def test_unlimited_providers_are_not_queued(monkeypatch):
+    monkeypatch.setattr(settings, "GEMINI_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(settings, "GEMINI_TOKENS_PER_MINUTE", 0)
+    governor = RateGovernor()
+    await asyncio.wait_for(asyncio.gather(*(governor.acquire("gemini", 10_000) for _ in range(50))), timeout=0.5)
+
+
+@pytest.mark.unit
+def test_estimate_tokens_counts_prompt_and_completion(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_EXPECTED_COMPLETION_TOKENS", 100)
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}]) == 200
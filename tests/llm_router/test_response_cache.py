@@ -0,0 +1,119 @@
+"""Tests for the LLM response cache, request coalescing and client reuse."""
+
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+import llm_router.llm_router as router
+from llm_router.response_cache import CachedChatModel, LLMResponseCache
+from observability.llm_telemetry import cache_stats
+
+
+class Intent(BaseModel):
+    intent: str
+    reason: str
+
+
+class CountingLLM:
+    def __init__(self, delay=0.0, fail=False):
+        self.calls = 0
+        self.delay = delay
+        self.fail = fail
+
+    def with_structured_output(self, schema, **kwargs):
+        parent = self
+
+        class Structured:
+            async def ainvoke(self, messages):
+                parent.calls += 1
+                return schema(intent="new_request", reason="formal query")
+
+        return Structured()
+
+    async def ainvoke(self, messages):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream 503")
+        return AIMessage(content=f"answer {self.calls}", usage_metadata={"input_tokens": 40, "output_tokens": 10, "total_tokens": 50})
+
+
+def _model(llm, cache):
+    return CachedChatModel(llm, task="routing", provider="groq", model="llama-3.1-8b-instant", temperature=0.2, cache=cache)
+
+
+PROMPT = [{"role": "system", "content": "Classify the RTI query."}, {"role": "user", "content": "Query: road repair budget Pune"}]
+
+
+@pytest.mark.unit
+async def test_identical_prompts_are_served_from_cache():
+    llm, cache = CountingLLM(), LLMResponseCache(max_entries=8, ttl=60)
+    model = _model(llm, cache)
+    before = cache_stats()
+
+    first = await model.ainvoke(PROMPT)
+    spaced = [{"role": "system", "content": "Classify  the RTI query.\n"}, {"role": "user", "content": " Query: road repair budget Pune"}]
+    second = await model.ainvoke(spaced)
+    other = await model.ainvoke([{"role": "user", "content": "Query: water tanker schedule"}])
+
+    assert llm.calls == 2
+    assert first.content == second.content == "answer 1" and other.content == "answer 2"
+    assert second is not first
+    after = cache_stats()
+    assert after["hit"] - before["hit"] == 1
+    assert after["tokens_saved"] - before["tokens_saved"] == 50
+
+
+@pytest.mark.unit
+async def test_structured_outputs_are_keyed_by_schema():
+    llm, cache = CountingLLM(), LLMResponseCache(max_entries=8, ttl=60)
+    model = _model(llm, cache)
+
+    structured = model.with_structured_output(Intent)
+    first = await structured.ainvoke(PROMPT)
+    second = await structured.ainvoke(PROMPT)
+    plain = await model.ainvoke(PROMPT)
+
+    assert isinstance(second, Intent) and second == first and second is not first
+    assert isinstance(plain, AIMessage)
+    assert llm.calls == 2
+
+
+@pytest.mark.unit
+async def test_concurrent_identical_prompts_share_one_upstream_call():
+    llm, cache = CountingLLM(delay=0.05), LLMResponseCache(max_entries=8, ttl=60)
+    model = _model(llm, cache)
+
+    results = await asyncio.gather(*(model.ainvoke(PROMPT) for _ in range(5)))
+
+    assert llm.calls == 1
+    assert {result.content for result in results} == {"answer 1"}
+
+
+@pytest.mark.unit
+async def test_failures_reach_every_waiter_and_are_not_cached():
+    llm, cache = CountingLLM(delay=0.02, fail=True), LLMResponseCache(max_entries=8, ttl=60)
+    model = _model(llm, cache)
+
+    results = await asyncio.gather(*(model.ainvoke(PROMPT) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert llm.calls == 1
+
+    llm.fail = False
+    assert (await model.ainvoke(PROMPT)).content == "answer 2"
+
+
+@pytest.mark.unit
+def test_clients_are_built_once_per_provider_model_and_temperature(monkeypatch):
+    built = []
+    monkeypatch.setattr(router, "_clients", {})
+    monkeypatch.setitem(router._BUILDERS, "groq", lambda model, temperature: built.append((model, temperature)) or CountingLLM())
+
+    first = router._client("groq", "llama-3.1-8b-instant", 0.2)
+    second = router._client("groq", "llama-3.1-8b-instant", 0.2)
+    router._client("groq", "llama-3.1-8b-instant", 0.7)
+
+    assert first is second
+    assert built == [("llama-3.1-8b-instant", 0.2), ("llama-3.1-8b-instant", 0.7)]
@@ -0,0 +1,74 @@
+"""Tests for the queued logging pipeline."""
+
+import io
+import json
+import logging
+
+import pytest
+
+from observability.context import request_id_var
+from observability.logger import LogWriter, QueuedLogHandler
+
+KEEP = {"component": "audit"}  # exempt from sampling
+
+
+@pytest.fixture
+def pipeline(request):
+    streams = {name: io.StringIO() for name in ("console", "app.log", "error.log")}
+    writer = LogWriter(maxsize=4, batch_size=8, streams={name: logging.StreamHandler(stream) for name, stream in streams.items()})
+    logger = logging.getLogger(f"test-pipeline-{request.node.name}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [QueuedLogHandler(writer, [("console", logging.INFO), ("app.log", logging.INFO), ("error.log", logging.ERROR)])]
+    yield writer, logger, streams
+    writer.stop()
+
+
+def _lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.mark.unit
+def test_records_are_formatted_once_and_routed_by_level(pipeline, monkeypatch):
+    writer, logger, streams = pipeline
+    calls = []
+    format_ = writer.formatter.format
+    monkeypatch.setattr(writer.formatter, "format", lambda record: calls.append(record) or format_(record))
+    writer.start()
+
+    logger.info("retrieved %d chunks", 8, extra=KEEP)
+    logger.error("tool failed", extra=KEEP)
+    assert writer.flush()
+
+    assert len(calls) == 2
+    assert [line["message"] for line in _lines(streams["app.log"])] == ["retrieved 8 chunks", "tool failed"]
+    assert [line["message"] for line in _lines(streams["error.log"])] == ["tool failed"]
+
+
+@pytest.mark.unit
+def test_context_and_redaction_use_the_emitting_thread_values(pipeline):
+    writer, logger, streams = pipeline
+    writer.start()
+    token = request_id_var.set("req-42")
+    logger.warning("applicant email is citizen@example.com")
+    request_id_var.reset(token)
+    writer.flush()
+
+    line = _lines(streams["console"])[0]
+    assert line["request_id"] == "req-42"
+    assert "citizen@example.com" not in line["message"]
+    assert "log_context" not in line
+
+
+@pytest.mark.unit
+def test_full_queue_drops_and_reports_records(pipeline):
+    writer, logger, streams = pipeline
+    for index in range(7):
+        logger.warning("burst %d", index)
+    assert writer.dropped == 3
+
+    writer.start()
+    writer.flush()
+    messages = [line["message"] for line in _lines(streams["console"])]
+    assert messages[:4] == [f"burst {index}" for index in range(4)]
+    assert "dropped 3 log records" in messages[-1]
@@ -0,0 +1,108 @@
+"""Tests for the @trace_node instrumentation tiers and the node trace recorder."""
+
+import pytest
+
+import observability.node_logger as node_logger
+from config.settings import settings
+from observability.node_logger import NodeTraceRecorder, trace_node
+from observability.telemetry_models import Outcome
+
+
+@pytest.fixture
+def events(monkeypatch):
+    captured = []
+    monkeypatch.setattr(node_logger.telemetry, "log_node_event", lambda **kwargs: captured.append(("node", kwargs)))
+    monkeypatch.setattr(node_logger.telemetry, "log_graph_event", lambda **kwargs: captured.append(("graph", kwargs)))
+    monkeypatch.setattr(node_logger.telemetry, "log_error", lambda *args, **kwargs: None)
+    return captured
+
+
+@pytest.fixture
+def recorder(monkeypatch):
+    recorder = NodeTraceRecorder(ring_size=3, max_requests=2)
+    monkeypatch.setattr(node_logger, "_recorder", recorder)
+    return recorder
+
+
+@trace_node("echo_node")
+async def echo_node(state):
+    return {"workflow_path": [*state["workflow_path"], "echo_node"], "department": state["department"]}
+
+
+@trace_node("broken_node")
+async def broken_node(state):
+    raise ValueError("boom")
+
+
+def _state():
+    return {"request_id": "req-1", "workflow_path": ["router_node"], "department": "Health"}
+
+
+@pytest.mark.unit
+async def test_light_mode_logs_once_without_hashing(monkeypatch, events, recorder):
+    monkeypatch.setattr(settings, "NODE_TRACE_MODE", "light")
+    monkeypatch.setattr(node_logger, "compress_state", lambda *args: pytest.fail("light mode must not hash state"))
+
+    await echo_node(_state())
+
+    assert len(events) == 1
+    kind, event = events[0]
+    assert kind == "node" and event["event"] == "echo_node_completed"
+    # The department is the same object handed back, so only workflow_path changed
+    assert event["changed_keys"] == ["workflow_path"]
+
+
+@pytest.mark.unit
+async def test_sampled_mode_hashes_sampled_runs_and_failures(monkeypatch, events, recorder):
+    monkeypatch.setattr(settings, "NODE_TRACE_MODE", "sampled")
+    monkeypatch.setattr(settings, "NODE_TRACE_SAMPLE_RATE", 0.0)
+    await echo_node(_state())
+    assert [event["event"] for _kind, event in events] == ["echo_node_completed"]
+
+    events.clear()
+    monkeypatch.setattr(settings, "NODE_TRACE_SAMPLE_RATE", 1.0)
+    await echo_node(_state())
+    assert events[1][1]["event"] == "echo_node_state_updated" and events[1][1]["state_hash"]
+
+    events.clear()
+    monkeypatch.setattr(settings, "NODE_TRACE_SAMPLE_RATE", 0.0)
+    with pytest.raises(ValueError):
+        await broken_node(_state())
+    assert [event["event"] for _kind, event in events] == ["broken_node_failed", "broken_node_failed_state"]
+
+
+@pytest.mark.unit
+async def test_full_mode_keeps_start_and_state_events(monkeypatch, events, recorder):
+    monkeypatch.setattr(settings, "NODE_TRACE_MODE", "full")
+    await echo_node(_state())
+    assert [event["event"] for _kind, event in events] == ["echo_node_started", "echo_node_completed", "echo_node_state_updated"]
+
+
+@pytest.mark.unit
+async def test_recorder_dumps_only_failed_or_slow_requests(monkeypatch, events, recorder):
+    monkeypatch.setattr(settings, "NODE_TRACE_MODE", "light")
+    monkeypatch.setattr(settings, "NODE_TRACE_SLOW_REQUEST_MS", 1000)
+
+    for _ in range(4):
+        await echo_node(_state())
+    assert recorder.finish("req-1", execution_time_ms=50) is None
+
+    await echo_node(_state())
+    with pytest.raises(ValueError):
+        await broken_node(_state())
+    trace = recorder.finish("req-1", execution_time_ms=50)
+    assert [entry["node"] for entry in trace] == ["echo_node", "broken_node"]
+    assert trace[-1]["outcome"] == Outcome.FAILURE.value and "boom" in trace[-1]["error"]
+    assert events[-1][1]["event"] == "node_trace_dump"
+
+    for _ in range(4):
+        await echo_node(_state())
+    assert len(recorder.finish("req-1", execution_time_ms=5000)) == 3
+
+
+@pytest.mark.unit
+def test_recorder_bounds_tracked_requests(recorder):
+    for request_id in ("req-1", "req-2", "req-3"):
+        recorder.record(request_id, "echo_node", 1.0, [], Outcome.FAILURE)
+    assert recorder.finish("req-1", execution_time_ms=0) is None
+    assert recorder.finish("req-3", execution_time_ms=0)
@@ -35,3 +35,22 @@ def test_real_pytesseract_execution():
     result = run_pytesseract(img_byte_arr.getvalue(), language="eng")
     assert result is not None
     assert "engine" in result
+
+@pytest.mark.unit
+@pytest.mark.ocr
+def test_ocr_router_rerenders_low_confidence_pages_at_high_dpi(monkeypatch):
+    import rag.ocr.ocr_router as ocr_router
+    from config.settings import settings
+
+    rendered = []
+    monkeypatch.setattr(ocr_router, "get_image_from_pdf_page", lambda page, dpi: rendered.append(dpi) or str(dpi).encode())
+    confidences = {b"150": 0.3, b"300": 0.9}
+    monkeypatch.setattr(ocr_router, "run_pytesseract", lambda image: {"text": "scan", "confidence": confidences[image], "engine": "pytesseract"})
+    monkeypatch.setattr(settings, "OCR_LOW_DPI", 150)
+    monkeypatch.setattr(settings, "OCR_HIGH_DPI", 300)
+    monkeypatch.setattr(settings, "OCR_RERENDER_CONFIDENCE", 0.6)
+
+    assert OCRRouter.process_page(object(), "")["dpi"] == 300
+    confidences[b"150"] = 0.8
+    assert OCRRouter.process_page(object(), "")["dpi"] == 150
+    assert rendered == [150, 300, 150]
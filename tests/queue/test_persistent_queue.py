@@ -19,7 +19,7 @@ def test_persistent_queue_lifecycle(temp_workspace):
     
     assert queue.claim("worker_2") is None
     
-    queue.complete("job1")
+    assert queue.complete("job1", "worker_1")
     
     queue2 = PersistentQueue(db_path=str(db_path))
     assert queue2.claim("worker_3") is None
@@ -32,7 +32,7 @@ def test_persistent_queue_failure(temp_workspace):
     
     queue.push("job2", {})
     queue.claim("worker_1")
-    queue.fail("job2", "Some error")
+    queue.fail("job2", "worker_1", "Some error")
     
     import sqlite3
     import contextlib
@@ -42,3 +42,97 @@ def test_persistent_queue_failure(temp_workspace):
             row = conn.execute("SELECT * FROM jobs WHERE job_id = 'job2'").fetchone()
             assert row["status"] == "FAILED"
             assert row["failure_reason"] == "Some error"
+
+@pytest.mark.unit
+@pytest.mark.queue
+def test_batch_claims_never_overlap_across_threads(temp_workspace):
+    import concurrent.futures
+
+    queue = PersistentQueue(db_path=str(temp_workspace / "batch_queue.db"))
+    queue.push_many((f"job{i}", {"n": i}) for i in range(200))
+
+    def drain(worker_id):
+        claimed = []
+        while jobs := queue.claim_batch(worker_id, 7):
+            claimed.extend(job["job_id"] for job in jobs)
+        return claimed
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(drain, [f"worker_{i}" for i in range(8)]))
+
+    claimed = [job_id for result in results for job_id in result]
+    assert len(claimed) == len(set(claimed)) == 200
+    assert queue.counts() == {"PROCESSING": 200}
+
+@pytest.mark.unit
+@pytest.mark.queue
+def test_expired_lease_requeues_then_dead_letters(temp_workspace):
+    queue = PersistentQueue(db_path=str(temp_workspace / "lease_queue.db"))
+    queue.push("job3", {}, max_attempts=2)
+
+    assert queue.claim("worker_1", lease_seconds=0.01)["attempts"] == 1
+    import time
+    time.sleep(0.02)
+    job = queue.claim("worker_2", lease_seconds=0.01)
+    assert job["worker_id"] == "worker_2" and job["attempts"] == 2
+    time.sleep(0.02)
+    assert queue.claim("worker_3") is None
+    assert [dead["job_id"] for dead in queue.dead_letters()] == ["job3"]
+
+    assert queue.requeue_dead() == 1
+    assert queue.claim("worker_4")["attempts"] == 1
+
+@pytest.mark.unit
+@pytest.mark.queue
+def test_retryable_failure_backs_off(temp_workspace, monkeypatch):
+    from config.settings import settings
+
+    monkeypatch.setattr(settings, "QUEUE_RETRY_BASE_SECONDS", 60)
+    queue = PersistentQueue(db_path=str(temp_workspace / "retry_queue.db"))
+    queue.push("job4", {}, max_attempts=2)
+
+    queue.claim("worker_1")
+    assert queue.fail("job4", "worker_1", "embedder timeout", retryable=True) == "PENDING"
+    assert queue.claim("worker_1") is None
+
+    monkeypatch.setattr(settings, "QUEUE_RETRY_BASE_SECONDS", 0)
+    queue.push("job5", {}, max_attempts=1)
+    queue.claim("worker_1")
+    assert queue.fail("job5", "worker_1", "embedder timeout", retryable=True) == "DEAD"
+
+@pytest.mark.unit
+@pytest.mark.queue
+async def test_queue_worker_completes_and_retries(temp_workspace):
+    from rag.queue.embedding_worker import QueueWorker
+
+    queue = PersistentQueue(db_path=str(temp_workspace / "worker_queue.db"))
+    queue.push_many((f"job{i}", {"n": i}) for i in range(10))
+    batches = []
+
+    async def handler(jobs):
+        batches.append(len(jobs))
+        return {"job3": "corrupt file"} if any(job["job_id"] == "job3" for job in jobs) else {}
+
+    processed = await QueueWorker(queue, handler, worker_id="w", batch_size=4).run(drain=True)
+
+    assert processed == 10
+    assert batches == [4, 4, 2]
+    assert queue.counts()["COMPLETED"] == 9
+
+@pytest.mark.unit
+@pytest.mark.queue
+def test_stale_worker_cannot_complete_or_fail_a_reclaimed_job(temp_workspace):
+    import time
+
+    queue = PersistentQueue(db_path=str(temp_workspace / "stale_queue.db"))
+    queue.push_many([("job6", {}), ("job7", {})])
+    queue.claim_batch("worker_1", 2, lease_seconds=0.01)
+    time.sleep(0.02)
+    assert len(queue.claim_batch("worker_2", 2)) == 2
+
+    assert queue.complete_many(["job6", "job7"], "worker_1") == ["job6", "job7"]
+    assert queue.fail("job6", "worker_1", "late failure", retryable=True) == "LOST"
+    assert queue.counts() == {"PROCESSING": 2}
+
+    assert queue.complete_many(["job6", "job7"], "worker_2") == []
+    assert queue.counts() == {"COMPLETED": 2}
@@ -0,0 +1,87 @@
+"""Tests for batched multi-query, multi-language retrieval."""
+
+import asyncio
+
+import pytest
+from rag.retrievers.hybrid_retriever import HybridRetriever, _merge_key
+from rag.retrievers.semantic_retriever import SemanticRetriever
+from rag.types import DocumentChunk, DocumentMetadata
+from rag.vectorstore.native_faiss_store import NativeFaissStore
+
+LANGUAGES = ["", "en", "hi", "mr"]
+QUERIES = ["repair works budget", "सड़क मरम्मत बजट", "रस्ता दुरुस्ती अंदाजपत्रक"]
+
+
+@pytest.fixture
+def retriever(temp_workspace, mock_env, monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "RAG_SIMILARITY_THRESHOLD", 0.0)
+
+    store = NativeFaissStore(index_path=temp_workspace)
+    store.rebuild(
+        [
+            DocumentChunk(
+                text=f"Chunk {i} on works",
+                chunk_id=f"chunk{i}",
+                chunk_index=i,
+                content_hash=f"hash{i}",
+                metadata=DocumentMetadata(department="Public Works Department", language=("en", "hi", "mr")[i % 3]),
+            )
+            for i in range(30)
+        ]
+    )
+    semantic = SemanticRetriever()
+    semantic.store = store
+    return HybridRetriever(semantic_retriever=semantic)
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_retrieve_many_matches_per_variant_fan_out(retriever):
+    calls = []
+    embed = retriever.semantic.store._embed_queries
+    retriever.semantic.store._embed_queries = lambda texts: calls.append(len(texts)) or embed(texts)
+
+    batched, cache_hit, confidence = await retriever.retrieve_many(QUERIES, languages=LANGUAGES, k=3, use_cache=False)
+    assert calls == [len(QUERIES)]
+    assert cache_hit is False
+
+    fan_out = await asyncio.gather(
+        *(retriever.retrieve(query, language=language, k=3, use_cache=False) for query in QUERIES for language in LANGUAGES)
+    )
+    merged = {}
+    for results, _hit, _confidence in fan_out:
+        for result in results:
+            if _merge_key(result) not in merged or result.score > merged[_merge_key(result)].score:
+                merged[_merge_key(result)] = result
+    expected = sorted(merged.values(), key=lambda item: item.score, reverse=True)[:3]
+
+    assert [(result.text, result.score) for result in batched] == [(result.text, result.score) for result in expected]
+    assert confidence == max(item[2] for item in fan_out)
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_retrieve_many_partitions_by_language(retriever):
+    partitions = await retriever.semantic.retrieve_many(["works"], languages=["hi", "mr"], k=4)
+    assert set(partitions[0]) == {"hi", "mr"}
+    for language, results in partitions[0].items():
+        assert len(results) == 4
+        assert all(result.metadata.language == language for result in results)
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+async def test_cache_miss_embeds_the_query_once(retriever, monkeypatch):
+    monkeypatch.setattr(HybridRetriever, "_cache_get", lambda self, key: asyncio.sleep(0, None))
+    monkeypatch.setattr(HybridRetriever, "_cache_set", lambda self, key, results: asyncio.sleep(0))
+    retriever.query_cache.clear()
+    store = retriever.semantic.store
+    calls = []
+    embed_query, embed = store.embedder.embed_query, store._embed_queries
+    monkeypatch.setattr(store.embedder, "embed_query", lambda text: calls.append(text) or embed_query(text))
+    monkeypatch.setattr(store, "_embed_queries", lambda texts: calls.extend(texts) or embed(texts))
+
+    results, cache_hit, _confidence = await retriever.retrieve("road works budget", k=3)
+    assert not cache_hit and results
+    assert calls == ["road works budget"]
@@ -0,0 +1,50 @@
+"""Tests for the similarity-keyed retrieval cache."""
+
+import pytest
+from rag.types import DocumentMetadata, RetrievalResult
+from rag.vectorstore.semantic_cache import SemanticQueryCache
+
+
+def _results(text: str) -> list[RetrievalResult]:
+    return [RetrievalResult(text=text, score=0.9, metadata=DocumentMetadata(department="Municipal Corporation"))]
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+def test_paraphrase_hits_within_partition_only():
+    cache = SemanticQueryCache(threshold=0.95, max_entries=8, ttl=60)
+    cache.set([1.0, 0.0, 0.2], _results("road budget"), department="Municipal Corporation", language="en", k=5)
+
+    hit = cache.get([0.98, 0.02, 0.21], department="municipal corporation", language="en", k=5)
+    assert hit is not None and hit[0].text == "road budget"
+
+    assert cache.get([0.98, 0.02, 0.21], department="Municipal Corporation", language="hi", k=5) is None
+    assert cache.get([0.0, 1.0, 0.0], department="Municipal Corporation", language="en", k=5) is None
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+def test_entries_expire_and_evict_lru():
+    cache = SemanticQueryCache(threshold=0.99, max_entries=2, ttl=60)
+    for index, vector in enumerate(([1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0])):
+        cache.set(vector, _results(str(index)), department="", language="", k=3)
+    assert cache.get([1.0, 0.0, 0.0], department="", language="", k=3) is None
+    assert cache.get([0.0, 0.0, 1.0], department="", language="", k=3)[0].text == "2"
+
+    cache.ttl = -1
+    cache.set([0.5, 0.5, 0.0], _results("stale"), department="", language="", k=3)
+    assert cache.get([0.5, 0.5, 0.0], department="", language="", k=3) is None
+
+
+@pytest.mark.unit
+@pytest.mark.rag
+def test_expired_exact_match_counts_as_miss():
+    from observability.metrics import semantic_cache_lookups_total
+    cache = SemanticQueryCache(threshold=0.95, max_entries=8, ttl=-1)
+    cache.set([1.0, 0.0, 0.0], _results("stale"), department="", language="", k=3)
+    misses = semantic_cache_lookups_total.labels(outcome="miss")._value.get()
+    near_hits = semantic_cache_lookups_total.labels(outcome="near_hit")._value.get()
+
+    assert cache.get([1.0, 0.0, 0.0], department="", language="", k=3) is None
+    assert semantic_cache_lookups_total.labels(outcome="miss")._value.get() == misses + 1
+    assert semantic_cache_lookups_total.labels(outcome="near_hit")._value.get() == near_hits
@@ -0,0 +1,102 @@
+"""Tests for the single-pass PII engine and its masker / redactor / tool callers."""
+
+import pytest
+
+from observability.pii_redactor import redact_log_record
+from security.pii_engine import contains_pii, detect_pii, mask_text, redact_text
+from security.pii_masker import mask_pii
+from tools.utility.pii_redaction_tool import PIIRedactionTool
+
+TEXT = (
+    "Applicant Ravi (PAN ABCDE1234F, Aadhaar 1234 5678 9012) can be reached at "
+    "+91 9876543210 or ravi.k@example.gov.in; refund to account 001234567890123 "
+    "or card 4111-1111-1111-1111."
+)
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_detects_every_kind_with_offsets():
+    matches = detect_pii(TEXT)
+    assert [match.kind for match in matches] == ["PAN", "AADHAAR", "PHONE", "EMAIL", "ACCOUNT", "CARD"]
+    for match in matches:
+        assert TEXT[match.start:match.end] == match.text
+    assert matches[2].text == "+91 9876543210"
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_overlapping_patterns_resolve_by_priority():
+    # A card is not half-matched as Aadhaar, a mobile number is not an account
+    assert [match.kind for match in detect_pii("4111 1111 1111 1111")] == ["CARD"]
+    assert [match.kind for match in detect_pii("call 9876543210")] == ["PHONE"]
+    assert [match.kind for match in detect_pii("a/c 123456789")] == ["ACCOUNT"]
+    assert [(match.kind, match.text) for match in detect_pii("mail 9876543210@example.in")] == [("EMAIL", "9876543210@example.in")]
+    assert detect_pii("RTI-2024-123456 filed on 2026-05-20 10:30") == []
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_card_needs_four_groups_of_four():
+    text = "Aadhaar 1234 5678 9012 2 copies"
+    assert [(match.kind, match.text) for match in detect_pii(text)] == [("AADHAAR", "1234 5678 9012")]
+    assert mask_text(text) == "Aadhaar [AADHAAR_MASKED] 2 copies"
+
+
+@pytest.mark.unit
+@pytest.mark.security
+@pytest.mark.multilingual
+def test_devanagari_digits_are_detected_at_original_offsets():
+    text = "आधार १२३४ ५६७८ ९०१२, मोबाइल ९८७६५४३२१०"
+    matches = detect_pii(text)
+
+    assert [(match.kind, match.text) for match in matches] == [("AADHAAR", "१२३४ ५६७८ ९०१२"), ("PHONE", "९८७६५४३२१०")]
+    assert mask_text("आधार १२३४ ५६७८ ९०१२") == "आधार [AADHAAR_MASKED]"
+    assert contains_pii("मोबाइल ९८७६५४३२१०")
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_text_without_digits_or_at_sign_is_returned_untouched():
+    text = "Please share the tender documents for the ward office renovation."
+    assert mask_text(text) is text
+    assert not contains_pii(text)
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_masker_redactor_and_tool_agree_on_spans():
+    masked = mask_pii(TEXT)
+    redacted = redact_text(TEXT)
+    assert masked.replace("_MASKED]", "]") == redacted.replace("_REDACTED]", "]")
+    assert "[AADHAAR_MASKED]" in masked and "9876543210" not in masked
+
+    record = redact_log_record({"message": TEXT, "nested": [{"email": "ravi.k@example.gov.in"}], "count": 3})
+    assert record["message"] == redacted
+    assert record["nested"][0]["email"] == "[EMAIL_REDACTED]"
+
+
+@pytest.mark.unit
+@pytest.mark.security
+async def test_redaction_tool_returns_spans_without_values():
+    result = await PIIRedactionTool().execute(text=TEXT)
+    assert result["text"] == mask_pii(TEXT)
+    assert {span["type"] for span in result["pii_spans"]} == {"PAN", "AADHAAR", "PHONE", "EMAIL", "ACCOUNT", "CARD"}
+    assert all(set(span) == {"type", "start", "end"} for span in result["pii_spans"])
+
+
+@pytest.mark.unit
+@pytest.mark.security
+def test_log_redaction_leaves_identifiers_alone():
+    record = {
+        "request_id": "6f1c2a9e-4d7b-4b21-9a3f-2e8d1c0b7a64",
+        "trace_id": "4bf92f3577b34da6a3ce929d0e0e4736",
+        "state_hash": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+        "epoch_ms": "1760751000123",
+        "message": "Loaded doc_1234567890ab for 4bf92f3577b34da6a3ce929d0e0e4736, applicant phone 9876543210",
+    }
+    redacted = redact_log_record(record)
+    assert {key: redacted[key] for key in ("request_id", "trace_id", "state_hash", "epoch_ms")} == {
+        key: record[key] for key in ("request_id", "trace_id", "state_hash", "epoch_ms")
+    }
+    assert redacted["message"] == "Loaded doc_1234567890ab for 4bf92f3577b34da6a3ce929d0e0e4736, applicant phone [PHONE_REDACTED]"
@@ -19,7 +19,7 @@ def test_queue_database_size_stability(temp_workspace):
         queue.push(job_id, {"data": "A" * 1000}) # 1KB payload
         job = queue.claim("worker_bloat")
         assert job is not None
-        queue.complete(job_id)
+        queue.complete(job_id, "worker_bloat")
         
     final_size = os.path.getsize(db_path)
     
@@ -26,7 +26,7 @@ def test_queue_recovery_and_resume(temp_workspace):
     assert job is not None
     
     # 2. Simulate worker crash / failure
-    queue.fail(job_id, "OutOfMemoryError during document parsing")
+    queue.fail(job_id, "worker_1", "OutOfMemoryError during document parsing")
     
     # 3. Verify it is marked failed and cannot be claimed by others
     assert queue.claim("worker_2") is None
@@ -78,11 +78,11 @@ async def test_load_testing_bug_detection():
         else:
             raise e
 
-def test_html_report_generator():
+def test_html_report_generator(temp_workspace):
     """Verify HTML report generator executes without templating crashes."""
     from evaluation.reports.html_report_generator import HTMLReportGenerator
     
-    generator = HTMLReportGenerator()
+    generator = HTMLReportGenerator(report_dir=str(temp_workspace))
     report_data = {
         "hallucination_rate": 0.05,
         "latency": 350.5,
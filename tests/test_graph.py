@@ -18,9 +18,12 @@ def mock_settings():
 def test_graph_compilation(mock_settings):
     """Verify that the LangGraph compiles cleanly without cycles or syntax errors."""
     try:
+        from graph.fused_nodes import stage_members
         from graph.graph_builder import build_graph
         graph = build_graph(enable_hitl=False)
         assert graph is not None
+        # Fused steps run their member nodes inside a single graph node
+        compiled_nodes = {member for name in graph.nodes for member in stage_members(name)}
         # Check that we have all standard nodes compiled
         expected_nodes = [
             "router_node", "planner_node", "formatter_node", "info_fetcher_node", "classifier_node",
@@ -29,7 +32,7 @@ def test_graph_compilation(mock_settings):
             "consensus_node", "memory_learning_node", "tracker_node"
         ]
         for node in expected_nodes:
-            assert node in graph.nodes, f"Missing node in compiled graph: {node}"
+            assert node in compiled_nodes, f"Missing node in compiled graph: {node}"
     except Exception as e:
         pytest.fail(f"Graph compilation failed: {e}")
 
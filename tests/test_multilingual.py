@@ -39,3 +39,41 @@ def test_marathi_normalizer():
     normalizer = MarathiNormalizer()
     res = normalizer.normalize("माहितीचा   अधिकार   ॥")
     assert "माहितीचा अधिकार ॥" in res
+
+async def test_translate_many_batches_memory_cache_and_providers(monkeypatch):
+    """Verify translate_many resolves memory and cache in bulk and only sends misses to providers."""
+    from multilingual.translation.translator_router import TranslatorRouter
+
+    router = TranslatorRouter()
+    calls = []
+
+    async def lookup_many(db, texts, source, targets):
+        calls.append(("memory", tuple(texts), tuple(targets)))
+        return {("जल आपूर्ति", "en"): "water supply"}
+
+    async def get_many(items):
+        calls.append(("cache", tuple(items)))
+        return {("जल आपूर्ति", "hi", "mr"): "पाणीपुरवठा"}
+
+    async def remember_many(db, entries):
+        calls.append(("remember", len(entries)))
+        return {"stored": False}
+
+    async def set_many(translations):
+        calls.append(("cache_set", len(translations)))
+
+    async def provider_translate(text, source, target):
+        calls.append(("provider", target))
+        return f"{target}:{text}"
+
+    monkeypatch.setattr(router.memory, "lookup_many", lookup_many)
+    monkeypatch.setattr(router.memory, "remember_many", remember_many)
+    monkeypatch.setattr(router.cache, "get_many", get_many)
+    monkeypatch.setattr(router.cache, "set_many", set_many)
+    monkeypatch.setattr(router.providers[0], "translate", provider_translate)
+
+    results = await router.translate_many(["जल आपूर्ति"], ["en", "hi", "mr", "ta"], source_language="hi")
+    row = results[0]
+    assert [item["provider"] for item in row] == ["translation_memory", "identity", "redis_cache", "IndicTransAdapter"]
+    assert row[3]["translated_text"] == "ta:जल आपूर्ति"
+    assert [call[0] for call in calls] == ["memory", "cache", "provider", "cache_set", "remember"]
@@ -0,0 +1,96 @@
+"""Tests for the shared government HTTP pool and its on-disk cache."""
+
+import pytest
+from aiohttp import web
+from tools.government.http_pool import GovernmentHttpPool, HttpResponseCache
+
+
+@pytest.fixture
+async def gazette_server():
+    hits = {"full": 0, "not_modified": 0}
+
+    async def circular(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            hits["not_modified"] += 1
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        hits["full"] += 1
+        return web.Response(text="circular body", headers={"ETag": '"v1"', "Cache-Control": "no-cache"})
+
+    async def fresh(request):
+        hits["full"] += 1
+        return web.Response(text="gazette body", headers={"Cache-Control": "max-age=600"})
+
+    async def private(request):
+        hits["full"] += 1
+        return web.Response(text="secret", headers={"Cache-Control": "no-store", "ETag": '"x"'})
+
+    app = web.Application()
+    app.router.add_get("/circular", circular)
+    app.router.add_get("/gazette", fresh)
+    app.router.add_get("/private", private)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}", hits
+    await runner.cleanup()
+
+
+@pytest.mark.unit
+async def test_revalidates_with_etag_and_serves_fresh_entries_locally(gazette_server, temp_workspace):
+    base, hits = gazette_server
+    pool = GovernmentHttpPool(HttpResponseCache(temp_workspace / "http"))
+    try:
+        first = await pool.get(f"{base}/circular")
+        second = await pool.get(f"{base}/circular")
+        assert (first.from_cache, second.revalidated, second.text()) == (False, True, "circular body")
+        assert hits == {"full": 1, "not_modified": 1}
+
+        await pool.get(f"{base}/gazette")
+        cached = await pool.get(f"{base}/gazette")
+        assert cached.from_cache and not cached.revalidated
+        assert hits["full"] == 2
+
+        await pool.get(f"{base}/private")
+        await pool.get(f"{base}/private")
+        assert hits["full"] == 4
+    finally:
+        await pool.close()
+
+
+@pytest.mark.unit
+async def test_cache_survives_new_pool(gazette_server, temp_workspace):
+    base, hits = gazette_server
+    for _ in range(2):
+        pool = GovernmentHttpPool(HttpResponseCache(temp_workspace / "http"))
+        assert (await pool.get(f"{base}/gazette")).text() == "gazette body"
+        await pool.close()
+    assert hits["full"] == 1
+
+
+@pytest.mark.unit
+def test_cache_evicts_oldest_entries_over_the_size_cap(temp_workspace):
+    import os
+    import time
+    from tools.government.http_pool import CachedResponse
+
+    cache = HttpResponseCache(temp_workspace / "http", max_bytes=3000, max_age_seconds=3600)
+    for index in range(4):
+        cache.store(f"https://egazette.gov.in/{index}", CachedResponse(f"u{index}", 200, b"x" * 1000, {"ETag": f'"{index}"'}))
+        meta_path, _body_path = cache._paths(f"https://egazette.gov.in/{index}")
+        os.utime(meta_path, (time.time() - 100 + index,) * 2)
+
+    cache.prune()
+    kept = [index for index in range(4) if cache.load(f"https://egazette.gov.in/{index}") is not None]
+    assert kept == [2, 3]
+
+
+@pytest.mark.unit
+def test_cache_drops_entries_past_max_age(temp_workspace):
+    from tools.government.http_pool import CachedResponse
+
+    cache = HttpResponseCache(temp_workspace / "http", max_age_seconds=0)
+    cache.store("https://egazette.gov.in/old", CachedResponse("u", 200, b"body", {"ETag": '"v"'}))
+    assert cache.load("https://egazette.gov.in/old") is None
+    assert list((temp_workspace / "http").iterdir()) == []
@@ -0,0 +1,46 @@
+"""Tests for the shared chunk duplicate index."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from rag.types import DocumentChunk, DocumentMetadata
+from rag.vectorstore.dedup_index import ChunkHashIndex
+
+
+def _chunk(chunk_id: str, content_hash: str) -> DocumentChunk:
+    return DocumentChunk(text=chunk_id, chunk_id=chunk_id, chunk_index=0, content_hash=content_hash, metadata=DocumentMetadata())
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_chunk_hash_index_bulk_membership(temp_workspace):
+    index = ChunkHashIndex(temp_workspace / "hashes.db")
+    index.add([("a", "h1"), ("b", "h2")])
+
+    fresh = index.filter_new([_chunk("a", "x"), _chunk("c", "h2"), _chunk("d", "h3"), _chunk("e", "h3")])
+    assert [chunk.chunk_id for chunk in fresh] == ["d"]
+
+    reopened = ChunkHashIndex(temp_workspace / "hashes.db")
+    assert reopened.count() == 2
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+async def test_mongo_dedup_uses_single_round_trip(monkeypatch):
+    from rag.vectorstore.mongo_store import MongoDBVectorStore
+
+    store = MongoDBVectorStore()
+    cursor = MagicMock()
+    cursor.to_list = AsyncMock(return_value=[{"_id": "c0"}, {"_id": "other", "content_hash": "h1"}])
+    collection = MagicMock()
+    collection.find = MagicMock(return_value=cursor)
+    collection.insert_many = AsyncMock(return_value=MagicMock(inserted_ids=["c2", "c3"]))
+    monkeypatch.setattr(store, "_get_collection", AsyncMock(return_value=collection))
+
+    result = await store.aadd_chunks([_chunk(f"c{i}", f"h{i}") for i in range(4)])
+
+    assert result == {"indexed": 2, "duplicates": 2}
+    assert collection.find.call_count == 1
+    inserted = collection.insert_many.call_args.args[0]
+    assert [document["_id"] for document in inserted] == ["c2", "c3"]
+    assert collection.insert_many.call_args.kwargs == {"ordered": False}
@@ -0,0 +1,51 @@
+"""Tests for the MongoDB local embedding matrix fallback."""
+
+import pytest
+from rag.vectorstore.embedding_matrix import LocalEmbeddingMatrix
+
+
+@pytest.fixture
+def matrix():
+    local = LocalEmbeddingMatrix("vector_chunks")
+    local._append(
+        ["a", "b", "c", "d"],
+        [[1.0, 0.0], [0.9, 0.1], [0.0, 1.0], [0.8, 0.2]],
+        [
+            {"department": "Health", "language": "en"},
+            {"department": "Health", "language": "hi"},
+            {"department": "Education", "language": "en"},
+            {"department": "Health", "language": "en", "is_active": False},
+        ],
+    )
+    return local
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_top_k_scores_active_rows_in_order(matrix):
+    mask, residual = matrix.filter_mask(None)
+    top = matrix.top_k([1.0, 0.0], mask, 3)
+    assert residual == {}
+    assert [chunk_id for chunk_id, _score in top] == ["a", "b", "c"]
+    assert top[0][1] == pytest.approx(1.0)
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_filters_are_applied_as_masks(matrix):
+    mask, residual = matrix.filter_mask({"department": "health", "language": ["en"], "document_type": "", "section": "x"})
+    assert residual == {"section": "x"}
+    assert [chunk_id for chunk_id, _score in matrix.top_k([0.0, 1.0], mask, 5)] == ["a"]
+    assert matrix.top_k([1.0, 0.0], matrix.restrict(mask, {"b"}), 5) == []
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_snapshot_scan_ignores_rows_appended_after_it(matrix):
+    mask, _residual = matrix.filter_mask(None)
+    snapshot, ids = matrix.matrix, matrix.ids
+    matrix._append(["e"], [[1.0, 0.0]], [{"department": "Health"}])
+
+    top = matrix.top_k([1.0, 0.0], mask, 5, snapshot, ids)
+    assert [chunk_id for chunk_id, _score in top] == ["a", "b", "c"]
+    assert matrix.size == 5
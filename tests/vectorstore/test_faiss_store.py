@@ -49,3 +49,85 @@ def test_deactivate_document_chunks(temp_workspace, mock_env):
     assert store.manifest["chunk1"]["is_active"] is False
     assert store.manifest["chunk1"]["is_latest"] is False
     assert store.manifest["chunk3"]["is_active"] is True
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_add_chunks_writes_segments_and_compacts(temp_workspace, mock_env, monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "FAISS_ALLOW_DANGEROUS_DESERIALIZATION", True)
+    store = RealFaissStore(index_path=temp_workspace)
+    for i in range(3):
+        chunk = DocumentChunk(text=f"Chunk {i}", chunk_id=str(i), chunk_index=i, content_hash=f"hash{i}", metadata=DocumentMetadata())
+        assert store.add_chunks([chunk])["indexed"] == 1
+
+    assert len(list((temp_workspace / "segments").iterdir())) == 3
+    assert not (temp_workspace / "index.faiss").exists()
+    assert len(RealFaissStore(index_path=temp_workspace).store.docstore._dict) == 3
+
+    store.compact()
+    assert list((temp_workspace / "segments").iterdir()) == []
+    assert (temp_workspace / "manifest.log.jsonl").read_text() == ""
+
+    reloaded = RealFaissStore(index_path=temp_workspace)
+    assert len(reloaded.manifest) == 3
+    assert len(reloaded.store.docstore._dict) == 3
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_torn_log_line_and_orphan_segment_are_ignored(temp_workspace, mock_env):
+    store = RealFaissStore(index_path=temp_workspace)
+    chunk = DocumentChunk(text="Chunk 1", chunk_id="1", chunk_index=1, content_hash="hash1", metadata=DocumentMetadata())
+    store.add_chunks([chunk])
+
+    (temp_workspace / "segments" / "000000000002").mkdir()
+    with (temp_workspace / "manifest.log.jsonl").open("a", encoding="utf-8") as handle:
+        handle.write('{"seq": 2, "op": "add", "chu')
+
+    reloaded = RealFaissStore(index_path=temp_workspace)
+    assert list(reloaded.manifest) == ["1"]
+    assert not (temp_workspace / "segments" / "000000000002").exists()
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_compaction_racing_a_rebuild_is_discarded(temp_workspace, mock_env, monkeypatch):
+    from config.settings import settings
+    monkeypatch.setattr(settings, "FAISS_ALLOW_DANGEROUS_DESERIALIZATION", True)
+    store = RealFaissStore(index_path=temp_workspace)
+    for i in range(2):
+        store.add_chunks([DocumentChunk(text=f"Chunk {i}", chunk_id=str(i), chunk_index=i, content_hash=f"hash{i}", metadata=DocumentMetadata())])
+
+    write_snapshot = store._write_snapshot
+    rebuilt = DocumentChunk(text="Rebuilt", chunk_id="r", chunk_index=0, content_hash="hash-r", metadata=DocumentMetadata())
+
+    def write_then_rebuild(*args):
+        tmp = write_snapshot(*args)
+        monkeypatch.setattr(store, "_write_snapshot", write_snapshot)
+        store.rebuild([rebuilt])  # lands while the compaction's snapshot is still unpublished
+        return tmp
+
+    monkeypatch.setattr(store, "_write_snapshot", write_then_rebuild)
+    store.compact()
+
+    assert list(temp_workspace.glob(".compact-*")) == []
+    assert list(RealFaissStore(index_path=temp_workspace).manifest) == ["r"]
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_batched_queries_match_single_queries(temp_workspace, mock_env):
+    from tests.mocks.mock_embedder import MockEmbedder
+
+    class AsymmetricEmbedder(MockEmbedder):
+        """Query and document vectors differ, as with Gemini's task types."""
+        def embed_documents(self, texts):
+            return [self.embed_query(f"document:{text}") for text in texts]
+
+    store = RealFaissStore(index_path=temp_workspace)
+    store.embedder = AsymmetricEmbedder()
+    store.rebuild([DocumentChunk(text=f"Chunk {i}", chunk_id=str(i), chunk_index=i, content_hash=f"hash{i}", metadata=DocumentMetadata()) for i in range(10)])
+    queries = ["budget", "Chunk 3"]
+
+    batched = store.similarity_search_many(queries, k=3)
+    single = [store.similarity_search_with_score(query, k=3) for query in queries]
+    assert [[(result.text, round(distance, 4)) for result, distance in hits] for hits in batched] == [
+        [(result.text, round(distance, 4)) for result, distance in hits] for hits in single
+    ]
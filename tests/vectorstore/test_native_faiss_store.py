@@ -0,0 +1,87 @@
+"""Tests for the native FAISS vector store."""
+
+import pytest
+from rag.types import DocumentChunk, DocumentMetadata
+from rag.vectorstore.native_faiss_store import NativeFaissStore
+
+
+def _chunk(index: int, department: str, language: str = "en", document_id: str = "") -> DocumentChunk:
+    return DocumentChunk(
+        text=f"Chunk {index} about {department}",
+        chunk_id=f"chunk{index}",
+        chunk_index=index,
+        content_hash=f"hash{index}",
+        metadata=DocumentMetadata(department=department, language=language, document_id=document_id),
+    )
+
+
+@pytest.fixture
+def native_store(temp_workspace, mock_env):
+    store = NativeFaissStore(index_path=temp_workspace)
+    chunks = [_chunk(i, "Public Works Department" if i % 10 == 0 else "Ministry of Education") for i in range(100)]
+    store.rebuild(chunks)
+    return store
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_native_store_filtered_search_returns_exactly_k(native_store):
+    results = native_store.similarity_search_with_score("road repair", k=5, filters={"department": "public works department"})
+    assert len(results) == 5
+    assert all(result.metadata.department == "Public Works Department" for result, _distance in results)
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_native_store_unknown_filter_value_returns_nothing(native_store):
+    assert native_store.similarity_search_with_score("road", k=5, filters={"language": "mr"}) == []
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_native_store_persists_and_deduplicates(temp_workspace, mock_env):
+    store = NativeFaissStore(index_path=temp_workspace)
+    assert store.add_chunks([_chunk(1, "Health", document_id="doc1")])["indexed"] == 1
+
+    reloaded = NativeFaissStore(index_path=temp_workspace)
+    assert reloaded.size == 1
+    result = reloaded.add_chunks([_chunk(1, "Health", document_id="doc1")])
+    assert result == {"indexed": 0, "duplicates": 1}
+
+    assert reloaded.deactivate_document("doc1") == 1
+    assert reloaded.similarity_search_with_score("health", k=3) == []
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_native_store_reingests_after_a_corrupt_load(temp_workspace, mock_env):
+    store = NativeFaissStore(index_path=temp_workspace)
+    store.add_chunks([_chunk(1, "Health")])
+    store.index_file.write_bytes(b"not a faiss index")
+
+    reloaded = NativeFaissStore(index_path=temp_workspace)
+    assert not reloaded.is_loaded
+    assert reloaded.add_chunks([_chunk(1, "Health")])["indexed"] == 1
+    assert len(reloaded.similarity_search_with_score("health", k=3)) == 1
+
+
+@pytest.mark.unit
+@pytest.mark.vectorstore
+def test_native_store_batched_queries_match_single_queries(temp_workspace, mock_env):
+    from tests.mocks.mock_embedder import MockEmbedder
+
+    class AsymmetricEmbedder(MockEmbedder):
+        """Query and document vectors differ, as with Gemini's task types."""
+        def embed_documents(self, texts):
+            return [self.embed_query(f"document:{text}") for text in texts]
+
+    store = NativeFaissStore(index_path=temp_workspace)
+    store.embedder = AsymmetricEmbedder()
+    store.rebuild([_chunk(i, "Health") for i in range(20)])
+    queries = ["hospital beds", "Chunk 3 about Health"]
+
+    batched = store.similarity_search_many(queries, k=4)
+    single = [store.similarity_search_with_score(query, k=4) for query in queries]
+    assert [[(result.text, round(score, 5)) for result, score in hits] for hits in batched] == [
+        [(result.text, round(score, 5)) for result, score in hits] for hits in single
+    ]
@@ -2,11 +2,11 @@ from __future__ import annotations
 
 from urllib.parse import urlparse
 
-import aiohttp
 from pydantic import BaseModel, Field
 
 from rag.ingestion.loaders.html_loader import extract_text_from_html
 from tools.base.base_tool import BaseTool
+from tools.government.http_pool import get_government_http
 
 
 class GovSearchInput(BaseModel):
@@ -28,10 +28,11 @@ class GovernmentSearchTool(BaseTool):
         domain = parsed.netloc.lower()
         if not (domain.endswith(".gov.in") or domain.endswith(".nic.in") or "municipal" in domain):
             raise ValueError("Live fetch is restricted to official government/municipal domains")
-        async with aiohttp.ClientSession(headers={"User-Agent": "RTI-Agent-Governance/3.0"}) as session:
-            async with session.get(url, timeout=self.timeout_seconds) as response:
-                response.raise_for_status()
-                html = await response.text()
-        text = extract_text_from_html(html)
+        response = await get_government_http().get(
+            url,
+            headers={"User-Agent": "RTI-Agent-Governance/3.0"},
+            timeout=self.timeout_seconds,
+        )
+        text = extract_text_from_html(response.text())
         return {"url": url, "text": text[:max_chars], "freshness_score": 1.0}
 
@@ -0,0 +1,283 @@
+"""Shared connection pool and on-disk HTTP cache for government fetches.
+
+Every government tool used to open its own ``aiohttp.ClientSession``, paying a
+fresh TCP/TLS handshake per request to the same handful of ``.gov.in`` hosts.
+``GovernmentHttpPool`` keeps one keep-alive session per event loop with
+per-host connection limits and DNS caching, and fronts it with
+``HttpResponseCache`` so repeated fetches of the same circulars and gazettes
+are served locally while fresh and revalidated with conditional GETs after.
+The cache directory is bounded: entries older than
+GOV_HTTP_CACHE_MAX_AGE_SECONDS are dropped, and once it grows past
+GOV_HTTP_CACHE_MAX_MB the least recently stored entries are evicted.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+import aiohttp
+from multidict import CIMultiDict
+
+from config.settings import settings
+from observability.structured_logger import get_logger
+
+logger = get_logger(__name__)
+
+_pool: GovernmentHttpPool | None = None
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    status: int
+    body: bytes
+    headers: Mapping[str, str] = field(default_factory=dict)
+    charset: str | None = None
+    from_cache: bool = False
+    revalidated: bool = False
+
+    def text(self) -> str:
+        return self.body.decode(self.charset or "utf-8", errors="ignore")
+
+
+class HttpResponseCache:
+    """File-per-URL response store honoring ETag, Last-Modified and Cache-Control."""
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        max_bytes: int | None = None,
+        max_age_seconds: float | None = None,
+    ):
+        self.cache_dir = Path(cache_dir or settings.GOV_HTTP_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes if max_bytes is not None else settings.GOV_HTTP_CACHE_MAX_MB * 1024 * 1024
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.GOV_HTTP_CACHE_MAX_AGE_SECONDS
+        self._size: int | None = None  # bytes on disk, scanned lazily
+        self._lock = threading.Lock()
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{digest}.json", self.cache_dir / f"{digest}.body"
+
+    def load(self, url: str) -> tuple[dict[str, Any], bytes] | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if time.time() - meta.get("stored_at", 0.0) > self.max_age_seconds:
+                self._remove(meta_path)
+                return None
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url: str, response: CachedResponse) -> None:
+        storable, expires_at = freshness(response.headers)
+        validators = {name: response.headers[name] for name in ("ETag", "Last-Modified") if response.headers.get(name)}
+        if not storable or (not validators and expires_at <= time.time()):
+            return
+        meta = {
+            "url": url,
+            "final_url": response.url,
+            "status": response.status,
+            "charset": response.charset,
+            "headers": validators,
+            "expires_at": expires_at,
+            "stored_at": time.time(),
+        }
+        meta_path, body_path = self._paths(url)
+        previous = _file_size(body_path) + _file_size(meta_path)
+        encoded = json.dumps(meta).encode("utf-8")
+        _atomic_write(body_path, response.body)
+        _atomic_write(meta_path, encoded)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(response.body) + len(encoded) - previous
+            over = self._size > self.max_bytes
+        if over:
+            self.prune()
+
+    def prune(self) -> int:
+        """Drops expired-by-age entries, then the oldest stored ones until under 90% of the size cap."""
+        for body_path in self.cache_dir.glob("*.body"):
+            if not body_path.with_suffix(".json").exists():
+                self._remove(body_path.with_suffix(".json"))  # orphaned by an interrupted store
+        entries = []
+        for meta_path in self.cache_dir.glob("*.json"):
+            try:
+                stat = meta_path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size + _file_size(meta_path.with_suffix(".body")), meta_path))
+        entries.sort()
+        total = sum(size for _mtime, size, _path in entries)
+        cutoff = time.time() - self.max_age_seconds
+        target = self.max_bytes * 0.9
+        removed = 0
+        for mtime, size, meta_path in entries:
+            if mtime >= cutoff and total <= target:
+                break
+            self._remove(meta_path)
+            total -= size
+            removed += 1
+        with self._lock:
+            self._size = total
+        if removed:
+            logger.info(f"[HttpResponseCache] Evicted {removed} entries ({total / 1048576:.1f} MB kept)")
+        return removed
+
+    def _scan_size(self) -> int:
+        return sum(_file_size(path) for path in self.cache_dir.iterdir() if path.suffix in (".json", ".body"))
+
+    @staticmethod
+    def _remove(meta_path: Path) -> None:
+        # Meta first: an entry without its meta file is never served
+        for path in (meta_path, meta_path.with_suffix(".body")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def refresh(self, url: str, meta: dict[str, Any], headers: Mapping[str, str]) -> None:
+        """Extends a cached entry after a ``304 Not Modified``."""
+        _storable, meta["expires_at"] = freshness(headers)
+        for name in ("ETag", "Last-Modified"):
+            if headers.get(name):
+                meta["headers"][name] = headers[name]
+        meta_path, _body_path = self._paths(url)
+        _atomic_write(meta_path, json.dumps(meta).encode("utf-8"))
+
+
+class GovernmentHttpPool:
+    def __init__(self, cache: HttpResponseCache | None = None):
+        self.cache = cache or HttpResponseCache()
+        # aiohttp sessions are bound to the loop that created them
+        self._sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession] = weakref.WeakKeyDictionary()
+
+    def session(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=settings.GOV_HTTP_POOL_LIMIT,
+                limit_per_host=settings.GOV_HTTP_LIMIT_PER_HOST,
+                keepalive_timeout=settings.GOV_HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=settings.GOV_HTTP_DNS_TTL_SECONDS,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    async def get(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        timeout: float = 15,
+        raise_for_status: bool = True,
+        use_cache: bool = True,
+    ) -> CachedResponse:
+        """GETs ``url`` through the shared pool, serving or revalidating from the disk cache."""
+        cached = await asyncio.to_thread(self.cache.load, url) if use_cache else None
+        request_headers = dict(headers or {})
+        if cached is not None:
+            meta, body = cached
+            if meta["expires_at"] > time.time():
+                return CachedResponse(meta["final_url"], meta["status"], body, meta["headers"], meta["charset"], from_cache=True)
+            if meta["headers"].get("ETag"):
+                request_headers["If-None-Match"] = meta["headers"]["ETag"]
+            if meta["headers"].get("Last-Modified"):
+                request_headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+
+        async with self.session().get(
+            url,
+            headers=request_headers,
+            timeout=aiohttp.ClientTimeout(total=timeout),
+            allow_redirects=True,
+        ) as response:
+            if response.status == 304 and cached is not None:
+                meta, body = cached
+                await asyncio.to_thread(self.cache.refresh, url, meta, CIMultiDict(response.headers))
+                return CachedResponse(meta["final_url"], meta["status"], body, meta["headers"], meta["charset"], from_cache=True, revalidated=True)
+            if raise_for_status:
+                response.raise_for_status()
+            result = CachedResponse(
+                url=str(response.url),
+                status=response.status,
+                body=await response.read(),
+                headers=CIMultiDict(response.headers),
+                charset=response.charset,
+            )
+        if use_cache and result.status == 200:
+            try:
+                await asyncio.to_thread(self.cache.store, url, result)
+            except OSError as exc:
+                logger.warning(f"[GovernmentHttpPool] Could not cache {url}: {exc}")
+        return result
+
+    async def close(self) -> None:
+        for session in list(self._sessions.values()):
+            if not session.closed:
+                await session.close()
+        self._sessions.clear()
+
+
+def freshness(headers: Mapping[str, str]) -> tuple[bool, float]:
+    """Returns ``(storable, expires_at)`` from Cache-Control / Expires; stale entries must be revalidated."""
+    directives: dict[str, str] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"')
+    if "no-store" in directives:
+        return False, 0.0
+    if "no-cache" in directives:
+        return True, 0.0
+    for name in ("s-maxage", "max-age"):
+        if directives.get(name, "").isdigit():
+            return True, time.time() + int(directives[name])
+    if headers.get("Expires"):
+        try:
+            return True, parsedate_to_datetime(headers["Expires"]).timestamp()
+        except (TypeError, ValueError):
+            return True, 0.0
+    return True, 0.0
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def get_government_http() -> GovernmentHttpPool:
+    global _pool
+    if _pool is None:
+        _pool = GovernmentHttpPool()
+    return _pool
+
+
+async def close_government_http() -> None:
+    """Closes the shared pool's sessions; called on API shutdown."""
+    if _pool is not None:
+        await _pool.close()
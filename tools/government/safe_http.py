@@ -8,9 +8,10 @@ from dataclasses import dataclass
 from urllib.parse import urljoin, urlparse
 from urllib.robotparser import RobotFileParser
 
-import aiohttp
 from bs4 import BeautifulSoup
 
+from tools.government.http_pool import get_government_http
+
 
 ALLOWED_SUFFIXES = (".gov.in", ".nic.in")
 ALLOWED_HOSTS = {"data.gov.in", "egazette.nic.in", "indiacode.nic.in", "pib.gov.in"}
@@ -50,13 +51,10 @@ class SafeGovernmentHttpClient:
             raise ValueError("URL is not an allowlisted government endpoint")
         if respect_robots and not await self._robots_allowed(url):
             raise ValueError("robots.txt disallows this fetch")
-        timeout = aiohttp.ClientTimeout(total=self.timeout_seconds)
         headers = {"User-Agent": "RTI-Agent-v2-Government-Research/1.0 (+read-only)"}
-        async with aiohttp.ClientSession(headers=headers, timeout=timeout) as session:
-            async with session.get(url, allow_redirects=True) as response:
-                response.raise_for_status()
-                body = await response.text(errors="ignore")
-                final_url = str(response.url)
+        response = await get_government_http().get(url, headers=headers, timeout=self.timeout_seconds)
+        body = response.text()
+        final_url = response.url
         soup = BeautifulSoup(body, "html.parser")
         for tag in soup(["script", "style", "noscript"]):
             tag.decompose()
@@ -78,12 +76,11 @@ class SafeGovernmentHttpClient:
                 parser = RobotFileParser()
                 parser.set_url(urljoin(root, "/robots.txt"))
                 try:
-                    async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=5)) as session:
-                        async with session.get(parser.url) as response:
-                            if response.status >= 400:
-                                self._robots_cache[root] = parser
-                                return True
-                            parser.parse((await response.text()).splitlines())
+                    response = await get_government_http().get(parser.url, timeout=5, raise_for_status=False)
+                    if response.status >= 400:
+                        self._robots_cache[root] = parser
+                        return True
+                    parser.parse(response.text().splitlines())
                 except Exception:
                     return True
                 self._robots_cache[root] = parser
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from tools.base.base_tool import BaseTool
 from tools.utility.language_detector_tool import TextInput
-from security.pii_masker import mask_pii
+from security.pii_engine import detect_pii, mask_matches
 
 
 class PIIRedactionTool(BaseTool):
@@ -14,5 +14,8 @@ class PIIRedactionTool(BaseTool):
     input_schema = TextInput
 
     async def execute(self, text: str):
-        return {"text": mask_pii(text)}
+        matches = detect_pii(text)
+        # Offsets refer to the input text; the matched values themselves are not returned
+        spans = [{"type": match.kind, "start": match.start, "end": match.end} for match in matches]
+        return {"text": mask_matches(text, matches), "pii_spans": spans}
 